@@ -0,0 +1,146 @@
+const cluster = require('cluster');
+const os = require('os');
+require('dotenv').config();
+const { relay } = require('./utils/clusterChannel');
+
+// CLUSTER_WORKERS: 'auto' for one worker per core, a number for that many, or
+// unset/1 to run the server in this process as before
+const workerCount = () => {
+  const setting = process.env.CLUSTER_WORKERS;
+  if (setting === 'auto') {
+    return typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+  }
+  return Math.max(1, parseInt(setting, 10) || 1);
+};
+
+// A worker that dies sooner than this after starting counts as crash-looping,
+// and its replacement is started with an increasing delay
+const MIN_HEALTHY_UPTIME_MS = 5000;
+const MAX_RESTART_DELAY_MS = 30 * 1000;
+// How long a rolling restart waits for a replacement to listen, and for its
+// predecessor to drain (server.js gives in-flight requests SHUTDOWN_TIMEOUT_MS)
+const RESTART_LISTEN_TIMEOUT_MS = 30 * 1000;
+const RESTART_DRAIN_TIMEOUT_MS = (parseInt(process.env.SHUTDOWN_TIMEOUT_MS, 10) || 10 * 1000) + 5000;
+
+const runPrimary = (count) => {
+  let shuttingDown = false;
+  let quickCrashes = 0;
+  // Workers being replaced on purpose, which must not be restarted when they exit
+  const retiring = new Set();
+  // Crash restarts waiting out their backoff
+  const restartTimers = new Set();
+
+  const fork = () => {
+    const worker = cluster.fork();
+    worker.startedAt = Date.now();
+    return worker;
+  };
+
+  // Resolves with the first of events the worker emits, or 'timeout'
+  const waitFor = (worker, events, timeoutMs) => new Promise((resolve) => {
+    const listeners = events.map((event) => [event, () => done(event)]);
+    const timer = setTimeout(() => done('timeout'), timeoutMs);
+    const done = (result) => {
+      clearTimeout(timer);
+      listeners.forEach(([event, listener]) => worker.off(event, listener));
+      resolve(result);
+    };
+    listeners.forEach(([event, listener]) => worker.once(event, listener));
+  });
+
+  // Cache invalidations of one worker reach the others through here
+  cluster.on('message', relay);
+
+  cluster.on('listening', (worker, address) => {
+    console.log(`Worker ${worker.process.pid} listening on port ${address.port}`);
+  });
+
+  cluster.on('exit', (worker, code, signal) => {
+    if (shuttingDown || retiring.delete(worker)) return;
+
+    const uptime = Date.now() - worker.startedAt;
+    quickCrashes = uptime < MIN_HEALTHY_UPTIME_MS ? quickCrashes + 1 : 0;
+    const delay = quickCrashes > 0 ? Math.min(MAX_RESTART_DELAY_MS, 1000 * 2 ** (quickCrashes - 1)) : 0;
+    console.error(`❌ Worker ${worker.process.pid} died (${signal || code}), restarting in ${delay}ms`);
+    const timer = setTimeout(() => {
+      restartTimers.delete(timer);
+      if (!shuttingDown) fork();
+    }, delay);
+    restartTimers.add(timer);
+  });
+
+  // Replace the workers one at a time: each new worker must be listening before
+  // its predecessor is asked to drain, so the port is never left unserved
+  let restarting = false;
+  const rollingRestart = async () => {
+    if (restarting || shuttingDown) return;
+    restarting = true;
+    console.log('Rolling restart of the workers...');
+    try {
+      for (const worker of Object.values(cluster.workers)) {
+        if (shuttingDown) break;
+        if (worker.isDead()) continue;
+        const replacement = fork();
+        // Not restarted by the exit handler if it dies before listening; the
+        // old worker stays and the restart stops there
+        retiring.add(replacement);
+        const started = await waitFor(replacement, ['listening', 'exit'], RESTART_LISTEN_TIMEOUT_MS);
+        if (started !== 'listening') {
+          console.error(`❌ Replacement worker ${replacement.process.pid} ${started === 'exit' ? 'exited' : 'timed out'}`
+            + ' before listening; rolling restart stopped');
+          if (!replacement.isDead()) replacement.process.kill('SIGKILL');
+          return;
+        }
+        retiring.delete(replacement);
+
+        retiring.add(worker);
+        const exited = waitFor(worker, ['exit'], RESTART_DRAIN_TIMEOUT_MS);
+        worker.process.kill('SIGTERM');
+        if (await exited === 'timeout') worker.process.kill('SIGKILL');
+      }
+      console.log('Rolling restart completed.');
+    } finally {
+      restarting = false;
+    }
+  };
+
+  // Each worker drains its own connections on SIGTERM (see server.js)
+  const shutdown = (signal) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    restartTimers.forEach((timer) => clearTimeout(timer));
+    restartTimers.clear();
+    console.log(`${signal} received. Draining the workers...`);
+    const workers = Object.values(cluster.workers).filter((worker) => !worker.isDead());
+    if (workers.length === 0) {
+      console.log('All workers stopped.');
+      process.exit(0);
+    }
+    let running = workers.length;
+    cluster.on('exit', (worker) => {
+      if (!workers.includes(worker)) return;
+      running -= 1;
+      if (running === 0) {
+        console.log('All workers stopped.');
+        process.exit(0);
+      }
+    });
+    workers.forEach((worker) => worker.process.kill('SIGTERM'));
+  };
+
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+  process.on('SIGHUP', rollingRestart);
+
+  console.log(`Primary ${process.pid} starting ${count} workers`);
+  for (let i = 0; i < count; i++) {
+    fork();
+  }
+};
+
+const count = workerCount();
+if (cluster.isPrimary && count > 1) {
+  runPrimary(count);
+} else {
+  require('./server');
+}
@@ -20,49 +20,7 @@ const resumeStorage = new CloudinaryStorage({
   },
 });
 
-// Configure storage for profile images
-const profileImageStorage = new CloudinaryStorage({
-  cloudinary: cloudinary,
-  params: {
-    folder: 'portfolio/profile',
-    allowed_formats: ['jpg', 'png', 'jpeg', 'webp'],
-    transformation: [
-      { width: 400, height: 400, crop: 'fill', gravity: 'face' },
-      { quality: 'auto', fetch_format: 'auto' }
-    ],
-    public_id: (req, file) => `naveen-profile-${Date.now()}`,
-  },
-});
-
-// Configure storage for project images
-const projectImageStorage = new CloudinaryStorage({
-  cloudinary: cloudinary,
-  params: {
-    folder: 'portfolio/projects',
-    allowed_formats: ['jpg', 'png', 'jpeg', 'webp'],
-    transformation: [
-      { width: 800, height: 600, crop: 'fit' },
-      { quality: 'auto', fetch_format: 'auto' }
-    ],
-    public_id: (req, file) => `project-${Date.now()}`,
-  },
-});
-
-// Configure storage for tech stack logos
-const techLogoStorage = new CloudinaryStorage({
-  cloudinary: cloudinary,
-  params: {
-    folder: 'portfolio/tech-logos',
-    allowed_formats: ['jpg', 'png', 'jpeg', 'webp'],
-    transformation: [
-      { width: 100, height: 100, crop: 'fit' },
-      { quality: 'auto', fetch_format: 'auto' }
-    ],
-    public_id: (req, file) => `tech-logo-${Date.now()}`,
-  },
-});
-
-// Create multer upload instances
+// Resume uploads; images go through config/imageStore.js, which stores their variants
 const uploadResume = multer({
   storage: resumeStorage,
   limits: { fileSize: 5 * 1024 * 1024 }, // 5MB limit
@@ -75,42 +33,6 @@ const uploadResume = multer({
   }
 });
 
-const uploadProfileImage = multer({
-  storage: profileImageStorage,
-  limits: { fileSize: 2 * 1024 * 1024 }, // 2MB limit
-  fileFilter: (req, file, cb) => {
-    if (file.mimetype.startsWith('image/')) {
-      cb(null, true);
-    } else {
-      cb(new Error('Only image files are allowed'), false);
-    }
-  }
-});
-
-const uploadProjectImage = multer({
-  storage: projectImageStorage,
-  limits: { fileSize: 3 * 1024 * 1024 }, // 3MB limit
-  fileFilter: (req, file, cb) => {
-    if (file.mimetype.startsWith('image/')) {
-      cb(null, true);
-    } else {
-      cb(new Error('Only image files are allowed for project images'), false);
-    }
-  }
-});
-
-const uploadTechLogo = multer({
-  storage: techLogoStorage,
-  limits: { fileSize: 1 * 1024 * 1024 }, // 1MB limit
-  fileFilter: (req, file, cb) => {
-    if (file.mimetype.startsWith('image/')) {
-      cb(null, true);
-    } else {
-      cb(new Error('Only image files are allowed for tech logos'), false);
-    }
-  }
-});
-
 // Helper function to delete file from Cloudinary
 const deleteFromCloudinary = async (publicId, resourceType = 'image') => {
   try {
@@ -127,8 +49,5 @@ const deleteFromCloudinary = async (publicId, resourceType = 'image') => {
 module.exports = {
   cloudinary,
   uploadResume,
-  uploadProfileImage,
-  uploadProjectImage,
-  uploadTechLogo,
   deleteFromCloudinary
 };
\ No newline at end of file
@@ -0,0 +1,28 @@
+// MongoClient options for mongoose.connect. Pool settings come from the
+// environment; anything left unset keeps the driver default.
+const POOL_SETTINGS = {
+  maxPoolSize: 'MONGO_MAX_POOL_SIZE',
+  minPoolSize: 'MONGO_MIN_POOL_SIZE',
+  maxConnecting: 'MONGO_MAX_CONNECTING',
+  maxIdleTimeMS: 'MONGO_MAX_IDLE_TIME_MS',
+  waitQueueTimeoutMS: 'MONGO_WAIT_QUEUE_TIMEOUT_MS',
+  serverSelectionTimeoutMS: 'MONGO_SERVER_SELECTION_TIMEOUT_MS',
+  connectTimeoutMS: 'MONGO_CONNECT_TIMEOUT_MS',
+  socketTimeoutMS: 'MONGO_SOCKET_TIMEOUT_MS'
+};
+
+const mongoOptions = () => {
+  const options = {
+    // Command events feed the per-operation timings of utils/dbPoolMetrics.js
+    monitorCommands: true
+  };
+  Object.entries(POOL_SETTINGS).forEach(([option, variable]) => {
+    const value = parseInt(process.env[variable], 10);
+    if (!Number.isNaN(value)) options[option] = value;
+  });
+  return options;
+};
+
+module.exports = {
+  mongoOptions
+};
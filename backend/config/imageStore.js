@@ -0,0 +1,255 @@
+const fs = require('fs/promises');
+const path = require('path');
+const multer = require('multer');
+const { cloudinary } = require('./cloudinary');
+
+// Every uploaded image is stored as a set of widths in its original kind of
+// format (jpg, or png where transparency matters) plus a modern format, so
+// browsers pick the smallest file that fills the slot from a srcset.
+const modernFormat = process.env.IMAGE_MODERN_FORMAT || 'webp';
+
+const IMAGE_PRESETS = {
+  profile: {
+    folder: 'portfolio/profile',
+    prefix: 'naveen-profile',
+    widths: [160, 320, 640, 960],
+    aspectRatio: 1,
+    crop: 'fill',
+    gravity: 'face',
+    fallbackFormat: 'jpg',
+    sizes: '320px'
+  },
+  project: {
+    folder: 'portfolio/projects',
+    prefix: 'project',
+    widths: [320, 640, 960, 1280],
+    aspectRatio: 4 / 3,
+    crop: 'limit',
+    fallbackFormat: 'jpg',
+    sizes: '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw'
+  },
+  techLogo: {
+    folder: 'portfolio/tech-logos',
+    prefix: 'tech-logo',
+    widths: [32, 64, 96, 128],
+    aspectRatio: 1,
+    crop: 'limit',
+    fallbackFormat: 'png',
+    sizes: '32px'
+  }
+};
+
+const MIME_TYPES = { jpg: 'image/jpeg', png: 'image/png', webp: 'image/webp', avif: 'image/avif' };
+
+// One entry per width and format of a preset
+const variantSpecs = (preset) => [preset.fallbackFormat, modernFormat].flatMap((format) => (
+  preset.widths.map((width) => ({ width, height: Math.round(width / preset.aspectRatio), format }))
+));
+
+// Cloudinary keeps the original and renders the variants as eager
+// transformations at upload time; destroying the original removes them too
+class CloudinaryImageStore {
+  upload(buffer, preset) {
+    const specs = variantSpecs(preset);
+    return new Promise((resolve, reject) => {
+      cloudinary.uploader.upload_stream({
+        folder: preset.folder,
+        public_id: `${preset.prefix}-${Date.now()}`,
+        allowed_formats: ['jpg', 'png', 'jpeg', 'webp'],
+        eager: specs.map(({ width, height, format }) => ({
+          width,
+          height,
+          crop: preset.crop,
+          ...(preset.gravity ? { gravity: preset.gravity } : {}),
+          quality: 'auto',
+          format
+        }))
+      }, (error, result) => {
+        if (error) return reject(error);
+        resolve({
+          publicId: result.public_id,
+          width: result.width,
+          height: result.height,
+          variants: result.eager.map((derived, i) => ({
+            publicId: result.public_id,
+            url: derived.secure_url,
+            width: derived.width,
+            height: derived.height,
+            format: specs[i].format,
+            bytes: derived.bytes
+          }))
+        });
+      }).end(buffer);
+    });
+  }
+
+  async destroy(publicIds) {
+    await Promise.all(publicIds.map((publicId) => (
+      cloudinary.uploader.destroy(publicId, { resource_type: 'image', invalidate: true })
+    )));
+  }
+}
+
+// Writes the variants under IMAGE_LOCAL_DIR and serves them from
+// IMAGE_LOCAL_URL; for development and tests without a Cloudinary account.
+// Resizing needs the optional sharp package.
+class LocalImageStore {
+  constructor({ dir, baseUrl }) {
+    this.dir = path.resolve(dir);
+    this.baseUrl = baseUrl.replace(/\/$/, '');
+    this.sharp = null;
+  }
+
+  // Path under which server.js serves the files
+  get urlPath() {
+    return new URL(this.baseUrl).pathname;
+  }
+
+  loadSharp() {
+    if (!this.sharp) {
+      try {
+        this.sharp = require('sharp');
+      } catch (error) {
+        throw new Error('IMAGE_STORE=local needs the sharp package (npm install sharp)');
+      }
+    }
+    return this.sharp;
+  }
+
+  // Stored files are addressed by their path relative to dir, which must not
+  // lead out of it
+  filePath(publicId) {
+    const file = path.resolve(this.dir, publicId);
+    if (!file.startsWith(`${this.dir}${path.sep}`)) {
+      throw new Error(`Invalid image public ID: ${publicId}`);
+    }
+    return file;
+  }
+
+  async upload(buffer, preset) {
+    const sharp = this.loadSharp();
+    const { width, height } = await sharp(buffer).metadata();
+    const publicId = `${preset.folder}/${preset.prefix}-${Date.now()}`;
+    await fs.mkdir(path.dirname(this.filePath(publicId)), { recursive: true });
+
+    const variants = await Promise.all(variantSpecs(preset).map(async (spec) => {
+      const variantId = `${publicId}-${spec.width}w.${spec.format}`;
+      const info = await sharp(buffer)
+        .rotate()
+        .resize({
+          width: spec.width,
+          height: spec.height,
+          fit: preset.crop === 'fill' ? 'cover' : 'inside',
+          position: preset.gravity === 'face' ? sharp.strategy.attention : 'centre',
+          withoutEnlargement: true
+        })
+        .toFormat(spec.format === 'jpg' ? 'jpeg' : spec.format)
+        .toFile(this.filePath(variantId));
+      return {
+        publicId: variantId,
+        url: `${this.baseUrl}/${variantId}`,
+        width: info.width,
+        height: info.height,
+        format: spec.format,
+        bytes: info.size
+      };
+    }));
+    return { publicId, width, height, variants };
+  }
+
+  async destroy(publicIds) {
+    await Promise.all(publicIds.map((publicId) => fs.rm(this.filePath(publicId), { force: true })));
+  }
+}
+
+const createImageStore = () => {
+  if (process.env.IMAGE_STORE === 'local') {
+    return new LocalImageStore({
+      dir: process.env.IMAGE_LOCAL_DIR || path.join(__dirname, '..', 'uploads'),
+      baseUrl: process.env.IMAGE_LOCAL_URL || `http://127.0.0.1:${process.env.PORT || 8001}/uploads`
+    });
+  }
+  return new CloudinaryImageStore();
+};
+
+const toSrcset = (variants) => variants.map((variant) => `${variant.url} ${variant.width}w`).join(', ');
+
+// The srcset-style description stored on a document: src and srcset in the
+// fallback format for <img>, a <source> per modern format, and the public IDs
+// that deleting the image has to remove
+const buildImageSet = (upload, preset) => {
+  const byFormat = (format) => {
+    const seen = new Set();
+    // An original narrower than a preset width yields the same file twice
+    return upload.variants
+      .filter((variant) => variant.format === format)
+      .sort((a, b) => a.width - b.width)
+      .filter((variant) => !seen.has(variant.width) && seen.add(variant.width));
+  };
+  const fallback = byFormat(preset.fallbackFormat);
+  const modern = byFormat(modernFormat);
+
+  return {
+    src: fallback[fallback.length - 1].url,
+    srcset: toSrcset(fallback),
+    sources: modern.length > 0 ? [{ type: MIME_TYPES[modernFormat], srcset: toSrcset(modern) }] : [],
+    sizes: preset.sizes,
+    width: upload.width,
+    height: upload.height,
+    publicIds: [...new Set([upload.publicId, ...upload.variants.map((variant) => variant.publicId)])]
+  };
+};
+
+// Everything to remove with a document's image: the variants of its image set
+// and the public ID of an image uploaded before there were variants
+const imagePublicIds = (imageSet, legacyPublicId) => (
+  [...new Set([legacyPublicId, ...(imageSet?.publicIds || [])])].filter(Boolean)
+);
+
+const imageStore = createImageStore();
+
+// Uploads are kept in memory and handed to the image store, which writes the variants
+const imageUpload = (maxBytes, message) => multer({
+  storage: multer.memoryStorage(),
+  limits: { fileSize: maxBytes },
+  fileFilter: (req, file, cb) => {
+    if (file.mimetype.startsWith('image/')) {
+      cb(null, true);
+    } else {
+      cb(new Error(message), false);
+    }
+  }
+});
+
+const uploadProfileImage = imageUpload(2 * 1024 * 1024, 'Only image files are allowed'); // 2MB limit
+const uploadProjectImage = imageUpload(3 * 1024 * 1024, 'Only image files are allowed for project images'); // 3MB limit
+const uploadTechLogo = imageUpload(1 * 1024 * 1024, 'Only image files are allowed for tech logos'); // 1MB limit
+
+// Store an upload under a preset and describe it as an image set
+const storeImage = async (file, preset) => buildImageSet(await imageStore.upload(file.buffer, preset), preset);
+
+// Remove every variant of an image; failures are logged, never thrown, as the
+// document they belonged to is already gone
+const removeImage = async (imageSet, legacyPublicId) => {
+  const publicIds = imagePublicIds(imageSet, legacyPublicId);
+  if (publicIds.length === 0) return;
+  try {
+    await imageStore.destroy(publicIds);
+  } catch (error) {
+    console.error('Error deleting image variants:', error);
+  }
+};
+
+module.exports = {
+  IMAGE_PRESETS,
+  CloudinaryImageStore,
+  LocalImageStore,
+  imageStore,
+  buildImageSet,
+  imagePublicIds,
+  uploadProfileImage,
+  uploadProjectImage,
+  uploadTechLogo,
+  storeImage,
+  removeImage
+};
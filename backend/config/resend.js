@@ -1,21 +1,26 @@
 const { Resend } = require('resend');
 const resend = new Resend(process.env.RESEND_API_KEY);
 
+const SENDER = 'Naveen Agarwal <onboarding@resend.dev>'; // Verified domain sender
+const ADMIN_INBOX = 'naveenagarwal7624@gmail.com';       // Your admin inbox
+
 // 📩 Email to Admin (from contact form)
-const sendContactEmail = async ({ name, email, message }) => {
-  try {
-    await resend.emails.send({
-      from: 'Naveen Agarwal <onboarding@resend.dev>', // Verified domain sender
-      to: 'naveenagarwal7624@gmail.com',               // Your admin inbox
-      replyTo: email,                                  // So you can reply directly
-      subject: 'New Contact Message from Portfolio',
-      html: `
+const buildContactEmail = ({ name, email, message }) => ({
+  from: SENDER,
+  to: ADMIN_INBOX,
+  replyTo: email,                                        // So you can reply directly
+  subject: 'New Contact Message from Portfolio',
+  html: `
         <h2>New Contact Message</h2>
         <p><strong>Name:</strong> ${name}</p>
         <p><strong>Email:</strong> ${email}</p>
         <p><strong>Message:</strong><br>${message.replace(/\n/g, '<br>')}</p>
       `
-    });
+});
+
+const sendContactEmail = async ({ name, email, message }) => {
+  try {
+    await resend.emails.send(buildContactEmail({ name, email, message }));
     return { success: true };
   } catch (error) {
     console.error('❌ Failed to send admin email:', error);
@@ -24,19 +29,21 @@ const sendContactEmail = async ({ name, email, message }) => {
 };
 
 // 🤖 Auto Reply to User
-const sendAutoReply = async ({ name, email }) => {
-  try {
-    await resend.emails.send({
-      from: 'Naveen Agarwal <onboarding@resend.dev>',
-      to: email,
-      subject: 'Thanks for contacting me!',
-      html: `
+const buildAutoReply = ({ name, email }) => ({
+  from: SENDER,
+  to: email,
+  subject: 'Thanks for contacting me!',
+  html: `
         <h2>Hi ${name},</h2>
         <p>Thank you for reaching out through my portfolio website.</p>
         <p>I’ve received your message and will get back to you shortly.</p>
         <p>Regards,<br><strong>Naveen Agarwal</strong></p>
       `
-    });
+});
+
+const sendAutoReply = async ({ name, email }) => {
+  try {
+    await resend.emails.send(buildAutoReply({ name, email }));
     return { success: true };
   } catch (error) {
     console.error('⚠️ Failed to send auto-reply:', error);
@@ -44,8 +51,35 @@ const sendAutoReply = async ({ name, email }) => {
   }
 };
 
+// 📨 Send one email; resolves with its provider id, rejects if Resend refused it
+const sendEmail = async (email) => {
+  const { data, error } = await resend.emails.send(email);
+  if (error) {
+    throw new Error(error.message || 'Resend rejected the email');
+  }
+  return data && data.id;
+};
+
+// 📦 Send up to 100 emails in one API call. Resolves with the provider ids in
+// the order of emails, rejects if Resend refused the batch. The builders use
+// the SDK's replyTo, which emails.send maps to the API's reply_to; the batch
+// call is given the API's field name directly.
+const sendEmailBatch = async (emails) => {
+  const { data, error } = await resend.batch.send(emails.map(({ replyTo, ...email }) => (
+    replyTo ? { ...email, reply_to: replyTo } : email
+  )));
+  if (error) {
+    throw new Error(error.message || 'Resend rejected the email batch');
+  }
+  return (data && data.data ? data.data : []).map((sent) => sent.id);
+};
+
 module.exports = {
   resend,
+  buildContactEmail,
+  buildAutoReply,
   sendContactEmail,
-  sendAutoReply
+  sendAutoReply,
+  sendEmail,
+  sendEmailBatch
 };
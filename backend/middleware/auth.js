@@ -1,5 +1,6 @@
 const jwt = require('jsonwebtoken');
 const User = require('../models/User');
+const { getCachedUser, cacheUser } = require('../utils/userCache');
 
 const auth = async (req, res, next) => {
   try {
@@ -12,9 +13,16 @@ const auth = async (req, res, next) => {
       });
     }
 
+    // The signature and expiry are checked on every request; only the user
+    // lookup behind a valid token is cached
     const decoded = jwt.verify(token, process.env.JWT_SECRET);
-    const user = await User.findById(decoded.id).select('-password');
-    
+    let user = getCachedUser(token);
+
+    if (!user || String(user._id) !== String(decoded.id)) {
+      user = await User.findById(decoded.id).select('-password').lean();
+      if (user) cacheUser(token, user, decoded.exp);
+    }
+
     if (!user) {
       return res.status(401).json({ 
         success: false, 
@@ -23,6 +31,7 @@ const auth = async (req, res, next) => {
     }
 
     req.user = user;
+    req.token = token;
     next();
   } catch (error) {
     console.error('Auth middleware error:', error);
@@ -0,0 +1,119 @@
+const LRUCache = require('../utils/lruCache');
+const { subscribe, publish } = require('../utils/clusterChannel');
+
+// Serialized responses of the public portfolio routes, keyed by route and query
+const portfolioCache = new LRUCache({
+  maxEntries: parseInt(process.env.PORTFOLIO_CACHE_MAX_ENTRIES, 10) || 200,
+  ttlMs: parseInt(process.env.PORTFOLIO_CACHE_TTL_MS, 10) || 5 * 60 * 1000
+});
+
+// Bumped on every invalidation, so a response computed from data read before an
+// admin write is never stored after that write has invalidated the cache
+const generations = {
+  personal: 0,
+  projects: 0,
+  techStack: 0
+};
+
+// Called with the invalidated tags after every invalidation, for data derived
+// from the same collections outside this cache (utils/portfolioBundle.js)
+const invalidationListeners = [];
+
+const onInvalidate = (listener) => {
+  invalidationListeners.push(listener);
+};
+
+// Route path plus query parameters in a stable order
+const cacheKey = (req) => {
+  const params = new URLSearchParams();
+  Object.keys(req.query).sort().forEach((name) => {
+    params.append(name, String(req.query[name]));
+  });
+  const query = params.toString();
+  return `${req.baseUrl}${req.path}${query ? `?${query}` : ''}`;
+};
+
+// Serve a cached response if there is one, otherwise cache what the route sends.
+// tags name the data the response is built from (personal, projects, techStack).
+// Validators set by the route (ETag, Last-Modified) are cached with the body, so
+// conditional requests for a cached response are answered without the database.
+const cacheResponse = (...tags) => (req, res, next) => {
+  const key = cacheKey(req);
+  const cached = portfolioCache.get(key);
+
+  if (cached) {
+    res.set('X-Cache', 'HIT');
+    if (cached.etag) res.set('ETag', cached.etag);
+    if (cached.lastModified) res.set('Last-Modified', cached.lastModified);
+    if (cached.etag) res.set('Cache-Control', 'no-cache');
+    if (req.fresh) {
+      return res.status(304).end();
+    }
+    res.type('application/json');
+    return res.send(cached.body);
+  }
+
+  const startGenerations = tags.map((tag) => generations[tag]);
+
+  // Routes send through res.json, or with a body they serialized themselves
+  // through sendData (utils/serializers.js)
+  res.sendSerialized = (body) => {
+    const unchanged = tags.every((tag, i) => generations[tag] === startGenerations[i]);
+
+    if (res.statusCode === 200 && unchanged) {
+      portfolioCache.set(key, {
+        body,
+        tags,
+        etag: res.get('ETag'),
+        lastModified: res.get('Last-Modified')
+      });
+    }
+
+    res.set('X-Cache', 'MISS');
+    res.type('application/json');
+    return res.send(body);
+  };
+  res.json = (payload) => res.sendSerialized(JSON.stringify(payload));
+
+  next();
+};
+
+const dropTags = (tags) => {
+  tags.forEach((tag) => {
+    generations[tag]++;
+  });
+  invalidationListeners.forEach((listener) => listener(tags));
+  return portfolioCache.deleteWhere((key, entry) => entry.tags.some((tag) => tags.includes(tag)));
+};
+
+const dropAll = () => {
+  Object.keys(generations).forEach((tag) => {
+    generations[tag]++;
+  });
+  invalidationListeners.forEach((listener) => listener(Object.keys(generations)));
+  portfolioCache.clear();
+};
+
+// Under cluster.js every worker caches on its own; invalidations are passed to
+// the others, so none keeps serving (or answering 304 for) the old data
+subscribe('cache:invalidate', ({ tags }) => dropTags(tags));
+subscribe('cache:clear', () => dropAll());
+
+// Drop every cached response built from any of the given tags
+const invalidateCache = (...tags) => {
+  publish('cache:invalidate', { tags });
+  return dropTags(tags);
+};
+
+const clearCache = () => {
+  publish('cache:clear');
+  dropAll();
+};
+
+module.exports = {
+  portfolioCache,
+  cacheResponse,
+  invalidateCache,
+  clearCache,
+  onInvalidate
+};
@@ -0,0 +1,40 @@
+const crypto = require('crypto');
+
+// Count and newest updatedAt of the documents a response is built from, in one round-trip
+const collectionVersion = async (Model, match = {}) => {
+  const [version] = await Model.aggregate([
+    { $match: match },
+    { $group: { _id: null, count: { $sum: 1 }, lastModified: { $max: '$updatedAt' } } }
+  ]);
+  return version || { count: 0, lastModified: null };
+};
+
+// Set a strong ETag and Last-Modified derived from the collection versions, and
+// answer with 304 when the client's copy is still current. Every admin write bumps
+// updatedAt or the document count, so the ETag changes whenever the body would.
+// Returns true when the 304 has been sent and the route should stop.
+const sendIfFresh = (req, res, versions) => {
+  const hash = crypto.createHash('sha1').update(req.originalUrl);
+  let lastModified = null;
+
+  versions.forEach(({ count, lastModified: modified }) => {
+    hash.update(`|${count}|${modified ? modified.getTime() : 0}`);
+    if (modified && (!lastModified || modified > lastModified)) lastModified = modified;
+  });
+
+  res.set('ETag', `"${hash.digest('base64url')}"`);
+  if (lastModified) res.set('Last-Modified', lastModified.toUTCString());
+  // Let browsers keep the response but revalidate it on every use
+  res.set('Cache-Control', 'no-cache');
+
+  if (req.fresh) {
+    res.status(304).end();
+    return true;
+  }
+  return false;
+};
+
+module.exports = {
+  collectionVersion,
+  sendIfFresh
+};
@@ -0,0 +1,34 @@
+const { AsyncLocalStorage } = require('async_hooks');
+
+// Per-request store, visible to driver events fired while the request is handled
+const requestContext = new AsyncLocalStorage();
+
+// Count every command the MongoClient sends against the request that issued it.
+// The client must be created with monitorCommands: true.
+const trackCommands = (client) => {
+  client.on('commandStarted', () => {
+    const store = requestContext.getStore();
+    if (store) store.dbRoundtrips++;
+  });
+};
+
+// Report the number of database round-trips a request needed in X-DB-Roundtrips
+const countRoundtrips = (req, res, next) => {
+  const store = { dbRoundtrips: 0 };
+  const writeHead = res.writeHead;
+
+  res.writeHead = function (...args) {
+    if (!res.headersSent) {
+      res.setHeader('X-DB-Roundtrips', String(store.dbRoundtrips));
+    }
+    return writeHead.apply(this, args);
+  };
+
+  requestContext.run(store, next);
+};
+
+module.exports = {
+  requestContext,
+  trackCommands,
+  countRoundtrips
+};
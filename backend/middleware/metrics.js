@@ -0,0 +1,82 @@
+const crypto = require('crypto');
+const auth = require('./auth');
+const { startRequest, renderMetrics } = require('../utils/metrics');
+
+// Label requests by the route that answered them rather than the raw URL.
+// Requests no route matched (404s) share one label, and those answered by a
+// router's middleware (auth, rate limits) are labelled with its mount path.
+const routeLabel = (req, res) => {
+  if (req.route) return `${req.baseUrl}${req.route.path}`;
+  if (res.statusCode === 404) return 'unmatched';
+  return `${req.baseUrl}/*`;
+};
+
+// Record every request's status and duration for /api/metrics. Register it
+// before the routes so that rejected requests are timed too.
+const requestMetrics = (req, res, next) => {
+  const done = startRequest();
+  let recorded = false;
+  const record = () => {
+    if (recorded) return;
+    recorded = true;
+    done(req.method, routeLabel(req, res), res.statusCode);
+  };
+  // 'close' alone covers clients that hang up before the response is written
+  res.on('finish', record);
+  res.on('close', record);
+  next();
+};
+
+// Report the CPU time a request took until its headers were written in a
+// Server-Timing header. Concurrent requests share the process's CPU clock, so
+// the figure is only exact for requests answered one at a time (benchmarks).
+const reportCpuTime = (req, res, next) => {
+  const started = process.cpuUsage();
+  const writeHead = res.writeHead;
+
+  res.writeHead = function (...args) {
+    if (!res.headersSent) {
+      const { user, system } = process.cpuUsage(started);
+      res.setHeader('Server-Timing', `cpu;dur=${((user + system) / 1000).toFixed(3)}`);
+    }
+    return writeHead.apply(this, args);
+  };
+
+  next();
+};
+
+const sameToken = (given, expected) => {
+  const digest = (value) => crypto.createHash('sha256').update(value).digest();
+  return crypto.timingSafeEqual(digest(given), digest(expected));
+};
+
+// Scrapers present METRICS_TOKEN as a bearer token; without one configured the
+// endpoint takes an admin login like the rest of the admin API
+const metricsAuth = (req, res, next) => {
+  const expected = process.env.METRICS_TOKEN;
+  if (!expected) return auth(req, res, next);
+
+  const token = req.header('Authorization')?.replace('Bearer ', '');
+  if (!token || !sameToken(token, expected)) {
+    return res.status(401).json({
+      success: false,
+      message: 'Invalid metrics token'
+    });
+  }
+  next();
+};
+
+// Prometheus text format. Under cluster.js each worker keeps its own metrics,
+// so a scrape describes whichever worker answered it.
+const serveMetrics = (req, res) => {
+  res.set('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+  res.set('Cache-Control', 'no-store');
+  res.send(renderMetrics());
+};
+
+module.exports = {
+  requestMetrics,
+  reportCpuTime,
+  metricsAuth,
+  serveMetrics
+};
@@ -0,0 +1,48 @@
+const cluster = require('cluster');
+const rateLimit = require('express-rate-limit');
+const { MongoRateLimitStore } = require('../utils/rateLimitStore');
+
+// 'mongo' shares each limiter's counters between all server processes and
+// instances; 'memory' keeps them in this process. Unset, the counters are in
+// MongoDB only when cluster.js runs several workers; several single-process
+// instances behind a load balancer need RATE_LIMIT_STORE=mongo.
+const configuredStore = process.env.RATE_LIMIT_STORE;
+const rateLimitStore = configuredStore === 'memory' || configuredStore === 'mongo'
+  ? configuredStore
+  : (cluster.isWorker ? 'mongo' : 'memory');
+
+// How the shared counters of limiters created with { batched: true } are
+// written: once a key has RATE_LIMIT_SYNC_HITS hits counted in this process,
+// or RATE_LIMIT_SYNC_MS after the first
+const syncHits = parseInt(process.env.RATE_LIMIT_SYNC_HITS, 10) || 10;
+const syncIntervalMs = parseInt(process.env.RATE_LIMIT_SYNC_MS, 10) || 1000;
+
+const mongoStores = [];
+
+// express-rate-limit middleware named after the quota it enforces. Clients see
+// their quota in the RateLimit-* headers. If the shared store can't be reached,
+// requests are let through rather than failing the API. A batched limiter
+// counts locally and writes its shared counters in the background, for high
+// volume routes with a generous quota; otherwise every hit is written before
+// the request goes on, which keeps small quotas exact.
+const createRateLimiter = (name, options, { batched = false } = {}) => {
+  let store;
+  if (rateLimitStore === 'mongo') {
+    store = new MongoRateLimitStore(name, batched ? { syncHits, syncIntervalMs } : {});
+    mongoStores.push(store);
+  }
+  return rateLimit({
+    standardHeaders: true,
+    passOnStoreError: true,
+    ...(store ? { store } : {}),
+    ...options
+  });
+};
+
+// Write the hits batched limiters haven't written yet, before shutting down
+const flushRateLimiters = () => Promise.all(mongoStores.map((store) => store.flush()));
+
+module.exports = {
+  createRateLimiter,
+  flushRateLimiters
+};
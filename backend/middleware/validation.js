@@ -1,4 +1,4 @@
-const { body, validationResult } = require('express-validator');
+const { body, query, validationResult } = require('express-validator');
 
 // Validation error handler
 const handleValidationErrors = (req, res, next) => {
@@ -63,6 +63,10 @@ const projectValidation = [
     .trim()
     .custom((value) => !value || value.trim().length > 0)
     .withMessage('Image public ID must be a string'),
+  body('imageSet')
+    .optional({ nullable: true })
+    .isObject()
+    .withMessage('Image set must be an object'),
   body('githubUrl')
     .isURL()
     .withMessage('GitHub URL must be a valid URL'),
@@ -188,17 +192,133 @@ const techStackValidation = [
     .trim()
     .custom((value) => !value || value.trim().length > 0)
     .withMessage('Logo public ID must be a string'),
+  body('logoSet')
+    .optional({ nullable: true })
+    .isObject()
+    .withMessage('Logo set must be an object'),
   body('order')
     .optional()
     .isInt({ min: 0 })
     .withMessage('Order must be a non-negative integer')
 ];
 
+// Largest page of GET /api/portfolio/projects search results
+const MAX_SEARCH_LIMIT = 50;
+
+// Project search rules: ?q= keywords, ?tech= comma-separated tags that must all
+// be present, ?page= and ?limit=
+const projectSearchValidation = [
+  query('q')
+    .optional()
+    .isString()
+    .withMessage('Search text must be a string')
+    .bail()
+    .trim()
+    .isLength({ max: 100 })
+    .withMessage('Search text must be at most 100 characters'),
+  query('tech')
+    .optional()
+    .isString()
+    .withMessage('Tech tags must be a comma-separated list')
+    .bail()
+    .customSanitizer((value) => value.split(',').map((tag) => tag.trim()).filter(Boolean))
+    .custom((tags) => tags.length <= 10)
+    .withMessage('At most 10 tech tags can be searched for'),
+  query('page')
+    .optional()
+    .isInt({ min: 1 })
+    .withMessage('Page must be a positive integer')
+    .toInt(),
+  query('limit')
+    .optional()
+    .isInt({ min: 1, max: MAX_SEARCH_LIMIT })
+    .withMessage(`Limit must be between 1 and ${MAX_SEARCH_LIMIT}`)
+    .toInt()
+];
+
+// Largest number of items a bulk request may carry
+const MAX_BATCH_ITEMS = 500;
+
+const OBJECT_ID = /^[0-9a-f]{24}$/i;
+
+// Bulk request validation: { create: [...], update: [{ id, ...fields }], delete: [id, ...] }.
+// Every item is checked against the single-item rules in one pass before anything
+// is written, and all errors come back together, their paths prefixed with the
+// item's position (e.g. create[2].title). Sanitized items end up in req.batch.
+const batchValidation = (rules) => async (req, res, next) => {
+  const { create = [], update = [], delete: remove = [] } = req.body || {};
+  const fail = (message, errors) => res.status(400).json({
+    success: false,
+    message,
+    ...(errors ? { errors } : {})
+  });
+
+  if (![create, update, remove].every(Array.isArray)) {
+    return fail('create, update and delete must be arrays');
+  }
+  const size = create.length + update.length + remove.length;
+  if (size === 0) {
+    return fail('Batch is empty');
+  }
+  if (size > MAX_BATCH_ITEMS) {
+    return fail(`Batch is limited to ${MAX_BATCH_ITEMS} items`);
+  }
+
+  const errors = [];
+  const fieldError = (path, msg, value) => errors.push({ type: 'field', value, msg, path, location: 'body' });
+  const checkItem = async (item, path) => {
+    const itemReq = { body: item };
+    await Promise.all(rules.map((rule) => rule.run(itemReq)));
+    validationResult(itemReq).array().forEach((error) => {
+      errors.push({ ...error, path: `${path}.${error.path}` });
+    });
+  };
+
+  const seen = new Set();
+  const checkId = (id, path) => {
+    if (typeof id !== 'string' || !OBJECT_ID.test(id)) {
+      fieldError(path, 'Must be a valid id', id);
+    } else if (seen.has(id.toLowerCase())) {
+      fieldError(path, 'Each id may appear only once per batch', id);
+    } else {
+      seen.add(id.toLowerCase());
+    }
+  };
+
+  const updates = [];
+  for (const [index, item] of create.entries()) {
+    if (!item || typeof item !== 'object') {
+      fieldError(`create[${index}]`, 'Must be an object', item);
+    } else {
+      await checkItem(item, `create[${index}]`);
+    }
+  }
+  for (const [index, item] of update.entries()) {
+    if (!item || typeof item !== 'object') {
+      fieldError(`update[${index}]`, 'Must be an object', item);
+      continue;
+    }
+    const { id, ...fields } = item;
+    checkId(id, `update[${index}].id`);
+    await checkItem(fields, `update[${index}]`);
+    updates.push({ id, fields });
+  }
+  remove.forEach((id, index) => checkId(id, `delete[${index}]`));
+
+  if (errors.length > 0) {
+    return fail('Validation errors', errors);
+  }
+  req.batch = { create, update: updates, delete: remove };
+  next();
+};
+
 module.exports = {
   handleValidationErrors,
+  batchValidation,
   loginValidation,
   contactValidation,
   projectValidation,
   personalValidation,
-  techStackValidation
+  techStackValidation,
+  projectSearchValidation
 };
\ No newline at end of file
@@ -31,7 +31,11 @@ const contactSchema = new mongoose.Schema({
   timestamps: true
 });
 
-// Index for better query performance
-contactSchema.index({ status: 1, createdAt: -1 });
+// Index for better query performance; both match the keyset order of the admin
+// message list, with and without a status filter
+contactSchema.index({ status: 1, createdAt: -1, _id: -1 });
+contactSchema.index({ createdAt: -1, _id: -1 });
+// A sender's recent submissions, which POST /api/contact checks for duplicates
+contactSchema.index({ ipAddress: 1, createdAt: -1 });
 
 module.exports = mongoose.model('Contact', contactSchema);
\ No newline at end of file
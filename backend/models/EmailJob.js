@@ -0,0 +1,58 @@
+const mongoose = require('mongoose');
+
+// Outbox entry for an email that still has to be handed to Resend
+const emailJobSchema = new mongoose.Schema({
+  kind: {
+    type: String,
+    enum: ['contactNotification', 'autoReply'],
+    required: true
+  },
+  contact: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Contact'
+  },
+  payload: {
+    name: String,
+    email: String,
+    message: String
+  },
+  status: {
+    type: String,
+    enum: ['pending', 'sending', 'sent', 'failed'],
+    default: 'pending'
+  },
+  attempts: {
+    type: Number,
+    default: 0
+  },
+  nextAttemptAt: {
+    type: Date,
+    default: Date.now
+  },
+  // A worker that claimed the job must finish before this, or it is claimed again
+  lockedUntil: {
+    type: Date
+  },
+  claimId: {
+    type: String
+  },
+  lastError: {
+    type: String
+  },
+  providerId: {
+    type: String
+  },
+  sentAt: {
+    type: Date
+  }
+}, {
+  timestamps: true
+});
+
+// Due-job lookup of the outbox worker
+emailJobSchema.index({ status: 1, nextAttemptAt: 1 });
+emailJobSchema.index({ claimId: 1 });
+// Delivered jobs are kept for a week
+emailJobSchema.index({ sentAt: 1 }, { expireAfterSeconds: 7 * 24 * 60 * 60 });
+
+module.exports = mongoose.model('EmailJob', emailJobSchema);
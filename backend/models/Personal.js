@@ -1,4 +1,5 @@
 const mongoose = require('mongoose');
+const imageSetSchema = require('./imageSet');
 
 const personalSchema = new mongoose.Schema({
   name: {
@@ -42,6 +43,10 @@ const personalSchema = new mongoose.Schema({
     type: String,
     default: ''
   },
+  profileImageSet: {
+    type: imageSetSchema,
+    default: undefined
+  },
   resumeUrl: {
     type: String,
     default: ''
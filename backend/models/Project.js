@@ -1,4 +1,5 @@
 const mongoose = require('mongoose');
+const imageSetSchema = require('./imageSet');
 
 const projectSchema = new mongoose.Schema({
   title: {
@@ -25,6 +26,10 @@ const projectSchema = new mongoose.Schema({
     type: String,
     default: ''
   },
+  imageSet: {
+    type: imageSetSchema,
+    default: undefined
+  },
   techStack: [{
     type: String,
     trim: true
@@ -53,5 +58,13 @@ const projectSchema = new mongoose.Schema({
 
 // Index for better query performance
 projectSchema.index({ category: 1, featured: -1, createdAt: -1 });
+// Keyword search of GET /api/portfolio/projects?q=; a title match outranks a
+// tag match, which outranks one in the description
+projectSchema.index(
+  { title: 'text', techStack: 'text', description: 'text' },
+  { name: 'project_search', weights: { title: 10, techStack: 5, description: 1 } }
+);
+// ?tech= filters: multikey, one entry per tag, in the list's sort order
+projectSchema.index({ techStack: 1, featured: -1, order: 1, createdAt: -1 });
 
 module.exports = mongoose.model('Project', projectSchema);
\ No newline at end of file
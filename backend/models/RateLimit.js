@@ -0,0 +1,35 @@
+const mongoose = require('mongoose');
+
+// Sliding window counter of one rate limiter key, shared by every server process.
+// Hits are counted per fixed window; the previous window's count is kept so the
+// limiter can weigh it into a sliding estimate.
+const rateLimitSchema = new mongoose.Schema({
+  // `${limiter}:${client key}`
+  _id: {
+    type: String
+  },
+  // Index of the current window (Date.now() / windowMs, rounded down)
+  window: {
+    type: Number,
+    required: true
+  },
+  count: {
+    type: Number,
+    default: 0
+  },
+  previous: {
+    type: Number,
+    default: 0
+  },
+  expiresAt: {
+    type: Date,
+    required: true
+  }
+}, {
+  versionKey: false
+});
+
+// Counters are dropped once neither of their windows matters any more
+rateLimitSchema.index({ expiresAt: 1 }, { expireAfterSeconds: 0 });
+
+module.exports = mongoose.model('RateLimit', rateLimitSchema);
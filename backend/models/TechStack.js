@@ -1,4 +1,5 @@
 const mongoose = require('mongoose');
+const imageSetSchema = require('./imageSet');
 
 const techStackSchema = new mongoose.Schema({
   name: {
@@ -31,6 +32,10 @@ const techStackSchema = new mongoose.Schema({
     default: '',
     trim: true
   },
+  logoSet: {
+    type: imageSetSchema,
+    default: undefined
+  },
   order: {
     type: Number,
     default: 0
@@ -1,5 +1,6 @@
 const mongoose = require('mongoose');
 const bcrypt = require('bcryptjs');
+const { forgetUser } = require('../utils/userCache');
 
 const userSchema = new mongoose.Schema({
   email: {
@@ -41,6 +42,15 @@ userSchema.methods.comparePassword = async function(candidatePassword) {
   return bcrypt.compare(candidatePassword, this.password);
 };
 
+// Drop cached auth lookups whenever a user changes, so the auth middleware
+// never serves a modified or deleted user from memory
+userSchema.post('save', (doc) => forgetUser(doc._id));
+userSchema.post('deleteOne', { document: true, query: false }, (doc) => forgetUser(doc._id));
+userSchema.post(['deleteOne', 'findOneAndDelete', 'findOneAndUpdate'], { document: false, query: true }, function (doc) {
+  forgetUser(doc ? doc._id : null);
+});
+userSchema.post(['updateOne', 'updateMany', 'deleteMany', 'replaceOne'], { document: false, query: true }, () => forgetUser());
+
 // Remove password from JSON output
 userSchema.methods.toJSON = function() {
   const userObject = this.toObject();
@@ -0,0 +1,21 @@
+const mongoose = require('mongoose');
+
+// Width variants of an uploaded image, as built by buildImageSet in
+// config/imageStore.js: src/srcset/sizes for an <img> in the fallback format
+// and a <source> per modern format
+const imageSetSchema = new mongoose.Schema({
+  src: { type: String, required: true },
+  srcset: { type: String, default: '' },
+  sources: [{
+    _id: false,
+    type: { type: String, required: true },
+    srcset: { type: String, required: true }
+  }],
+  sizes: { type: String, default: '' },
+  width: Number,
+  height: Number,
+  // Everything the image store has to remove when the image goes
+  publicIds: [String]
+}, { _id: false });
+
+module.exports = imageSetSchema;
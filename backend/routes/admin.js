@@ -1,19 +1,42 @@
 const express = require('express');
+const { pipeline } = require('stream');
 const Personal = require('../models/Personal');
 const Project = require('../models/Project');
 const TechStack = require('../models/TechStack');
 const Contact = require('../models/Contact');
 const auth = require('../middleware/auth');
-const { uploadResume, uploadProfileImage, uploadProjectImage, uploadTechLogo, deleteFromCloudinary } = require('../config/cloudinary');
+const { portfolioCache, invalidateCache, clearCache } = require('../middleware/cache');
+const { portfolioBundle } = require('../utils/portfolioBundle');
+const { getSummaryCounts, getSummaryCountsLegacy, legacyCountsRequested } = require('../utils/portfolioStats');
+const { outboxStats } = require('../utils/emailOutbox');
+const { dbPoolMetrics } = require('../utils/dbPoolMetrics');
+const { encodeCursor, decodeCursor, afterCursor } = require('../utils/pagination');
+const LRUCache = require('../utils/lruCache');
+const { EXPORT_FORMATS, createExportStream } = require('../utils/exportStream');
+const { loadBatchTargets, schemaErrors, batchOperations } = require('../utils/batchWrite');
+const { shapes, hydratedRead, sendData, sendList } = require('../utils/serializers');
+const { uploadResume, deleteFromCloudinary } = require('../config/cloudinary');
+const {
+  IMAGE_PRESETS,
+  uploadProfileImage,
+  uploadProjectImage,
+  uploadTechLogo,
+  storeImage,
+  removeImage
+} = require('../config/imageStore');
 const { 
   projectValidation, 
   personalValidation, 
   techStackValidation, 
-  handleValidationErrors 
+  handleValidationErrors,
+  batchValidation
 } = require('../middleware/validation');
 
 const router = express.Router();
 
+// Featured projects shown on the portfolio; featuring another one retires the oldest
+const MAX_FEATURED_PROJECTS = 3;
+
 // Apply auth middleware to all routes
 router.use(auth);
 
@@ -22,13 +45,7 @@ router.use(auth);
 // GET /api/admin/projects - Get all projects for admin
 router.get('/projects', async (req, res) => {
   try {
-    const projects = await Project.find()
-      .sort({ featured: -1, order: 1, createdAt: -1 });
-
-    res.json({
-      success: true,
-      data: projects
-    });
+    await sendList(req, res, Project.find().sort({ featured: -1, order: 1, createdAt: -1 }), shapes.adminProject);
   } catch (error) {
     console.error('Error fetching admin projects:', error);
     res.status(500).json({
@@ -45,7 +62,7 @@ router.post('/projects', projectValidation, handleValidationErrors, async (req,
     
     if (projectData.featured) {
       const featuredCount = await Project.countDocuments({ featured: true });
-      if (featuredCount >= 3) {
+      if (featuredCount >= MAX_FEATURED_PROJECTS) {
         await Project.updateOne(
           { featured: true },
           { featured: false },
@@ -56,6 +73,7 @@ router.post('/projects', projectValidation, handleValidationErrors, async (req,
 
     const project = new Project(projectData);
     await project.save();
+    invalidateCache('projects');
 
     res.status(201).json({
       success: true,
@@ -71,6 +89,88 @@ router.post('/projects', projectValidation, handleValidationErrors, async (req,
   }
 });
 
+// POST /api/admin/projects/bulk - Create, update and delete projects in one request
+// Body: { create: [project], update: [{ id, ...project }], delete: [id] }. The batch is
+// validated as a whole, the featured cap is applied once for the whole batch, and
+// everything is written with a single bulkWrite.
+router.post('/projects/bulk', batchValidation(projectValidation), async (req, res) => {
+  try {
+    const batch = req.batch;
+    const errors = await schemaErrors(Project, batch);
+    if (errors.length > 0) {
+      return res.status(400).json({
+        success: false,
+        message: 'Validation errors',
+        errors
+      });
+    }
+
+    const [{ targets, missing }, featured] = await Promise.all([
+      loadBatchTargets(Project, batch, 'featured imagePublicId imageSet'),
+      Project.find({ featured: true }).sort({ updatedAt: 1 }).select('_id').lean()
+    ]);
+
+    if (missing.length > 0) {
+      return res.status(404).json({
+        success: false,
+        message: 'Some projects were not found',
+        missing
+      });
+    }
+
+    // Featured projects once the batch is applied: the batch's own, then the
+    // untouched ones, oldest first, which make way if there are too many
+    const batchFeatured = batch.create.filter((project) => project.featured).length +
+      batch.update.filter(({ id, fields }) => (
+        fields.featured !== undefined ? fields.featured : targets.get(id.toLowerCase()).featured
+      )).length;
+    if (batchFeatured > MAX_FEATURED_PROJECTS) {
+      return res.status(400).json({
+        success: false,
+        message: `A batch can feature at most ${MAX_FEATURED_PROJECTS} projects`
+      });
+    }
+    const untouched = featured.filter((project) => !targets.has(String(project._id)));
+    const unfeatured = untouched
+      .slice(0, Math.max(0, untouched.length + batchFeatured - MAX_FEATURED_PROJECTS))
+      .map((project) => project._id);
+
+    const { operations, createdIds } = batchOperations(batch);
+    operations.unshift(...unfeatured.map((id) => ({
+      updateOne: { filter: { _id: id }, update: { $set: { featured: false } } }
+    })));
+
+    let result;
+    try {
+      result = await Project.bulkWrite(operations, { ordered: true });
+    } finally {
+      // An ordered bulkWrite that fails partway keeps the writes before the failure
+      invalidateCache('projects');
+    }
+
+    await Promise.all(batch.delete
+      .map((id) => targets.get(id.toLowerCase()))
+      .map((project) => removeImage(project.imageSet, project.imagePublicId)));
+
+    res.json({
+      success: true,
+      message: 'Projects updated successfully',
+      data: {
+        created: createdIds,
+        updated: batch.update.length,
+        deleted: result.deletedCount,
+        unfeatured
+      }
+    });
+  } catch (error) {
+    console.error('Error applying project batch:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to apply project batch'
+    });
+  }
+});
+
 // PUT /api/admin/projects/:id - Update project
 router.put('/projects/:id', projectValidation, handleValidationErrors, async (req, res) => {
   try {
@@ -82,6 +182,7 @@ router.put('/projects/:id', projectValidation, handleValidationErrors, async (re
       updateData,
       { new: true, runValidators: true }
     );
+    invalidateCache('projects');
 
     if (!project) {
       return res.status(404).json({
@@ -110,6 +211,7 @@ router.delete('/projects/:id', async (req, res) => {
     const { id } = req.params;
 
     const project = await Project.findByIdAndDelete(id);
+    invalidateCache('projects');
 
     if (!project) {
       return res.status(404).json({
@@ -118,13 +220,7 @@ router.delete('/projects/:id', async (req, res) => {
       });
     }
 
-    if (project.imagePublicId) {
-      try {
-        await deleteFromCloudinary(project.imagePublicId, 'image');
-      } catch (deleteError) {
-        console.error('Error deleting project image:', deleteError);
-      }
-    }
+    await removeImage(project.imageSet, project.imagePublicId);
 
     res.json({
       success: true,
@@ -149,12 +245,16 @@ router.post('/upload/project-image', uploadProjectImage.single('projectImage'),
       });
     }
 
+    // The client saves the image set with the project
+    const imageSet = await storeImage(req.file, IMAGE_PRESETS.project);
+
     res.json({
       success: true,
       message: 'Project image uploaded successfully',
       data: {
-        url: req.file.path,
-        publicId: req.file.public_id
+        url: imageSet.src,
+        publicId: imageSet.publicIds[0],
+        imageSet
       }
     });
   } catch (error) {
@@ -190,6 +290,7 @@ router.get('/personal', async (req, res) => {
         }
       });
       await personal.save();
+      invalidateCache('personal');
     }
 
     res.json({
@@ -219,6 +320,7 @@ router.put('/personal', personalValidation, handleValidationErrors, async (req,
     }
 
     await personal.save();
+    invalidateCache('personal');
 
     res.json({
       success: true,
@@ -269,6 +371,7 @@ router.post('/upload/resume', uploadResume.single('resume'), async (req, res) =>
     personal.resumeUrl = req.file.path;
     personal.resumePublicId = req.file.public_id;
     await personal.save();
+    invalidateCache('personal');
 
     res.json({
       success: true,
@@ -321,6 +424,7 @@ router.post('/upload/frontend-resume', uploadResume.single('frontendResume'), as
     personal.frontendResumeUrl = req.file.path;
     personal.frontendResumePublicId = req.file.public_id;
     await personal.save();
+    invalidateCache('personal');
 
     res.json({
       success: true,
@@ -373,6 +477,7 @@ router.post('/upload/backend-resume', uploadResume.single('backendResume'), asyn
     personal.backendResumeUrl = req.file.path;
     personal.backendResumePublicId = req.file.public_id;
     await personal.save();
+    invalidateCache('personal');
 
     res.json({
       success: true,
@@ -402,15 +507,12 @@ router.post('/upload/profile-image', uploadProfileImage.single('profileImage'),
       });
     }
 
+    const imageSet = await storeImage(req.file, IMAGE_PRESETS.profile);
     let personal = await Personal.findOne();
-    
-    if (personal && personal.profileImagePublicId) {
-      try {
-        await deleteFromCloudinary(personal.profileImagePublicId, 'image');
-      } catch (deleteError) {
-        console.error('Error deleting old profile image:', deleteError);
-      }
-    }
+    // Copied now: assigning the new image set may reuse the nested object
+    const previousPublicIds = personal
+      ? [...(personal.profileImageSet?.publicIds || []), personal.profileImagePublicId]
+      : [];
 
     if (!personal) {
       personal = new Personal({
@@ -422,16 +524,26 @@ router.post('/upload/profile-image', uploadProfileImage.single('profileImage'),
       });
     }
 
-    personal.profileImageUrl = req.file.path;
-    personal.profileImagePublicId = req.file.public_id;
-    await personal.save();
+    personal.profileImageUrl = imageSet.src;
+    personal.profileImagePublicId = imageSet.publicIds[0];
+    personal.profileImageSet = imageSet;
+    try {
+      await personal.save();
+    } catch (saveError) {
+      // Nothing refers to the new variants; the previous image stays in place
+      await removeImage(imageSet);
+      throw saveError;
+    }
+    invalidateCache('personal');
+    await removeImage({ publicIds: previousPublicIds });
 
     res.json({
       success: true,
       message: 'Profile image uploaded successfully',
       data: {
-        url: req.file.path,
-        publicId: req.file.public_id
+        url: imageSet.src,
+        publicId: imageSet.publicIds[0],
+        imageSet
       }
     });
   } catch (error) {
@@ -453,12 +565,16 @@ router.post('/upload/tech-logo', uploadTechLogo.single('techLogo'), async (req,
       });
     }
 
+    // The client saves the image set with the tech stack item as logoSet
+    const imageSet = await storeImage(req.file, IMAGE_PRESETS.techLogo);
+
     res.json({
       success: true,
       message: 'Tech logo uploaded successfully',
       data: {
-        url: req.file.path,
-        publicId: req.file.public_id
+        url: imageSet.src,
+        publicId: imageSet.publicIds[0],
+        imageSet
       }
     });
   } catch (error) {
@@ -475,13 +591,7 @@ router.post('/upload/tech-logo', uploadTechLogo.single('techLogo'), async (req,
 // GET /api/admin/tech-stack - Get all tech stack items
 router.get('/tech-stack', async (req, res) => {
   try {
-    const techStack = await TechStack.find()
-      .sort({ category: 1, order: 1, name: 1 });
-
-    res.json({
-      success: true,
-      data: techStack
-    });
+    await sendList(req, res, TechStack.find().sort({ category: 1, order: 1, name: 1 }), shapes.adminTechStack);
   } catch (error) {
     console.error('Error fetching tech stack:', error);
     res.status(500).json({
@@ -496,6 +606,7 @@ router.post('/tech-stack', techStackValidation, handleValidationErrors, async (r
   try {
     const techItem = new TechStack(req.body);
     await techItem.save();
+    invalidateCache('techStack');
 
     res.status(201).json({
       success: true,
@@ -511,6 +622,62 @@ router.post('/tech-stack', techStackValidation, handleValidationErrors, async (r
   }
 });
 
+// POST /api/admin/tech-stack/bulk - Create, update and delete tech stack items in one request
+// Body: { create: [item], update: [{ id, ...item }], delete: [id] }, validated as a
+// whole and written with a single bulkWrite
+router.post('/tech-stack/bulk', batchValidation(techStackValidation), async (req, res) => {
+  try {
+    const batch = req.batch;
+    const errors = await schemaErrors(TechStack, batch);
+    if (errors.length > 0) {
+      return res.status(400).json({
+        success: false,
+        message: 'Validation errors',
+        errors
+      });
+    }
+
+    const { targets, missing } = await loadBatchTargets(TechStack, batch, 'logoPublicId logoSet');
+
+    if (missing.length > 0) {
+      return res.status(404).json({
+        success: false,
+        message: 'Some tech stack items were not found',
+        missing
+      });
+    }
+
+    const { operations, createdIds } = batchOperations(batch);
+    let result;
+    try {
+      result = await TechStack.bulkWrite(operations, { ordered: true });
+    } finally {
+      // An ordered bulkWrite that fails partway keeps the writes before the failure
+      invalidateCache('techStack');
+    }
+
+    await Promise.all(batch.delete
+      .map((id) => targets.get(id.toLowerCase()))
+      .map((techItem) => removeImage(techItem.logoSet, techItem.logoPublicId)));
+
+    res.json({
+      success: true,
+      message: 'Tech stack updated successfully',
+      data: {
+        created: createdIds,
+        updated: batch.update.length,
+        deleted: result.deletedCount
+      }
+    });
+  } catch (error) {
+    console.error('Error applying tech stack batch:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to apply tech stack batch'
+    });
+  }
+});
+
 // PUT /api/admin/tech-stack/:id - Update tech stack item
 router.put('/tech-stack/:id', techStackValidation, handleValidationErrors, async (req, res) => {
   try {
@@ -522,6 +689,7 @@ router.put('/tech-stack/:id', techStackValidation, handleValidationErrors, async
       updateData,
       { new: true, runValidators: true }
     );
+    invalidateCache('techStack');
 
     if (!techItem) {
       return res.status(404).json({
@@ -550,6 +718,7 @@ router.delete('/tech-stack/:id', async (req, res) => {
     const { id } = req.params;
 
     const techItem = await TechStack.findByIdAndDelete(id);
+    invalidateCache('techStack');
 
     if (!techItem) {
       return res.status(404).json({
@@ -558,13 +727,7 @@ router.delete('/tech-stack/:id', async (req, res) => {
       });
     }
 
-    if (techItem.logoPublicId) {
-      try {
-        await deleteFromCloudinary(techItem.logoPublicId, 'image');
-      } catch (deleteError) {
-        console.error('Error deleting tech logo:', deleteError);
-      }
-    }
+    await removeImage(techItem.logoSet, techItem.logoPublicId);
 
     res.json({
       success: true,
@@ -581,32 +744,110 @@ router.delete('/tech-stack/:id', async (req, res) => {
 
 // ============= CONTACT MESSAGE MANAGEMENT =============
 
+// Fields a message list may be narrowed to with ?fields=
+const CONTACT_FIELDS = ['name', 'email', 'message', 'status', 'ipAddress', 'userAgent', 'createdAt', 'updatedAt'];
+
+// Message totals per status filter. A list only needs a rough total, so it is
+// refreshed every 30 seconds instead of counted on every page.
+const contactTotals = new LRUCache({ maxEntries: 10, ttlMs: 30 * 1000 });
+
+const approximateContactTotal = async (query) => {
+  const key = query.status || 'all';
+  let total = contactTotals.get(key);
+  if (total === undefined) {
+    // Without a filter the collection metadata has the count, no scan needed
+    total = query.status ? await Contact.countDocuments(query) : await Contact.estimatedDocumentCount();
+    contactTotals.set(key, total);
+  }
+  return total;
+};
+
 // GET /api/admin/contact/messages - Get all contact messages
+// Pages are keyset-paginated on (createdAt, _id): follow pagination.nextCursor with
+// ?cursor=. ?fields=name,email,status trims each message for list views. ?page=N
+// keeps the original offset pagination with an exact total.
 router.get('/contact/messages', async (req, res) => {
   try {
-    const { status, page = 1, limit = 10 } = req.query;
+    const { status, page, cursor, fields } = req.query;
     let query = {};
     if (status && status !== 'all') query.status = status;
 
-    const contacts = await Contact.find(query)
-      .sort({ createdAt: -1 })
-      .skip((page - 1) * limit)
-      .limit(parseInt(limit));
+    if (page !== undefined && cursor === undefined) {
+      const limit = req.query.limit || 10;
+      const find = Contact.find(query)
+        .sort({ createdAt: -1 })
+        .skip((page - 1) * limit)
+        .limit(parseInt(limit));
+      const hydrated = hydratedRead(req);
+      if (!hydrated) find.select(shapes.contact.projection).lean();
+
+      const contacts = await find;
+      const total = await Contact.countDocuments(query);
+      const pagination = {
+        page: parseInt(page),
+        limit: parseInt(limit),
+        total,
+        pages: Math.ceil(total / limit)
+      };
+
+      if (hydrated) {
+        return res.json({
+          success: true,
+          data: {
+            contacts,
+            pagination
+          }
+        });
+      }
+      return sendData(res, `{"contacts":${shapes.contact.list(contacts)},"pagination":${JSON.stringify(pagination)}}`);
+    }
 
-    const total = await Contact.countDocuments(query);
+    const limit = Math.min(Math.max(parseInt(req.query.limit, 10) || 10, 1), 100);
+    const filter = { ...query };
+    if (cursor !== undefined) {
+      const position = decodeCursor(cursor);
+      if (!position) {
+        return res.status(400).json({
+          success: false,
+          message: 'Invalid cursor'
+        });
+      }
+      Object.assign(filter, afterCursor(position));
+    }
 
-    res.json({
-      success: true,
-      data: {
-        contacts,
-        pagination: {
-          page: parseInt(page),
-          limit: parseInt(limit),
-          total,
-          pages: Math.ceil(total / limit)
-        }
+    // One extra document tells whether there is a next page
+    const find = Contact.find(filter)
+      .sort({ createdAt: -1, _id: -1 })
+      .limit(limit + 1)
+      .lean();
+
+    if (fields) {
+      const selected = String(fields).split(',').map((field) => field.trim()).filter(Boolean);
+      const unknown = selected.filter((field) => !CONTACT_FIELDS.includes(field));
+      if (unknown.length > 0) {
+        return res.status(400).json({
+          success: false,
+          message: `Unknown fields: ${unknown.join(', ')}`
+        });
       }
-    });
+      // createdAt is part of the cursor, so it is always returned
+      find.select([...new Set([...selected, 'createdAt'])].join(' '));
+    } else {
+      find.select(shapes.contact.projection);
+    }
+
+    const [contacts, total] = await Promise.all([find, approximateContactTotal(query)]);
+    const hasMore = contacts.length > limit;
+    if (hasMore) contacts.pop();
+
+    const pagination = {
+      limit,
+      total,
+      totalIsApproximate: true,
+      hasMore,
+      nextCursor: hasMore ? encodeCursor(contacts[contacts.length - 1]) : null
+    };
+    sendData(res, `{"contacts":${shapes.contact.list(contacts)},"pagination":${JSON.stringify(pagination)}}`);
 
   } catch (error) {
     console.error('Error fetching contact messages:', error);
@@ -617,6 +858,72 @@ router.get('/contact/messages', async (req, res) => {
   }
 });
 
+// GET /api/admin/contact/export - Stream every contact message as NDJSON or CSV
+// ?format=ndjson|csv (default ndjson), ?status=, ?since= / ?until= (ISO dates on
+// createdAt), ?fields= as for the message list. Rows are read from a Mongo cursor
+// and written as they arrive, newest first, so memory stays flat however many
+// messages there are. A failure mid-stream aborts the response, which clients see
+// as a truncated chunked body.
+router.get('/contact/export', (req, res) => {
+  const { format = 'ndjson', status, since, until, fields } = req.query;
+  const exportFormat = EXPORT_FORMATS[format];
+  if (!exportFormat) {
+    return res.status(400).json({
+      success: false,
+      message: 'Invalid format. Must be one of: ndjson, csv'
+    });
+  }
+
+  const query = {};
+  if (status && status !== 'all') query.status = status;
+  const range = {};
+  for (const [name, operator] of [['since', '$gte'], ['until', '$lt']]) {
+    if (req.query[name] === undefined) continue;
+    const date = new Date(String(req.query[name]));
+    if (Number.isNaN(date.getTime())) {
+      return res.status(400).json({
+        success: false,
+        message: `Invalid ${name} date`
+      });
+    }
+    range[operator] = date;
+  }
+  if (since !== undefined || until !== undefined) query.createdAt = range;
+
+  let exportFields = ['_id', ...CONTACT_FIELDS];
+  if (fields) {
+    const selected = String(fields).split(',').map((field) => field.trim()).filter(Boolean);
+    const unknown = selected.filter((field) => field !== '_id' && !CONTACT_FIELDS.includes(field));
+    if (unknown.length > 0) {
+      return res.status(400).json({
+        success: false,
+        message: `Unknown fields: ${unknown.join(', ')}`
+      });
+    }
+    exportFields = selected;
+  }
+
+  const cursor = Contact.find(query)
+    .sort({ createdAt: -1, _id: -1 })
+    .select(exportFields.join(' '))
+    .lean()
+    .cursor({ batchSize: 500 });
+
+  const stamp = new Date().toISOString().slice(0, 10);
+  res.set({
+    'Content-Type': exportFormat.contentType,
+    'Content-Disposition': `attachment; filename="contact-messages-${stamp}.${exportFormat.extension}"`,
+    'Cache-Control': 'no-store'
+  });
+
+  // pipeline forwards backpressure and closes the cursor if the client goes away
+  pipeline(cursor, createExportStream(format, exportFields), res, (error) => {
+    if (error && error.code !== 'ERR_STREAM_PREMATURE_CLOSE') {
+      console.error('Error exporting contact messages:', error);
+    }
+  });
+});
+
 // PUT /api/admin/contact/messages/:id/status - Update contact message status
 router.put('/contact/messages/:id/status', async (req, res) => {
   try {
@@ -638,6 +945,8 @@ router.put('/contact/messages/:id/status', async (req, res) => {
         message: 'Contact message not found'
       });
     }
+    // Per-status totals just shifted
+    contactTotals.clear();
 
     res.json({
       success: true,
@@ -654,32 +963,82 @@ router.put('/contact/messages/:id/status', async (req, res) => {
   }
 });
 
+// ============= RESPONSE CACHE =============
+
+// GET /api/admin/cache - Public portfolio response cache and bundle statistics
+router.get('/cache', (req, res) => {
+  res.json({
+    success: true,
+    data: {
+      ...portfolioCache.stats(),
+      bundle: portfolioBundle.stats()
+    }
+  });
+});
+
+// DELETE /api/admin/cache - Drop every cached portfolio response
+router.delete('/cache', (req, res) => {
+  clearCache();
+  res.json({
+    success: true,
+    message: 'Portfolio cache cleared'
+  });
+});
+
+// ============= EMAIL OUTBOX =============
+
+// GET /api/admin/email-outbox - Contact email jobs by delivery status
+router.get('/email-outbox', async (req, res) => {
+  try {
+    res.json({
+      success: true,
+      data: await outboxStats()
+    });
+  } catch (error) {
+    console.error('Error fetching email outbox stats:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to fetch email outbox stats'
+    });
+  }
+});
+
+// ============= DATABASE POOL =============
+
+// GET /api/admin/db-metrics - Connection pool usage and per-operation timings of
+// the MongoDB client in the process that answers
+router.get('/db-metrics', (req, res) => {
+  res.json({
+    success: true,
+    data: dbPoolMetrics.snapshot()
+  });
+});
+
 // ============= DASHBOARD STATS =============
 
 // GET /api/admin/dashboard - Get admin dashboard stats
 router.get('/dashboard', async (req, res) => {
   try {
-    const [
+    const countSummary = legacyCountsRequested(req) ? getSummaryCountsLegacy : getSummaryCounts;
+    const hydrated = hydratedRead(req);
+    const recent = (Model, shape) => {
+      const find = Model.find().sort({ createdAt: -1 }).limit(5);
+      return hydrated ? find : find.select(shape.projection).lean();
+    };
+    const [summary, recentProjects, recentMessages] = await Promise.all([
+      countSummary({ includeMessages: true }),
+      recent(Project, shapes.adminProject),
+      recent(Contact, shapes.contact)
+    ]);
+    const {
       totalProjects,
       featuredProjects,
       aiProjects,
       webProjects,
       techStackCount,
       totalMessages,
-      newMessages,
-      recentProjects,
-      recentMessages
-    ] = await Promise.all([
-      Project.countDocuments(),
-      Project.countDocuments({ featured: true }),
-      Project.countDocuments({ category: 'AI' }),
-      Project.countDocuments({ category: 'Web' }),
-      TechStack.countDocuments(),
-      Contact.countDocuments(),
-      Contact.countDocuments({ status: 'new' }),
-      Project.find().sort({ createdAt: -1 }).limit(5),
-      Contact.find().sort({ createdAt: -1 }).limit(5)
-    ]);
+      newMessages
+    } = summary;
 
     res.json({
       success: true,
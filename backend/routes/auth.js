@@ -2,6 +2,7 @@ const express = require('express');
 const jwt = require('jsonwebtoken');
 const User = require('../models/User');
 const auth = require('../middleware/auth');
+const { forgetToken } = require('../utils/userCache');
 const { loginValidation, handleValidationErrors } = require('../middleware/validation');
 
 const router = express.Router();
@@ -80,7 +81,9 @@ router.post('/verify', auth, async (req, res) => {
 router.post('/logout', auth, async (req, res) => {
   try {
     // In a stateless JWT system, logout is typically handled client-side
-    // by removing the token from storage
+    // by removing the token from storage; the server only forgets the
+    // user it cached for this token
+    forgetToken(req.token);
     res.json({
       success: true,
       message: 'Logout successful'
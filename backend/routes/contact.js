@@ -1,14 +1,25 @@
 const express = require('express');
 const { validationResult } = require('express-validator');
 const Contact = require('../models/Contact');
+const EmailJob = require('../models/EmailJob');
 const { sendContactEmail, sendAutoReply } = require('../config/resend');
 const { contactValidation, handleValidationErrors } = require('../middleware/validation');
-const rateLimit = require('express-rate-limit');
+const { emailWorker, contactEmailJobs } = require('../utils/emailOutbox');
+const { createRateLimiter } = require('../middleware/rateLimiter');
+const { logger } = require('../utils/logger');
+const {
+  contactFingerprint,
+  duplicateCheckEnabled,
+  storedDuplicateCheckEnabled,
+  duplicateWindowStart,
+  claimSubmission,
+  forgetSubmission
+} = require('../utils/contactFingerprints');
 
 // Contact form specific rate limiting
-const contactLimiter = rateLimit({
+const contactLimiter = createRateLimiter('contact', {
   windowMs: 60 * 60 * 1000, // 1 hour
-  max: 10,
+  max: parseInt(process.env.CONTACT_RATE_LIMIT_MAX, 10) || 10,
   message: {
     success: false,
     message: 'Too many contact submissions. Please try again later.'
@@ -24,12 +35,32 @@ const contactLimiter = rateLimit({
 
 const router = express.Router();
 
-// Enhanced validation error handler with debugging
+// 'outbox' (default) queues the emails for the background worker, 'inline' sends
+// them before responding
+const inlineEmailDelivery = process.env.EMAIL_DELIVERY === 'inline';
+
+// Fraction of submissions whose debug and info lines are logged (warnings and
+// errors always are)
+const logSampleRate = Number.isFinite(parseFloat(process.env.CONTACT_LOG_SAMPLE_RATE))
+  ? parseFloat(process.env.CONTACT_LOG_SAMPLE_RATE)
+  : 1;
+const contactLog = logger.child({ route: 'POST /api/contact' });
+
+// Shape of a submission for the logs: which fields came in and how long the
+// message is, never the name, address or text themselves
+const describeBody = (body) => ({
+  fields: Object.keys(body || {}),
+  messageLength: typeof body?.message === 'string' ? body.message.length : undefined
+});
+
+// Validation error handler that logs why a submission was rejected
 const handleValidationErrorsWithDebug = (req, res, next) => {
   const errors = validationResult(req);
   if (!errors.isEmpty()) {
-    console.log('❌ Validation errors:', errors.array());
-    console.log('📝 Request body:', req.body);
+    req.log.debug({
+      errors: errors.array().map(({ path, msg }) => ({ path, msg })),
+      body: describeBody(req.body)
+    }, 'Contact submission failed validation');
     return res.status(400).json({
       success: false,
       message: 'Validation errors',
@@ -39,10 +70,19 @@ const handleValidationErrorsWithDebug = (req, res, next) => {
   next();
 };
 
+// Per-request logger, sampled once per submission
+const requestLogger = (req, res, next) => {
+  req.log = contactLog.forRequest(req, logSampleRate);
+  next();
+};
+
 // 📩 POST /api/contact - Submit contact form
-router.post('/', contactLimiter, contactValidation, handleValidationErrorsWithDebug, async (req, res) => {
+router.post('/', contactLimiter, requestLogger, contactValidation, handleValidationErrorsWithDebug, async (req, res) => {
+  const log = req.log;
+  // Fingerprint of a submission claimed but not yet stored
+  let fingerprint = null;
   try {
-    console.log('📧 Processing contact form submission:', req.body);
+    log.debug({ body: describeBody(req.body) }, 'Processing contact form submission');
     
     const { name, email, message } = req.body;
 
@@ -55,17 +95,30 @@ router.post('/', contactLimiter, contactValidation, handleValidationErrorsWithDe
                      req.socket.remoteAddress;
     const userAgent = req.get('User-Agent');
     
-    console.log('🔍 Client info:', { ipAddress, userAgent });
+    log.debug({ ipAddress, userAgent }, 'Client info');
     
-    // Get client IP for tracking submissions
-    const oneHourAgo = new Date(Date.now() - 60 * 60 * 1000);
-    Contact.countDocuments({ 
-      ipAddress: ipAddress,
-      createdAt: { $gte: oneHourAgo }
-    })
-    .catch(err => {
-      console.error('Error tracking submissions:', err);
-    });
+    // 🔁 Reject a replay of a recent submission before anything is stored or
+    // mailed: first against this process's recent submissions, then, when other
+    // processes take submissions too, against the sender's stored contacts,
+    // found through the (ipAddress, createdAt) index
+    if (duplicateCheckEnabled()) {
+      fingerprint = contactFingerprint({ email, message });
+      const duplicate = !claimSubmission(fingerprint) || (storedDuplicateCheckEnabled() && await Contact.exists({
+        ipAddress,
+        createdAt: { $gte: duplicateWindowStart() },
+        email,
+        message
+      }));
+      if (duplicate) {
+        // Stays claimed: it is a duplicate for the rest of the window
+        fingerprint = null;
+        log.info({ ipAddress }, 'Duplicate contact submission rejected');
+        return res.status(409).json({
+          success: false,
+          message: 'This message was already received. I will get back to you soon.'
+        });
+      }
+    }
 
     // 💾 Save contact submission to database
     const contact = new Contact({
@@ -76,28 +129,48 @@ router.post('/', contactLimiter, contactValidation, handleValidationErrorsWithDe
       userAgent
     });
 
-    console.log('💾 Saving contact to database...');
-    await contact.save();
-    console.log('✅ Contact saved successfully');
-
-    // 📧 Send admin notification
-    try {
-      console.log('📧 Sending admin notification...');
-      await sendContactEmail({ name, email, message });
-      console.log('✅ Admin notification sent');
-    } catch (emailError) {
-      console.error('❌ Failed to send admin email:', emailError);
-    }
+    if (inlineEmailDelivery) {
+      await contact.save();
+      log.debug({ contactId: contact._id }, 'Contact saved');
+
+      // 📧 Send admin notification
+      try {
+        await sendContactEmail({ name, email, message });
+        log.debug('Admin notification sent');
+      } catch (emailError) {
+        log.error({ err: emailError, contactId: contact._id }, 'Failed to send admin email');
+      }
 
-    // 🤖 Send auto-reply
-    try {
-      console.log('🤖 Sending auto-reply...');
-      await sendAutoReply({ name, email });
-      console.log('✅ Auto-reply sent');
-    } catch (replyError) {
-      console.error('❌ Failed to send auto-reply:', replyError);
+      // 🤖 Send auto-reply
+      try {
+        await sendAutoReply({ name, email });
+        log.debug('Auto-reply sent');
+      } catch (replyError) {
+        log.error({ err: replyError, contactId: contact._id }, 'Failed to send auto-reply');
+      }
+    } else {
+      // 💾 Save the contact, then queue its emails in the outbox; the worker
+      // delivers them, so Resend's latency never reaches the response. The jobs
+      // are only written once the contact is, so nothing is mailed about a
+      // submission that wasn't stored.
+      await contact.save();
+      const jobs = await EmailJob.insertMany(contactEmailJobs(contact)).catch(async (queueError) => {
+        // Undo the save, so the sender can resubmit instead of the contact
+        // staying without its emails and the resubmission counting as a duplicate
+        await Contact.deleteOne({ _id: contact._id }).catch((deleteError) => {
+          log.error({ err: deleteError, contactId: contact._id }, 'Failed to remove contact without emails');
+        });
+        throw queueError;
+      });
+      log.debug({ contactId: contact._id, emailsQueued: jobs.length }, 'Contact saved');
+      emailWorker.notify();
     }
 
+    log.info({
+      contactId: contact._id,
+      delivery: inlineEmailDelivery ? 'inline' : 'outbox'
+    }, 'Contact form submitted');
+
     // 🎉 Final Response
     res.status(201).json({
       success: true,
@@ -109,7 +182,9 @@ router.post('/', contactLimiter, contactValidation, handleValidationErrorsWithDe
     });
 
   } catch (error) {
-    console.error('❌ Contact form submission error:', error);
+    log.error({ err: error }, 'Contact form submission error');
+    // Not stored, so sending it again isn't a duplicate
+    if (fingerprint) forgetSubmission(fingerprint);
     
     if (error.name === 'ValidationError') {
       const errors = Object.values(error.errors).map(err => err.message);
@@ -2,33 +2,64 @@ const express = require('express');
 const Personal = require('../models/Personal');
 const Project = require('../models/Project');
 const TechStack = require('../models/TechStack');
+const { cacheResponse } = require('../middleware/cache');
+const { collectionVersion, sendIfFresh } = require('../middleware/conditional');
+const { getSummaryCounts, legacyCountsRequested } = require('../utils/portfolioStats');
+const { DEFAULT_PERSONAL, portfolioBundle } = require('../utils/portfolioBundle');
+const { projectSearchValidation, handleValidationErrors } = require('../middleware/validation');
+const { shapes, sendData, sendList } = require('../utils/serializers');
 
 const router = express.Router();
 
+// Search results per page unless ?limit= says otherwise
+const DEFAULT_SEARCH_LIMIT = 12;
+
+// One page of projects matching ?q= and ?tech=, with the total for the pager.
+// Keyword matches come in text score order (the project_search index weighs
+// title over tags over description), tag-only searches in the list's order.
+// The count/lastModified behind the ETag is read first and also gives the
+// total, so a revalidation that ends in a 304 never reads the page.
+const searchProjects = async (req, res, query) => {
+  const { q, tech = [], page = 1, limit = DEFAULT_SEARCH_LIMIT } = req.query;
+  const filter = { ...query };
+  if (q) filter.$text = { $search: q };
+  if (tech.length > 0) filter.techStack = { $all: tech };
+
+  const version = await collectionVersion(Project, filter);
+  if (sendIfFresh(req, res, [version])) return;
+
+  const find = Project.find(filter)
+    .select(shapes.project.projection)
+    .skip((page - 1) * limit)
+    .limit(limit)
+    .lean();
+  if (q) {
+    find.select({ score: { $meta: 'textScore' } })
+      .sort({ score: { $meta: 'textScore' }, featured: -1, order: 1, createdAt: -1 });
+  } else {
+    find.sort({ featured: -1, order: 1, createdAt: -1 });
+  }
+
+  const projects = await find;
+  const pagination = {
+    page,
+    limit,
+    total: version.count,
+    pages: Math.ceil(version.count / limit)
+  };
+  sendData(res, `{"projects":${shapes.projectSearchResult.list(projects)},"pagination":${JSON.stringify(pagination)}}`);
+};
+
 // GET /api/portfolio/personal - Get personal information
-router.get('/personal', async (req, res) => {
+router.get('/personal', cacheResponse('personal'), async (req, res) => {
   try {
+    if (sendIfFresh(req, res, [await collectionVersion(Personal)])) return;
+
     let personal = await Personal.findOne();
     
     // If no personal data exists, return default data
     if (!personal) {
-      personal = {
-        name: 'Naveen Agarwal',
-        title: 'Front-End Web Developer',
-        tagline: 'Building modern, responsive web experiences with clean code and creative design',
-        bio: 'Passionate Front-End Developer with expertise in modern web technologies.',
-        email: 'naveen.agarwal.dev@gmail.com',
-        phone: '+91 98765 43210',
-        location: 'India',
-        profileImageUrl: 'https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=400&h=400&fit=crop&crop=face',
-        resumeUrl: '',
-        socialLinks: {
-          github: 'https://github.com/naveen-agarwal',
-          linkedin: 'https://linkedin.com/in/naveen-agarwal-dev',
-          twitter: 'https://twitter.com/naveen_dev',
-          email: 'mailto:naveen.agarwal.dev@gmail.com'
-        }
-      };
+      personal = DEFAULT_PERSONAL;
     }
 
     res.json({
@@ -45,22 +76,23 @@ router.get('/personal', async (req, res) => {
 });
 
 // GET /api/portfolio/projects - Get all projects
-router.get('/projects', async (req, res) => {
+// ?q=, ?tech=, ?page= or ?limit= make it a ranked, paginated search instead
+router.get('/projects', projectSearchValidation, handleValidationErrors, cacheResponse('projects'), async (req, res) => {
   try {
-    const { category } = req.query;
+    const { category, q, tech, page, limit } = req.query;
     
     let query = {};
     if (category && category !== 'All') {
       query.category = category;
     }
 
-    const projects = await Project.find(query)
-      .sort({ featured: -1, order: 1, createdAt: -1 });
+    if ([q, tech, page, limit].some((param) => param !== undefined)) {
+      return await searchProjects(req, res, query);
+    }
 
-    res.json({
-      success: true,
-      data: projects
-    });
+    if (sendIfFresh(req, res, [await collectionVersion(Project, query)])) return;
+
+    await sendList(req, res, Project.find(query).sort({ featured: -1, order: 1, createdAt: -1 }), shapes.project);
   } catch (error) {
     console.error('Error fetching projects:', error);
     res.status(500).json({
@@ -71,16 +103,15 @@ router.get('/projects', async (req, res) => {
 });
 
 // GET /api/portfolio/projects/featured - Get featured projects
-router.get('/projects/featured', async (req, res) => {
+router.get('/projects/featured', cacheResponse('projects'), async (req, res) => {
   try {
-    const projects = await Project.find({ featured: true })
+    if (sendIfFresh(req, res, [await collectionVersion(Project, { featured: true })])) return;
+
+    const find = Project.find({ featured: true })
       .sort({ order: 1, createdAt: -1 })
       .limit(3);
 
-    res.json({
-      success: true,
-      data: projects
-    });
+    await sendList(req, res, find, shapes.project);
   } catch (error) {
     console.error('Error fetching featured projects:', error);
     res.status(500).json({
@@ -91,15 +122,11 @@ router.get('/projects/featured', async (req, res) => {
 });
 
 // GET /api/portfolio/tech-stack - Get tech stack
-router.get('/tech-stack', async (req, res) => {
+router.get('/tech-stack', cacheResponse('techStack'), async (req, res) => {
   try {
-    const techStack = await TechStack.find()
-      .sort({ category: 1, order: 1, name: 1 });
+    if (sendIfFresh(req, res, [await collectionVersion(TechStack)])) return;
 
-    res.json({
-      success: true,
-      data: techStack
-    });
+    await sendList(req, res, TechStack.find().sort({ category: 1, order: 1, name: 1 }), shapes.techStack);
   } catch (error) {
     console.error('Error fetching tech stack:', error);
     res.status(500).json({
@@ -110,22 +137,37 @@ router.get('/tech-stack', async (req, res) => {
 });
 
 // GET /api/portfolio/stats - Get portfolio statistics
-router.get('/stats', async (req, res) => {
+router.get('/stats', cacheResponse('projects', 'techStack'), async (req, res) => {
   try {
-    const [totalProjects, aiProjects, webProjects, techCount] = await Promise.all([
-      Project.countDocuments(),
-      Project.countDocuments({ category: 'AI' }),
-      Project.countDocuments({ category: 'Web' }),
-      TechStack.countDocuments()
-    ]);
+    let summary;
+
+    if (legacyCountsRequested(req)) {
+      const versions = await Promise.all([collectionVersion(Project), collectionVersion(TechStack)]);
+      if (sendIfFresh(req, res, versions)) return;
+      const [totalProjects, aiProjects, webProjects, techStackCount] = await Promise.all([
+        Project.countDocuments(),
+        Project.countDocuments({ category: 'AI' }),
+        Project.countDocuments({ category: 'Web' }),
+        TechStack.countDocuments()
+      ]);
+      summary = { totalProjects, aiProjects, webProjects, techStackCount };
+    } else {
+      // One aggregation yields both the counts and the ETag validators
+      summary = await getSummaryCounts();
+      const versions = [
+        { count: summary.totalProjects, lastModified: summary.projectsLastModified },
+        { count: summary.techStackCount, lastModified: summary.techStackLastModified }
+      ];
+      if (sendIfFresh(req, res, versions)) return;
+    }
 
     res.json({
       success: true,
       data: {
-        totalProjects,
-        aiProjects,
-        webProjects,
-        techCount,
+        totalProjects: summary.totalProjects,
+        aiProjects: summary.aiProjects,
+        webProjects: summary.webProjects,
+        techCount: summary.techStackCount,
         yearsExperience: 3,
         clients: 25
       }
@@ -139,4 +181,35 @@ router.get('/stats', async (req, res) => {
   }
 });
 
+// GET /api/portfolio/bundle - Personal info, projects, tech stack and stats in
+// one response, served from a pre-serialized snapshot without a database read
+router.get('/bundle', async (req, res) => {
+  try {
+    const bundle = await portfolioBundle.get();
+    // The stored variants stand in for compression(), which leaves encoded bodies alone
+    const encoding = req.acceptsEncodings('br', 'gzip', 'identity') || 'identity';
+
+    res.set({
+      'Content-Type': 'application/json; charset=utf-8',
+      'Cache-Control': 'no-cache',
+      Vary: 'Accept-Encoding',
+      // Each encoding is a different representation, so each has its own ETag
+      ETag: `"${bundle.etag}${encoding === 'identity' ? '' : `-${encoding}`}"`
+    });
+    if (bundle.lastModified) res.set('Last-Modified', bundle.lastModified.toUTCString());
+    if (req.fresh) {
+      return res.status(304).end();
+    }
+
+    if (encoding !== 'identity') res.set('Content-Encoding', encoding);
+    res.send(bundle.variants[encoding]);
+  } catch (error) {
+    console.error('Error fetching portfolio bundle:', error);
+    res.status(500).json({
+      success: false,
+      message: 'Failed to fetch portfolio'
+    });
+  }
+});
+
 module.exports = router;
\ No newline at end of file
@@ -4,7 +4,6 @@ const cors = require('cors');
 const helmet = require('helmet');
 const compression = require('compression');
 const morgan = require('morgan');
-const rateLimit = require('express-rate-limit');
 require('dotenv').config();
 
 
@@ -13,12 +12,27 @@ const authRoutes = require('./routes/auth');
 const portfolioRoutes = require('./routes/portfolio');
 const adminRoutes = require('./routes/admin');
 const contactRoutes = require('./routes/contact');
+const { trackCommands, countRoundtrips } = require('./middleware/dbMetrics');
+const { createRateLimiter, flushRateLimiters } = require('./middleware/rateLimiter');
+const { requestMetrics, reportCpuTime, metricsAuth, serveMetrics } = require('./middleware/metrics');
+const { mongoOptions } = require('./config/database');
+const { dbPoolMetrics } = require('./utils/dbPoolMetrics');
+const { emailWorker } = require('./utils/emailOutbox');
+const { imageStore, LocalImageStore } = require('./config/imageStore');
+
+// Report per-request database round-trips in an X-DB-Roundtrips header (benchmarks)
+const exposeDbRoundtrips = process.env.DB_ROUNDTRIP_HEADER === 'true';
+// Report per-request CPU time in a Server-Timing header (benchmarks)
+const exposeCpuTime = process.env.CPU_TIME_HEADER === 'true';
 
 const app = express();
 
 // Trust proxy - important for getting real client IP when behind a proxy
 app.set('trust proxy', true);
 
+// Request counts and latencies per route, served at /api/metrics
+app.use(requestMetrics);
+
 // Security middleware
 app.use(helmet());
 app.use(compression());
@@ -53,20 +67,54 @@ app.use(cors({
 }));
 
 // Rate limiting for non-contact routes
-// We'll apply this middleware to specific routes instead of globally
-const generalRateLimiter = rateLimit({
+// We'll apply this middleware to specific routes instead of globally. Batched:
+// with shared counters, reads still don't wait for MongoDB.
+const generalRateLimiter = createRateLimiter('general', {
   windowMs: 15 * 60 * 1000, // 15 minutes
-  max: 100, // limit each IP to 100 requests per windowMs
+  max: parseInt(process.env.RATE_LIMIT_MAX, 10) || 100, // limit each IP to 100 requests per windowMs
   message: {
     success: false,
     message: 'Too many requests. Please try again later.'
   }
+}, { batched: true });
+
+// Set once SIGTERM is received: responses then ask clients to close the
+// connection, so keep-alive clients reconnect to a worker that is still serving
+let draining = false;
+app.use((req, res, next) => {
+  if (draining) res.set('Connection', 'close');
+  next();
 });
 
 // Body parsing middleware
 app.use(express.json({ limit: '10mb' }));
 app.use(express.urlencoded({ extended: true, limit: '10mb' }));
 
+if (exposeDbRoundtrips) {
+  app.use(countRoundtrips);
+}
+
+if (exposeCpuTime) {
+  app.use(reportCpuTime);
+}
+
+// With IMAGE_STORE=local the image variants are served from here. Their names
+// never change, and the frontend on another origin may embed them.
+if (imageStore instanceof LocalImageStore) {
+  // Fail at startup rather than on the first upload
+  try {
+    imageStore.loadSharp();
+  } catch (error) {
+    console.error(error.message);
+    process.exit(1);
+  }
+  app.use(imageStore.urlPath, express.static(imageStore.dir, {
+    immutable: true,
+    maxAge: '1y',
+    setHeaders: (res) => res.set('Cross-Origin-Resource-Policy', 'cross-origin')
+  }));
+}
+
 // Apply rate limiting to specific routes (excluding contact and admin routes)
 app.use('/api/auth', generalRateLimiter, authRoutes);
 app.use('/api/portfolio', generalRateLimiter, portfolioRoutes);
@@ -81,12 +129,15 @@ if (process.env.NODE_ENV !== 'production') {
 }
 
 // Connect to MongoDB
-mongoose.connect(process.env.MONGO_URL, {
-  useNewUrlParser: true,
-  useUnifiedTopology: true,
-})
+mongoose.connect(process.env.MONGO_URL, mongoOptions())
 .then(() => {
   console.log('Connected to MongoDB');
+  dbPoolMetrics.attach(mongoose.connection.getClient());
+  if (exposeDbRoundtrips) {
+    trackCommands(mongoose.connection.getClient());
+  }
+  // Deliver queued contact emails, including any left over from a previous run
+  emailWorker.start();
 })
 .catch((error) => {
   console.error('MongoDB connection error:', error);
@@ -111,6 +162,13 @@ app.get('/api', (req, res) => {
   });
 });
 
+// Prometheus metrics. With METRICS_PORT set they are served without auth on a
+// separate listener (bind it to an internal interface) instead.
+const metricsPort = parseInt(process.env.METRICS_PORT, 10);
+if (!metricsPort) {
+  app.get('/api/metrics', metricsAuth, serveMetrics);
+}
+
 // Error handling middleware
 app.use((err, req, res, next) => {
   console.error('Error:', err);
@@ -182,18 +240,58 @@ app.use('*', (req, res) => {
 
 const PORT = process.env.PORT || 8001;
 
-app.listen(PORT, '0.0.0.0', () => {
+const server = app.listen(PORT, '0.0.0.0', () => {
   console.log(`Server running on port ${PORT}`);
   console.log(`Environment: ${process.env.NODE_ENV || 'development'}`);
 });
 
-// Graceful shutdown
-process.on('SIGTERM', () => {
-  console.log('SIGTERM received. Shutting down gracefully...');
-  mongoose.connection.close(() => {
-    console.log('MongoDB connection closed.');
-    process.exit(0);
+let metricsServer = null;
+if (metricsPort) {
+  const metricsApp = express();
+  metricsApp.get('/api/metrics', serveMetrics);
+  const metricsHost = process.env.METRICS_HOST || '127.0.0.1';
+  metricsServer = metricsApp.listen(metricsPort, metricsHost, () => {
+    console.log(`Metrics on http://${metricsHost}:${metricsPort}/api/metrics`);
   });
-});
+}
+
+// Graceful shutdown: stop accepting connections, let in-flight requests finish
+// (their connections are closed once they are answered), then close Mongo. Under
+// cluster.js each worker drains this way while the others keep serving.
+const shutdownTimeoutMs = parseInt(process.env.SHUTDOWN_TIMEOUT_MS, 10) || 10000;
+
+const shutdown = async (signal) => {
+  if (draining) return;
+  draining = true;
+  console.log(`${signal} received. Shutting down gracefully...`);
+
+  const timer = setTimeout(() => {
+    console.error(`❌ Requests still running after ${shutdownTimeoutMs}ms, closing their connections`);
+    if (server.closeAllConnections) server.closeAllConnections();
+  }, shutdownTimeoutMs);
+  timer.unref();
+
+  await new Promise((resolve) => {
+    server.close(resolve);
+    // Keep-alive connections with no request in flight would hold close() open
+    if (server.closeIdleConnections) server.closeIdleConnections();
+  });
+  clearTimeout(timer);
+  if (metricsServer) metricsServer.close();
+  console.log('HTTP server closed.');
+
+  await emailWorker.stop();
+  try {
+    await flushRateLimiters();
+  } catch (error) {
+    console.error('Error writing rate limit counters:', error.message);
+  }
+  await mongoose.connection.close();
+  console.log('MongoDB connection closed.');
+  process.exit(0);
+};
+
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
 
 module.exports = app;
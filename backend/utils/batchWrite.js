@@ -0,0 +1,73 @@
+const mongoose = require('mongoose');
+
+// Ids a validated batch (see batchValidation) updates or deletes
+const batchTargetIds = (batch) => [...batch.update.map(({ id }) => id), ...batch.delete];
+
+// Load the documents a batch updates or deletes in one query. Returns them keyed by
+// id, plus the ids that don't exist, so a batch can be refused before any write.
+const loadBatchTargets = async (Model, batch, select) => {
+  const ids = batchTargetIds(batch);
+  const docs = ids.length > 0
+    ? await Model.find({ _id: { $in: ids } }).select(select).lean()
+    : [];
+  const targets = new Map(docs.map((doc) => [String(doc._id), doc]));
+  return {
+    targets,
+    missing: ids.filter((id) => !targets.has(String(id).toLowerCase()))
+  };
+};
+
+// Schema validation of the documents a batch creates and the fields it updates,
+// in the error format of batchValidation, so a change the model would refuse
+// fails the whole batch up front instead of halfway through the bulkWrite
+const schemaErrors = async (Model, batch) => {
+  const errors = [];
+  const collect = (prefix) => (error) => {
+    if (error.name !== 'ValidationError') throw error;
+    Object.values(error.errors).forEach((fieldError) => {
+      errors.push({
+        type: 'field',
+        value: fieldError.value,
+        msg: fieldError.message,
+        path: `${prefix}.${fieldError.path}`,
+        location: 'body'
+      });
+    });
+  };
+  await Promise.all([
+    ...batch.create.map((document, index) => (
+      new Model(document).validate().catch(collect(`create[${index}]`))
+    )),
+    // Only the fields an update sets are validated, as with runValidators
+    ...batch.update.map(({ fields }, index) => (
+      Model.validate(fields, Object.keys(fields)).catch(collect(`update[${index}]`))
+    ))
+  ]);
+  return errors;
+};
+
+// bulkWrite operations for a batch: inserts, $set updates and deletes, in that
+// order. Created documents get their ids up front so they can be reported.
+// Updates run the schema's update validators as well, like the single-item PUTs.
+const batchOperations = (batch) => {
+  const createdIds = batch.create.map(() => new mongoose.Types.ObjectId());
+  const operations = [
+    ...batch.create.map((document, index) => ({
+      insertOne: { document: { ...document, _id: createdIds[index] } }
+    })),
+    ...batch.update.map(({ id, fields }) => ({
+      updateOne: { filter: { _id: id }, update: { $set: fields }, runValidators: true }
+    })),
+    ...batch.delete.map((id) => ({
+      deleteOne: { filter: { _id: id } }
+    }))
+  ];
+  return { operations, createdIds };
+};
+
+module.exports = {
+  batchTargetIds,
+  loadBatchTargets,
+  schemaErrors,
+  batchOperations
+};
@@ -0,0 +1,48 @@
+const cluster = require('cluster');
+
+// Messages between the workers of cluster.js. A worker publishes through its
+// IPC channel and the primary relays the message to every other worker, so
+// per-process caches drop what a write on another worker made stale. Outside
+// cluster mode publishing does nothing.
+const MESSAGE_TYPE = 'portfolio:cluster-channel';
+
+const subscribers = new Map();
+
+const subscribe = (topic, handler) => {
+  if (!subscribers.has(topic)) subscribers.set(topic, []);
+  subscribers.get(topic).push(handler);
+};
+
+// Run on the other workers only: the publisher has already applied the change
+const publish = (topic, payload) => {
+  if (cluster.isWorker && process.connected) {
+    process.send({ type: MESSAGE_TYPE, topic, payload });
+  }
+};
+
+if (cluster.isWorker) {
+  process.on('message', (message) => {
+    if (!message || message.type !== MESSAGE_TYPE) return;
+    (subscribers.get(message.topic) || []).forEach((handler) => {
+      try {
+        handler(message.payload);
+      } catch (error) {
+        console.error(`Error handling cluster message ${message.topic}:`, error);
+      }
+    });
+  });
+}
+
+// Used by the primary: pass a worker's message on to all the others
+const relay = (from, message) => {
+  if (!message || message.type !== MESSAGE_TYPE) return;
+  Object.values(cluster.workers).forEach((worker) => {
+    if (worker !== from && worker.isConnected()) worker.send(message);
+  });
+};
+
+module.exports = {
+  subscribe,
+  publish,
+  relay
+};
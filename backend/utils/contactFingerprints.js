@@ -0,0 +1,57 @@
+const cluster = require('cluster');
+const crypto = require('crypto');
+const LRUCache = require('./lruCache');
+
+// Contact submissions seen within the duplicate window, keyed by a hash of the
+// address and message so their text is never held in memory. Entries expire
+// with the window and the oldest are evicted past the size limit. A window of
+// 0 disables the check.
+const windowMs = parseInt(process.env.CONTACT_DUPLICATE_WINDOW_MS, 10);
+const recentSubmissions = new LRUCache({
+  maxEntries: parseInt(process.env.CONTACT_FINGERPRINT_MAX_ENTRIES, 10) || 10000,
+  ttlMs: Number.isNaN(windowMs) ? 10 * 60 * 1000 : windowMs
+});
+
+// Of a validated submission: the address is normalized and the message trimmed
+const contactFingerprint = ({ email, message }) => (
+  crypto.createHash('sha256').update(`${email}\n${message}`).digest('base64url')
+);
+
+const duplicateCheckEnabled = () => recentSubmissions.ttlMs > 0;
+
+// Each process keeps its own recent submissions, so where another process may
+// have taken the first one POST /api/contact also looks among the sender's
+// stored contacts. Unset, that is only when cluster.js runs several workers;
+// several single-process instances behind a load balancer need
+// CONTACT_DUPLICATE_CHECK_STORED=true. A single process sees every submission
+// itself and skips the extra read.
+const configuredStoredCheck = process.env.CONTACT_DUPLICATE_CHECK_STORED;
+const storedCheck = configuredStoredCheck === 'true' || configuredStoredCheck === 'false'
+  ? configuredStoredCheck === 'true'
+  : cluster.isWorker;
+
+const storedDuplicateCheckEnabled = () => storedCheck;
+
+// Start of the window a submission is a duplicate within
+const duplicateWindowStart = () => new Date(Date.now() - recentSubmissions.ttlMs);
+
+// Remember a submission; false if it was already seen within the window. Done
+// before anything is awaited, so concurrent replays are caught too.
+const claimSubmission = (fingerprint) => {
+  if (recentSubmissions.get(fingerprint)) return false;
+  recentSubmissions.set(fingerprint, true);
+  return true;
+};
+
+// For a submission that wasn't stored, so sending it again isn't a duplicate
+const forgetSubmission = (fingerprint) => recentSubmissions.delete(fingerprint);
+
+module.exports = {
+  recentSubmissions,
+  contactFingerprint,
+  duplicateCheckEnabled,
+  storedDuplicateCheckEnabled,
+  duplicateWindowStart,
+  claimSubmission,
+  forgetSubmission
+};
@@ -0,0 +1,170 @@
+// Connection pool and command statistics of this process's MongoClient, from the
+// driver's connection pool (CMAP) and command monitoring events. In cluster mode
+// every worker has its own pool, so a snapshot describes the worker that took it.
+
+// Upper bounds (ms) of the latency buckets; anything slower lands in +Inf
+const LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500];
+
+// Count, total, max and bucketed distribution of a stream of durations
+class DurationStats {
+  constructor() {
+    this.count = 0;
+    this.failures = 0;
+    this.totalMs = 0;
+    this.maxMs = 0;
+    this.buckets = new Array(LATENCY_BUCKETS_MS.length + 1).fill(0);
+  }
+
+  record(durationMs, failed = false) {
+    this.count++;
+    if (failed) this.failures++;
+    this.totalMs += durationMs;
+    this.maxMs = Math.max(this.maxMs, durationMs);
+    const bucket = LATENCY_BUCKETS_MS.findIndex((bound) => durationMs <= bound);
+    this.buckets[bucket === -1 ? LATENCY_BUCKETS_MS.length : bucket]++;
+  }
+
+  toJSON() {
+    const buckets = {};
+    LATENCY_BUCKETS_MS.forEach((bound, index) => {
+      buckets[bound] = this.buckets[index];
+    });
+    buckets['+Inf'] = this.buckets[LATENCY_BUCKETS_MS.length];
+    return {
+      count: this.count,
+      failures: this.failures,
+      totalMs: Math.round(this.totalMs * 1000) / 1000,
+      meanMs: this.count ? Math.round((this.totalMs / this.count) * 1000) / 1000 : 0,
+      maxMs: this.maxMs,
+      buckets
+    };
+  }
+}
+
+class DbPoolMetrics {
+  constructor() {
+    this.client = null;
+    this.servers = new Map();
+    this.created = 0;
+    this.closed = 0;
+    this.checkOutFailures = 0;
+    this.cleared = 0;
+    this.checkOutWait = new DurationStats();
+    this.operations = new Map();
+  }
+
+  server(address) {
+    if (!this.servers.has(address)) {
+      // Connection ids open and checked out, and start times of waiting check-outs
+      this.servers.set(address, { open: new Set(), checkedOut: new Set(), waiting: [] });
+    }
+    return this.servers.get(address);
+  }
+
+  operation(name) {
+    if (!this.operations.has(name)) this.operations.set(name, new DurationStats());
+    return this.operations.get(name);
+  }
+
+  // Subscribe to a connected MongoClient's events. Connections opened before this
+  // are picked up as they are checked out.
+  attach(client) {
+    this.client = client;
+    const checkOutDone = (event, failed) => {
+      const started = this.server(event.address).waiting.shift();
+      // durationMS is reported by newer drivers; otherwise time it from the queue
+      const waitedMs = event.durationMS !== undefined ? event.durationMS : Date.now() - (started || Date.now());
+      this.checkOutWait.record(waitedMs, failed);
+    };
+
+    client.on('connectionCreated', (event) => {
+      this.created++;
+      this.server(event.address).open.add(event.connectionId);
+    });
+    client.on('connectionClosed', (event) => {
+      this.closed++;
+      const server = this.server(event.address);
+      server.open.delete(event.connectionId);
+      server.checkedOut.delete(event.connectionId);
+    });
+    client.on('connectionCheckOutStarted', (event) => {
+      this.server(event.address).waiting.push(Date.now());
+    });
+    client.on('connectionCheckedOut', (event) => {
+      const server = this.server(event.address);
+      server.open.add(event.connectionId);
+      server.checkedOut.add(event.connectionId);
+      checkOutDone(event, false);
+    });
+    client.on('connectionCheckOutFailed', (event) => {
+      this.checkOutFailures++;
+      checkOutDone(event, true);
+    });
+    client.on('connectionCheckedIn', (event) => {
+      this.server(event.address).checkedOut.delete(event.connectionId);
+    });
+    client.on('connectionPoolCleared', () => {
+      this.cleared++;
+    });
+    client.on('commandSucceeded', (event) => {
+      this.operation(event.commandName).record(event.duration);
+    });
+    client.on('commandFailed', (event) => {
+      this.operation(event.commandName).record(event.duration, true);
+    });
+  }
+
+  snapshot() {
+    const servers = {};
+    let total = 0;
+    let checkedOut = 0;
+    let waitQueue = 0;
+    this.servers.forEach((server, address) => {
+      servers[address] = {
+        connections: server.open.size,
+        checkedOut: server.checkedOut.size,
+        idle: server.open.size - server.checkedOut.size,
+        waitQueue: server.waiting.length
+      };
+      total += server.open.size;
+      checkedOut += server.checkedOut.size;
+      waitQueue += server.waiting.length;
+    });
+
+    const options = this.client ? this.client.options : {};
+    const operations = {};
+    this.operations.forEach((stats, name) => {
+      operations[name] = stats.toJSON();
+    });
+    return {
+      pid: process.pid,
+      attached: this.client !== null,
+      pool: {
+        maxPoolSize: options.maxPoolSize,
+        minPoolSize: options.minPoolSize,
+        maxIdleTimeMS: options.maxIdleTimeMS,
+        waitQueueTimeoutMS: options.waitQueueTimeoutMS,
+        connections: total,
+        checkedOut,
+        idle: total - checkedOut,
+        waitQueue,
+        created: this.created,
+        closed: this.closed,
+        checkOutFailures: this.checkOutFailures,
+        cleared: this.cleared,
+        checkOutWait: this.checkOutWait.toJSON()
+      },
+      servers,
+      operations
+    };
+  }
+}
+
+const dbPoolMetrics = new DbPoolMetrics();
+
+module.exports = {
+  LATENCY_BUCKETS_MS,
+  DurationStats,
+  DbPoolMetrics,
+  dbPoolMetrics
+};
@@ -0,0 +1,215 @@
+const crypto = require('crypto');
+const EmailJob = require('../models/EmailJob');
+const { buildContactEmail, buildAutoReply, sendEmail, sendEmailBatch } = require('../config/resend');
+
+const BUILDERS = {
+  contactNotification: buildContactEmail,
+  autoReply: buildAutoReply
+};
+
+// Outbox entries for the admin notification and the auto-reply of a contact submission
+const contactEmailJobs = (contact) => {
+  const payload = { name: contact.name, email: contact.email, message: contact.message };
+  return ['contactNotification', 'autoReply'].map((kind) => ({
+    kind,
+    contact: contact._id,
+    payload
+  }));
+};
+
+// Jobs a worker may claim: pending ones that are due, and ones whose worker died mid-send
+const dueFilter = (now) => ({
+  $or: [
+    { status: 'pending', nextAttemptAt: { $lte: now } },
+    { status: 'sending', lockedUntil: { $lte: now } }
+  ]
+});
+
+// Drains the outbox in batches: claim due jobs, send them with one Resend batch
+// call, then mark them sent or reschedule them with exponential backoff. When
+// Resend refuses a batch, its emails are sent one at a time, so a bad address
+// or a malformed job only holds back itself. Claims are made with a
+// conditional update, so several processes can share the outbox.
+class EmailOutboxWorker {
+  constructor({
+    batchSize = 50,
+    pollIntervalMs = 5000,
+    maxAttempts = 6,
+    retryBaseMs = 5000,
+    retryMaxMs = 15 * 60 * 1000,
+    lockMs = 60 * 1000
+  } = {}) {
+    // Resend accepts at most 100 emails per batch
+    this.batchSize = Math.min(batchSize, 100);
+    this.pollIntervalMs = pollIntervalMs;
+    this.maxAttempts = maxAttempts;
+    this.retryBaseMs = retryBaseMs;
+    this.retryMaxMs = retryMaxMs;
+    this.lockMs = lockMs;
+    this.running = false;
+    this.draining = null;
+    this.rerun = false;
+    this.timer = null;
+    // Earliest retry this worker scheduled, so it doesn't wait a full poll for it
+    this.nextRetryAt = Infinity;
+  }
+
+  start() {
+    if (this.running) return;
+    this.running = true;
+    this.schedule(0);
+  }
+
+  // Stop polling and wait for the batch in flight
+  async stop() {
+    this.running = false;
+    clearTimeout(this.timer);
+    if (this.draining) await this.draining;
+  }
+
+  // Drain now instead of at the next poll, e.g. right after jobs were enqueued
+  notify() {
+    if (!this.running) return;
+    if (this.draining) {
+      this.rerun = true;
+      return;
+    }
+    this.schedule(0);
+  }
+
+  schedule(delayMs) {
+    clearTimeout(this.timer);
+    this.timer = setTimeout(() => {
+      this.draining = this.drain().finally(() => {
+        this.draining = null;
+        if (this.running) this.schedule(this.rerun ? 0 : this.nextDelay());
+        this.rerun = false;
+      });
+    }, delayMs);
+    // Never keep the process alive just to poll
+    if (this.timer.unref) this.timer.unref();
+  }
+
+  nextDelay() {
+    const untilRetry = Math.max(0, this.nextRetryAt - Date.now());
+    return Math.min(this.pollIntervalMs, untilRetry);
+  }
+
+  async drain() {
+    this.nextRetryAt = Infinity;
+    try {
+      let processed;
+      do {
+        processed = await this.processBatch();
+      } while (this.running && processed === this.batchSize);
+    } catch (error) {
+      console.error('❌ Email outbox worker error:', error);
+    }
+  }
+
+  // Claim, send and settle one batch; returns the number of jobs handled
+  async processBatch() {
+    const now = new Date();
+    const due = await EmailJob.find(dueFilter(now))
+      .sort({ nextAttemptAt: 1 })
+      .limit(this.batchSize)
+      .select('_id')
+      .lean();
+    if (due.length === 0) return 0;
+
+    const claimId = crypto.randomUUID();
+    await EmailJob.updateMany(
+      { _id: { $in: due.map((job) => job._id) }, ...dueFilter(now) },
+      {
+        $set: { status: 'sending', claimId, lockedUntil: new Date(now.getTime() + this.lockMs) },
+        $inc: { attempts: 1 }
+      }
+    );
+    const jobs = await EmailJob.find({ claimId, status: 'sending' }).lean();
+    if (jobs.length === 0) return due.length;
+
+    const results = await this.send(jobs.map((job) => BUILDERS[job.kind](job.payload)));
+
+    const settledAt = new Date();
+    await EmailJob.bulkWrite(jobs.map((job, index) => {
+      const { providerId, error } = results[index];
+      let update;
+      if (!error) {
+        update = { status: 'sent', sentAt: settledAt, providerId };
+      } else if (job.attempts >= this.maxAttempts) {
+        update = { status: 'failed', lastError: error.message };
+      } else {
+        const nextAttemptAt = settledAt.getTime() + this.retryDelay(job.attempts);
+        this.nextRetryAt = Math.min(this.nextRetryAt, nextAttemptAt);
+        update = { status: 'pending', lastError: error.message, nextAttemptAt: new Date(nextAttemptAt) };
+      }
+      return {
+        updateOne: {
+          filter: { _id: job._id, claimId },
+          update: { $set: update, $unset: { claimId: '', lockedUntil: '' } }
+        }
+      };
+    }), { ordered: false });
+
+    return due.length;
+  }
+
+  // Send emails as one batch, or one at a time if Resend refuses the batch;
+  // resolves with exactly one { providerId } or { error } per email
+  async send(emails) {
+    try {
+      const providerIds = await sendEmailBatch(emails);
+      if (providerIds.length !== emails.length) {
+        console.error(`❌ Resend returned ${providerIds.length} id(s) for a batch of ${emails.length} outbox email(s)`);
+      }
+      // An email without an id is retried like a failed one, so its job is settled either way
+      return emails.map((email, index) => (providerIds[index]
+        ? { providerId: providerIds[index] }
+        : { error: new Error('Resend returned no id for the email') }));
+    } catch (batchError) {
+      console.error(`❌ Failed to send ${emails.length} outbox email(s) as a batch:`, batchError.message);
+      if (emails.length === 1) return [{ error: batchError }];
+    }
+    // In turn rather than all at once, to stay within Resend's request rate
+    const results = [];
+    for (const email of emails) {
+      try {
+        results.push({ providerId: await sendEmail(email) });
+      } catch (error) {
+        console.error(`❌ Failed to send outbox email to ${email.to}:`, error.message);
+        results.push({ error });
+      }
+    }
+    return results;
+  }
+
+  // Exponential backoff with jitter: base, 2x base, 4x base, ... capped at retryMaxMs
+  retryDelay(attempts) {
+    const delay = Math.min(this.retryMaxMs, this.retryBaseMs * 2 ** (attempts - 1));
+    return Math.round(delay * (0.5 + Math.random() / 2));
+  }
+}
+
+const emailWorker = new EmailOutboxWorker({
+  batchSize: parseInt(process.env.EMAIL_OUTBOX_BATCH_SIZE, 10) || 50,
+  pollIntervalMs: parseInt(process.env.EMAIL_OUTBOX_POLL_MS, 10) || 5000,
+  maxAttempts: parseInt(process.env.EMAIL_OUTBOX_MAX_ATTEMPTS, 10) || 6,
+  retryBaseMs: parseInt(process.env.EMAIL_OUTBOX_RETRY_BASE_MS, 10) || 5000
+});
+
+// Outbox job counts by status, for the admin API
+const outboxStats = async () => {
+  const groups = await EmailJob.aggregate([{ $group: { _id: '$status', count: { $sum: 1 } } }]);
+  const stats = { pending: 0, sending: 0, sent: 0, failed: 0 };
+  groups.forEach(({ _id, count }) => {
+    stats[_id] = count;
+  });
+  return stats;
+};
+
+module.exports = {
+  EmailOutboxWorker,
+  emailWorker,
+  contactEmailJobs,
+  outboxStats
+};
@@ -0,0 +1,54 @@
+const { Transform } = require('stream');
+
+const EXPORT_FORMATS = {
+  ndjson: { contentType: 'application/x-ndjson; charset=utf-8', extension: 'ndjson' },
+  csv: { contentType: 'text/csv; charset=utf-8', extension: 'csv' }
+};
+
+// Cells starting with these would be evaluated as formulas by spreadsheet apps;
+// contact messages are untrusted input, so such cells get a leading quote
+const FORMULA_START = /^[=+\-@\t\r]/;
+
+const csvCell = (value) => {
+  if (value === undefined || value === null) return '';
+  let text = value instanceof Date ? value.toISOString() : String(value);
+  if (FORMULA_START.test(text)) text = `'${text}`;
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+// Object-mode documents in, NDJSON lines or CSV rows (with a header row) out.
+// Used between a Mongo cursor and the response with stream.pipeline, so a slow
+// client pauses the cursor instead of letting rows pile up in memory.
+const createExportStream = (format, fields) => {
+  let wroteHeader = false;
+
+  return new Transform({
+    writableObjectMode: true,
+    transform(doc, encoding, callback) {
+      if (format === 'ndjson') {
+        const row = {};
+        fields.forEach((field) => {
+          if (doc[field] !== undefined) row[field] = doc[field];
+        });
+        callback(null, `${JSON.stringify(row)}\n`);
+        return;
+      }
+
+      let chunk = '';
+      if (!wroteHeader) {
+        chunk = `${fields.join(',')}\r\n`;
+        wroteHeader = true;
+      }
+      callback(null, `${chunk}${fields.map((field) => csvCell(doc[field])).join(',')}\r\n`);
+    },
+    flush(callback) {
+      // An empty CSV export still gets its header row
+      callback(null, format === 'csv' && !wroteHeader ? `${fields.join(',')}\r\n` : undefined);
+    }
+  });
+};
+
+module.exports = {
+  EXPORT_FORMATS,
+  createExportStream
+};
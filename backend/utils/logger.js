@@ -0,0 +1,160 @@
+const fs = require('fs');
+const crypto = require('crypto');
+
+// Structured JSON-lines logger. Lines are buffered and written in batches, so a
+// burst of requests costs one write per flush instead of one per line, and
+// lines below LOG_LEVEL are dropped before anything is serialized.
+const LEVELS = { trace: 10, debug: 20, info: 30, warn: 40, error: 50, fatal: 60 };
+
+const threshold = LEVELS[process.env.LOG_LEVEL] || LEVELS.info;
+const flushIntervalMs = parseInt(process.env.LOG_FLUSH_MS, 10) || 100;
+// Lines that would grow the buffer past this are dropped (and counted) rather
+// than holding memory while the output can't keep up
+const maxBufferBytes = parseInt(process.env.LOG_MAX_BUFFER_BYTES, 10) || 1024 * 1024;
+
+class BufferedOutput {
+  constructor(stream, fd) {
+    this.stream = stream;
+    this.fd = fd;
+    this.chunks = [];
+    this.bytes = 0;
+    this.dropped = 0;
+    this.timer = null;
+    this.waitingForDrain = false;
+  }
+
+  write(line) {
+    if (this.bytes + line.length > maxBufferBytes) {
+      this.dropped++;
+      return;
+    }
+    this.chunks.push(line);
+    this.bytes += line.length;
+    if (!this.timer && !this.waitingForDrain) {
+      this.timer = setTimeout(() => this.flush(), flushIntervalMs);
+      this.timer.unref();
+    }
+  }
+
+  take() {
+    if (this.dropped) {
+      this.chunks.push(`${JSON.stringify({
+        level: LEVELS.warn, time: Date.now(), pid: process.pid, msg: 'Log lines dropped', dropped: this.dropped
+      })}\n`);
+      this.dropped = 0;
+    }
+    const data = this.chunks.join('');
+    this.chunks = [];
+    this.bytes = 0;
+    return data;
+  }
+
+  flush() {
+    this.timer = null;
+    if (this.waitingForDrain || (!this.chunks.length && !this.dropped)) return;
+    if (!this.stream.write(this.take())) {
+      this.waitingForDrain = true;
+      this.stream.once('drain', () => {
+        this.waitingForDrain = false;
+        this.flush();
+      });
+    }
+  }
+
+  // Write whatever is buffered before the process exits
+  flushSync() {
+    if (!this.chunks.length && !this.dropped) return;
+    const data = this.take();
+    try {
+      if (this.fd !== undefined) {
+        fs.writeSync(this.fd, data);
+      } else {
+        this.stream.write(data);
+      }
+    } catch (error) {
+      // Nowhere left to report it
+    }
+  }
+}
+
+// LOG_FILE appends to a file through an async stream; otherwise stdout
+const createOutput = () => {
+  if (process.env.LOG_FILE) {
+    const fd = fs.openSync(process.env.LOG_FILE, 'a');
+    return new BufferedOutput(fs.createWriteStream(null, { fd, autoClose: false }), fd);
+  }
+  return new BufferedOutput(process.stdout, process.stdout.fd);
+};
+
+const serializeError = (error) => ({
+  type: error.name,
+  message: error.message,
+  ...(error.code !== undefined ? { code: error.code } : {}),
+  stack: error.stack
+});
+
+class Logger {
+  constructor(output, bindings = {}, keep = true) {
+    this.output = output;
+    this.bindings = bindings;
+    // False for a request that wasn't sampled: only warn and above get through
+    this.keep = keep;
+  }
+
+  child(bindings) {
+    return new Logger(this.output, { ...this.bindings, ...bindings }, this.keep);
+  }
+
+  // Child logger for one request that keeps its debug and info lines with
+  // probability sampleRate, so busy routes log a representative fraction of
+  // requests in full instead of a fraction of every request's lines
+  forRequest(req, sampleRate = 1) {
+    return new Logger(this.output, {
+      ...this.bindings,
+      reqId: req.get('X-Request-Id') || crypto.randomUUID()
+    }, this.keep && (sampleRate >= 1 || Math.random() < sampleRate));
+  }
+
+  isEnabled(level) {
+    return LEVELS[level] >= threshold && (this.keep || LEVELS[level] >= LEVELS.warn);
+  }
+
+  // log.info('message') or log.info({ field: value }, 'message'); an Error in
+  // the err field is expanded with its stack
+  write(level, fields, msg) {
+    if (!this.isEnabled(level)) return;
+    if (typeof fields === 'string') {
+      msg = fields;
+      fields = {};
+    }
+    const entry = { level: LEVELS[level], time: Date.now(), pid: process.pid, ...this.bindings, ...fields, msg };
+    if (entry.err instanceof Error) entry.err = serializeError(entry.err);
+    let line;
+    try {
+      line = JSON.stringify(entry);
+    } catch (error) {
+      line = JSON.stringify({ level: entry.level, time: entry.time, pid: entry.pid, msg, unserializable: true });
+    }
+    this.output.write(`${line}\n`);
+  }
+
+  flush() {
+    this.output.flushSync();
+  }
+}
+
+Object.keys(LEVELS).forEach((level) => {
+  Logger.prototype[level] = function (fields, msg) {
+    this.write(level, fields, msg);
+  };
+});
+
+const output = createOutput();
+const logger = new Logger(output);
+process.on('exit', () => output.flushSync());
+
+module.exports = {
+  LEVELS,
+  Logger,
+  logger
+};
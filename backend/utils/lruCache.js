@@ -0,0 +1,78 @@
+// Bounded in-memory cache with per-entry TTL and least-recently-used eviction.
+// A Map iterates in insertion order, so re-inserting an entry on every read keeps
+// the least recently used entry at the front, ready to be evicted.
+class LRUCache {
+  constructor({ maxEntries = 500, ttlMs = 60 * 1000 } = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+
+    if (!entry || entry.expiresAt <= Date.now()) {
+      if (entry) this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key, value, ttlMs = this.ttlMs) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.evictions++;
+    }
+    return value;
+  }
+
+  delete(key) {
+    return this.entries.delete(key);
+  }
+
+  // Remove every entry for which predicate(key, value) is true
+  deleteWhere(predicate) {
+    let removed = 0;
+    for (const [key, entry] of this.entries) {
+      if (predicate(key, entry.value)) {
+        this.entries.delete(key);
+        removed++;
+      }
+    }
+    return removed;
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      entries: this.entries.size,
+      maxEntries: this.maxEntries,
+      ttlMs: this.ttlMs,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      hitRatio: lookups ? this.hits / lookups : 0
+    };
+  }
+}
+
+module.exports = LRUCache;
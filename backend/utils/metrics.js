@@ -0,0 +1,143 @@
+const { monitorEventLoopDelay } = require('perf_hooks');
+const { LATENCY_BUCKETS_MS, dbPoolMetrics } = require('./dbPoolMetrics');
+
+// Upper bounds (seconds) of the request duration histogram buckets
+const DURATION_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const escapeLabel = (value) => String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+const labelSet = (labels) => Object.entries(labels)
+  .map(([name, value]) => `${name}="${escapeLabel(value)}"`)
+  .join(',');
+
+// Cumulative histogram in the Prometheus sense: bucket i counts every observation <= bounds[i]
+class Histogram {
+  constructor(bounds = DURATION_BUCKETS) {
+    this.bounds = bounds;
+    this.counts = new Array(bounds.length).fill(0);
+    this.count = 0;
+    this.sum = 0;
+  }
+
+  observe(value) {
+    this.count++;
+    this.sum += value;
+    for (let i = this.bounds.length - 1; i >= 0 && value <= this.bounds[i]; i--) {
+      this.counts[i]++;
+    }
+  }
+
+  render(name, labels) {
+    const lines = this.bounds.map((bound, i) => `${name}_bucket{${labelSet({ ...labels, le: bound })}} ${this.counts[i]}`);
+    lines.push(`${name}_bucket{${labelSet({ ...labels, le: '+Inf' })}} ${this.count}`);
+    lines.push(`${name}_sum{${labelSet(labels)}} ${this.sum}`);
+    lines.push(`${name}_count{${labelSet(labels)}} ${this.count}`);
+    return lines;
+  }
+}
+
+// HTTP request metrics of this process, keyed by route template (e.g.
+// /api/admin/projects/:id) so ids and query strings don't multiply the series
+const requestTotals = new Map();
+const requestDurations = new Map();
+let requestsInFlight = 0;
+
+// Event-loop delay since the previous scrape. Samples include the sampling
+// interval itself, which is taken off before they are reported.
+const EVENT_LOOP_RESOLUTION_MS = 20;
+const eventLoopDelay = monitorEventLoopDelay({ resolution: EVENT_LOOP_RESOLUTION_MS });
+eventLoopDelay.enable();
+
+// Count a request as in flight; call the returned function once it is answered
+const startRequest = () => {
+  const startedAt = process.hrtime.bigint();
+  requestsInFlight++;
+  return (method, route, status) => {
+    requestsInFlight--;
+    const seconds = Number(process.hrtime.bigint() - startedAt) / 1e9;
+    const totalKey = JSON.stringify([method, route, status]);
+    requestTotals.set(totalKey, (requestTotals.get(totalKey) || 0) + 1);
+    const durationKey = JSON.stringify([method, route]);
+    if (!requestDurations.has(durationKey)) requestDurations.set(durationKey, new Histogram());
+    requestDurations.get(durationKey).observe(seconds);
+  };
+};
+
+// dbPoolMetrics keeps per-bucket counts in ms; Prometheus wants cumulative seconds
+const durationStatsLines = (name, labels, stats) => {
+  let cumulative = 0;
+  const lines = LATENCY_BUCKETS_MS.map((bound) => {
+    cumulative += stats.buckets[bound];
+    return `${name}_bucket{${labelSet({ ...labels, le: bound / 1000 })}} ${cumulative}`;
+  });
+  lines.push(`${name}_bucket{${labelSet({ ...labels, le: '+Inf' })}} ${stats.count}`);
+  lines.push(`${name}_sum{${labelSet(labels)}} ${stats.totalMs / 1000}`);
+  lines.push(`${name}_count{${labelSet(labels)}} ${stats.count}`);
+  return lines;
+};
+
+const metric = (name, type, help, lines) => [`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`, ...lines];
+
+// Prometheus text exposition format (0.0.4) of everything above
+const renderMetrics = () => {
+  const memory = process.memoryUsage();
+  const delay = (value) => (
+    Number.isFinite(value) ? Math.max(0, value / 1e6 - EVENT_LOOP_RESOLUTION_MS) / 1000 : 0
+  );
+  const db = dbPoolMetrics.snapshot();
+
+  const lines = [
+    ...metric('http_requests_total', 'counter', 'HTTP requests answered, by route template and status code',
+      [...requestTotals].map(([key, count]) => {
+        const [method, route, status] = JSON.parse(key);
+        return `http_requests_total{${labelSet({ method, route, status })}} ${count}`;
+      })),
+    ...metric('http_request_duration_seconds', 'histogram', 'Time to answer HTTP requests, by route template',
+      [...requestDurations].flatMap(([key, histogram]) => {
+        const [method, route] = JSON.parse(key);
+        return histogram.render('http_request_duration_seconds', { method, route });
+      })),
+    ...metric('http_requests_in_flight', 'gauge', 'HTTP requests being handled', [
+      `http_requests_in_flight ${requestsInFlight}`
+    ]),
+    ...metric('nodejs_eventloop_lag_seconds', 'gauge', 'Event-loop delay since the previous scrape', [
+      `nodejs_eventloop_lag_seconds{stat="mean"} ${delay(eventLoopDelay.mean)}`,
+      `nodejs_eventloop_lag_seconds{stat="p50"} ${delay(eventLoopDelay.percentile(50))}`,
+      `nodejs_eventloop_lag_seconds{stat="p99"} ${delay(eventLoopDelay.percentile(99))}`,
+      `nodejs_eventloop_lag_seconds{stat="max"} ${delay(eventLoopDelay.max)}`
+    ]),
+    ...metric('nodejs_heap_size_used_bytes', 'gauge', 'V8 heap in use', [
+      `nodejs_heap_size_used_bytes ${memory.heapUsed}`
+    ]),
+    ...metric('nodejs_heap_size_total_bytes', 'gauge', 'V8 heap allocated', [
+      `nodejs_heap_size_total_bytes ${memory.heapTotal}`
+    ]),
+    ...metric('nodejs_external_memory_bytes', 'gauge', 'Memory of C++ objects bound to JavaScript objects', [
+      `nodejs_external_memory_bytes ${memory.external}`
+    ]),
+    ...metric('process_resident_memory_bytes', 'gauge', 'Resident set size', [
+      `process_resident_memory_bytes ${memory.rss}`
+    ]),
+    ...metric('mongodb_pool_connections', 'gauge', 'MongoDB pool connections, by state', [
+      `mongodb_pool_connections{state="checked_out"} ${db.pool.checkedOut}`,
+      `mongodb_pool_connections{state="idle"} ${db.pool.idle}`
+    ]),
+    ...metric('mongodb_pool_wait_queue', 'gauge', 'Operations waiting for a MongoDB connection', [
+      `mongodb_pool_wait_queue ${db.pool.waitQueue}`
+    ]),
+    ...metric('mongodb_command_duration_seconds', 'histogram', 'MongoDB command round-trip time, by command',
+      Object.entries(db.operations).flatMap(([command, stats]) => (
+        durationStatsLines('mongodb_command_duration_seconds', { command }, stats)
+      )))
+  ];
+
+  eventLoopDelay.reset();
+  return `${lines.join('\n')}\n`;
+};
+
+module.exports = {
+  DURATION_BUCKETS,
+  Histogram,
+  startRequest,
+  renderMetrics
+};
@@ -0,0 +1,35 @@
+const mongoose = require('mongoose');
+
+const OBJECT_ID = /^[0-9a-f]{24}$/i;
+
+// Opaque keyset cursor: the (createdAt, _id) sort key of the last document on a page
+const encodeCursor = (doc) => Buffer
+  .from(JSON.stringify([new Date(doc.createdAt).getTime(), String(doc._id)]))
+  .toString('base64url');
+
+// Sort key encoded in a cursor, or null if the cursor is malformed
+const decodeCursor = (cursor) => {
+  try {
+    const [time, id] = JSON.parse(Buffer.from(String(cursor), 'base64url').toString('utf8'));
+    if (!Number.isFinite(time) || !OBJECT_ID.test(id)) return null;
+    return { createdAt: new Date(time), _id: new mongoose.Types.ObjectId(id) };
+  } catch (error) {
+    return null;
+  }
+};
+
+// Documents after a cursor in { createdAt: -1, _id: -1 } order. With an index on
+// that order the query seeks straight to the cursor, so a deep page costs the
+// same as the first one, where skip() walks every document before it.
+const afterCursor = ({ createdAt, _id }) => ({
+  $or: [
+    { createdAt: { $lt: createdAt } },
+    { createdAt, _id: { $lt: _id } }
+  ]
+});
+
+module.exports = {
+  encodeCursor,
+  decodeCursor,
+  afterCursor
+};
@@ -0,0 +1,168 @@
+const crypto = require('crypto');
+const zlib = require('zlib');
+const { promisify } = require('util');
+const Personal = require('../models/Personal');
+const Project = require('../models/Project');
+const TechStack = require('../models/TechStack');
+const { onInvalidate } = require('../middleware/cache');
+const { getSummaryCounts } = require('./portfolioStats');
+const { shapes } = require('./serializers');
+
+const gzip = promisify(zlib.gzip);
+const brotliCompress = promisify(zlib.brotliCompress);
+
+// Served as the personal information until an admin saves some
+const DEFAULT_PERSONAL = {
+  name: 'Naveen Agarwal',
+  title: 'Front-End Web Developer',
+  tagline: 'Building modern, responsive web experiences with clean code and creative design',
+  bio: 'Passionate Front-End Developer with expertise in modern web technologies.',
+  email: 'naveen.agarwal.dev@gmail.com',
+  phone: '+91 98765 43210',
+  location: 'India',
+  profileImageUrl: 'https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=400&h=400&fit=crop&crop=face',
+  resumeUrl: '',
+  socialLinks: {
+    github: 'https://github.com/naveen-agarwal',
+    linkedin: 'https://linkedin.com/in/naveen-agarwal-dev',
+    twitter: 'https://twitter.com/naveen_dev',
+    email: 'mailto:naveen.agarwal.dev@gmail.com'
+  }
+};
+
+// A snapshot is rebuilt in the background once it is this old even without a
+// write, in case an invalidation from another cluster worker was lost
+const bundleTtlMs = parseInt(process.env.PORTFOLIO_BUNDLE_TTL_MS, 10) || 5 * 60 * 1000;
+
+// The data of GET /api/portfolio/personal, /projects, /tech-stack and /stats
+const loadPortfolio = async () => {
+  const [personal, projects, techStack, summary] = await Promise.all([
+    Personal.findOne(),
+    Project.find().sort({ featured: -1, order: 1, createdAt: -1 }).select(shapes.project.projection).lean(),
+    TechStack.find().sort({ category: 1, order: 1, name: 1 }).select(shapes.techStack.projection).lean(),
+    getSummaryCounts()
+  ]);
+  const modified = [personal?.updatedAt, summary.projectsLastModified, summary.techStackLastModified]
+    .filter(Boolean);
+
+  return {
+    data: {
+      personal: personal || DEFAULT_PERSONAL,
+      projects,
+      techStack,
+      stats: {
+        totalProjects: summary.totalProjects,
+        aiProjects: summary.aiProjects,
+        webProjects: summary.webProjects,
+        techCount: summary.techStackCount,
+        yearsExperience: 3,
+        clients: 25
+      }
+    },
+    lastModified: modified.length ? new Date(Math.max(...modified)) : null
+  };
+};
+
+// The landing page's data as one response, serialized and compressed once per
+// change instead of on every request. Admin writes invalidate it through the
+// response cache, and the next snapshot is built right away.
+class PortfolioBundle {
+  constructor() {
+    this.current = null;
+    this.building = null;
+    // Bumped by every invalidation; a snapshot built from older data is stale
+    this.generation = 0;
+    this.rebuildScheduled = false;
+    this.builds = 0;
+  }
+
+  async build() {
+    const generation = this.generation;
+    const { data, lastModified } = await loadPortfolio();
+    const body = Buffer.from(`{"success":true,"data":{${[
+      `"personal":${JSON.stringify(data.personal)}`,
+      `"projects":${shapes.project.list(data.projects)}`,
+      `"techStack":${shapes.techStack.list(data.techStack)}`,
+      `"stats":${JSON.stringify(data.stats)}`
+    ].join(',')}}}`);
+    // Compressed at the highest levels, since it happens once per change
+    const [gzipped, brotli] = await Promise.all([
+      gzip(body, { level: zlib.constants.Z_BEST_COMPRESSION }),
+      brotliCompress(body, {
+        params: {
+          [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+          [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length
+        }
+      })
+    ]);
+    this.builds++;
+    return {
+      generation,
+      builtAt: Date.now(),
+      etag: crypto.createHash('sha1').update(body).digest('base64url'),
+      lastModified,
+      variants: { identity: body, gzip: gzipped, br: brotli }
+    };
+  }
+
+  // Build a snapshot unless one is already being built. Callers waiting on a
+  // build that was overtaken by a write get the snapshot built after it.
+  refresh() {
+    if (!this.building) {
+      this.building = this.build().then((snapshot) => {
+        this.current = snapshot;
+        this.building = null;
+        return snapshot.generation === this.generation ? snapshot : this.refresh();
+      }, (error) => {
+        this.building = null;
+        throw error;
+      });
+    }
+    return this.building;
+  }
+
+  // The current snapshot; only the first request and requests right after a
+  // write wait for a build
+  async get() {
+    if (!this.current || this.current.generation !== this.generation) {
+      return this.refresh();
+    }
+    if (Date.now() - this.current.builtAt > bundleTtlMs) {
+      this.refresh().catch((error) => console.error('Error rebuilding portfolio bundle:', error));
+    }
+    return this.current;
+  }
+
+  invalidate() {
+    this.generation++;
+    // Rebuild once per tick, so a bulk write's invalidations cost one build
+    if (!this.current || this.rebuildScheduled) return;
+    this.rebuildScheduled = true;
+    setImmediate(() => {
+      this.rebuildScheduled = false;
+      this.refresh().catch((error) => console.error('Error rebuilding portfolio bundle:', error));
+    });
+  }
+
+  stats() {
+    const snapshot = this.current;
+    return {
+      builds: this.builds,
+      stale: !snapshot || snapshot.generation !== this.generation,
+      builtAt: snapshot ? new Date(snapshot.builtAt).toISOString() : null,
+      ttlMs: bundleTtlMs,
+      bytes: snapshot
+        ? Object.fromEntries(Object.entries(snapshot.variants).map(([encoding, body]) => [encoding, body.length]))
+        : null
+    };
+  }
+}
+
+const portfolioBundle = new PortfolioBundle();
+onInvalidate(() => portfolioBundle.invalidate());
+
+module.exports = {
+  DEFAULT_PERSONAL,
+  PortfolioBundle,
+  portfolioBundle
+};
@@ -0,0 +1,108 @@
+const Project = require('../models/Project');
+const TechStack = require('../models/TechStack');
+const Contact = require('../models/Contact');
+
+const EMPTY_SUMMARY = {
+  totalProjects: 0,
+  featuredProjects: 0,
+  aiProjects: 0,
+  webProjects: 0,
+  techStackCount: 0,
+  totalMessages: 0,
+  newMessages: 0,
+  projectsLastModified: null,
+  techStackLastModified: null
+};
+
+// Every dashboard / stats number from a single aggregation. Tech stack and contact
+// documents are appended to the project stream with $unionWith (MongoDB 4.4+), each
+// tagged with its kind and trimmed to the fields the counts need, and one $group
+// tallies them. That is one round-trip and one pass per collection, where separate
+// countDocuments calls cost a round-trip and a scan each.
+const getSummaryCounts = async ({ includeMessages = false } = {}) => {
+  const isKind = (kind) => ({ $eq: ['$kind', kind] });
+  const countIf = (condition) => ({ $sum: { $cond: [condition, 1, 0] } });
+  const projectWith = (condition) => countIf({ $and: [isKind('project'), condition] });
+
+  const pipeline = [
+    { $project: { _id: 0, kind: { $literal: 'project' }, featured: 1, category: 1, updatedAt: 1 } },
+    {
+      $unionWith: {
+        coll: TechStack.collection.name,
+        pipeline: [{ $project: { _id: 0, kind: { $literal: 'techStack' }, updatedAt: 1 } }]
+      }
+    }
+  ];
+
+  if (includeMessages) {
+    pipeline.push({
+      $unionWith: {
+        coll: Contact.collection.name,
+        pipeline: [{ $project: { _id: 0, kind: { $literal: 'contact' }, status: 1 } }]
+      }
+    });
+  }
+
+  pipeline.push({
+    $group: {
+      _id: null,
+      totalProjects: countIf(isKind('project')),
+      featuredProjects: projectWith({ $eq: ['$featured', true] }),
+      aiProjects: projectWith({ $eq: ['$category', 'AI'] }),
+      webProjects: projectWith({ $eq: ['$category', 'Web'] }),
+      techStackCount: countIf(isKind('techStack')),
+      totalMessages: countIf(isKind('contact')),
+      newMessages: countIf({ $and: [isKind('contact'), { $eq: ['$status', 'new'] }] }),
+      // $max skips the nulls, leaving the newest updatedAt of each kind
+      projectsLastModified: { $max: { $cond: [isKind('project'), '$updatedAt', null] } },
+      techStackLastModified: { $max: { $cond: [isKind('techStack'), '$updatedAt', null] } }
+    }
+  });
+
+  const [summary] = await Project.aggregate(pipeline);
+  return { ...EMPTY_SUMMARY, ...summary };
+};
+
+// The previous one-countDocuments-per-number implementation, kept so the harness
+// can compare round-trips and latency against it (?strategy=legacy)
+const getSummaryCountsLegacy = async ({ includeMessages = false } = {}) => {
+  const [
+    totalProjects,
+    featuredProjects,
+    aiProjects,
+    webProjects,
+    techStackCount,
+    totalMessages,
+    newMessages
+  ] = await Promise.all([
+    Project.countDocuments(),
+    Project.countDocuments({ featured: true }),
+    Project.countDocuments({ category: 'AI' }),
+    Project.countDocuments({ category: 'Web' }),
+    TechStack.countDocuments(),
+    includeMessages ? Contact.countDocuments() : 0,
+    includeMessages ? Contact.countDocuments({ status: 'new' }) : 0
+  ]);
+
+  return {
+    ...EMPTY_SUMMARY,
+    totalProjects,
+    featuredProjects,
+    aiProjects,
+    webProjects,
+    techStackCount,
+    totalMessages,
+    newMessages
+  };
+};
+
+// With LEGACY_COUNTS_PARAM=true, ?strategy=legacy reads the counts the old way;
+// for benchmarks only, and ignored otherwise
+const legacyCountsAllowed = process.env.LEGACY_COUNTS_PARAM === 'true';
+const legacyCountsRequested = (req) => legacyCountsAllowed && req.query.strategy === 'legacy';
+
+module.exports = {
+  getSummaryCounts,
+  getSummaryCountsLegacy,
+  legacyCountsRequested
+};
@@ -0,0 +1,187 @@
+const RateLimit = require('../models/RateLimit');
+const LRUCache = require('./lruCache');
+
+// Hits a sliding window counter estimates for the last windowMs: all of the
+// current window plus the part of the previous one that still overlaps it
+const slidingHits = ({ count, previous }, elapsed) => count + Math.floor(previous * (1 - elapsed));
+
+// Reported once per failed sync, however many keys it was writing
+const logSyncError = (error) => console.error('Error syncing rate limit counters:', error.message);
+
+// express-rate-limit store that keeps its counters in MongoDB, so every server
+// process and instance enforces one shared quota. Each write is a single atomic
+// upsert that rolls the window over and adds the hits.
+//
+// With syncHits 1 every hit is written before the request goes on, so the quota
+// is exact; keys over the limit are then remembered locally until the sliding
+// estimate allows them again, so requests from a client that is already blocked
+// don't cost a database round-trip. With a larger syncHits, hits are counted
+// in this process and a key's pending hits are written once there are syncHits
+// of them or syncIntervalMs after the first, whichever comes first. Requests
+// never wait for MongoDB; each write brings back the hits of the other
+// processes, so a client can get past the quota by at most the hits the other
+// processes haven't written yet.
+class MongoRateLimitStore {
+  constructor(prefix, { maxBlockedKeys = 10000, syncHits = 1, syncIntervalMs = 1000, maxKeys = 10000 } = {}) {
+    // Counters live outside the process, namespaced per limiter
+    this.localKeys = false;
+    this.prefix = prefix;
+    // key -> time the key is allowed again
+    this.blocked = new LRUCache({ maxEntries: maxBlockedKeys });
+    this.syncHits = Math.max(1, syncHits);
+    this.syncIntervalMs = syncIntervalMs;
+    // key -> { window, count, previous, pending }: the shared counter as of its
+    // last write plus the hits counted since, pending of them not yet written
+    this.counters = new LRUCache({ maxEntries: maxKeys });
+    // Counters with pending hits, kept here too so eviction can't lose them
+    this.dirty = new Map();
+    this.syncTimer = null;
+  }
+
+  init(options) {
+    this.windowMs = options.windowMs;
+    const limit = options.limit ?? options.max;
+    // A limit computed per request can't be known ahead, so nothing is remembered as blocked
+    this.limit = typeof limit === 'number' ? limit : null;
+  }
+
+  // Add hits to the shared counter in the given window; resolves with the counter
+  write(key, hits, window) {
+    return RateLimit.findOneAndUpdate(
+      { _id: `${this.prefix}:${key}` },
+      [{
+        $set: {
+          previous: {
+            $switch: {
+              branches: [
+                { case: { $eq: ['$window', window] }, then: '$previous' },
+                { case: { $eq: ['$window', window - 1] }, then: '$count' }
+              ],
+              default: 0
+            }
+          },
+          count: { $cond: [{ $eq: ['$window', window] }, { $add: ['$count', hits] }, hits] },
+          window,
+          expiresAt: new Date((window + 2) * this.windowMs)
+        }
+      }],
+      { upsert: true, new: true }
+    ).lean();
+  }
+
+  async increment(key) {
+    if (this.syncHits > 1) return this.countLocally(key);
+
+    const blockedUntil = this.blocked.get(key);
+    if (blockedUntil !== undefined) {
+      return { totalHits: this.limit + 1, resetTime: new Date(blockedUntil) };
+    }
+
+    const now = Date.now();
+    const window = Math.floor(now / this.windowMs);
+    const counter = await this.write(key, 1, window);
+
+    const windowStart = window * this.windowMs;
+    const totalHits = slidingHits(counter, (now - windowStart) / this.windowMs);
+    if (this.limit !== null && totalHits > this.limit) {
+      // The estimate falls back under the limit once enough of the previous window has slid out
+      const freedAt = counter.count >= this.limit
+        ? 1
+        : 1 - (this.limit - counter.count) / counter.previous;
+      const blockedUntil = windowStart + Math.ceil(freedAt * this.windowMs);
+      this.blocked.set(key, blockedUntil, blockedUntil - now);
+    }
+    return { totalHits, resetTime: new Date(windowStart + this.windowMs) };
+  }
+
+  countLocally(key) {
+    const now = Date.now();
+    const window = Math.floor(now / this.windowMs);
+    let counter = this.dirty.get(key) || this.counters.get(key);
+    if (!counter) {
+      counter = { window, count: 0, previous: 0, pending: 0 };
+    } else if (counter.window !== window) {
+      // Hits still pending are written into the current window
+      counter.previous = counter.window === window - 1 ? counter.count : 0;
+      counter.count = 0;
+      counter.window = window;
+    }
+    counter.count++;
+    counter.pending++;
+    this.counters.set(key, counter, 2 * this.windowMs);
+    this.dirty.set(key, counter);
+
+    if (counter.pending >= this.syncHits) {
+      this.sync(key).catch(logSyncError);
+    } else if (!this.syncTimer) {
+      this.syncTimer = setTimeout(() => {
+        this.syncTimer = null;
+        this.flush().catch(logSyncError);
+      }, this.syncIntervalMs);
+      this.syncTimer.unref();
+    }
+
+    const windowStart = window * this.windowMs;
+    return {
+      totalHits: slidingHits(counter, (now - windowStart) / this.windowMs),
+      resetTime: new Date(windowStart + this.windowMs)
+    };
+  }
+
+  // Write the pending hits of one key and take in the shared counter
+  async sync(key) {
+    const counter = this.dirty.get(key);
+    if (!counter) return;
+    this.dirty.delete(key);
+    const hits = counter.pending;
+    counter.pending = 0;
+    let shared;
+    try {
+      shared = await this.write(key, hits, Math.floor(Date.now() / this.windowMs));
+    } catch (error) {
+      // Kept for the next sync
+      counter.pending += hits;
+      this.dirty.set(key, counter);
+      throw error;
+    }
+    // Hits counted while the write was in flight are still pending
+    if (shared.window >= counter.window) {
+      counter.window = shared.window;
+      counter.count = shared.count + counter.pending;
+      counter.previous = shared.previous;
+    }
+  }
+
+  // Write every pending hit, e.g. before the process exits
+  async flush() {
+    const results = await Promise.allSettled([...this.dirty.keys()].map((key) => this.sync(key)));
+    const failed = results.find((result) => result.status === 'rejected');
+    if (failed) throw failed.reason;
+  }
+
+  async decrement(key) {
+    const counter = this.dirty.get(key);
+    if (counter && counter.pending > 0) {
+      counter.pending--;
+      counter.count--;
+      return;
+    }
+    if (this.syncHits > 1) {
+      const known = this.counters.get(key);
+      if (known && known.count > 0) known.count--;
+    }
+    await RateLimit.updateOne({ _id: `${this.prefix}:${key}`, count: { $gt: 0 } }, { $inc: { count: -1 } });
+  }
+
+  async resetKey(key) {
+    this.blocked.delete(key);
+    this.counters.delete(key);
+    this.dirty.delete(key);
+    await RateLimit.deleteOne({ _id: `${this.prefix}:${key}` });
+  }
+}
+
+module.exports = {
+  MongoRateLimitStore,
+  slidingHits
+};
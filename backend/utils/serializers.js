@@ -0,0 +1,131 @@
+// Response shapes of the list routes (contracts.md), used twice: as the query's
+// projection, so MongoDB only sends the fields a response carries, and as a
+// precompiled JSON serializer for the plain objects a lean() query returns.
+// Each field's key is quoted once here and its value written by a function
+// picked for its type, instead of hydrating Mongoose documents and walking them
+// through toJSON and JSON.stringify on every request.
+
+// Writers by field type; null is written as null for every type
+const writers = {
+  id: (value) => `"${value}"`,
+  string: (value) => JSON.stringify(value),
+  number: (value) => (Number.isFinite(value) ? String(value) : 'null'),
+  boolean: (value) => (value ? 'true' : 'false'),
+  date: (value) => JSON.stringify(value),
+  strings: (values) => `[${values.map((value) => JSON.stringify(value)).join(',')}]`,
+  // Nested documents (image sets) are written as they are
+  object: (value) => JSON.stringify(value)
+};
+
+// A shape from { field: type }: its projection, and serializers for one
+// document and for an array of them. Fields a document doesn't have are left
+// out, like JSON.stringify leaves out undefined.
+const defineShape = (fields) => {
+  const entries = Object.entries(fields).map(([name, type]) => {
+    if (!writers[type]) throw new Error(`Unknown field type ${type} for ${name}`);
+    return { name, key: `${JSON.stringify(name)}:`, write: writers[type] };
+  });
+
+  const serialize = (doc) => {
+    let body = '';
+    for (const { name, key, write } of entries) {
+      const value = doc[name];
+      if (value === undefined) continue;
+      body += `${body ? ',' : ''}${key}${value === null ? 'null' : write(value)}`;
+    }
+    return `{${body}}`;
+  };
+
+  return {
+    fields: Object.keys(fields),
+    projection: Object.keys(fields).join(' '),
+    serialize,
+    list: (docs) => `[${docs.map(serialize).join(',')}]`
+  };
+};
+
+const projectFields = {
+  _id: 'id',
+  title: 'string',
+  description: 'string',
+  category: 'string',
+  image: 'string',
+  imageSet: 'object',
+  techStack: 'strings',
+  githubUrl: 'string',
+  liveUrl: 'string',
+  featured: 'boolean',
+  createdAt: 'date',
+  updatedAt: 'date'
+};
+
+const techStackFields = {
+  _id: 'id',
+  name: 'string',
+  icon: 'string',
+  logoUrl: 'string',
+  logoSet: 'object',
+  color: 'string',
+  category: 'string'
+};
+
+const shapes = {
+  // GET /api/portfolio/projects, /projects/featured and the bundle
+  project: defineShape(projectFields),
+  // Search results also carry their text score
+  projectSearchResult: defineShape({ ...projectFields, score: 'number' }),
+  // The admin edits the fields the public never sees
+  adminProject: defineShape({ ...projectFields, imagePublicId: 'string', order: 'number' }),
+  techStack: defineShape(techStackFields),
+  adminTechStack: defineShape({
+    ...techStackFields,
+    logoPublicId: 'string',
+    order: 'number',
+    createdAt: 'date',
+    updatedAt: 'date'
+  }),
+  contact: defineShape({
+    _id: 'id',
+    name: 'string',
+    email: 'string',
+    message: 'string',
+    status: 'string',
+    ipAddress: 'string',
+    userAgent: 'string',
+    createdAt: 'date',
+    updatedAt: 'date'
+  })
+};
+
+// With HYDRATED_READ_PARAM=true, ?read=hydrated reads full Mongoose documents
+// and sends them through res.json, the way the list routes did before; for
+// benchmarking the lean path against only, and ignored otherwise
+const hydratedReadAllowed = process.env.HYDRATED_READ_PARAM === 'true';
+const hydratedRead = (req) => hydratedReadAllowed && req.query.read === 'hydrated';
+
+// Send { success: true, data } where data is already serialized JSON; through
+// the response cache when the route has one
+const sendData = (res, data) => {
+  const body = `{"success":true,"data":${data}}`;
+  if (res.sendSerialized) return res.sendSerialized(body);
+  res.type('application/json');
+  return res.send(body);
+};
+
+// Send the result of a list query in a shape: projected, lean and serialized,
+// or hydrated with ?read=hydrated where that is allowed
+const sendList = async (req, res, find, shape) => {
+  if (hydratedRead(req)) {
+    return res.json({ success: true, data: await find });
+  }
+  const docs = await find.select(shape.projection).lean();
+  return sendData(res, shape.list(docs));
+};
+
+module.exports = {
+  defineShape,
+  shapes,
+  hydratedRead,
+  sendData,
+  sendList
+};
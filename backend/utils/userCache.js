@@ -0,0 +1,62 @@
+const crypto = require('crypto');
+const LRUCache = require('./lruCache');
+const { subscribe, publish } = require('./clusterChannel');
+
+// Users resolved by the auth middleware, keyed by a hash of the bearer token so
+// tokens themselves are never held in memory. A TTL of 0 disables the cache.
+const ttlMs = parseInt(process.env.AUTH_CACHE_TTL_MS, 10);
+const userCache = new LRUCache({
+  maxEntries: parseInt(process.env.AUTH_CACHE_MAX_ENTRIES, 10) || 500,
+  ttlMs: Number.isNaN(ttlMs) ? 60 * 1000 : ttlMs
+});
+
+const tokenKey = (token) => crypto.createHash('sha256').update(token).digest('base64url');
+
+const getCachedUser = (token) => {
+  if (userCache.ttlMs <= 0) return undefined;
+  return userCache.get(tokenKey(token));
+};
+
+// Cache the user a token resolved to, never past the token's own expiry
+// (exp is the JWT claim, in seconds)
+const cacheUser = (token, user, exp) => {
+  const ttl = Math.min(userCache.ttlMs, exp * 1000 - Date.now());
+  if (ttl > 0) userCache.set(tokenKey(token), user, ttl);
+};
+
+const dropKey = (key) => userCache.delete(key);
+
+const dropUser = (userId) => {
+  if (!userId) {
+    userCache.clear();
+    return;
+  }
+  userCache.deleteWhere((key, user) => String(user._id) === userId);
+};
+
+// Under cluster.js every worker caches on its own; a logout or a user change
+// is passed to the others, so a revoked token stops working on all of them.
+// Only the token's hash is sent.
+subscribe('users:forget-token', ({ key }) => dropKey(key));
+subscribe('users:forget-user', ({ userId }) => dropUser(userId));
+
+const forgetToken = (token) => {
+  const key = tokenKey(token);
+  publish('users:forget-token', { key });
+  return dropKey(key);
+};
+
+// Drop every cached token of a user, or of all users when no id is given
+const forgetUser = (userId) => {
+  const id = userId ? String(userId) : null;
+  publish('users:forget-user', { userId: id });
+  dropUser(id);
+};
+
+module.exports = {
+  userCache,
+  getCachedUser,
+  cacheUser,
+  forgetToken,
+  forgetUser
+};
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Portfolio backend API.
+Implements the contract in contracts.md (health, portfolio, auth, admin and contact
+routes) on top of an in-memory store, so backend_test.py and its benchmarks can run
+offline against a loopback socket. The stand-in itself is the standin package.
+"""
+
+from standin.server import main
+
+if __name__ == "__main__":
+    main()
@@ -2,578 +2,400 @@
 """
 Comprehensive Backend API Testing for Portfolio Application
 Tests all endpoints including authentication, public APIs, contact form, and admin routes.
+The tests and benchmarks live in the harness package; this is their command line.
 """
 
-import requests
-import json
-import sys
+import argparse
 import os
-from datetime import datetime
+import subprocess
+import sys
+import tempfile
 
-# Get backend URL from frontend .env
-BACKEND_URL = "https://faddc90b-2180-456b-822d-9f2d0f3283f9.preview.emergentagent.com"
-API_BASE = f"{BACKEND_URL}/api"
+from harness.bulk import BulkImportBenchmark
+from harness.config import ADMIN_EMAIL, ADMIN_PASSWORD, API_BASE, STANDIN_SCRIPT
+from harness.contact import ContactLoggingBenchmark, ContactSpamBenchmark, EmailOutboxBenchmark, logging_configs
+from harness.images import ImageVariantBenchmark
+from harness.lean import LeanReadBenchmark
+from harness.load import (ADMIN_LOAD_TESTS, LOAD_TESTS, LoadGenerator, PoolSampler, ServerMetricsScraper,
+                          WorkerScalingBenchmark)
+from harness.messages import ExportBenchmark, PaginationBenchmark
+from harness.reads import (AuthCacheBenchmark, CacheBenchmark, PortfolioBundleBenchmark, RevalidationBenchmark,
+                           SummaryAggregationBenchmark)
+from harness.ratelimit import RateLimitBenchmark
+from harness.regression import BenchmarkRunner
+from harness.search import ProjectSearchBenchmark
+from harness.tester import PortfolioAPITester
 
-# Admin credentials from backend .env
-ADMIN_EMAIL = "admin@naveen-portfolio.com"
-ADMIN_PASSWORD = "N@veenDev#2025"
+# General limiter quota of the benchmark stand-ins, more than any run sends
+BENCH_RATE_MAX = 10 ** 9
 
-class PortfolioAPITester:
-    def __init__(self):
-        self.session = requests.Session()
-        self.auth_token = None
-        self.test_results = []
-        
-    def log_test(self, test_name, success, message, details=None):
-        """Log test results"""
-        result = {
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'details': details,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.test_results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
-        if details and not success:
-            print(f"   Details: {details}")
-    
-    def test_health_check(self):
-        """Test basic health check endpoint"""
-        try:
-            response = self.session.get(f"{API_BASE}/health", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success'):
-                    self.log_test("Health Check", True, "API is running")
-                    return True
-                else:
-                    self.log_test("Health Check", False, "API returned success=false", data)
-            else:
-                self.log_test("Health Check", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Health Check", False, "Connection failed", str(e))
-        return False
-    
-    def test_root_endpoint(self):
-        """Test root API endpoint"""
-        try:
-            response = self.session.get(f"{API_BASE}", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and 'Portfolio Backend API' in data.get('message', ''):
-                    self.log_test("Root Endpoint", True, "Root API endpoint working")
-                    return True
-                else:
-                    self.log_test("Root Endpoint", False, "Unexpected response format", data)
-            else:
-                self.log_test("Root Endpoint", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Root Endpoint", False, "Connection failed", str(e))
-        return False
-    
-    def test_admin_login_correct(self):
-        """Test admin login with correct credentials"""
-        try:
-            login_data = {
-                "email": ADMIN_EMAIL,
-                "password": ADMIN_PASSWORD
-            }
-            response = self.session.post(f"{API_BASE}/auth/login", json=login_data, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('token'):
-                    self.auth_token = data['token']
-                    self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
-                    self.log_test("Admin Login (Correct)", True, "Login successful with valid credentials")
-                    return True
-                else:
-                    self.log_test("Admin Login (Correct)", False, "Login response missing token", data)
-            else:
-                self.log_test("Admin Login (Correct)", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Admin Login (Correct)", False, "Login request failed", str(e))
-        return False
-    
-    def test_admin_login_incorrect(self):
-        """Test admin login with incorrect credentials"""
-        try:
-            login_data = {
-                "email": ADMIN_EMAIL,
-                "password": "wrongpassword"
-            }
-            response = self.session.post(f"{API_BASE}/auth/login", json=login_data, timeout=10)
-            
-            if response.status_code == 401:
-                data = response.json()
-                if not data.get('success'):
-                    self.log_test("Admin Login (Incorrect)", True, "Correctly rejected invalid credentials")
-                    return True
-                else:
-                    self.log_test("Admin Login (Incorrect)", False, "Should have rejected invalid credentials", data)
-            else:
-                self.log_test("Admin Login (Incorrect)", False, f"Expected 401, got {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Admin Login (Incorrect)", False, "Login request failed", str(e))
-        return False
-    
-    def test_jwt_verification(self):
-        """Test JWT token verification endpoint"""
-        if not self.auth_token:
-            self.log_test("JWT Verification", False, "No auth token available")
-            return False
-            
-        try:
-            response = self.session.post(f"{API_BASE}/auth/verify", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('user'):
-                    self.log_test("JWT Verification", True, "Token verification successful")
-                    return True
-                else:
-                    self.log_test("JWT Verification", False, "Verification response invalid", data)
-            else:
-                self.log_test("JWT Verification", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("JWT Verification", False, "Verification request failed", str(e))
-        return False
-    
-    def test_protected_route_without_auth(self):
-        """Test that protected routes require authentication"""
-        # Temporarily remove auth header
-        temp_headers = self.session.headers.copy()
-        if 'Authorization' in self.session.headers:
-            del self.session.headers['Authorization']
-        
-        try:
-            response = self.session.get(f"{API_BASE}/admin/dashboard", timeout=10)
-            
-            if response.status_code == 401:
-                data = response.json()
-                if not data.get('success'):
-                    self.log_test("Protected Route Auth", True, "Correctly requires authentication")
-                    result = True
-                else:
-                    self.log_test("Protected Route Auth", False, "Should require authentication", data)
-                    result = False
-            else:
-                self.log_test("Protected Route Auth", False, f"Expected 401, got {response.status_code}", response.text)
-                result = False
-        except Exception as e:
-            self.log_test("Protected Route Auth", False, "Request failed", str(e))
-            result = False
-        finally:
-            # Restore headers
-            self.session.headers.update(temp_headers)
-        
-        return result
-    
-    def test_personal_info(self):
-        """Test GET /api/portfolio/personal"""
-        try:
-            response = self.session.get(f"{API_BASE}/portfolio/personal", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('data'):
-                    personal_data = data['data']
-                    required_fields = ['name', 'title', 'email']
-                    missing_fields = [field for field in required_fields if not personal_data.get(field)]
-                    
-                    if not missing_fields:
-                        self.log_test("Personal Info API", True, "Personal information retrieved successfully")
-                        return True
-                    else:
-                        self.log_test("Personal Info API", False, f"Missing required fields: {missing_fields}", personal_data)
-                else:
-                    self.log_test("Personal Info API", False, "Invalid response format", data)
-            else:
-                self.log_test("Personal Info API", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Personal Info API", False, "Request failed", str(e))
-        return False
-    
-    def test_projects_all(self):
-        """Test GET /api/portfolio/projects"""
-        try:
-            response = self.session.get(f"{API_BASE}/portfolio/projects", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and 'data' in data:
-                    projects = data['data']
-                    self.log_test("Projects API (All)", True, f"Retrieved {len(projects)} projects")
-                    return True
-                else:
-                    self.log_test("Projects API (All)", False, "Invalid response format", data)
-            else:
-                self.log_test("Projects API (All)", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Projects API (All)", False, "Request failed", str(e))
-        return False
-    
-    def test_projects_ai_filter(self):
-        """Test GET /api/portfolio/projects?category=AI"""
-        try:
-            response = self.session.get(f"{API_BASE}/portfolio/projects?category=AI", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and 'data' in data:
-                    projects = data['data']
-                    # Check if all returned projects are AI category (if any exist)
-                    ai_projects = [p for p in projects if p.get('category') == 'AI']
-                    if len(projects) == 0 or len(ai_projects) == len(projects):
-                        self.log_test("Projects API (AI Filter)", True, f"AI filter working, found {len(projects)} AI projects")
-                        return True
-                    else:
-                        self.log_test("Projects API (AI Filter)", False, f"Filter not working: {len(ai_projects)}/{len(projects)} are AI", projects)
-                else:
-                    self.log_test("Projects API (AI Filter)", False, "Invalid response format", data)
-            else:
-                self.log_test("Projects API (AI Filter)", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Projects API (AI Filter)", False, "Request failed", str(e))
-        return False
-    
-    def test_projects_web_filter(self):
-        """Test GET /api/portfolio/projects?category=Web"""
-        try:
-            response = self.session.get(f"{API_BASE}/portfolio/projects?category=Web", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and 'data' in data:
-                    projects = data['data']
-                    # Check if all returned projects are Web category (if any exist)
-                    web_projects = [p for p in projects if p.get('category') == 'Web']
-                    if len(projects) == 0 or len(web_projects) == len(projects):
-                        self.log_test("Projects API (Web Filter)", True, f"Web filter working, found {len(projects)} Web projects")
-                        return True
-                    else:
-                        self.log_test("Projects API (Web Filter)", False, f"Filter not working: {len(web_projects)}/{len(projects)} are Web", projects)
-                else:
-                    self.log_test("Projects API (Web Filter)", False, "Invalid response format", data)
-            else:
-                self.log_test("Projects API (Web Filter)", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Projects API (Web Filter)", False, "Request failed", str(e))
-        return False
-    
-    def test_tech_stack(self):
-        """Test GET /api/portfolio/tech-stack"""
-        try:
-            response = self.session.get(f"{API_BASE}/portfolio/tech-stack", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and 'data' in data:
-                    tech_stack = data['data']
-                    self.log_test("Tech Stack API", True, f"Retrieved {len(tech_stack)} tech stack items")
-                    return True
-                else:
-                    self.log_test("Tech Stack API", False, "Invalid response format", data)
-            else:
-                self.log_test("Tech Stack API", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Tech Stack API", False, "Request failed", str(e))
-        return False
-    
-    def test_portfolio_stats(self):
-        """Test GET /api/portfolio/stats"""
-        try:
-            response = self.session.get(f"{API_BASE}/portfolio/stats", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('data'):
-                    stats = data['data']
-                    required_stats = ['totalProjects', 'aiProjects', 'webProjects', 'techCount']
-                    missing_stats = [stat for stat in required_stats if stat not in stats]
-                    
-                    if not missing_stats:
-                        self.log_test("Portfolio Stats API", True, "Portfolio statistics retrieved successfully")
-                        return True
-                    else:
-                        self.log_test("Portfolio Stats API", False, f"Missing stats: {missing_stats}", stats)
-                else:
-                    self.log_test("Portfolio Stats API", False, "Invalid response format", data)
-            else:
-                self.log_test("Portfolio Stats API", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Portfolio Stats API", False, "Request failed", str(e))
-        return False
-    
-    def test_contact_form_valid(self):
-        """Test POST /api/contact with valid data"""
-        try:
-            contact_data = {
-                "name": "John Doe",
-                "email": "john.doe@example.com",
-                "message": "This is a test message for the portfolio contact form. Testing the API functionality."
-            }
-            
-            response = self.session.post(f"{API_BASE}/contact", json=contact_data, timeout=10)
-            
-            if response.status_code == 201:
-                data = response.json()
-                if data.get('success') and 'Thank you for your message' in data.get('message', ''):
-                    self.log_test("Contact Form (Valid)", True, "Contact form submission successful")
-                    return True
-                else:
-                    self.log_test("Contact Form (Valid)", False, "Unexpected response format", data)
-            else:
-                self.log_test("Contact Form (Valid)", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Contact Form (Valid)", False, "Request failed", str(e))
-        return False
-    
-    def test_contact_form_invalid(self):
-        """Test POST /api/contact with invalid data"""
-        try:
-            # Test with missing required fields
-            contact_data = {
-                "name": "",
-                "email": "invalid-email",
-                "message": ""
-            }
-            
-            response = self.session.post(f"{API_BASE}/contact", json=contact_data, timeout=10)
-            
-            if response.status_code == 400:
-                data = response.json()
-                if not data.get('success'):
-                    self.log_test("Contact Form (Invalid)", True, "Correctly rejected invalid data")
-                    return True
-                else:
-                    self.log_test("Contact Form (Invalid)", False, "Should have rejected invalid data", data)
-            else:
-                self.log_test("Contact Form (Invalid)", False, f"Expected 400, got {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Contact Form (Invalid)", False, "Request failed", str(e))
-        return False
-    
-    def test_admin_dashboard(self):
-        """Test GET /api/admin/dashboard (requires auth)"""
-        if not self.auth_token:
-            self.log_test("Admin Dashboard", False, "No auth token available")
-            return False
-            
-        try:
-            response = self.session.get(f"{API_BASE}/admin/dashboard", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('data') and data['data'].get('stats'):
-                    self.log_test("Admin Dashboard", True, "Dashboard data retrieved successfully")
-                    return True
-                else:
-                    self.log_test("Admin Dashboard", False, "Invalid dashboard response format", data)
-            else:
-                self.log_test("Admin Dashboard", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Admin Dashboard", False, "Request failed", str(e))
-        return False
-    
-    def test_admin_projects(self):
-        """Test GET /api/admin/projects (requires auth)"""
-        if not self.auth_token:
-            self.log_test("Admin Projects", False, "No auth token available")
-            return False
-            
-        try:
-            response = self.session.get(f"{API_BASE}/admin/projects", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and 'data' in data:
-                    projects = data['data']
-                    self.log_test("Admin Projects", True, f"Admin projects retrieved: {len(projects)} projects")
-                    return True
-                else:
-                    self.log_test("Admin Projects", False, "Invalid response format", data)
-            else:
-                self.log_test("Admin Projects", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Admin Projects", False, "Request failed", str(e))
-        return False
-    
-    def test_admin_personal(self):
-        """Test GET /api/admin/personal (requires auth)"""
-        if not self.auth_token:
-            self.log_test("Admin Personal", False, "No auth token available")
-            return False
-            
-        try:
-            response = self.session.get(f"{API_BASE}/admin/personal", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('data'):
-                    self.log_test("Admin Personal", True, "Admin personal info retrieved successfully")
-                    return True
-                else:
-                    self.log_test("Admin Personal", False, "Invalid response format", data)
-            else:
-                self.log_test("Admin Personal", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Admin Personal", False, "Request failed", str(e))
-        return False
-    
-    def test_admin_tech_stack(self):
-        """Test GET /api/admin/tech-stack (requires auth)"""
-        if not self.auth_token:
-            self.log_test("Admin Tech Stack", False, "No auth token available")
-            return False
-            
-        try:
-            response = self.session.get(f"{API_BASE}/admin/tech-stack", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and 'data' in data:
-                    tech_stack = data['data']
-                    self.log_test("Admin Tech Stack", True, f"Admin tech stack retrieved: {len(tech_stack)} items")
-                    return True
-                else:
-                    self.log_test("Admin Tech Stack", False, "Invalid response format", data)
-            else:
-                self.log_test("Admin Tech Stack", False, f"HTTP {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("Admin Tech Stack", False, "Request failed", str(e))
-        return False
-    
-    def test_404_endpoint(self):
-        """Test invalid endpoint returns 404"""
-        try:
-            response = self.session.get(f"{API_BASE}/nonexistent-endpoint", timeout=10)
-            
-            if response.status_code == 404:
-                data = response.json()
-                if not data.get('success'):
-                    self.log_test("404 Error Handling", True, "Correctly returns 404 for invalid endpoints")
-                    return True
-                else:
-                    self.log_test("404 Error Handling", False, "Should return success=false for 404", data)
-            else:
-                self.log_test("404 Error Handling", False, f"Expected 404, got {response.status_code}", response.text)
-        except Exception as e:
-            self.log_test("404 Error Handling", False, "Request failed", str(e))
-        return False
-    
-    def test_rate_limiting(self):
-        """Test rate limiting on contact form (basic test)"""
-        try:
-            # Make multiple rapid requests to test rate limiting
-            contact_data = {
-                "name": "Rate Test",
-                "email": "ratetest@example.com",
-                "message": "Testing rate limiting"
-            }
-            
-            responses = []
-            for i in range(3):
-                response = self.session.post(f"{API_BASE}/contact", json=contact_data, timeout=10)
-                responses.append(response.status_code)
-            
-            # Check if any requests were rate limited (429) or if all succeeded
-            if 429 in responses:
-                self.log_test("Rate Limiting", True, "Rate limiting is working")
-                return True
-            elif all(status in [201, 400] for status in responses):
-                self.log_test("Rate Limiting", True, "Rate limiting configured (may not trigger in test)")
-                return True
-            else:
-                self.log_test("Rate Limiting", False, f"Unexpected response codes: {responses}")
-        except Exception as e:
-            self.log_test("Rate Limiting", False, "Request failed", str(e))
-        return False
-    
-    def run_all_tests(self):
-        """Run all tests in sequence"""
-        print("=" * 80)
-        print("PORTFOLIO BACKEND API COMPREHENSIVE TESTING")
-        print("=" * 80)
-        print(f"Testing API at: {API_BASE}")
-        print(f"Timestamp: {datetime.now().isoformat()}")
-        print("=" * 80)
-        
-        # Basic connectivity tests
-        print("\n🔍 BASIC CONNECTIVITY TESTS")
-        print("-" * 40)
-        self.test_health_check()
-        self.test_root_endpoint()
-        
-        # Authentication tests
-        print("\n🔐 AUTHENTICATION TESTS")
-        print("-" * 40)
-        self.test_admin_login_correct()
-        self.test_admin_login_incorrect()
-        self.test_jwt_verification()
-        self.test_protected_route_without_auth()
-        
-        # Public API tests
-        print("\n🌐 PUBLIC API TESTS")
-        print("-" * 40)
-        self.test_personal_info()
-        self.test_projects_all()
-        self.test_projects_ai_filter()
-        self.test_projects_web_filter()
-        self.test_tech_stack()
-        self.test_portfolio_stats()
-        
-        # Contact form tests
-        print("\n📧 CONTACT FORM TESTS")
-        print("-" * 40)
-        self.test_contact_form_valid()
-        self.test_contact_form_invalid()
-        self.test_rate_limiting()
-        
-        # Admin protected endpoint tests
-        print("\n👨‍💼 ADMIN PROTECTED ENDPOINT TESTS")
-        print("-" * 40)
-        self.test_admin_dashboard()
-        self.test_admin_projects()
-        self.test_admin_personal()
-        self.test_admin_tech_stack()
-        
-        # Error handling tests
-        print("\n⚠️ ERROR HANDLING TESTS")
-        print("-" * 40)
-        self.test_404_endpoint()
-        
-        # Summary
-        print("\n" + "=" * 80)
-        print("TEST SUMMARY")
-        print("=" * 80)
-        
-        passed = sum(1 for result in self.test_results if result['success'])
-        failed = len(self.test_results) - passed
-        
-        print(f"Total Tests: {len(self.test_results)}")
-        print(f"Passed: {passed}")
-        print(f"Failed: {failed}")
-        print(f"Success Rate: {(passed/len(self.test_results)*100):.1f}%")
-        
-        if failed > 0:
-            print(f"\n❌ FAILED TESTS ({failed}):")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"  - {result['test']}: {result['message']}")
-        
-        print("\n" + "=" * 80)
-        return passed, failed
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Portfolio backend API tests")
+    parser.add_argument('--target', default=os.environ.get('BACKEND_URL'),
+                        help="Backend base URL, without /api (default: $BACKEND_URL or the preview host)")
+    parser.add_argument('--standin', action='store_true',
+                        help="Start the in-memory stand-in backend on loopback and test against it")
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help="Write per-endpoint latency histograms as JSON")
+    parser.add_argument('--metrics-prom', metavar='PATH',
+                        help="Write per-endpoint latency histograms in Prometheus text format")
+    parser.add_argument('--metrics-token', default=os.environ.get('METRICS_TOKEN'),
+                        help="METRICS_TOKEN of the target, for scraping /api/metrics (default: admin login)")
+    parser.add_argument('--metrics-url', metavar='URL',
+                        help="Server metrics served on an internal METRICS_PORT, "
+                             "e.g. http://127.0.0.1:9464/api/metrics (default: <target>/api/metrics)")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="Functional tests run concurrently on this many threads; 1 runs them in order (default: 8)")
+    parser.add_argument('--load', action='store_true',
+                        help="Run the load generator instead of the functional tests")
+    parser.add_argument('--concurrency', type=int, default=10,
+                        help="Number of concurrent load workers (default: 10)")
+    parser.add_argument('--duration', type=float, default=30,
+                        help="Load test duration in seconds (default: 30)")
+    parser.add_argument('--tests', nargs='+', metavar='TEST', choices=sorted({**LOAD_TESTS, **ADMIN_LOAD_TESTS}),
+                        help="Test calls to replay under load, e.g. test_projects_all "
+                             "(default: public read endpoints)")
+    parser.add_argument('--include-admin', action='store_true',
+                        help="Also replay the authenticated admin read endpoints under load")
+    parser.add_argument('--db-metrics', action='store_true',
+                        help="In --load mode, sample the MongoDB pool from /api/admin/db-metrics and report it "
+                             "next to client latency")
+    parser.add_argument('--db-metrics-interval', type=float, default=1.0, metavar='SECONDS',
+                        help="Seconds between db-metrics samples (default: 1)")
+    parser.add_argument('--standin-pool-size', type=int, default=100,
+                        help="Connection pool size of the stand-in store (default: 100, the driver default)")
+    parser.add_argument('--bench', action='store_true',
+                        help="Benchmark every endpoint and fail on regressions against the baseline")
+    parser.add_argument('--bench-cache', action='store_true',
+                        help="Compare cache-miss and cache-hit latency of the cached portfolio reads")
+    parser.add_argument('--bench-etag', action='store_true',
+                        help="Compare full GETs with If-None-Match revalidations of the portfolio reads")
+    parser.add_argument('--bench-db', action='store_true',
+                        help="Compare DB round-trips and latency of the aggregated and legacy dashboard/stats counts")
+    parser.add_argument('--bench-auth', action='store_true',
+                        help="Compare admin-route latency with and without the verified-user cache "
+                             "(with --standin; otherwise measures the target as configured)")
+    parser.add_argument('--standin-processes', type=int, default=2,
+                        help="Extra stand-in server processes sharing the rate limit counters, which "
+                             "test_rate_limiting spreads its bursts over (default: 2)")
+    parser.add_argument('--rate-limit-targets', nargs='+', metavar='URL', default=[],
+                        help="Other instances of the target backend (base URLs, without /api) that "
+                             "test_rate_limiting spreads its bursts over")
+    parser.add_argument('--standin-db-latency', type=float, default=0.0, metavar='MS',
+                        help="Simulated MongoDB round-trip time of the stand-in store (default: 0)")
+    parser.add_argument('--bench-ratelimit', action='store_true',
+                        help="Compare read throughput with the general limiter off, in memory and with shared "
+                             "counters written every hit or in batches (with --standin; uses --concurrency, "
+                             "--duration, --rounds and --standin-db-latency)")
+    parser.add_argument('--rounds', type=int, default=3,
+                        help="Times each target is loaded in --bench-ratelimit and --bench-logging mode, to "
+                             "show the run-to-run spread (default: 3)")
+    parser.add_argument('--bench-pagination', action='store_true',
+                        help="Compare deep-page latency of offset and keyset pagination of the admin messages")
+    parser.add_argument('--bench-export', action='store_true',
+                        help="Compare a streamed NDJSON/CSV export of the contact messages with paginated reads")
+    parser.add_argument('--bench-workers', type=int, nargs='+', metavar='N',
+                        help="Start the server with each of these CLUSTER_WORKERS counts in turn and compare "
+                             "read throughput (the stand-in with --standin, otherwise --server-cmd)")
+    parser.add_argument('--server-cmd',
+                        help="Command that starts the real server for --bench-workers and --bench-logging, run "
+                             "with PORT and CLUSTER_WORKERS or LOG_LEVEL set, e.g. 'node backend/cluster.js'")
+    parser.add_argument('--client-processes', type=int,
+                        help="Load client processes in --bench-workers mode (default: one per core)")
+    parser.add_argument('--bench-bulk', action='store_true',
+                        help="Compare importing projects and tech stack one request per item with the bulk endpoints")
+    parser.add_argument('--bulk-items', type=int, default=1000,
+                        help="Projects and tech stack items each imported per method in --bench-bulk mode "
+                             "(default: 1000)")
+    parser.add_argument('--bench-bundle', action='store_true',
+                        help="First-paint latency and bytes of /portfolio/bundle against the four separate requests")
+    parser.add_argument('--bench-images', action='store_true',
+                        help="Check the width variants of uploaded images and the bytes srcset saves per screen")
+    parser.add_argument('--image-format', choices=['webp', 'avif'], default='webp',
+                        help="Modern format --bench-images expects next to jpg/png: the server's IMAGE_MODERN_FORMAT "
+                             "(default: webp)")
+    parser.add_argument('--bench-search', action='store_true',
+                        help="Compare indexed project search with filtering the full list in the client")
+    parser.add_argument('--search-projects', type=int, default=50000,
+                        help="Projects in the generated --bench-search catalogue (default: 50000)")
+    parser.add_argument('--bench-lean', action='store_true',
+                        help="Compare hydrated and lean reads of the list routes: server CPU, size and throughput")
+    parser.add_argument('--lean-items', type=int, default=2000,
+                        help="Projects and tech stack items generated for --bench-lean (default: 2000)")
+    parser.add_argument('--bench-logging', action='store_true',
+                        help="Contact form throughput with debug logging off and on: starts --server-cmd with each "
+                             "LOG_LEVEL and CONTACT_LOG_SAMPLE_RATE (uses --concurrency, --duration and --rounds); "
+                             "with --standin only the log volume is reported")
+    parser.add_argument('--log-sample-rate', type=float, default=0.1,
+                        help="CONTACT_LOG_SAMPLE_RATE of the sampled stand-in in --bench-logging (default: 0.1)")
+    parser.add_argument('--bench-spam', action='store_true',
+                        help="Replay identical contact submissions with and without the duplicate check "
+                             "(uses --concurrency)")
+    parser.add_argument('--spam-bots', type=int, default=20,
+                        help="Senders in --bench-spam mode, each with its own IP and message (default: 20)")
+    parser.add_argument('--spam-replays', type=int, default=25,
+                        help="Times each --bench-spam sender submits its message (default: 25)")
+    parser.add_argument('--seed-contacts', type=int, default=100000,
+                        help="Contact messages loaded into the stand-in for --bench-pagination and --bench-export "
+                             "(default: 100000)")
+    parser.add_argument('--page-size', type=int, default=20,
+                        help="Messages per page in --bench-pagination mode (default: 20)")
+    parser.add_argument('--bench-email', action='store_true',
+                        help="Time contact submissions and check delivery through a local fake Resend API "
+                             "(a real server must run with RESEND_BASE_URL set to it)")
+    parser.add_argument('--resend-port', type=int, default=0,
+                        help="Port of the fake Resend API in --bench-email mode (default: any free port)")
+    parser.add_argument('--resend-latency', type=float, default=0.15, metavar='SECONDS',
+                        help="Delay of each fake Resend API call (default: 0.15)")
+    parser.add_argument('--delivery-timeout', type=float, default=30, metavar='SECONDS',
+                        help="How long to wait for queued emails to be delivered (default: 30)")
+    parser.add_argument('--iterations', type=int,
+                        help="Timed iterations per endpoint in --bench modes (default: 200 for --bench, otherwise 50)")
+    parser.add_argument('--warmup', type=int, default=20,
+                        help="Untimed warm-up iterations per endpoint in --bench mode (default: 20)")
+    parser.add_argument('--baseline', default='bench_baseline.json', metavar='PATH',
+                        help="Baseline file keyed by git commit (default: bench_baseline.json)")
+    parser.add_argument('--baseline-commit', metavar='COMMIT',
+                        help="Compare against this commit's results (default: most recent other commit)")
+    parser.add_argument('--threshold', type=float, default=15.0, metavar='PCT',
+                        help="Fail when a gated p50 or p99 grows by more than PCT percent (default: 15)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help="Ignore regressions smaller than this many milliseconds (default: 0.5)")
+    parser.add_argument('--gate', nargs='+', metavar='ENDPOINT',
+                        help="Endpoints whose regressions fail the run, e.g. 'GET /api/portfolio/projects' "
+                             "(default: the projects and dashboard reads)")
+    parser.add_argument('--no-save', action='store_true',
+                        help="Compare against the baseline without recording this run")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Record this run even if it fails (by default only passing runs are recorded)")
+    return parser.parse_args(argv)
 
 def main():
     """Main test execution"""
-    tester = PortfolioAPITester()
-    passed, failed = tester.run_all_tests()
-    
+    args = parse_args()
+
+    fake_resend = None
+    if args.bench_email:
+        from fake_resend import FakeResend
+        fake_resend = FakeResend(port=args.resend_port, latency=args.resend_latency)
+        fake_resend.start()
+
+    standins = []
+    processes = []
+    benchmarking = args.load or any(value for name, value in vars(args).items() if name.startswith('bench'))
+    # Rate limit counters the stand-in shares with the stand-in processes below
+    rate_limit_db = os.path.join(tempfile.mkdtemp(prefix='standin-'), 'rate-limits.db')
+
+    def start_standin(**options):
+        from standin.app import StandinApp
+        from standin.ratelimit import SqliteRateLimitStore
+        from standin.server import StandinBackend
+        options.setdefault('resend_url', fake_resend.url if fake_resend else None)
+        # Short retry backoff, so the email retry check finishes quickly
+        options.setdefault('outbox_options', {'retry_base': 0.2})
+        # Benchmarks send far more than 100 portfolio requests per 15 minutes: the
+        # general limiter still counts every request, against a quota no run reaches.
+        # They also compare against the old read paths.
+        if benchmarking:
+            options.setdefault('general_rate_max', BENCH_RATE_MAX)
+            options.setdefault('hydrated_read_param', True)
+            options.setdefault('legacy_counts_param', True)
+        options.setdefault('rate_limit_store', SqliteRateLimitStore(rate_limit_db, args.standin_db_latency / 1000))
+        app = StandinApp(ADMIN_EMAIL, ADMIN_PASSWORD, db_latency=args.standin_db_latency / 1000,
+                         db_pool_size=args.standin_pool_size, **options)
+        standins.append(StandinBackend(app=app))
+        return f"{standins[-1].start()}/api"
+
+    def start_standin_process():
+        # Only the first line is read, so keep the logs from filling the pipe
+        process = subprocess.Popen([sys.executable, STANDIN_SCRIPT, '--port', '0', '--rate-limit-db', rate_limit_db,
+                                    '--log-level', 'warn'], stdout=subprocess.PIPE, text=True)
+        processes.append(process)
+        # "Stand-in backend listening on <url>/api"
+        return process.stdout.readline().split()[-1]
+
+    log_files = []
+
+    def logging_standins(sample_rate):
+        """(label, LogOutput, StandinApp options) of the --bench-logging stand-ins, each logging to its own file"""
+        from standin.logs import LogOutput
+        for label, env in logging_configs(sample_rate):
+            log_file = tempfile.NamedTemporaryFile('w', prefix='standin-log-', suffix='.jsonl', delete=False)
+            log_files.append(log_file)
+            yield label, LogOutput(log_file), {'log_level': env['LOG_LEVEL'],
+                                               'contact_log_sample_rate': float(env.get('CONTACT_LOG_SAMPLE_RATE', 1))}
+
+    def rate_limit_standins():
+        """(label, StandinApp options) of the --bench-ratelimit stand-ins"""
+        from standin.ratelimit import MemoryRateLimitStore, SqliteRateLimitStore
+        latency = args.standin_db_latency / 1000
+        yield 'off', {'general_rate_max': None}
+        # A single process, the default without CLUSTER_WORKERS
+        yield 'memory', {'rate_limit_store': MemoryRateLimitStore()}
+        # Shared counters written before every request goes on (the contact limiter's way)
+        yield 'shared, every hit', {'rate_limit_store': SqliteRateLimitStore(rate_limit_db, latency),
+                                    'general_rate_sync_hits': 1}
+        # The general limiter's shared counters under CLUSTER_WORKERS
+        yield 'shared, batched', {'rate_limit_store': SqliteRateLimitStore(rate_limit_db, latency)}
+
+    targets = None
+    rate_limit_targets = [f"{url.rstrip('/')}/api" for url in args.rate_limit_targets]
+    try:
+        if args.standin:
+            seeded = args.bench_pagination or args.bench_export or args.bench_lean
+            api_base = start_standin(seed_contacts=args.seed_contacts if seeded else 0)
+            # Benchmarks that compare two configurations get a second stand-in
+            if args.bench_email:
+                targets = [('inline', start_standin(email_delivery='inline')), ('outbox', api_base)]
+            elif args.bench_auth:
+                targets = [('no cache', start_standin(auth_cache_ttl=0)), ('cache', api_base)]
+            elif args.bench_spam:
+                # 'on + stored' also searches the stored contacts, as cluster workers do
+                targets = [('off', start_standin(contact_duplicate_window=0), False), ('on', api_base, True),
+                           ('on + stored', start_standin(contact_duplicate_check_stored=True), True)]
+            elif args.bench_ratelimit:
+                targets = [(label, start_standin(**options),
+                            standins[-1].app.general_rate_store if standins[-1].app.general_limiter else None)
+                           for label, options in rate_limit_standins()]
+            elif args.bench_images:
+                # PNG alone when the stand-in has no encoder for the other formats
+                from standin.constants import IMAGE_PRESETS
+                targets = [('target', api_base, {kind: standins[-1].app.images.formats(preset)
+                                                 for kind, preset in IMAGE_PRESETS.items()})]
+            elif args.bench_logging and not args.server_cmd:
+                targets = [(label, start_standin(log_output=output, **options), output)
+                           for label, output, options in logging_standins(args.log_sample_rate)]
+            elif not benchmarking:
+                rate_limit_targets = [start_standin_process() for _ in range(args.standin_processes)]
+        else:
+            api_base = f"{args.target.rstrip('/')}/api" if args.target else API_BASE
+
+        failed = run(args, api_base, targets=targets or [('target', api_base)], fake_resend=fake_resend,
+                     rate_limit_targets=[api_base] + rate_limit_targets)
+    finally:
+        for standin in standins:
+            standin.stop()
+        for process in processes:
+            process.terminate()
+            process.wait()
+        for log_file in log_files:
+            log_file.close()
+            os.unlink(log_file.name)
+        if fake_resend:
+            fake_resend.stop()
+
     # Exit with appropriate code
     sys.exit(0 if failed == 0 else 1)
 
+def run(args, api_base, targets=None, fake_resend=None, rate_limit_targets=None):
+    """Run the mode selected on the command line and return the failure count"""
+    benchmark = None
+    if args.bench_ratelimit:
+        benchmark = RateLimitBenchmark(targets, concurrency=args.concurrency, duration=args.duration,
+                                       rounds=args.rounds, store_latency=args.standin_db_latency / 1000)
+    elif args.bench_email:
+        benchmark = EmailOutboxBenchmark(targets, fake_resend, iterations=args.iterations or 50,
+                                         delivery_timeout=args.delivery_timeout)
+    elif args.bench_pagination:
+        benchmark = PaginationBenchmark(api_base, iterations=args.iterations or 20, page_size=args.page_size)
+    elif args.bench_export:
+        benchmark = ExportBenchmark(api_base)
+    elif args.bench_workers:
+        if not args.standin and not args.server_cmd:
+            print("❌ --bench-workers starts its own servers: pass --standin or --server-cmd")
+            return 1
+        # Stand-in workers don't share logins, so only the public reads are replayed
+        benchmark = WorkerScalingBenchmark(args.bench_workers, None if args.standin else args.server_cmd,
+                                           args.client_processes,
+                                           concurrency=args.concurrency, duration=args.duration,
+                                           tests={name: LOAD_TESTS[name] for name in args.tests or LOAD_TESTS
+                                                  if name in LOAD_TESTS})
+    elif args.bench_bundle:
+        benchmark = PortfolioBundleBenchmark(api_base, iterations=args.iterations or 50)
+    elif args.bench_images:
+        # Only the stand-in says which formats it stores; Node always writes the modern one
+        formats = targets[0][2] if len(targets[0]) > 2 else None
+        benchmark = ImageVariantBenchmark(api_base, include_profile=args.standin, modern_format=args.image_format,
+                                          formats=formats)
+    elif args.bench_search:
+        benchmark = ProjectSearchBenchmark(api_base, projects=args.search_projects, iterations=args.iterations or 20)
+    elif args.bench_lean:
+        benchmark = LeanReadBenchmark(api_base, items=args.lean_items, iterations=args.iterations or 50,
+                                      concurrency=args.concurrency, compare_cpu=not args.standin)
+    elif args.bench_logging:
+        if not args.standin and not args.server_cmd:
+            print("❌ --bench-logging starts its own servers: pass --server-cmd, or --standin for log volume only")
+            return 1
+        benchmark = ContactLoggingBenchmark(None if args.server_cmd else targets, server_cmd=args.server_cmd,
+                                            sample_rate=args.log_sample_rate, concurrency=args.concurrency,
+                                            duration=args.duration, rounds=args.rounds)
+    elif args.bench_spam:
+        benchmark = ContactSpamBenchmark(targets, bots=args.spam_bots, replays=args.spam_replays,
+                                         concurrency=args.concurrency)
+    elif args.bench_bulk:
+        benchmark = BulkImportBenchmark(api_base, items=args.bulk_items)
+    elif args.bench_auth:
+        benchmark = AuthCacheBenchmark(targets, iterations=args.iterations or 50)
+    elif args.bench:
+        benchmark = BenchmarkRunner(
+            api_base=api_base,
+            iterations=args.iterations or 200,
+            warmup=args.warmup,
+            baseline_path=args.baseline,
+            threshold=args.threshold,
+            min_delta_ms=args.min_delta_ms,
+            gated=args.gate,
+            baseline_commit=args.baseline_commit,
+            save=not args.no_save,
+            save_failing=args.save_baseline
+        )
+    elif args.bench_cache:
+        benchmark = CacheBenchmark(api_base, iterations=args.iterations or 50)
+    elif args.bench_etag:
+        benchmark = RevalidationBenchmark(api_base, iterations=args.iterations or 50)
+    elif args.bench_db:
+        benchmark = SummaryAggregationBenchmark(api_base, iterations=args.iterations or 50)
+    if benchmark:
+        failures = benchmark.run()
+        benchmark.recorder.export(args.metrics_json, args.metrics_prom, api_base)
+        return failures
+
+    if args.load:
+        tests = None
+        if args.tests:
+            known = {**LOAD_TESTS, **ADMIN_LOAD_TESTS}
+            tests = {name: known[name] for name in args.tests}
+        generator = LoadGenerator(
+            api_base=api_base,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            tests=tests,
+            include_admin=args.include_admin
+        )
+        sampler = PoolSampler(api_base, args.db_metrics_interval) if args.db_metrics else None
+        if sampler and not sampler.start():
+            return sampler.report({})
+        server_metrics = ServerMetricsScraper(api_base, args.metrics_token, args.metrics_url)
+        server_before = server_metrics.scrape()
+        try:
+            merged = generator.run()
+        finally:
+            if sampler:
+                sampler.stop()
+        _, errors = generator.report(merged)
+        server_metrics.report(server_before, server_metrics.scrape(), generator.recorder)
+        if sampler:
+            errors += sampler.report(generator.timeline)
+        generator.recorder.export(args.metrics_json, args.metrics_prom, api_base)
+        return errors
+
+    tester = PortfolioAPITester(api_base)
+    tester.rate_limit_targets = rate_limit_targets or [api_base]
+    tester.server_metrics = ServerMetricsScraper(api_base, args.metrics_token, args.metrics_url)
+    passed, failed = tester.run_all_tests(args.workers)
+    tester.recorder.export(args.metrics_json, args.metrics_prom, api_base)
+    return failed
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
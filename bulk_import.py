@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Bulk import client for POST /api/admin/projects/bulk and /api/admin/tech-stack/bulk.
+A catalogue of projects and tech stack items goes in as a few validated batches,
+each written with one bulkWrite, instead of one request and one insert per item
+the way scripts/seedDatabase.js does it.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+from contact_export import login
+
+# Same limit as MAX_BATCH_ITEMS in middleware/validation.js
+MAX_BATCH_ITEMS = 500
+
+COLLECTIONS = {
+    'projects': 'admin/projects/bulk',
+    'techStack': 'admin/tech-stack/bulk',
+}
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def apply_batch(session, api_base, collection, create=(), update=(), delete=()):
+    """Send one bulk request for collection ('projects' or 'techStack'); returns its data.
+
+    Raises requests.HTTPError if the batch is refused; nothing of a refused batch is written.
+    """
+    body = {key: list(items) for key, items in (('create', create), ('update', update), ('delete', delete))
+            if items}
+    response = session.post(f"{api_base}/{COLLECTIONS[collection]}", json=body, timeout=60)
+    response.raise_for_status()
+    return response.json()['data']
+
+def import_catalogue(session, api_base, projects=(), tech_stack=(), batch_size=MAX_BATCH_ITEMS):
+    """Create projects and tech stack items in batches of batch_size; returns the created ids
+    as {'projects': [...], 'techStack': [...]}. Batches that went in before a refused one stay."""
+    if not 0 < batch_size <= MAX_BATCH_ITEMS:
+        raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_ITEMS}")
+    created = {}
+    for collection, items in (('projects', list(projects)), ('techStack', list(tech_stack))):
+        created[collection] = []
+        for batch in chunks(items, batch_size):
+            created[collection].extend(apply_batch(session, api_base, collection, create=batch)['created'])
+    return created
+
+def delete_all(session, api_base, collection, ids, batch_size=MAX_BATCH_ITEMS):
+    """Delete the given ids in batches; returns how many were deleted"""
+    return sum(apply_batch(session, api_base, collection, delete=batch)['deleted']
+               for batch in chunks(list(ids), batch_size))
+
+def main():
+    """Import a JSON catalogue ({"projects": [...], "techStack": [...]}, the shape of
+    mockData in scripts/seedDatabase.js) into a running backend"""
+    parser = argparse.ArgumentParser(description="Bulk import projects and tech stack into the portfolio backend")
+    parser.add_argument('catalogue', help="JSON file with projects and/or techStack arrays, or - for stdin")
+    parser.add_argument('--target', default=os.environ.get('BACKEND_URL', 'http://127.0.0.1:8001'),
+                        help="Backend base URL, without /api (default: $BACKEND_URL or http://127.0.0.1:8001)")
+    parser.add_argument('--email', default=os.environ.get('ADMIN_EMAIL'), help="Admin email (default: $ADMIN_EMAIL)")
+    parser.add_argument('--password', default=os.environ.get('ADMIN_PASSWORD'),
+                        help="Admin password (default: $ADMIN_PASSWORD)")
+    parser.add_argument('--batch-size', type=int, default=MAX_BATCH_ITEMS,
+                        help=f"Items per request (default and maximum: {MAX_BATCH_ITEMS})")
+    args = parser.parse_args()
+    if not args.email or not args.password:
+        parser.error("admin credentials are required (--email/--password or ADMIN_EMAIL/ADMIN_PASSWORD)")
+
+    if args.catalogue == '-':
+        catalogue = json.load(sys.stdin)
+    else:
+        with open(args.catalogue, encoding='utf-8') as handle:
+            catalogue = json.load(handle)
+
+    api_base = f"{args.target.rstrip('/')}/api"
+    session = requests.Session()
+    login(session, api_base, args.email, args.password)
+
+    started = time.time()
+    try:
+        created = import_catalogue(session, api_base, catalogue.get('projects', []),
+                                   catalogue.get('techStack', []), args.batch_size)
+    except requests.HTTPError as error:
+        print(f"Import refused: {error.response.status_code} {error.response.text}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Imported {len(created['projects'])} projects and {len(created['techStack'])} tech stack items "
+          f"in {time.time() - started:.2f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Streaming client for GET /api/admin/contact/export.
+Rows are parsed and handed over as they arrive off the socket, so pulling the
+whole contact history needs one request and constant memory instead of
+thousands of paginated round-trips.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import requests
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+def login(session, api_base, email, password):
+    """Authenticate session with the admin credentials"""
+    response = session.post(f"{api_base}/auth/login", json={'email': email, 'password': password}, timeout=10)
+    response.raise_for_status()
+    session.headers['Authorization'] = f"Bearer {response.json()['token']}"
+
+def stream_contacts(session, api_base, export_format='ndjson', **filters):
+    """Yield contact messages one by one as the export streams in.
+
+    filters are passed through as query parameters (status, since, until, fields).
+    CSV rows come back as dicts of strings. Raises requests.HTTPError if the export
+    is refused, and requests.exceptions.ChunkedEncodingError if it is cut short.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"export_format must be one of {', '.join(EXPORT_FORMATS)}")
+    params = {key: value for key, value in filters.items() if value is not None}
+    params['format'] = export_format
+
+    with session.get(f"{api_base}/admin/contact/export", params=params, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        # Read through urllib3 so Content-Encoding is undone while streaming
+        response.raw.decode_content = True
+        text = io.TextIOWrapper(response.raw, encoding='utf-8', newline='')
+        if export_format == 'csv':
+            yield from csv.DictReader(text)
+        else:
+            for line in text:
+                if line.strip():
+                    yield json.loads(line)
+
+def main():
+    """Export contact messages to a file or stdout, reporting progress on stderr"""
+    parser = argparse.ArgumentParser(description="Stream contact messages out of the portfolio backend")
+    parser.add_argument('--target', default=os.environ.get('BACKEND_URL', 'http://127.0.0.1:8001'),
+                        help="Backend base URL, without /api (default: $BACKEND_URL or http://127.0.0.1:8001)")
+    parser.add_argument('--email', default=os.environ.get('ADMIN_EMAIL'), help="Admin email (default: $ADMIN_EMAIL)")
+    parser.add_argument('--password', default=os.environ.get('ADMIN_PASSWORD'),
+                        help="Admin password (default: $ADMIN_PASSWORD)")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+    parser.add_argument('--status', choices=('new', 'read', 'replied'))
+    parser.add_argument('--since', help="Only messages created at or after this ISO date")
+    parser.add_argument('--until', help="Only messages created before this ISO date")
+    parser.add_argument('--fields', help="Comma-separated fields to export, e.g. _id,name,email,createdAt")
+    parser.add_argument('--output', help="Write rows here instead of stdout")
+    args = parser.parse_args()
+    if not args.email or not args.password:
+        parser.error("admin credentials are required (--email/--password or ADMIN_EMAIL/ADMIN_PASSWORD)")
+
+    api_base = f"{args.target.rstrip('/')}/api"
+    session = requests.Session()
+    login(session, api_base, args.email, args.password)
+
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    statuses = Counter()
+    started = time.time()
+    writer = None
+    try:
+        for count, row in enumerate(stream_contacts(session, api_base, args.format, status=args.status,
+                                                    since=args.since, until=args.until, fields=args.fields), 1):
+            if args.format == 'csv':
+                if writer is None:
+                    writer = csv.DictWriter(out, fieldnames=list(row), lineterminator='\n')
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                out.write(json.dumps(row) + '\n')
+            statuses[row.get('status', 'n/a')] += 1
+            if count % 10000 == 0:
+                print(f"{count} rows...", file=sys.stderr)
+    finally:
+        if args.output:
+            out.close()
+
+    elapsed = time.time() - started
+    total = sum(statuses.values())
+    summary = ', '.join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+    print(f"Exported {total} messages in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s) "
+          f"[{summary}]", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Local fake of the Resend email API (POST /emails and POST /emails/batch).
+Point the backend at it with RESEND_BASE_URL, or hand its URL to the stand-in, and
+the harness can check contact-form latency and eventual delivery without sending
+real mail. Provider latency and failures are configurable.
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+class FakeResendHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        # Not part of the Resend API: lets the harness inspect what was delivered
+        if urlsplit(self.path).path == '/emails':
+            self.send_json(200, {'data': self.server.fake.delivered()})
+        else:
+            self.send_json(404, {'name': 'not_found', 'message': 'Not found'})
+
+    def do_DELETE(self):
+        if urlsplit(self.path).path == '/emails':
+            self.server.fake.reset()
+            self.send_json(200, {'data': []})
+        else:
+            self.send_json(404, {'name': 'not_found', 'message': 'Not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            self.send_json(400, {'name': 'validation_error', 'message': 'Invalid JSON body'})
+            return
+
+        path = urlsplit(self.path).path
+        if path == '/emails' and isinstance(body, dict):
+            emails = [body]
+        elif path == '/emails/batch' and isinstance(body, list) and 0 < len(body) <= 100:
+            emails = body
+        else:
+            self.send_json(422, {'name': 'validation_error', 'message': 'Expected an email or a batch of 1-100 emails'})
+            return
+
+        status, payload = self.server.fake.accept(emails)
+        if status == 200 and path == '/emails':
+            payload = payload['data'][0]
+        self.send_json(status, payload)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeResend:
+    """Fake Resend API on a loopback ThreadingHTTPServer in a background thread"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0):
+        self.latency = latency
+        self.lock = threading.Condition()
+        self.emails = []
+        self.calls = 0
+        self.failures_left = 0
+        self.server = ThreadingHTTPServer((host, port), FakeResendHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fake-resend', daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def fail_next(self, count):
+        """Answer the next count API calls with HTTP 500"""
+        with self.lock:
+            self.failures_left = count
+
+    def accept(self, emails):
+        """Record a send call after the configured latency; returns (status, payload)"""
+        time.sleep(self.latency)
+        with self.lock:
+            self.calls += 1
+            if self.failures_left > 0:
+                self.failures_left -= 1
+                return 500, {'name': 'internal_server_error', 'message': 'Fake Resend failure'}
+            sent = [dict(email, id=str(uuid.uuid4()), receivedAt=time.time()) for email in emails]
+            self.emails.extend(sent)
+            self.lock.notify_all()
+        return 200, {'data': [{'id': email['id']} for email in sent]}
+
+    def delivered(self):
+        with self.lock:
+            return list(self.emails)
+
+    def reset(self):
+        with self.lock:
+            self.emails = []
+            self.calls = 0
+            self.failures_left = 0
+
+    def wait_for(self, count, timeout):
+        """Block until at least count emails were delivered; returns whether they were"""
+        deadline = time.time() + timeout
+        with self.lock:
+            while len(self.emails) < count:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.lock.wait(remaining)
+            return True
+
+def main():
+    """Serve the fake Resend API in the foreground"""
+    parser = argparse.ArgumentParser(description="Local fake of the Resend email API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Seconds to wait before answering each send call (default: 0)")
+    args = parser.parse_args()
+
+    fake = FakeResend(args.host, args.port, args.latency)
+    print(f"Fake Resend API listening on {fake.url} (set RESEND_BASE_URL to this)")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -40,9 +40,9 @@ const Home = () => {
   useEffect(() => {
     const fetchPortfolioData = async () => {
       try {
-        const [personalResponse, projectsResponse, techStackResponse, statsResponse] = await Promise.all([
+        // Projects searches and pages its own list
+        const [personalResponse, techStackResponse, statsResponse] = await Promise.all([
           portfolioAPI.getPersonal(),
-          portfolioAPI.getProjects(),
           portfolioAPI.getTechStack(),
           portfolioAPI.getStats()
         ]);
@@ -57,7 +57,6 @@ const Home = () => {
               twitter: "https://x.com/NaveenAgar47373"
             }
           },
-          projects: projectsResponse.data.data,
           techStack: techStackResponse.data.data,
           stats: statsResponse.data.data
         });
@@ -70,7 +69,6 @@ const Home = () => {
             title: 'Front-End Web Developer',
             tagline: 'Building modern, responsive web experiences with clean code and creative design'
           },
-          projects: [],
           techStack: [],
           stats: {}
         });
@@ -116,7 +114,7 @@ const Home = () => {
         <Hero personalData={portfolioData?.personal} />
         <About personalData={portfolioData?.personal} statsData={portfolioData?.stats} />
         <TechStack techStackData={portfolioData?.techStack} />
-        <Projects projectsData={portfolioData?.projects} />
+        <Projects />
         <Contact />
       </main>
       <Footer personalData={portfolioData?.personal} />
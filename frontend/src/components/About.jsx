@@ -4,6 +4,7 @@ import { Button } from './ui/button';
 import { Card, CardContent } from './ui/card';
 import { Progress } from './ui/progress';
 import { portfolioAPI } from '../services/api';
+import ResponsiveImage from './ResponsiveImage';
 
 const About = () => {
   const [personalData, setPersonalData] = useState(null);
@@ -124,13 +125,12 @@ const About = () => {
             <div className="relative group">
               <div className="w-80 h-80 mx-auto rounded-2xl overflow-hidden bg-gradient-to-br from-blue-500 to-purple-600 p-1">
                 <div className="w-full h-full rounded-2xl overflow-hidden">
-                  <img 
-                    src={displayData.profileImageUrl || "Naveen.jpg"}
+                  <ResponsiveImage
+                    src={displayData.profileImageUrl}
+                    imageSet={displayData.profileImageSet}
+                    fallbackSrc="Naveen.jpg"
                     alt={displayData.name || "Naveen Agarwal"}
                     className="w-full h-full object-cover transition-transform duration-300 group-hover:scale-105"
-                    onError={(e) => {
-                      e.target.src = "Naveen.jpg";
-                    }}
                   />
                 </div>
               </div>
@@ -1,40 +1,82 @@
 import React, { useState, useEffect } from 'react';
 import { portfolioAPI } from '../services/api';
-import { ExternalLink, Github, Filter } from 'lucide-react';
+import { ExternalLink, Github, Filter, Search, X } from 'lucide-react';
 import { Button } from './ui/button';
 import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
 import { Badge } from './ui/badge';
+import { Input } from './ui/input';
+import ResponsiveImage from './ResponsiveImage';
+
+// Projects per page of search results
+const PAGE_SIZE = 12;
 
 const Projects = () => {
   const [activeFilter, setActiveFilter] = useState('All');
   const [hoveredProject, setHoveredProject] = useState(null);
   const [projects, setProjects] = useState([]);
+  const [pagination, setPagination] = useState(null);
+  const [query, setQuery] = useState('');
+  const [searchTerm, setSearchTerm] = useState('');
+  const [techFilters, setTechFilters] = useState([]);
+  const [page, setPage] = useState(1);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
   const filters = ['All', 'AI', 'Web'];
 
+  // Search once typing pauses rather than on every keystroke
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setSearchTerm(query.trim());
+      setPage(1);
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [query]);
+
+  // The server filters, ranks and pages the projects; later pages are appended
   useEffect(() => {
+    let cancelled = false;
     const fetchProjects = async () => {
       setLoading(true);
       setError(null);
       try {
-        const response = await portfolioAPI.getProjects();
-        setProjects(response.data.data);
+        const response = await portfolioAPI.searchProjects({
+          q: searchTerm,
+          tech: techFilters,
+          category: activeFilter,
+          page,
+          limit: PAGE_SIZE
+        });
+        if (cancelled) return;
+        const { projects: found, pagination: pager } = response.data.data;
+        setProjects((previous) => (page === 1 ? found : [...previous, ...found]));
+        setPagination(pager);
       } catch (err) {
-        setError('Failed to load projects.');
+        if (!cancelled) setError('Failed to load projects.');
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     };
     fetchProjects();
-  }, []);
+    return () => {
+      cancelled = true;
+    };
+  }, [activeFilter, searchTerm, techFilters, page]);
 
-  const filteredProjects = Array.isArray(projects)
-    ? (activeFilter === 'All'
-      ? projects
-      : projects.filter(project => project.category === activeFilter))
-    : [];
+  const changeFilter = (filter) => {
+    setActiveFilter(filter);
+    setPage(1);
+  };
+
+  const toggleTech = (tech) => {
+    setTechFilters((previous) => (previous.includes(tech)
+      ? previous.filter((tag) => tag !== tech)
+      : [...previous, tech]));
+    setPage(1);
+  };
+
+  const searching = searchTerm !== '' || techFilters.length > 0;
+  const filteredProjects = Array.isArray(projects) ? projects : [];
 
   const featuredProjects = Array.isArray(filteredProjects)
     ? filteredProjects.filter(project => project.featured)
@@ -56,8 +98,10 @@ const Projects = () => {
       onMouseLeave={() => setHoveredProject(null)}
     >
       <div className="relative overflow-hidden rounded-t-lg">
-        <img
+        <ResponsiveImage
           src={project.image}
+          imageSet={project.imageSet}
+          sizes={featured ? '(min-width: 1024px) 33vw, 100vw' : undefined}
           alt={project.title}
           className={`w-full object-cover transition-transform duration-300 group-hover:scale-110 ${
             featured ? 'h-64' : 'h-48'
@@ -115,7 +159,12 @@ const Projects = () => {
                 <Badge
                   key={tech}
                   variant="secondary"
-                  className="bg-gray-700 text-gray-300 text-xs"
+                  className={`cursor-pointer text-xs ${
+                    techFilters.includes(tech)
+                      ? 'bg-blue-600 text-white'
+                      : 'bg-gray-700 text-gray-300 hover:bg-gray-600'
+                  }`}
+                  onClick={() => toggleTech(tech)}
                 >
                   {tech}
                 </Badge>
@@ -147,7 +196,8 @@ const Projects = () => {
     </Card>
   );
 
-  if (loading) {
+  // Only the first load replaces the section; later ones keep the search box in place
+  if (loading && pagination === null) {
     return (
       <section id="projects" className="py-20 bg-gray-800">
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 text-center text-white">
@@ -157,7 +207,7 @@ const Projects = () => {
     );
   }
 
-  if (error) {
+  if (error && pagination === null) {
     return (
       <section id="projects" className="py-20 bg-gray-800">
         <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 text-center text-red-500">
@@ -187,7 +237,7 @@ const Projects = () => {
             {filters.map((filter) => (
               <Button
                 key={filter}
-                onClick={() => setActiveFilter(filter)}
+                onClick={() => changeFilter(filter)}
                 variant={activeFilter === filter ? "default" : "ghost"}
                 className={`px-6 py-2 rounded-md transition-all duration-200 ${
                   activeFilter === filter
@@ -202,6 +252,36 @@ const Projects = () => {
           </div>
         </div>
 
+        {/* Search */}
+        <div className="max-w-xl mx-auto mb-12">
+          <div className="relative">
+            <Search className="absolute left-3 top-1/2 -translate-y-1/2 h-4 w-4 text-gray-400" />
+            <Input
+              type="search"
+              value={query}
+              onChange={(e) => setQuery(e.target.value)}
+              className="pl-10 bg-gray-700 border-gray-600 text-white placeholder-gray-400 focus:border-blue-500 focus:ring-blue-500"
+              placeholder="Search projects by name, description or technology"
+            />
+          </div>
+          {techFilters.length > 0 && (
+            <div className="flex flex-wrap items-center gap-2 mt-4">
+              <span className="text-sm text-gray-500">Using:</span>
+              {techFilters.map((tech) => (
+                <Badge
+                  key={tech}
+                  className="cursor-pointer bg-blue-600 text-white"
+                  onClick={() => toggleTech(tech)}
+                >
+                  {tech}
+                  <X className="h-3 w-3 ml-1" />
+                </Badge>
+              ))}
+            </div>
+          )}
+          {error && <p className="text-red-500 text-center mt-4">{error}</p>}
+        </div>
+
         {/* Projects Grid */}
         {filteredProjects.length > 0 ? (
           <div className="space-y-12">
@@ -237,8 +317,27 @@ const Projects = () => {
           </div>
         ) : (
           <div className="text-center py-16">
-            <p className="text-gray-400 text-lg mb-4">No projects available yet.</p>
-            <p className="text-gray-500">Check back soon for updates!</p>
+            {searching ? (
+              <p className="text-gray-400 text-lg mb-4">No projects match your search.</p>
+            ) : (
+              <>
+                <p className="text-gray-400 text-lg mb-4">No projects available yet.</p>
+                <p className="text-gray-500">Check back soon for updates!</p>
+              </>
+            )}
+          </div>
+        )}
+
+        {/* Next page of results */}
+        {pagination && page < pagination.pages && (
+          <div className="text-center mt-12">
+            <Button
+              className="bg-blue-600 hover:bg-blue-700 text-white px-8 py-3 rounded-lg"
+              disabled={loading}
+              onClick={() => setPage(page + 1)}
+            >
+              {loading ? 'Loading...' : `Load more (${pagination.total - filteredProjects.length} left)`}
+            </Button>
           </div>
         )}
 
@@ -0,0 +1,41 @@
+import React, { useState } from 'react';
+
+// <img> for an uploaded image: with its image set (the width variants stored
+// by the backend) the browser downloads the smallest file that fills the slot,
+// in the modern format when it supports it. The set is only used while it
+// still describes src, i.e. the URL wasn't replaced by hand since the upload.
+const ResponsiveImage = ({ src, imageSet, sizes, fallbackSrc, alt, ...props }) => {
+  const [failed, setFailed] = useState(false);
+
+  if (failed) {
+    return <img src={fallbackSrc} alt={alt} {...props} />;
+  }
+
+  const handleError = fallbackSrc ? () => setFailed(true) : undefined;
+
+  if (!imageSet || imageSet.src !== src) {
+    return <img src={src || fallbackSrc} alt={alt} onError={handleError} {...props} />;
+  }
+
+  return (
+    <picture>
+      {imageSet.sources.map((source) => (
+        <source key={source.type} type={source.type} srcSet={source.srcset} sizes={sizes || imageSet.sizes} />
+      ))}
+      <img
+        src={imageSet.src}
+        srcSet={imageSet.srcset}
+        sizes={sizes || imageSet.sizes}
+        width={imageSet.width}
+        height={imageSet.height}
+        alt={alt}
+        loading="lazy"
+        decoding="async"
+        onError={handleError}
+        {...props}
+      />
+    </picture>
+  );
+};
+
+export default ResponsiveImage;
@@ -26,6 +26,7 @@ const AdminProjectEdit = () => {
     category: 'Web',
     image: '',
     imagePublicId: '',
+    imageSet: null,
     techStack: '',
     githubUrl: '',
     liveUrl: '',
@@ -59,6 +60,7 @@ const AdminProjectEdit = () => {
             category: project.category || 'Web',
             image: project.image || '',
             imagePublicId: project.imagePublicId || '',
+            imageSet: project.imageSet || null,
             techStack: (project.techStack || []).join(', '),
             githubUrl: project.githubUrl || '',
             liveUrl: project.liveUrl || '',
@@ -135,7 +137,8 @@ const AdminProjectEdit = () => {
         setFormData(prev => ({
           ...prev,
           image: response.data.data.url,
-          imagePublicId: response.data.data.publicId
+          imagePublicId: response.data.data.publicId,
+          imageSet: response.data.data.imageSet
         }));
         toast({
           title: 'Project Image Uploaded',
@@ -51,9 +51,12 @@ export const portfolioAPI = {
   // Get personal information
   getPersonal: () => apiClient.get('/portfolio/personal'),
   
-  // Get all projects
-  getProjects: (category = '') => {
-    const params = category && category !== 'All' ? { category } : {};
+  // Search projects by keyword (title, description, tech) and tags, one page at a time
+  searchProjects: ({ q = '', tech = [], category = '', page = 1, limit = 12 } = {}) => {
+    const params = { page, limit };
+    if (q) params.q = q;
+    if (tech.length > 0) params.tech = tech.join(',');
+    if (category && category !== 'All') params.category = category;
     return apiClient.get('/portfolio/projects', { params });
   },
   
@@ -0,0 +1,7 @@
+"""
+Test and benchmark harness of the Portfolio backend, run through backend_test.py.
+
+config, timing and tester hold the target settings, the timed HTTP session and
+the functional tests. base has what every benchmark shares. The benchmarks
+themselves are grouped by the part of the API they measure.
+"""
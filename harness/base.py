@@ -0,0 +1,89 @@
+"""
+What the benchmarks share: the report every one of them prints, the admin
+login most of them need, and reading the server's X-DB-Roundtrips header.
+"""
+
+from .config import API_BASE
+from .tester import PortfolioAPITester
+from .timing import LatencyRecorder
+
+# Failures listed at the end of a report; the count covers the rest
+MAX_LISTED_FAILURES = 10
+
+def print_failures(failures):
+    if failures:
+        print(f"\n❌ {len(failures)} problem(s):")
+        for line in failures[:MAX_LISTED_FAILURES]:
+            print(f"  - {line}")
+
+def db_roundtrips(response):
+    """Database round-trips of a response (X-DB-Roundtrips, sent by servers run with
+    DB_ROUNDTRIP_HEADER=true), or None without the header"""
+    roundtrips = response.headers.get('X-DB-Roundtrips')
+    return int(roundtrips) if roundtrips is not None else None
+
+def mean_roundtrips(roundtrips):
+    return f"{sum(roundtrips) / len(roundtrips):.1f}" if roundtrips else 'n/a'
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+def spread(values):
+    """Range of repeated measurements, e.g. '480-530'"""
+    return f"{min(values):.0f}-{max(values):.0f}"
+
+class Benchmark:
+    """One benchmark report. run() prints the title and the lines from describe(),
+    signs in as the admin when login_reason says what needs it, and leaves the rows
+    to measure(), which appends whatever went wrong to failures."""
+
+    title = None
+    # What the benchmark can't do without the admin login, or None if it needs none
+    login_reason = None
+
+    def __init__(self, api_base=None):
+        self.api_base = api_base or API_BASE
+        self.tester = PortfolioAPITester(self.api_base, verbose=False)
+        # Client latency of every request made, for --metrics-json/--metrics-prom
+        self.recorder = self.tester.recorder
+
+    def describe(self):
+        """Lines printed under the title"""
+        return [f"Target: {self.api_base}"]
+
+    def measure(self, failures):
+        raise NotImplementedError
+
+    def run(self):
+        """Print the report; returns the failure count"""
+        print("=" * 80)
+        print(self.title)
+        print("=" * 80)
+        for line in self.describe():
+            print(line)
+        failures = []
+        if self.login_reason and not self.tester.test_admin_login_correct():
+            failures.append(f"admin login failed, {self.login_reason}")
+        else:
+            self.measure(failures)
+        print_failures(failures)
+        print("=" * 80)
+        return len(failures)
+
+class ComparisonBenchmark(Benchmark):
+    """A benchmark of several targets side by side, e.g. stand-ins started with and
+    without a feature. targets are (label, api_base, ...) tuples; the first is the
+    one the others are compared with."""
+
+    def __init__(self, targets):
+        self.targets = targets
+        self.recorder = LatencyRecorder()
+
+    def describe(self):
+        return [f"Target ({label}): {api_base}" for label, api_base, *_ in self.targets]
+
+    def tester_for(self, api_base):
+        """A tester of one target that records into this benchmark's recorder"""
+        return PortfolioAPITester(api_base, verbose=False, recorder=self.recorder)
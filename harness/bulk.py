@@ -0,0 +1,141 @@
+"""
+Benchmark of importing a catalogue one item per request against the bulk
+endpoints, with the batch rules they enforce.
+"""
+
+import time
+
+import requests
+
+from bulk_import import MAX_BATCH_ITEMS, apply_batch, delete_all
+
+from .base import Benchmark, db_roundtrips
+
+class BulkImportBenchmark(Benchmark):
+    """Compares importing a catalogue one item per request, the way scripts/seedDatabase.js
+    saves it, with the bulk endpoints"""
+
+    title = "BULK IMPORT BENCHMARK"
+    login_reason = "nothing can be imported"
+
+    def __init__(self, api_base=None, items=1000, batch_size=MAX_BATCH_ITEMS):
+        super().__init__(api_base)
+        self.items = items
+        self.batch_size = batch_size
+        self.tester.session.hooks['response'].append(self.count)
+        self.requests = 0
+        self.roundtrips = 0
+
+    def count(self, response, *args, **kwargs):
+        self.requests += 1
+        self.roundtrips += db_roundtrips(response) or 0
+
+    def catalogue(self, run_id):
+        categories = ('Frontend', 'Backend', 'Database', 'Tools', 'Cloud', 'Mobile')
+        projects = [{
+            'title': f"Bulk {run_id} project {index}",
+            'description': f"Generated project {index} for the bulk import benchmark",
+            'category': ('AI', 'Web')[index % 2],
+            'techStack': ['Python', f"Lib{index % 17}"],
+            'githubUrl': f"https://github.com/example/bulk-{index}",
+            'liveUrl': f"https://bulk-{index}.example.com",
+            'featured': False,
+            'order': index,
+        } for index in range(self.items)]
+        tech_stack = [{
+            'name': f"Bulk {run_id} tech {index}",
+            'icon': 'Code',
+            'color': f"#{index % 0xffffff:06x}",
+            'category': categories[index % len(categories)],
+            'order': index,
+        } for index in range(self.items)]
+        return projects, tech_stack
+
+    def listed(self, path, prefix):
+        response = self.tester.session.get(f"{self.api_base}/admin/{path}", timeout=30)
+        response.raise_for_status()
+        return {doc['_id']: doc for doc in response.json()['data']
+                if doc.get('title', doc.get('name', '')).startswith(prefix)}
+
+    def one_by_one(self, projects, tech_stack):
+        created = {'projects': [], 'techStack': []}
+        for collection, path, items in (('projects', 'projects', projects), ('techStack', 'tech-stack', tech_stack)):
+            for item in items:
+                response = self.tester.session.post(f"{self.api_base}/admin/{path}", json=item, timeout=30)
+                response.raise_for_status()
+                created[collection].append(response.json()['data']['_id'])
+        return created
+
+    def bulk(self, projects, tech_stack):
+        created = {'projects': [], 'techStack': []}
+        for collection, items in (('projects', projects), ('techStack', tech_stack)):
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                created[collection].extend(
+                    apply_batch(self.tester.session, self.api_base, collection, create=batch)['created'])
+        return created
+
+    def check_batch_rules(self, prefix, failures):
+        """An invalid item refuses the whole batch; featuring a project rotates out the oldest"""
+        session = self.tester.session
+        projects, _ = self.catalogue(f"{prefix}-rules")
+        projects = projects[:4]
+        projects[3] = dict(projects[3], githubUrl='not a url')
+        response = session.post(f"{self.api_base}/admin/projects/bulk", json={'create': projects}, timeout=30)
+        paths = [error['path'] for error in response.json().get('errors', [])]
+        if response.status_code != 400 or paths != ['create[3].githubUrl']:
+            failures.append(f"invalid batch: expected 400 on create[3].githubUrl, got {response.status_code} {paths}")
+        if self.listed('projects', f"Bulk {prefix}-rules"):
+            failures.append("invalid batch: part of a refused batch was written")
+
+        featured = lambda: {doc_id: doc for doc_id, doc in self.listed('projects', '').items() if doc['featured']}
+        before = featured()
+        created = apply_batch(session, self.api_base, 'projects', create=[dict(projects[0], featured=True)])['created']
+        after = featured()
+        rotated = [before[doc_id] for doc_id in before if doc_id not in after]
+        if len(after) > 3 or created[0] not in after or len(rotated) != max(0, len(before) + 1 - 3):
+            failures.append(f"featured cap: {len(before)} featured before, {len(after)} after the batch")
+
+        # Put the featured projects back the way they were
+        editable = ('title', 'description', 'category', 'techStack', 'githubUrl', 'liveUrl', 'order')
+        restore = [dict({key: doc[key] for key in editable if key in doc}, id=doc['_id'], featured=True)
+                   for doc in rotated]
+        apply_batch(session, self.api_base, 'projects', delete=created, update=restore)
+
+    def measure(self, failures):
+        """Import the same catalogue both ways, check and delete it"""
+        print(f"{self.items} projects and {self.items} tech stack items per method "
+              f"(round-trips from X-DB-Roundtrips, set DB_ROUNDTRIP_HEADER=true on the server)")
+        print("-" * 80)
+        print(f"{'Method':<28}{'Requests':>10}{'Round-trips':>13}{'Seconds':>10}{'Items/s':>10}")
+        run_id = f"{int(time.time())}"
+        methods = [('one by one (seed script)', 'single', self.one_by_one),
+                   (f"bulk ({self.batch_size}/batch)", 'bulk', self.bulk)]
+        for label, tag, method in methods:
+            prefix = f"Bulk {run_id}-{tag}"
+            projects, tech_stack = self.catalogue(f"{run_id}-{tag}")
+            self.requests = self.roundtrips = 0
+            started = time.perf_counter()
+            try:
+                created = method(projects, tech_stack)
+            except (requests.exceptions.RequestException, KeyError, ValueError) as error:
+                failures.append(f"{label}: {error}")
+                continue
+            elapsed = time.perf_counter() - started
+            trips = str(self.roundtrips) if self.roundtrips else 'n/a'
+            print(f"{label:<28}{self.requests:>10}{trips:>13}{elapsed:>10.2f}"
+                  f"{2 * self.items / elapsed if elapsed else 0:>10.0f}")
+
+            stored_projects = self.listed('projects', prefix)
+            stored_tech = self.listed('tech-stack', prefix)
+            if set(stored_projects) != set(created['projects']) or set(stored_tech) != set(created['techStack']):
+                failures.append(f"{label}: {len(stored_projects)} projects and {len(stored_tech)} tech items "
+                                f"stored, {self.items} of each expected")
+            elif sorted(doc['title'] for doc in stored_projects.values()) != sorted(p['title'] for p in projects):
+                failures.append(f"{label}: stored projects don't match the catalogue")
+            deleted = (delete_all(self.tester.session, self.api_base, 'projects', created['projects'])
+                       + delete_all(self.tester.session, self.api_base, 'techStack', created['techStack']))
+            if deleted != len(created['projects']) + len(created['techStack']):
+                failures.append(f"{label}: cleanup deleted {deleted} documents")
+
+        self.check_batch_rules(run_id, failures)
@@ -0,0 +1,18 @@
+"""
+Target and credentials the harness uses unless the command line says otherwise.
+"""
+
+import os
+
+# Target backend: BACKEND_URL env var, overridden by --target or --standin
+BACKEND_URL = os.environ.get(
+    'BACKEND_URL', "https://faddc90b-2180-456b-822d-9f2d0f3283f9.preview.emergentagent.com"
+).rstrip('/')
+API_BASE = f"{BACKEND_URL}/api"
+
+# Admin credentials from backend .env
+ADMIN_EMAIL = "admin@naveen-portfolio.com"
+ADMIN_PASSWORD = "N@veenDev#2025"
+
+# The stand-in backend, started for --standin and --bench-workers
+STANDIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend_standin.py')
@@ -0,0 +1,382 @@
+"""
+Benchmarks of the contact form: where its emails are sent from, what its debug
+logging costs under load, and how much replayed spam reaches the database.
+"""
+
+import os
+import secrets
+import shlex
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .base import Benchmark, ComparisonBenchmark, db_roundtrips, median, spread
+from .load import free_port, launch_server, stop_server
+from .timing import LatencyHistogram, TimedSession, percentile
+
+class EmailOutboxBenchmark(ComparisonBenchmark):
+    """Times contact submissions and checks their emails reach the (fake) Resend API"""
+
+    title = "CONTACT EMAIL OUTBOX BENCHMARK"
+
+    def __init__(self, targets, fake_resend, iterations=50, delivery_timeout=30):
+        # targets: [(label, api_base)], e.g. the inline and outbox stand-ins
+        super().__init__(targets)
+        self.fake = fake_resend
+        self.iterations = iterations
+        self.delivery_timeout = delivery_timeout
+        self.tester = self.tester_for(targets[-1][1])
+
+    def submit(self, api_base, index):
+        """POST one contact form; returns (status code, seconds)"""
+        contact_data = {
+            "name": "Outbox Bench",
+            "email": f"outbox-bench-{index}@example.com",
+            "message": f"Email outbox benchmark submission number {index}."
+        }
+        session = self.tester.session
+        response = session.post(f"{api_base}/contact", json=contact_data,
+                                headers={'X-Bypass-Rate-Limit': 'true'}, timeout=30)
+        return response.status_code, session.pop_last_timing()['total']
+
+    def measure_target(self, label, api_base, failures):
+        """Submit the contact form iterations times, then wait for every email"""
+        self.fake.reset()
+        histogram = LatencyHistogram()
+        started = time.time()
+        accepted = 0
+        for index in range(self.iterations):
+            status, seconds = self.submit(api_base, index)
+            if status != 201:
+                failures.append(f"{label}: contact submission returned HTTP {status}")
+                continue
+            accepted += 1
+            histogram.record(seconds)
+
+        expected = 2 * accepted
+        if not self.fake.wait_for(expected, self.delivery_timeout):
+            failures.append(f"{label}: {len(self.fake.delivered())}/{expected} emails delivered "
+                            f"within {self.delivery_timeout:.0f}s")
+        emails = self.fake.delivered()
+        drained = max((email['receivedAt'] for email in emails), default=started) - started
+        return histogram, len(emails), expected, self.fake.calls, drained
+
+    def retry_check(self, api_base, failures):
+        """Fail the first two provider calls and expect the outbox to deliver anyway"""
+        self.fake.reset()
+        self.fake.fail_next(2)
+        started = time.time()
+        status, _ = self.submit(api_base, 'retry')
+        if status != 201:
+            failures.append(f"retry: contact submission returned HTTP {status}")
+            return None
+        if not self.fake.wait_for(2, self.delivery_timeout):
+            failures.append(f"retry: emails not delivered within {self.delivery_timeout:.0f}s "
+                            f"after two provider failures")
+            return None
+        return max(email['receivedAt'] for email in self.fake.delivered()) - started
+
+    def describe(self):
+        return ([f"Fake Resend: {self.fake.url} ({self.fake.latency * 1000:.0f} ms per API call)"]
+                + super().describe() + [f"{self.iterations} submissions per target (latencies in ms)"])
+
+    def measure(self, failures):
+        """Measure every target, then the retry path of the last"""
+        print("-" * 80)
+        print(f"{'Mode':<12}{'p50':>10}{'p99':>10}{'Delivered':>12}{'API calls':>11}{'All sent after':>16}")
+        for label, api_base in self.targets:
+            histogram, delivered, expected, calls, drained = self.measure_target(label, api_base, failures)
+            print(f"{label:<12}{histogram.percentile(50):>10.2f}{histogram.percentile(99):>10.2f}"
+                  f"{f'{delivered}/{expected}':>12}{calls:>11}{drained:>15.2f}s")
+
+        retried = self.retry_check(self.targets[-1][1], failures)
+        print("-" * 80)
+        if retried is not None:
+            print(f"Retry: delivered {retried:.2f}s after submission despite two failed provider calls")
+
+def logging_configs(sample_rate):
+    """(label, server environment) of the configurations --bench-logging compares"""
+    return [
+        ('debug off (info)', {'LOG_LEVEL': 'info'}),
+        ('debug on', {'LOG_LEVEL': 'debug'}),
+        (f'debug on, {sample_rate:.0%} sampled', {'LOG_LEVEL': 'debug', 'CONTACT_LOG_SAMPLE_RATE': str(sample_rate)}),
+    ]
+
+class ContactLoggingBenchmark(Benchmark):
+    """What the contact route's debug logging costs. With server_cmd the server
+    (backend/server.js) is started with each LOG_LEVEL and CONTACT_LOG_SAMPLE_RATE
+    in turn, logging to a file, and timed under concurrent load over several
+    rounds. Against the stand-ins only the log volume per submission is reported:
+    their logger is Python's, running in the load client's process, so their
+    throughput says nothing about utils/logger.js."""
+
+    title = "CONTACT LOGGING BENCHMARK"
+
+    def __init__(self, standins=None, server_cmd=None, sample_rate=0.1, concurrency=10, duration=10, rounds=3,
+                 submissions=200, startup_timeout=60):
+        # standins: [(label, api_base, LogOutput)], used when there is no server_cmd
+        super().__init__()
+        self.standins = standins or []
+        self.server_cmd = server_cmd
+        self.configs = logging_configs(sample_rate)
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rounds = rounds
+        self.submissions = submissions
+        self.startup_timeout = startup_timeout
+
+    def worker(self, api_base, worker_id, deadline=None, count=None):
+        """Submit valid forms until the deadline or count of them; returns (histogram, error statuses)"""
+        session = TimedSession(self.recorder)
+        histogram, errors = LatencyHistogram(), Counter()
+        index = 0
+        while (time.perf_counter() < deadline) if count is None else index < count:
+            contact_data = {
+                "name": "Logging Bench",
+                "email": f"logging-bench-{worker_id}-{index}@example.com",
+                "message": f"Contact logging benchmark submission {worker_id}-{index}."
+            }
+            try:
+                response = session.post(f"{api_base}/contact", json=contact_data,
+                                        headers={'X-Bypass-Rate-Limit': 'true'}, timeout=30)
+                if response.status_code == 201:
+                    histogram.record(session.pop_last_timing()['total'])
+                else:
+                    errors[str(response.status_code)] += 1
+            except requests.exceptions.RequestException as error:
+                errors[type(error).__name__] += 1
+            index += 1
+        return histogram, errors
+
+    def load(self, api_base, seconds=None, submissions=None):
+        """(histogram, error statuses, seconds) of the concurrent submissions to one server,
+        for a duration or a number of them"""
+        started = time.perf_counter()
+        deadline = started + seconds if seconds is not None else None
+        counts = ([None] * self.concurrency if submissions is None else
+                  [submissions // self.concurrency + (i < submissions % self.concurrency)
+                   for i in range(self.concurrency)])
+        histogram, errors = LatencyHistogram(), Counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            # New addresses each load, so no submission repeats an earlier one
+            run_id = secrets.token_hex(4)
+            futures = [pool.submit(self.worker, api_base, f"{run_id}-{i}", deadline, count)
+                       for i, count in enumerate(counts)]
+            for future in futures:
+                worker_histogram, worker_errors = future.result()
+                histogram.merge(worker_histogram)
+                errors.update(worker_errors)
+        return histogram, errors, time.perf_counter() - started
+
+    @staticmethod
+    def log_position(log_output):
+        """(lines logged, bytes written) so far"""
+        log_output.flush()
+        return log_output.lines, os.path.getsize(log_output.stream.name)
+
+    @staticmethod
+    def log_file_size(path):
+        """(lines, bytes) of a log file"""
+        with open(path, 'rb') as log:
+            data = log.read()
+        return data.count(b'\n'), len(data)
+
+    def describe(self):
+        if not self.server_cmd:
+            return ([f"Target ({label}): {api_base}" for label, api_base, _ in self.standins]
+                    + [f"{self.submissions} submissions per target, {self.concurrency} at a time"])
+        return [f"Server: {self.server_cmd}",
+                f"{self.concurrency} concurrent clients, {self.duration:g}s per configuration per round, "
+                f"{self.rounds} rounds (latencies in ms)"]
+
+    def measure(self, failures):
+        if self.server_cmd:
+            self.measure_servers(failures)
+        else:
+            self.measure_volume(failures)
+
+    def measure_volume(self, failures):
+        """Log lines and bytes per submission of each stand-in"""
+        print("-" * 80)
+        print(f"{'Logging':<30}{'Submitted':>11}{'Lines/req':>11}{'Bytes/req':>11}")
+        for label, api_base, log_output in self.standins:
+            lines_before, bytes_before = self.log_position(log_output)
+            histogram, errors, _ = self.load(api_base, submissions=self.submissions)
+            if errors:
+                failures.append(f"{label}: {sum(errors.values())} failed submissions ({errors.most_common(1)[0][0]})")
+            lines_after, bytes_after = self.log_position(log_output)
+            count = histogram.count or 1
+            print(f"{label:<30}{histogram.count:>11}{(lines_after - lines_before) / count:>11.1f}"
+                  f"{(bytes_after - bytes_before) / count:>11.0f}")
+        print("-" * 80)
+        print("Throughput isn't compared against the stand-ins: their logger runs in this process,\n"
+              "next to the load client. Pass --server-cmd to time the Node server at each LOG_LEVEL.")
+
+    def measure_servers(self, failures):
+        """Start the server with each configuration in turn, rounds times"""
+        histograms = {label: LatencyHistogram() for label, _ in self.configs}
+        throughputs = {label: [] for label, _ in self.configs}
+        volume = {label: [0, 0, 0] for label, _ in self.configs}
+        for _ in range(self.rounds):
+            for label, config in self.configs:
+                with tempfile.TemporaryDirectory(prefix='bench-logging-') as directory:
+                    log_path = os.path.join(directory, 'server.log')
+                    port = free_port()
+                    env = dict(os.environ, **config, PORT=str(port), LOG_FILE=log_path,
+                               RATE_LIMIT_MAX='1000000000')
+                    try:
+                        process, api_base = launch_server(shlex.split(self.server_cmd), port, env,
+                                                          f"server ({label})", self.startup_timeout)
+                    except RuntimeError as error:
+                        failures.append(str(error))
+                        continue
+                    try:
+                        # Untimed, so each start pays for its warm-up outside the measurement
+                        self.load(api_base, seconds=min(1.0, self.duration / 5))
+                        lines_before, bytes_before = self.log_file_size(log_path)
+                        histogram, errors, elapsed = self.load(api_base, seconds=self.duration)
+                    finally:
+                        # The logger flushes its buffer on the way out
+                        stop_server(process)
+                    lines_after, bytes_after = self.log_file_size(log_path)
+                if errors:
+                    failures.append(f"{label}: {sum(errors.values())} failed submissions "
+                                    f"({errors.most_common(1)[0][0]})")
+                histograms[label].merge(histogram)
+                throughputs[label].append(histogram.count / elapsed if elapsed else 0.0)
+                volume[label][0] += histogram.count
+                volume[label][1] += lines_after - lines_before
+                volume[label][2] += bytes_after - bytes_before
+
+        print("-" * 80)
+        print(f"{'Logging':<30}{'Req/s':>8}{'Range':>12}{'p50':>8}{'p99':>8}{'Lines/req':>11}{'Bytes/req':>11}")
+        measured = [label for label, _ in self.configs if throughputs[label]]
+        for label in measured:
+            histogram = histograms[label]
+            count = volume[label][0] or 1
+            print(f"{label:<30}{median(throughputs[label]):>8.1f}{spread(throughputs[label]):>12}"
+                  f"{histogram.percentile(50):>8.1f}{histogram.percentile(99):>8.1f}"
+                  f"{volume[label][1] / count:>11.1f}{volume[label][2] / count:>11.0f}")
+        print("-" * 80)
+        if len(measured) > 1 and median(throughputs[measured[0]]):
+            baseline = median(throughputs[measured[0]])
+            print(f"Median throughput relative to '{measured[0]}': " + ", ".join(
+                f"{label} {median(throughputs[label]) / baseline:.0%}" for label in measured[1:]))
+        print("Range is the lowest and highest req/s of the rounds; where ranges overlap the\n"
+              "difference between two rows is within this machine's run-to-run noise.")
+
+class ContactSpamBenchmark(ComparisonBenchmark):
+    """Replayed contact spam: bots each resubmit one message from their own IP, all
+    at once, with and without the duplicate check. Counts what reached the database
+    and the latency of every submission."""
+
+    title = "CONTACT SPAM BENCHMARK"
+
+    def __init__(self, targets, bots=20, replays=25, concurrency=10):
+        # targets: [(label, api_base)] or [(label, api_base, rejects duplicates)]
+        super().__init__([(label, api_base, *rest, True)[:3] for label, api_base, *rest in targets])
+        self.bots = bots
+        self.replays = replays
+        self.concurrency = concurrency
+        self.session = TimedSession(self.recorder)
+
+    def submit(self, api_base, run_id, bot):
+        """POST bot's message as bot's IP; returns (status, milliseconds, DB round-trips or None)"""
+        contact_data = {
+            "name": f"Spam Bot {bot}",
+            "email": f"spam-bot-{bot}@example.com",
+            "message": f"Spam benchmark {run_id}: the same message from bot {bot}, sent again and again."
+        }
+        # The bypass skips the hourly limit, so every replay reaches the route
+        response = self.session.post(f"{api_base}/contact", json=contact_data, timeout=30, headers={
+            'X-Forwarded-For': f"198.51.100.{bot % 256}",
+            'X-Bypass-Rate-Limit': 'true'
+        })
+        return response.status_code, self.session.pop_last_timing()['total'] * 1000, db_roundtrips(response)
+
+    @staticmethod
+    def stored(tester):
+        """(contacts, email jobs) stored so far"""
+        response = tester.session.get(f"{tester.api_base}/admin/contact/messages",
+                                      params={'page': 1, 'limit': 1}, timeout=30)
+        contacts = response.json()['data']['pagination']['total']
+        response = tester.session.get(f"{tester.api_base}/admin/email-outbox", timeout=30)
+        return contacts, sum(response.json()['data'].values())
+
+    def spam(self, api_base):
+        """Fire every bot's replays, interleaved; returns ([(status, ms, round-trips)], seconds)"""
+        # New messages each run, so earlier runs' submissions aren't duplicates
+        run_id = secrets.token_hex(4)
+        schedule = [bot for _ in range(self.replays) for bot in range(self.bots)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(lambda bot: self.submit(api_base, run_id, bot), schedule))
+        return results, time.perf_counter() - started
+
+    def describe(self):
+        return super().describe() + [f"{self.bots} bots x {self.replays} identical submissions, "
+                                     f"{self.concurrency} at a time (latencies in ms)"]
+
+    def measure(self, failures):
+        """Spam every target in turn"""
+        print("-" * 80)
+        print(f"{'Dup. check':<12}{'201':>6}{'409':>6}{'Contacts':>10}{'Emails':>8}{'DB trips':>10}"
+              f"{'p50':>8}{'p99':>8}{'p99 201':>9}{'Req/s':>8}")
+        writes = {}
+        trip_totals = {}
+        p99s = {}
+        accepted_p99s = {}
+        for label, api_base, rejects_duplicates in self.targets:
+            tester = self.tester_for(api_base)
+            if not tester.test_admin_login_correct():
+                failures.append(f"{label}: admin login failed")
+                continue
+            contacts_before, jobs_before = self.stored(tester)
+            results, elapsed = self.spam(api_base)
+            contacts_after, jobs_after = self.stored(tester)
+
+            statuses = Counter(status for status, _, _ in results)
+            latencies = sorted(ms for _, ms, _ in results)
+            trips = [count for _, _, count in results if count is not None]
+            accepted = sorted(ms for status, ms, _ in results if status == 201)
+            contacts, jobs = contacts_after - contacts_before, jobs_after - jobs_before
+            writes[label] = contacts + jobs
+            trip_totals[label] = sum(trips) if trips else None
+            p99s[label] = percentile(latencies, 99)
+            accepted_p99s[label] = percentile(accepted, 99) if accepted else 0.0
+            print(f"{label:<12}{statuses[201]:>6}{statuses[409]:>6}{contacts:>10}{jobs:>8}"
+                  f"{trip_totals[label] if trips else '-':>10}{percentile(latencies, 50):>8.1f}"
+                  f"{p99s[label]:>8.1f}{accepted_p99s[label]:>9.1f}"
+                  f"{len(results) / elapsed if elapsed else 0.0:>8.1f}")
+
+            unexpected = {status: count for status, count in statuses.items() if status not in (201, 409)}
+            if unexpected:
+                failures.append(f"{label}: unexpected responses {unexpected}")
+            expected_accepted = self.bots if rejects_duplicates else len(results)
+            if statuses[201] != expected_accepted:
+                failures.append(f"{label}: {statuses[201]} submissions accepted, expected {expected_accepted}")
+            if contacts != statuses[201]:
+                failures.append(f"{label}: {contacts} contacts stored for {statuses[201]} accepted submissions")
+        print("-" * 80)
+
+        baseline = self.targets[0][0]
+        if len(writes) > 1 and baseline in writes:
+            for label, _, _ in self.targets[1:]:
+                if label not in writes:
+                    continue
+                print(f"'{label}' against '{baseline}': {writes[label]} documents written (contacts + "
+                      f"emails) instead of {writes[baseline]}")
+                if trip_totals[label] is not None and trip_totals[baseline] is not None:
+                    print(f"  {trip_totals[label]} DB round-trips instead of {trip_totals[baseline]}")
+                print(f"  p99 {p99s[label]:.1f}ms instead of {p99s[baseline]:.1f}ms; accepted submissions "
+                      f"{accepted_p99s[label]:.1f}ms instead of {accepted_p99s[baseline]:.1f}ms")
+                if writes[label] >= writes[baseline]:
+                    failures.append(f"{label}: no fewer database writes than '{baseline}'")
+            print("A rejected replay is answered from memory without a database round-trip. Only where\n"
+                  "other processes take submissions too (cluster workers, 'on + stored') does the first\n"
+                  "submission of each message cost one extra read of the sender's stored contacts.\n"
+                  "Against the stand-in, latency is mostly request handling in one process (rejected\n"
+                  "replays have the same p50), so p99 moves by several ms from run to run either way.")
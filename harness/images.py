@@ -0,0 +1,238 @@
+"""
+Checks of the responsive image variants the server stores for each upload, and
+the bytes srcset saves each screen against the single image it used to get.
+"""
+
+import random
+import re
+import secrets
+import struct
+import zlib
+
+import requests
+
+from .base import Benchmark
+
+def synthetic_png(width, height, channels=3, seed=0):
+    """Photo-like test image: smooth gradients with a little noise, so it compresses
+    about as well as a photo would. Rows are summed as big integers, a byte per
+    channel, which stays fast in pure Python as no byte can overflow."""
+    rnd = random.Random(seed)
+    pixel = lambda *values: bytes(values[:channels])
+    horizontal = int.from_bytes(b''.join(pixel((x * 200) // width, 0, 100, 0) for x in range(width)), 'big')
+    noise_mask = int.from_bytes(pixel(3, 3, 3, 0) * width, 'big')
+    alpha = int.from_bytes(pixel(0, 0, 0, 240) * width, 'big') if channels == 4 else 0
+    scanlines = []
+    for y in range(height):
+        vertical = int.from_bytes(pixel(0, (y * 200) // height, 0, 0) * width, 'big')
+        noise = int.from_bytes(rnd.randbytes(width * channels), 'big') & noise_mask
+        scanlines.append(b'\x00' + (horizontal + vertical + noise + alpha).to_bytes(width * channels, 'big'))
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    color_type = {3: 2, 4: 6}[channels]
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b''.join(scanlines), 6)) + chunk(b'IEND', b''))
+
+def slot_width(sizes, viewport):
+    """CSS pixel width of an image slot from its sizes attribute, for (min-width)
+    conditions and px/vw lengths, as a browser evaluates it"""
+    for entry in sizes.split(','):
+        match = re.fullmatch(r'\s*(?:\(min-width:\s*(\d+)px\)\s*)?(\d+(?:\.\d+)?)(px|vw)\s*', entry)
+        if match and (match.group(1) is None or viewport >= int(match.group(1))):
+            length = float(match.group(2))
+            return length if match.group(3) == 'px' else viewport * length / 100
+    return viewport
+
+def pick_candidate(srcset, needed):
+    """(width, url) a browser takes from srcset for needed device pixels: the
+    narrowest that is wide enough, else the widest"""
+    candidates = sorted((int(width[:-1]), url) for url, width in
+                        (candidate.split() for candidate in srcset.split(',') if candidate.strip()))
+    return next((candidate for candidate in candidates if candidate[0] >= needed), candidates[-1])
+
+# The uploads --bench-images makes: (kind, upload path, form field, test image
+# size, channels, fallback format), and the screens whose downloads it compares
+IMAGE_UPLOADS = [
+    ('project', '/admin/upload/project-image', 'projectImage', (1400, 1050), 3, 'jpg'),
+    ('techLogo', '/admin/upload/tech-logo', 'techLogo', (256, 256), 4, 'png'),
+    ('profile', '/admin/upload/profile-image', 'profileImage', (1000, 1000), 3, 'jpg'),
+]
+IMAGE_MIME_TYPES = {'jpg': 'image/jpeg', 'png': 'image/png', 'webp': 'image/webp', 'avif': 'image/avif'}
+IMAGE_CLIENTS = [
+    ('Phone 360px @2x', 360, 2),
+    ('Phone 414px @3x', 414, 3),
+    ('Tablet 820px @2x', 820, 2),
+    ('Laptop 1366px @1x', 1366, 1),
+    ('Desktop 1920px @1x', 1920, 1),
+    ('Desktop 2560px @2x', 2560, 2),
+]
+
+class ImageVariantBenchmark(Benchmark):
+    """Uploads a project image, a tech logo and (on the stand-in) a profile
+    image; checks the stored width variants, then compares what each screen
+    downloads through srcset with the single image every screen used to get"""
+
+    title = "IMAGE VARIANT BENCHMARK"
+    login_reason = "images can't be uploaded"
+
+    def __init__(self, api_base=None, include_profile=False, modern_format='webp', formats=None):
+        super().__init__(api_base)
+        # Uploading a profile image replaces the target's, so only the stand-in does
+        self.include_profile = include_profile
+        # {kind: (fallback format, modern formats)} the server should store, by
+        # default what config/imageStore.js writes for IMAGE_MODERN_FORMAT
+        self.formats = formats or {kind: (fallback, (modern_format,)) for kind, *_, fallback in IMAGE_UPLOADS}
+        self.content_types = {}
+
+    def upload(self, path, field, data):
+        response = self.tester.session.post(f"{self.api_base}{path}", timeout=60,
+                                            files={field: ('bench.png', data, 'image/png')})
+        if response.status_code != 200:
+            raise ValueError(f"upload returned HTTP {response.status_code}: {response.text[:200]}")
+        return response.json()['data']
+
+    def fetch_sizes(self, image_set):
+        """{url: bytes} of every variant, or None for those that are missing"""
+        urls = [url for srcset in [image_set['srcset']] + [source['srcset'] for source in image_set['sources']]
+                for url, _ in (candidate.split() for candidate in srcset.split(','))]
+        sizes = {}
+        for url in urls:
+            response = requests.get(url, timeout=30)
+            self.content_types[url] = response.headers.get('Content-Type', '').split(';')[0].strip()
+            sizes[url] = (len(response.content) if response.status_code == 200
+                          and self.content_types[url].startswith('image/') else None)
+        return sizes
+
+    def check_formats(self, kind, image_set, sizes, failures):
+        """The fallback srcset and one source per modern format, each listing files
+        of its own format only, served with that format's Content-Type"""
+        fallback, modern = self.formats[kind]
+        types = [source['type'] for source in image_set['sources']]
+        if types != [IMAGE_MIME_TYPES[fmt] for fmt in modern]:
+            failures.append(f"{kind}: expected sources {[IMAGE_MIME_TYPES[fmt] for fmt in modern]}, got {types}")
+        formats = {mime: fmt for fmt, mime in IMAGE_MIME_TYPES.items()}
+        for fmt, srcset in [(fallback, image_set['srcset'])] + [(formats.get(source['type']), source['srcset'])
+                                                               for source in image_set['sources']]:
+            if fmt is None:
+                continue
+            urls = [candidate.split()[0] for candidate in srcset.split(',')]
+            misnamed = [url for url in urls if not url.endswith(f".{fmt}")]
+            if misnamed:
+                failures.append(f"{kind}: {len(misnamed)} {fmt} variant URL(s) without a .{fmt} name, e.g. {misnamed[0]}")
+            mistyped = [url for url in urls if sizes.get(url) is not None
+                        and self.content_types[url] != IMAGE_MIME_TYPES[fmt]]
+            if mistyped:
+                failures.append(f"{kind}: {fmt} variant served as {self.content_types[mistyped[0]]}, e.g. {mistyped[0]}")
+
+    def check_variants(self, kind, image_set, sizes, failures):
+        for label, srcset in [('fallback', image_set['srcset'])] + [(source['type'], source['srcset'])
+                                                                     for source in image_set['sources']]:
+            candidates = [(int(width[:-1]), url) for url, width in
+                          (candidate.split() for candidate in srcset.split(','))]
+            widths = [width for width, _ in candidates]
+            if len(candidates) < 2 or widths != sorted(set(widths)):
+                failures.append(f"{kind}: {label} srcset should list two or more ascending widths, got {widths}")
+            missing = [url for _, url in candidates if sizes.get(url) is None]
+            if missing:
+                failures.append(f"{kind}: {len(missing)} {label} variant(s) not served, e.g. {missing[0]}")
+            elif [sizes[url] for _, url in candidates] != sorted(sizes[url] for _, url in candidates):
+                failures.append(f"{kind}: {label} variants don't grow with their width")
+        if image_set['src'] != pick_candidate(image_set['srcset'], float('inf'))[1]:
+            failures.append(f"{kind}: src is not the widest fallback variant")
+
+    def attach(self, kind, upload, failures):
+        """Save the image set on a new document and check it comes back from the
+        public reads; returns a callable that deletes the document"""
+        session = self.tester.session
+        if kind == 'project':
+            body = {'title': 'Image variant check', 'description': 'Created by the image variant benchmark.',
+                    'category': 'Web', 'image': upload['url'], 'imagePublicId': upload['publicId'],
+                    'imageSet': upload['imageSet'], 'techStack': ['Python'],
+                    'githubUrl': 'https://github.com/example/image-check', 'liveUrl': 'https://example.com'}
+            collection, path, field = '/admin/projects', '/portfolio/projects', 'imageSet'
+        elif kind == 'techLogo':
+            body = {'name': f"Image check {secrets.token_hex(3)}", 'icon': 'Code', 'color': '#336699',
+                    'category': 'Tools', 'logoUrl': upload['url'], 'logoPublicId': upload['publicId'],
+                    'logoSet': upload['imageSet']}
+            collection, path, field = '/admin/tech-stack', '/portfolio/tech-stack', 'logoSet'
+        else:
+            # The upload itself saves it on the personal information
+            stored = session.get(f"{self.api_base}/portfolio/personal", timeout=10).json()['data']
+            if stored.get('profileImageSet') != upload['imageSet']:
+                failures.append("profile: image set not saved on the personal information")
+            return None
+        response = session.post(f"{self.api_base}{collection}", json=body, timeout=10)
+        if response.status_code != 201:
+            failures.append(f"{kind}: creating a document with the image set returned HTTP {response.status_code}")
+            return None
+        doc_id = response.json()['data']['_id']
+        listed = session.get(f"{self.api_base}{path}", timeout=10).json()['data']
+        if not any(doc['_id'] == doc_id and doc.get(field) == upload['imageSet'] for doc in listed):
+            failures.append(f"{kind}: GET /api{path} doesn't return the stored {field}")
+        return lambda: session.delete(f"{self.api_base}{collection}/{doc_id}", timeout=10)
+
+    def check_cleanup(self, kind, sizes, failures):
+        left = [url for url in sizes if requests.get(url, timeout=30).status_code != 404]
+        if left:
+            failures.append(f"{kind}: {len(left)} of {len(sizes)} variant(s) still served after deletion")
+
+    def report_savings(self, kind, image_set, sizes):
+        """Bytes each screen downloads with srcset against the single image; returns (srcset, modern) ratios"""
+        single = sizes[image_set['src']]
+        modern = image_set['sources'][0]['srcset'] if image_set['sources'] else None
+        print(f"{kind} ({image_set['width']}x{image_set['height']} original, sizes=\"{image_set['sizes']}\"); "
+              f"single image: {single} bytes")
+        ratios, modern_ratios = [], []
+        for label, viewport, dpr in IMAGE_CLIENTS:
+            needed = slot_width(image_set['sizes'], viewport) * dpr
+            width, url = pick_candidate(image_set['srcset'], needed)
+            ratios.append(sizes[url] / single)
+            line = f"  {label:<22}{needed:>7.0f}px  {width:>5}w {sizes[url]:>10}  {sizes[url] / single:>5.0%}"
+            if modern:
+                modern_width, modern_url = pick_candidate(modern, needed)
+                modern_ratios.append(sizes[modern_url] / single)
+                line += f"  {modern_width:>5}w {sizes[modern_url]:>10}  {sizes[modern_url] / single:>5.0%}"
+            print(line)
+        return sum(ratios) / len(ratios), (sum(modern_ratios) / len(modern_ratios) if modern_ratios else None)
+
+    def describe(self):
+        return super().describe() + [
+            "Bytes each screen downloads through srcset, against the single image (the widest variant)",
+            "every screen downloaded before"]
+
+    def measure(self, failures):
+        """Upload, check, measure and delete each kind of image"""
+        print("-" * 80)
+        print(f"  {'Screen':<22}{'Needs':>9}  {'Picks':>6}{'Bytes':>11}{'vs 1':>7}  {'Modern':>6}{'Bytes':>11}{'vs 1':>7}")
+        summary = []
+        for kind, path, field, (width, height), channels, _ in IMAGE_UPLOADS:
+            if kind == 'profile' and not self.include_profile:
+                print("profile: skipped, uploading one replaces the target's profile image (runs with --standin)")
+                continue
+            try:
+                upload = self.upload(path, field, synthetic_png(width, height, channels, seed=len(summary)))
+                image_set = upload['imageSet']
+                sizes = self.fetch_sizes(image_set)
+                self.check_variants(kind, image_set, sizes, failures)
+                self.check_formats(kind, image_set, sizes, failures)
+                if None not in sizes.values():
+                    summary.append((kind, *self.report_savings(kind, image_set, sizes)))
+                    if not image_set['sources']:
+                        print("  (no modern format: the server has no encoder for one)")
+                delete = self.attach(kind, upload, failures)
+                if kind == 'profile':
+                    # Replacing the profile image must remove the old one's variants
+                    self.upload(path, field, synthetic_png(64, 64, channels, seed=99))
+                elif delete:
+                    delete()
+                self.check_cleanup(kind, sizes, failures)
+            except (requests.exceptions.RequestException, ValueError, KeyError) as error:
+                failures.append(f"{kind}: {error}")
+        print("-" * 80)
+        for kind, ratio, modern_ratio in summary:
+            line = f"{kind}: srcset averages {ratio:.0%} of the single image's bytes across the screens above"
+            if modern_ratio is not None:
+                line += f", {modern_ratio:.0%} in the modern format"
+            print(line)
@@ -0,0 +1,221 @@
+"""
+Server CPU, response size and throughput of the list routes read as hydrated
+Mongoose documents and through the lean read path.
+"""
+
+import gzip
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bulk_import import delete_all, import_catalogue
+
+from .base import Benchmark
+from .timing import percentile
+
+# List reads --bench-lean compares: (path, served from the response cache). Cached
+# routes get a unique query parameter per request, so every one is computed.
+LEAN_READ_ENDPOINTS = [
+    ('/portfolio/projects', True),
+    ('/portfolio/projects/featured', True),
+    ('/portfolio/tech-stack', True),
+    ('/admin/projects', False),
+    ('/admin/tech-stack', False),
+    ('/admin/contact/messages?page=1&limit=100', False),
+    ('/admin/contact/messages?limit=100', False),
+    ('/admin/dashboard', False),
+]
+
+def server_cpu_ms(response):
+    """CPU time from a Server-Timing: cpu;dur=<ms> header, or None without one"""
+    match = re.search(r'(?:^|,)\s*cpu;dur=([\d.]+)', response.headers.get('Server-Timing', ''))
+    return float(match.group(1)) if match else None
+
+def projected_from(lean, hydrated, path='data'):
+    """Differences between a lean response and the hydrated one: every value in the
+    lean one must be the hydrated one's, which may carry more fields"""
+    if isinstance(lean, dict):
+        if not isinstance(hydrated, dict):
+            return [f"{path}: object in the lean response only"]
+        missing = [f"{path}.{key}: not in the hydrated response" for key in lean if key not in hydrated]
+        return missing + [problem for key in lean if key in hydrated
+                          for problem in projected_from(lean[key], hydrated[key], f"{path}.{key}")]
+    if isinstance(lean, list):
+        if not isinstance(hydrated, list) or len(lean) != len(hydrated):
+            return [f"{path}: {len(lean)} items, hydrated response has a different list"]
+        return [problem for index, (item, other) in enumerate(zip(lean, hydrated))
+                for problem in projected_from(item, other, f"{path}[{index}]")]
+    return [] if lean == hydrated else [f"{path}: {lean!r} != {hydrated!r}"]
+
+class LeanReadBenchmark(Benchmark):
+    """Per-request server CPU, response size and throughput of the list routes read
+    as hydrated Mongoose documents (?read=hydrated, which the server only honours
+    with HYDRATED_READ_PARAM=true) and through the lean read path. The stand-in
+    has no document hydration, so its timings say nothing about the real read
+    paths: with compare_cpu=False only the sizes and the lean projection are
+    checked, and CPU and throughput are left unmeasured."""
+
+    title = "LEAN READ BENCHMARK"
+    login_reason = "no catalogue can be generated"
+    READS = ('hydrated', 'lean')
+
+    def __init__(self, api_base=None, items=2000, iterations=50, concurrency=4, compare_cpu=True):
+        super().__init__(api_base)
+        self.items = items
+        self.iterations = iterations
+        self.concurrency = concurrency
+        self.compare_cpu = compare_cpu
+        self.requests_made = 0
+        self.counter_lock = threading.Lock()
+
+    def catalogue(self, run_id):
+        """Projects with image sets and tech stack items, the size of a grown portfolio"""
+        categories = ('Frontend', 'Backend', 'Database', 'Tools', 'Cloud', 'Mobile')
+        widths = (320, 640, 960, 1280)
+
+        def image_set(index):
+            base = f"https://res.cloudinary.com/demo/image/upload/portfolio/projects/lean-{run_id}-{index}"
+            return {
+                'src': f"{base}-1280w.jpg",
+                'srcset': ', '.join(f"{base}-{width}w.jpg {width}w" for width in widths),
+                'sources': [{'type': 'image/webp',
+                             'srcset': ', '.join(f"{base}-{width}w.webp {width}w" for width in widths)}],
+                'sizes': '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw',
+                'width': 1600,
+                'height': 1200,
+                'publicIds': [f"portfolio/projects/lean-{run_id}-{index}"],
+            }
+
+        projects = [{
+            'title': f"Lean {run_id} project {index}",
+            'description': f"Generated project {index} for the lean read benchmark, with an image set "
+                           f"and a typical tech stack",
+            'category': ('AI', 'Web')[index % 2],
+            'image': f"https://res.cloudinary.com/demo/image/upload/lean-{run_id}-{index}.jpg",
+            'imageSet': image_set(index),
+            'techStack': ['React', 'Node.js', 'MongoDB', f"Lib{index % 17}"],
+            'githubUrl': f"https://github.com/example/lean-{index}",
+            'liveUrl': f"https://lean-{index}.example.com",
+            'featured': False,
+            'order': index,
+        } for index in range(self.items)]
+        tech_stack = [{
+            'name': f"Lean {run_id} tech {index}",
+            'icon': 'Code',
+            'color': f"#{index % 0xffffff:06x}",
+            'category': categories[index % len(categories)],
+            'order': index,
+        } for index in range(self.items)]
+        return projects, tech_stack
+
+    def url(self, path, cached, read):
+        params = [] if read == 'lean' else ['read=hydrated']
+        if cached:
+            with self.counter_lock:
+                self.requests_made += 1
+                params.append(f"nocache={self.requests_made}")
+        if not params:
+            return f"{self.api_base}{path}"
+        return f"{self.api_base}{path}{'&' if '?' in path else '?'}{'&'.join(params)}"
+
+    def fetch(self, session, path, cached, read):
+        """(server CPU ms or None, decoded bytes, bytes on the wire, parsed body) of one request"""
+        response = session.get(self.url(path, cached, read), stream=True, timeout=60,
+                               headers={'Accept-Encoding': 'gzip'})
+        raw = response.raw.read(decode_content=False)
+        response.raise_for_status()
+        body = gzip.decompress(raw) if response.headers.get('Content-Encoding') == 'gzip' else raw
+        return server_cpu_ms(response), len(body), len(raw), json.loads(body)
+
+    def throughput(self, path, cached, read):
+        """Requests per second with concurrency clients, each sending iterations requests"""
+        def client(_):
+            with requests.Session() as session:
+                session.headers['Authorization'] = f"Bearer {self.tester.auth_token}"
+                for _ in range(self.iterations):
+                    self.fetch(session, path, cached, read)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(client, range(self.concurrency)))
+        return self.concurrency * self.iterations / (time.perf_counter() - started)
+
+    def measure_read(self, path, cached, read):
+        """(sorted CPU ms, decoded bytes, wire bytes, req/s or None, last body) of one
+        route and read path; nothing is timed unless compare_cpu"""
+        cpu, size, wire, body = [], 0, 0, None
+        for _ in range(self.iterations if self.compare_cpu else 1):
+            cpu_ms, size, wire, body = self.fetch(self.tester.session, path, cached, read)
+            if cpu_ms is not None:
+                cpu.append(cpu_ms)
+        rate = self.throughput(path, cached, read) if self.compare_cpu else None
+        return sorted(cpu), size, wire, rate, body
+
+    def measure(self, failures):
+        """Generate a catalogue, measure both read paths of every list route and delete it"""
+        run_id = int(time.time())
+        try:
+            created = import_catalogue(self.tester.session, self.api_base, *self.catalogue(run_id))
+        except requests.exceptions.RequestException as error:
+            failures.append(f"generating the catalogue failed: {error}")
+            return
+        print(f"{len(created['projects'])} projects and {len(created['techStack'])} tech stack items generated")
+        if self.compare_cpu:
+            print(f"{self.iterations} sequential requests per row for CPU (Server-Timing, set CPU_TIME_HEADER=true "
+                  f"on the server) and size, then {self.concurrency} clients for throughput")
+        else:
+            print("NOT MEASURED: hydrated vs lean CPU and throughput. The stand-in doesn't hydrate documents, so "
+                  "only response sizes and the lean projection are checked. Run against Node with "
+                  "CPU_TIME_HEADER=true and HYDRATED_READ_PARAM=true (--target) for the comparison.")
+        print("-" * 80)
+        print(f"{'Endpoint':<42}{'Read':<10}{'CPU p50':>9}{'p99':>8}{'KB':>9}{'gzip KB':>9}{'req/s':>8}")
+
+        summary = []
+        identical = 0
+        try:
+            for path, cached in LEAN_READ_ENDPOINTS:
+                measured = {}
+                for read in self.READS:
+                    cpu, size, wire, rate, body = self.measure_read(path, cached, read)
+                    measured[read] = (cpu, size, rate)
+                    if self.compare_cpu and not cpu:
+                        failures.append(f"{path}: no Server-Timing CPU time; run the server with "
+                                        f"CPU_TIME_HEADER=true")
+                    cpu_p50 = f"{percentile(cpu, 50):.2f}" if self.compare_cpu and cpu else 'n/a'
+                    cpu_p99 = f"{percentile(cpu, 99):.2f}" if self.compare_cpu and cpu else 'n/a'
+                    rate_text = f"{rate:.0f}" if rate is not None else 'n/a'
+                    print(f"{path:<42}{read:<10}{cpu_p50:>9}{cpu_p99:>8}{size / 1024:>9.1f}"
+                          f"{wire / 1024:>9.1f}{rate_text:>8}")
+                    measured[f"{read} body"] = body
+                identical += measured['lean body'] == measured['hydrated body']
+                problems = projected_from(measured['lean body'], measured['hydrated body'])
+                if problems:
+                    failures.append(f"{path}: lean response differs from the hydrated one: {problems[0]}")
+                summary.append((path, measured['hydrated'], measured['lean']))
+        except (requests.exceptions.RequestException, ValueError) as error:
+            failures.append(f"lean reads: {error}")
+        finally:
+            deleted = (delete_all(self.tester.session, self.api_base, 'projects', created['projects'])
+                       + delete_all(self.tester.session, self.api_base, 'techStack', created['techStack']))
+            if deleted != len(created['projects']) + len(created['techStack']):
+                failures.append(f"cleanup deleted {deleted} generated documents")
+        # The public lists leave out fields every document has, so identical bodies
+        # everywhere mean the server read them all lean
+        if summary and identical == len(summary):
+            failures.append("?read=hydrated was ignored; run the server with HYDRATED_READ_PARAM=true")
+
+        print("-" * 80)
+        for path, (hydrated_cpu, hydrated_size, hydrated_rate), (lean_cpu, lean_size, lean_rate) in summary:
+            line = f"{path:<42}"
+            if self.compare_cpu and hydrated_cpu and lean_cpu and percentile(hydrated_cpu, 50):
+                line += f" CPU {percentile(lean_cpu, 50) / percentile(hydrated_cpu, 50):>4.0%}"
+            line += f"  size {lean_size / hydrated_size:>4.0%}"
+            if lean_rate is not None:
+                line += f"  throughput {lean_rate / hydrated_rate:.2f}x"
+            print(line)
+        if not self.compare_cpu:
+            print("CPU and throughput NOT MEASURED on the stand-in (see above); sizes only")
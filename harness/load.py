@@ -0,0 +1,465 @@
+"""
+Load generation: concurrent replays of the functional tests, the cluster worker
+scaling benchmark built on them, and what is read from the server meanwhile
+(the MongoDB pool from /api/admin/db-metrics, route timings from /api/metrics).
+"""
+
+import multiprocessing
+import os
+import re
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from .base import Benchmark
+from .config import API_BASE, STANDIN_SCRIPT
+from .tester import PortfolioAPITester
+from .timing import LatencyHistogram, LatencyRecorder
+
+# Test calls replayed by the load generator, with the endpoint each one hits
+LOAD_TESTS = {
+    'test_health_check': 'GET /api/health',
+    'test_root_endpoint': 'GET /api',
+    'test_personal_info': 'GET /api/portfolio/personal',
+    'test_projects_all': 'GET /api/portfolio/projects',
+    'test_projects_ai_filter': 'GET /api/portfolio/projects?category=AI',
+    'test_projects_web_filter': 'GET /api/portfolio/projects?category=Web',
+    'test_tech_stack': 'GET /api/portfolio/tech-stack',
+    'test_portfolio_stats': 'GET /api/portfolio/stats',
+}
+
+ADMIN_LOAD_TESTS = {
+    'test_jwt_verification': 'POST /api/auth/verify',
+    'test_admin_dashboard': 'GET /api/admin/dashboard',
+    'test_admin_projects': 'GET /api/admin/projects',
+    'test_admin_personal': 'GET /api/admin/personal',
+    'test_admin_tech_stack': 'GET /api/admin/tech-stack',
+}
+
+# Seconds of load each histogram of LoadGenerator.timeline covers
+TIMELINE_SLOT = 0.1
+
+class LoadGenerator:
+    """Replays PortfolioAPITester calls from a pool of concurrent workers"""
+
+    def __init__(self, api_base=None, concurrency=10, duration=30, tests=None, include_admin=False):
+        self.api_base = api_base or API_BASE
+        self.concurrency = concurrency
+        self.duration = duration
+        self.tests = dict(tests or LOAD_TESTS)
+        if include_admin and not tests:
+            self.tests.update(ADMIN_LOAD_TESTS)
+        # Admin endpoints need every worker to hold its own token
+        self.needs_login = any(name in ADMIN_LOAD_TESTS for name in self.tests)
+        self.recorder = LatencyRecorder()
+        self.elapsed = 0.0
+        # Latencies of the calls finished in each TIMELINE_SLOT, keyed by
+        # int(perf_counter() / TIMELINE_SLOT), to line them up with server samples
+        self.timeline = {}
+
+    def _worker(self, worker_id, deadline):
+        """Call the configured tests round-robin until the deadline passes; returns
+        ({name: [latency histogram, errors]}, timeline)"""
+        tester = PortfolioAPITester(self.api_base, verbose=False, recorder=self.recorder, keep_results=False)
+        if self.needs_login and not tester.test_admin_login_correct():
+            return {}, {}
+
+        stats = {name: [LatencyHistogram(), 0] for name in self.tests}
+        timeline = {}
+        names = list(self.tests)
+        # Stagger the starting test so workers don't all hit one endpoint at once
+        index = worker_id % len(names)
+        while time.perf_counter() < deadline:
+            name = names[index]
+            start = time.perf_counter()
+            success = getattr(tester, name)()
+            finished = time.perf_counter()
+            stats[name][0].record(finished - start)
+            stats[name][1] += not success
+            slot = int(finished / TIMELINE_SLOT)
+            timeline.setdefault(slot, LatencyHistogram()).record(finished - start)
+            index = (index + 1) % len(names)
+        return stats, timeline
+
+    def run(self):
+        """Run the load test and return {name: [latency histogram, errors]} per endpoint"""
+        start = time.perf_counter()
+        deadline = start + self.duration
+        merged = {name: [LatencyHistogram(), 0] for name in self.tests}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(self._worker, i, deadline) for i in range(self.concurrency)]
+            for future in futures:
+                stats, timeline = future.result()
+                for name, (histogram, errors) in stats.items():
+                    merged[name][0].merge(histogram)
+                    merged[name][1] += errors
+                for slot, histogram in timeline.items():
+                    self.timeline.setdefault(slot, LatencyHistogram()).merge(histogram)
+        self.elapsed = time.perf_counter() - start
+        return merged
+
+    def report(self, merged):
+        """Print throughput and latency percentiles for each endpoint"""
+        print("=" * 80)
+        print("PORTFOLIO BACKEND LOAD TEST")
+        print("=" * 80)
+        print(f"Target: {self.api_base}")
+        print(f"Concurrency: {self.concurrency} workers, duration: {self.elapsed:.1f}s")
+        print("-" * 80)
+        print(f"{'Endpoint':<44}{'Reqs':>7}{'Errs':>6}{'Req/s':>8}{'p50':>8}{'p95':>8}{'p99':>8}")
+
+        total_requests = 0
+        total_errors = 0
+        for name, endpoint in self.tests.items():
+            histogram, errors = merged[name]
+            total_requests += histogram.count
+            total_errors += errors
+            throughput = histogram.count / self.elapsed if self.elapsed else 0.0
+            print(f"{endpoint:<44}{histogram.count:>7}{errors:>6}{throughput:>8.1f}"
+                  f"{histogram.percentile(50):>8.1f}{histogram.percentile(95):>8.1f}"
+                  f"{histogram.percentile(99):>8.1f}")
+
+        print("-" * 80)
+        print(f"Total: {total_requests} requests, {total_errors} errors, "
+              f"{total_requests / self.elapsed if self.elapsed else 0.0:.1f} req/s (latencies in ms)")
+        print("=" * 80)
+        return total_requests, total_errors
+
+def load_process(api_base, concurrency, duration, tests):
+    """Run a LoadGenerator in this process; returns (requests, errors, latency histogram).
+    Used by WorkerScalingBenchmark, so the load isn't capped by one client process."""
+    generator = LoadGenerator(api_base=api_base, concurrency=concurrency, duration=duration, tests=tests)
+    latencies, errors = LatencyHistogram(), 0
+    for histogram, endpoint_errors in generator.run().values():
+        latencies.merge(histogram)
+        errors += endpoint_errors
+    return latencies.count, errors, latencies
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+def launch_server(command, port, env, name='server', startup_timeout=60):
+    """Start a server listening on port; returns (process, api_base) once it answers"""
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+    api_base = f"http://127.0.0.1:{port}/api"
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline and process.poll() is None:
+        try:
+            if requests.get(f"{api_base}/health", timeout=2).status_code == 200:
+                return process, api_base
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f"{name} did not come up on port {port}")
+
+def stop_server(process):
+    """SIGTERM, so the server drains like it would in production"""
+    if process.poll() is None:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+class WorkerScalingBenchmark(Benchmark):
+    """Starts the server with each worker count in turn and measures read throughput
+    under the same load, to show how it scales with CLUSTER_WORKERS"""
+
+    title = "CLUSTER WORKER SCALING BENCHMARK"
+
+    def __init__(self, worker_counts, server_cmd, client_processes=None, concurrency=10, duration=10,
+                 tests=None, startup_timeout=60):
+        self.worker_counts = worker_counts
+        self.server_cmd = server_cmd
+        self.client_processes = client_processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.duration = duration
+        self.tests = dict(tests or LOAD_TESTS)
+        self.startup_timeout = startup_timeout
+        # The load runs in client processes of its own, which record nothing here
+        self.recorder = LatencyRecorder()
+
+    def start_server(self, workers):
+        """Start the server with workers workers; returns (process, api_base) once it answers"""
+        port = free_port()
+        if self.server_cmd:
+            command = shlex.split(self.server_cmd)
+        else:
+            command = [sys.executable, STANDIN_SCRIPT, '--port', str(port), '--workers', str(workers),
+                       '--general-rate-max', '0']
+        # The general limit of 100 requests per 15 minutes would turn the load into 429s
+        env = dict(os.environ, CLUSTER_WORKERS=str(workers), PORT=str(port), RATE_LIMIT_MAX='1000000000')
+        return launch_server(command, port, env, f"server with {workers} worker(s)", self.startup_timeout)
+
+    def load(self, api_base):
+        """(requests, errors, latency histogram) of the load on one server"""
+        # Spawned client processes: a single Python client would saturate before the server
+        with ProcessPoolExecutor(self.client_processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+            runs = [pool.submit(load_process, api_base, self.concurrency, self.duration, self.tests)
+                    for _ in range(self.client_processes)]
+            results = [run.result() for run in runs]
+        latencies = LatencyHistogram()
+        for _, _, run_latencies in results:
+            latencies.merge(run_latencies)
+        return sum(result[0] for result in results), sum(result[1] for result in results), latencies
+
+    def describe(self):
+        return [f"Server: {self.server_cmd or 'stand-in (backend_standin.py --workers N)'}",
+                f"Load: {self.client_processes} client process(es) x {self.concurrency} workers, "
+                f"{self.duration:.0f}s per worker count, on a host with {os.cpu_count()} core(s)"]
+
+    def measure(self, failures):
+        """Measure every worker count in turn"""
+        print("-" * 80)
+        print(f"{'Workers':<10}{'Requests':>10}{'Errors':>8}{'Req/s':>10}{'p50':>9}{'p99':>9}{'Speedup':>9}")
+        baseline = None
+        for workers in self.worker_counts:
+            try:
+                process, api_base = self.start_server(workers)
+            except RuntimeError as error:
+                failures.append(str(error))
+                continue
+            try:
+                count, errors, latencies = self.load(api_base)
+            finally:
+                stop_server(process)
+            throughput = count / self.duration
+            baseline = baseline or throughput
+            print(f"{workers:<10}{count:>10}{errors:>8}{throughput:>10.1f}{latencies.percentile(50):>9.1f}"
+                  f"{latencies.percentile(99):>9.1f}{throughput / baseline if baseline else 0:>8.2f}x")
+            if errors:
+                failures.append(f"{workers} worker(s): {errors} failed requests")
+            if process.returncode not in (0, -signal.SIGTERM):
+                failures.append(f"{workers} worker(s): server exited with {process.returncode} on SIGTERM")
+
+        print("-" * 80)
+        print("Speedup is relative to the first worker count; it levels off at the number of cores "
+              "(latencies in ms)")
+
+class PoolSampler:
+    """Polls /api/admin/db-metrics in the background during a load run, then lines the
+    pool samples up with the client latencies of the same intervals"""
+
+    def __init__(self, api_base=None, interval=1.0):
+        self.api_base = api_base or API_BASE
+        self.interval = interval
+        self.tester = PortfolioAPITester(self.api_base, verbose=False)
+        self.samples = []
+        self.errors = []
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if not self.tester.test_admin_login_correct():
+            self.errors.append("admin login failed, db-metrics can't be read")
+            return False
+        self.sample()
+        self.thread = threading.Thread(target=self.loop, name='pool-sampler', daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.sample()
+
+    def loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        try:
+            response = self.tester.session.get(f"{self.api_base}/admin/db-metrics", timeout=10)
+            response.raise_for_status()
+            self.samples.append((time.perf_counter(), response.json()['data']))
+        except (requests.exceptions.RequestException, KeyError, ValueError) as error:
+            self.errors.append(str(error))
+
+    @staticmethod
+    def operation_totals(snapshot):
+        operations = snapshot.get('operations', {}).values()
+        return sum(op['count'] for op in operations), sum(op['totalMs'] for op in operations)
+
+    def report(self, timeline):
+        """Print one row per sampling interval, with the client latencies of a
+        LoadGenerator.timeline; returns the number of sampling errors"""
+        print("=" * 80)
+        print(f"DB POOL DURING LOAD (/api/admin/db-metrics every {self.interval:g}s; "
+              f"latencies in ms)")
+        print("=" * 80)
+        if len(self.samples) < 2:
+            print("Not enough samples")
+        else:
+            first = self.samples[0][1]['pool']
+            print(f"maxPoolSize: {first.get('maxPoolSize', 'driver default')}")
+            print("-" * 80)
+            print(f"{'Time':>6}{'PID':>8}{'Out':>6}{'Idle':>6}{'WaitQ':>7}{'Ops/s':>8}{'Op avg':>8}"
+                  f"{'Wait avg':>10}{'Client p50':>11}{'p99':>8}")
+            started = self.samples[0][0]
+            congested, clear = LatencyHistogram(), LatencyHistogram()
+            for (previous_at, previous), (sampled_at, current) in zip(self.samples, self.samples[1:]):
+                pool, previous_pool = current['pool'], previous['pool']
+                count, total_ms = self.operation_totals(current)
+                previous_count, previous_total_ms = self.operation_totals(previous)
+                ops = count - previous_count
+                # Counters are per process; a different worker's sample can't be diffed
+                same_process = current.get('pid') == previous.get('pid')
+                waits = pool['checkOutWait']['count'] - previous_pool['checkOutWait']['count']
+                wait_ms = pool['checkOutWait']['totalMs'] - previous_pool['checkOutWait']['totalMs']
+                latencies = LatencyHistogram()
+                for slot, histogram in timeline.items():
+                    if previous_at < slot * TIMELINE_SLOT <= sampled_at:
+                        latencies.merge(histogram)
+                (congested if pool['waitQueue'] else clear).merge(latencies)
+                print(f"{sampled_at - started:>6.1f}{current.get('pid', ''):>8}{pool['checkedOut']:>6}"
+                      f"{pool['idle']:>6}{pool['waitQueue']:>7}"
+                      f"{(ops / (sampled_at - previous_at) if same_process else 0):>8.0f}"
+                      f"{(total_ms - previous_total_ms) / ops if same_process and ops else 0:>8.2f}"
+                      f"{wait_ms / waits if same_process and waits else 0:>10.2f}"
+                      f"{latencies.percentile(50):>11.1f}{latencies.percentile(99):>8.1f}")
+            print("-" * 80)
+            for label, latencies in (('with a wait queue', congested), ('without', clear)):
+                if latencies.count:
+                    print(f"Client latency in intervals {label}: p50 {latencies.percentile(50):.1f}, "
+                          f"p99 {latencies.percentile(99):.1f} ({latencies.count} requests)")
+        if self.errors:
+            print(f"\n❌ {len(self.errors)} sampling error(s): {self.errors[0]}")
+        print("=" * 80)
+        return len(self.errors)
+
+def parse_prometheus(text):
+    """Samples of a Prometheus text exposition as {(name, ((label, value), ...)): value}"""
+    samples = {}
+    sample_re = re.compile(r'^(\w+)(?:\{(.*)\})?\s+(\S+)')
+    label_re = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+    for line in text.splitlines():
+        match = sample_re.match(line)
+        if not match or line.startswith('#'):
+            continue
+        name, labels, value = match.groups()
+        labels = tuple(sorted((label, re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), raw))
+                              for label, raw in label_re.findall(labels or '')))
+        try:
+            samples[(name, labels)] = float(value)
+        except ValueError:
+            continue
+    return samples
+
+class ServerMetricsScraper:
+    """Scrapes /api/metrics before and after a run and sets the server's own time per
+    route template next to the client-side latency of the same requests"""
+
+    def __init__(self, api_base=None, token=None, metrics_url=None):
+        self.api_base = api_base or API_BASE
+        # METRICS_PORT deployments serve the metrics on their own, unauthenticated URL
+        self.metrics_url = metrics_url or f"{self.api_base}/metrics"
+        self.token = token
+        # Plain session, so scrapes don't show up in the client latency being compared
+        self.session = requests.Session()
+        self.error = None
+
+    def authorize(self):
+        if self.token is None and self.metrics_url.startswith(self.api_base):
+            tester = PortfolioAPITester(self.api_base, verbose=False)
+            if not tester.test_admin_login_correct():
+                raise ValueError("admin login failed")
+            self.token = tester.auth_token
+        if self.token:
+            self.session.headers['Authorization'] = f'Bearer {self.token}'
+
+    def scrape(self):
+        """Parsed samples, or None (with self.error set) if the metrics can't be read"""
+        try:
+            if 'Authorization' not in self.session.headers:
+                self.authorize()
+            response = self.session.get(self.metrics_url, timeout=10)
+            response.raise_for_status()
+            return parse_prometheus(response.text)
+        except (requests.exceptions.RequestException, ValueError) as error:
+            self.error = str(error)
+            return None
+
+    @staticmethod
+    def route_times(before, after):
+        """{(method, route): (requests, total seconds)} answered between two scrapes"""
+        times = {}
+        for (name, labels), value in after.items():
+            if name not in ('http_request_duration_seconds_count', 'http_request_duration_seconds_sum'):
+                continue
+            labels_map = dict(labels)
+            key = (labels_map.get('method'), labels_map.get('route'))
+            delta = value - before.get((name, labels), 0.0)
+            count, total = times.get(key, (0.0, 0.0))
+            times[key] = (count + delta, total) if name.endswith('_count') else (count, total + delta)
+        return {key: value for key, value in times.items() if value[0] > 0}
+
+    @staticmethod
+    def route_pattern(route):
+        """Paths a route label covers: :param is one segment, a trailing /* (requests a
+        router answered before any route) anything below the mount path"""
+        pattern = re.sub(r':\w+', '[^/]+', re.escape(route).replace('\\:', ':'))
+        return re.compile(pattern.replace('/\\*', '(/.*)?') + '/?')
+
+    def report(self, before, after, recorder):
+        """Print server vs client time per route between two scrapes"""
+        print(f"\n🖥️ SERVER vs CLIENT TIME (ms, from {self.metrics_url})")
+        if before is None or after is None:
+            print(f"Server metrics unavailable: {self.error}")
+            return
+        routes = {key: value for key, value in self.route_times(before, after).items()
+                  if key[1] != urlsplit(self.metrics_url).path}
+        # Client endpoints are raw paths; fold them into the route template that served them
+        client = {}
+        with recorder.lock:
+            for endpoint, phases in recorder.histograms.items():
+                method, path = endpoint.split(' ', 1)
+                matched = [route for (route_method, route) in routes if route_method == method
+                           and route != 'unmatched' and self.route_pattern(route).fullmatch(path)]
+                # Prefer literal routes (/projects/bulk) over parameterised ones (/projects/:id)
+                # and those over whole routers (/api/admin/*)
+                fallback = 'unmatched' if (method, 'unmatched') in routes else path
+                route = min(matched, key=lambda candidate: (candidate.endswith('/*'), candidate.count(':')),
+                            default=fallback)
+                count, total = client.get((method, route), (0, 0))
+                client[(method, route)] = (count + phases['total'].count, total + phases['total'].total / 1000.0)
+
+        print(f"{'Route':<46}{'Server':>7}{'Client':>7}{'Server':>9}{'Client':>9}{'Outside':>9}")
+        print(f"{'':<46}{'reqs':>7}{'reqs':>7}{'mean':>9}{'mean':>9}{'server':>9}")
+        for key in sorted(set(routes) | set(client), key=lambda item: (item[1], item[0])):
+            server_count, server_total = routes.get(key, (0, 0.0))
+            client_count, client_total = client.get(key, (0, 0.0))
+            server_mean = server_total * 1000 / server_count if server_count else None
+            client_mean = client_total / client_count if client_count else None
+            outside = (f"{client_mean - server_mean:>9.2f}" if server_mean is not None and client_mean is not None
+                       else f"{'-':>9}")
+            print(f"{key[0] + ' ' + key[1]:<46}{int(server_count):>7}{client_count:>7}"
+                  f"{(f'{server_mean:.2f}' if server_mean is not None else '-'):>9}"
+                  f"{(f'{client_mean:.2f}' if client_mean is not None else '-'):>9}{outside}")
+
+        gauges = {name: value for (name, labels), value in after.items() if not labels}
+        lag = {dict(labels).get('stat'): value for (name, labels), value in after.items()
+               if name == 'nodejs_eventloop_lag_seconds'}
+        details = []
+        if lag:
+            details.append(f"event-loop lag p99 {lag.get('p99', 0) * 1000:.1f}ms, max {lag.get('max', 0) * 1000:.1f}ms")
+        if 'nodejs_heap_size_used_bytes' in gauges:
+            details.append(f"heap {gauges['nodejs_heap_size_used_bytes'] / 2**20:.1f}/"
+                           f"{gauges.get('nodejs_heap_size_total_bytes', 0) / 2**20:.1f} MiB")
+        if 'process_resident_memory_bytes' in gauges:
+            details.append(f"RSS {gauges['process_resident_memory_bytes'] / 2**20:.1f} MiB")
+        if details:
+            print("Server: " + ", ".join(details))
+        print("Outside server = client mean - server mean: network, connection handling and client overhead")
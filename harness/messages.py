@@ -0,0 +1,187 @@
+"""
+Benchmarks of reading the contact messages: offset against keyset pagination,
+and paginated reads against the streamed export.
+"""
+
+import time
+import tracemalloc
+from collections import Counter
+
+import requests
+
+from contact_export import stream_contacts
+
+from .base import Benchmark
+from .timing import LatencyHistogram
+
+class PaginationBenchmark(Benchmark):
+    """Compares deep-page latency of offset (?page=) and keyset (?cursor=) message pagination"""
+
+    title = "ADMIN MESSAGE PAGINATION BENCHMARK"
+    login_reason = "the messages can't be read"
+    LIST_FIELDS = 'name,email,status,createdAt'
+
+    def __init__(self, api_base=None, iterations=20, page_size=20):
+        super().__init__(api_base)
+        self.iterations = iterations
+        self.page_size = page_size
+        # The cursor walk steps a whole number of pages at a time, at most 100 messages
+        self.walk_limit = page_size * max(1, 100 // page_size)
+
+    def get(self, params):
+        session = self.tester.session
+        response = session.get(f"{self.api_base}/admin/contact/messages", params=params, timeout=30)
+        return response, session.pop_last_timing()
+
+    def walk(self, failures):
+        """Follow nextCursor over every message; returns ({offset: cursor}, total)"""
+        cursors = {0: None}
+        seen = set()
+        params = {'limit': self.walk_limit, 'fields': 'status'}
+        offset = 0
+        total = None
+        while True:
+            response, _ = self.get(params)
+            if response.status_code != 200:
+                failures.append(f"cursor walk at offset {offset}: HTTP {response.status_code}")
+                break
+            data = response.json()['data']
+            total = data['pagination']['total']
+            ids = [contact['_id'] for contact in data['contacts']]
+            if seen.intersection(ids):
+                failures.append(f"cursor walk at offset {offset}: page repeats messages")
+            seen.update(ids)
+            offset += len(ids)
+            cursor = data['pagination']['nextCursor']
+            if not cursor:
+                break
+            cursors[offset] = cursor
+            params = dict(params, cursor=cursor)
+        if total is not None and len(seen) != total:
+            failures.append(f"cursor walk visited {len(seen)} of {total} messages")
+        return cursors, len(seen)
+
+    def measure(self, failures):
+        """Time offset and keyset pages at increasing depth"""
+        started = time.time()
+        cursors, total = self.walk(failures)
+        print(f"Cursor walk over {total} messages ({self.walk_limit} per page): {time.time() - started:.2f}s")
+        step = self.walk_limit
+        depths = sorted({offset for offset in (0, 1000, 10000, 50000, (total - 1) // step * step)
+                         if 0 <= offset < total and offset % step == 0})
+
+        print(f"{self.iterations} requests per depth, {self.page_size} messages per page (latencies in ms)")
+        print("-" * 80)
+        print(f"{'Offset':>10}{'offset p50':>12}{'offset p99':>12}{'keyset p50':>12}{'keyset p99':>12}{'Speedup':>10}")
+        for offset in depths:
+            legacy_params = {'page': offset // self.page_size + 1, 'limit': self.page_size}
+            keyset_params = {'limit': self.page_size}
+            if cursors.get(offset):
+                keyset_params['cursor'] = cursors[offset]
+
+            histograms = []
+            pages = []
+            for params in (legacy_params, keyset_params):
+                histogram = LatencyHistogram()
+                for _ in range(self.iterations):
+                    response, timing = self.get(params)
+                    if response.status_code != 200:
+                        failures.append(f"offset {offset} {params}: HTTP {response.status_code}")
+                        break
+                    histogram.record(timing['total'])
+                histograms.append(histogram)
+                pages.append([contact['_id'] for contact in response.json().get('data', {}).get('contacts', [])]
+                             if response.status_code == 200 else None)
+            if pages[0] != pages[1]:
+                failures.append(f"offset {offset}: offset and keyset pages hold different messages")
+
+            legacy, keyset = histograms
+            speedup = legacy.percentile(50) / keyset.percentile(50) if keyset.percentile(50) else 0.0
+            print(f"{offset:>10}{legacy.percentile(50):>12.2f}{legacy.percentile(99):>12.2f}"
+                  f"{keyset.percentile(50):>12.2f}{keyset.percentile(99):>12.2f}{speedup:>9.1f}x")
+
+        full, _ = self.get({'limit': self.page_size})
+        trimmed, _ = self.get({'limit': self.page_size, 'fields': self.LIST_FIELDS})
+        print("-" * 80)
+        print(f"Page size: {len(full.content)} bytes with every field, "
+              f"{len(trimmed.content)} bytes with fields={self.LIST_FIELDS}")
+
+class ExportBenchmark(Benchmark):
+    """Compares reading every contact message through the paginated list with one streamed export"""
+
+    title = "CONTACT MESSAGE EXPORT BENCHMARK"
+    login_reason = "the messages can't be read"
+
+    def __init__(self, api_base=None, page_size=100):
+        super().__init__(api_base)
+        self.page_size = page_size
+        self.requests = 0
+
+    def paginated(self):
+        """Messages from following nextCursor, one page request at a time"""
+        params = {'limit': self.page_size}
+        while True:
+            response = self.tester.session.get(f"{self.api_base}/admin/contact/messages", params=params, timeout=30)
+            response.raise_for_status()
+            self.requests += 1
+            data = response.json()['data']
+            yield from data['contacts']
+            if not data['pagination']['nextCursor']:
+                return
+            params = dict(params, cursor=data['pagination']['nextCursor'])
+
+    def exported(self, export_format):
+        self.requests += 1
+        return stream_contacts(self.tester.session, self.api_base, export_format)
+
+    @staticmethod
+    def consume(rows):
+        """Count and checksum rows as they arrive, without keeping them"""
+        count = 0
+        checksum = 0
+        statuses = Counter()
+        for row in rows:
+            count += 1
+            checksum = (checksum + int(row['_id'], 16)) % 2 ** 64
+            statuses[row['status']] += 1
+        return count, checksum, statuses
+
+    def measure(self, failures):
+        """Read everything three ways, then measure export memory"""
+        methods = [
+            (f"paginated ({self.page_size}/page)", self.paginated),
+            ('export ndjson', lambda: self.exported('ndjson')),
+            ('export csv', lambda: self.exported('csv')),
+        ]
+        print("-" * 80)
+        print(f"{'Method':<24}{'Requests':>10}{'Rows':>10}{'Seconds':>10}{'Rows/s':>12}")
+        reference = None
+        for label, rows in methods:
+            self.requests = 0
+            started = time.perf_counter()
+            try:
+                result = self.consume(rows())
+            except (requests.exceptions.RequestException, KeyError, ValueError) as error:
+                failures.append(f"{label}: {error}")
+                continue
+            elapsed = time.perf_counter() - started
+            print(f"{label:<24}{self.requests:>10}{result[0]:>10}{elapsed:>10.2f}"
+                  f"{result[0] / elapsed if elapsed else 0:>12.0f}")
+            if reference is None:
+                reference = result
+            elif result != reference:
+                failures.append(f"{label}: rows differ from the paginated read "
+                                f"({result[0]} vs {reference[0]} messages)")
+
+        # Client memory while streaming stays flat however many rows go by
+        tracemalloc.start()
+        try:
+            self.consume(self.exported('ndjson'))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        print("-" * 80)
+        if reference:
+            statuses = ', '.join(f"{status}: {count}" for status, count in sorted(reference[2].items()))
+            print(f"Messages by status: {statuses}")
+        print(f"Client peak memory while streaming the NDJSON export: {peak / 1024 / 1024:.2f} MB")
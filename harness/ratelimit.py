@@ -0,0 +1,110 @@
+"""
+Cost of the general rate limiter on the public read paths: no limiter, counters
+in the process, and shared counters written on every hit or in batches.
+"""
+
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .base import ComparisonBenchmark, median, spread
+from .timing import LatencyHistogram, TimedSession
+
+# Reads the general limiter guards, served from the response cache once warm
+RATE_LIMITED_READS = ['/portfolio/bundle', '/portfolio/projects', '/portfolio/tech-stack', '/portfolio/personal']
+
+class RateLimitBenchmark(ComparisonBenchmark):
+    """Read throughput and latency behind the general limiter in each of its
+    configurations. Targets are loaded in turn, round after round, so a slow
+    stretch of the machine shows up as spread instead of favouring one target."""
+
+    title = "GENERAL RATE LIMITER BENCHMARK"
+
+    def __init__(self, targets, concurrency=10, duration=5, rounds=3, store_latency=0.0):
+        # targets: [(label, api_base)] or, for the stand-ins, [(label, api_base, general limiter's store)];
+        # stores that write shared counters count their writes
+        super().__init__([(label, api_base, *rest, None)[:3] for label, api_base, *rest in targets])
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rounds = rounds
+        self.store_latency = store_latency
+
+    def worker(self, api_base, client_ip, deadline):
+        """GET the reads in turn as client_ip until the deadline; returns (histogram, statuses)"""
+        session = TimedSession(self.recorder)
+        histogram, statuses = LatencyHistogram(), Counter()
+        index = 0
+        while time.perf_counter() < deadline:
+            try:
+                response = session.get(f"{api_base}{RATE_LIMITED_READS[index % len(RATE_LIMITED_READS)]}",
+                                       headers={'X-Forwarded-For': client_ip}, timeout=30)
+                statuses[response.status_code] += 1
+                histogram.record(session.pop_last_timing()['total'])
+            except requests.exceptions.RequestException as error:
+                statuses[type(error).__name__] += 1
+            index += 1
+        return histogram, statuses
+
+    def load(self, api_base, seconds):
+        """(histogram, statuses, elapsed seconds) of concurrent reads, one client IP per worker"""
+        started = time.perf_counter()
+        deadline = started + seconds
+        histogram, statuses = LatencyHistogram(), Counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [pool.submit(self.worker, api_base, f"198.18.100.{index}", deadline)
+                       for index in range(self.concurrency)]
+            for future in futures:
+                worker_histogram, worker_statuses = future.result()
+                histogram.merge(worker_histogram)
+                statuses.update(worker_statuses)
+        return histogram, statuses, time.perf_counter() - started
+
+    def describe(self):
+        lines = super().describe() + [
+            f"{self.concurrency} concurrent clients, {self.duration:g}s per target per round, "
+            f"{self.rounds} rounds (latencies in ms)"]
+        if self.store_latency:
+            lines.append(f"Shared counter writes take {self.store_latency * 1000:g} ms more, "
+                         f"like a MongoDB round-trip (--standin-db-latency)")
+        return lines
+
+    def measure(self, failures):
+        """Load every target in turn, rounds times"""
+        histograms = {label: LatencyHistogram() for label, _, _ in self.targets}
+        throughputs = {label: [] for label, _, _ in self.targets}
+        writes = Counter()
+        for _, api_base, _ in self.targets:
+            # Fills the response cache and warms the connections
+            self.load(api_base, min(1.0, self.duration / 5))
+        for _ in range(self.rounds):
+            for label, api_base, store in self.targets:
+                writes_before = getattr(store, 'writes', 0)
+                histogram, statuses, elapsed = self.load(api_base, self.duration)
+                writes[label] += getattr(store, 'writes', 0) - writes_before
+                histograms[label].merge(histogram)
+                throughputs[label].append(histogram.count / elapsed if elapsed else 0.0)
+                unexpected = {status: count for status, count in statuses.items() if status != 200}
+                if unexpected:
+                    failures.append(f"{label}: unexpected responses {unexpected}")
+
+        print("-" * 80)
+        print(f"{'Limiter':<26}{'Reqs':>8}{'Req/s':>8}{'Range':>12}{'p50':>8}{'p99':>8}{'Writes/req':>12}")
+        for label, _, store in self.targets:
+            histogram = histograms[label]
+            shared = hasattr(store, 'writes') and histogram.count
+            per_request = f"{writes[label] / histogram.count:.3f}" if shared else '-'
+            print(f"{label:<26}{histogram.count:>8}{median(throughputs[label]):>8.0f}"
+                  f"{spread(throughputs[label]):>12}{histogram.percentile(50):>8.2f}"
+                  f"{histogram.percentile(99):>8.2f}{per_request:>12}")
+            if getattr(store, 'sync_hits', 1) > 1 and writes[label] >= histogram.count:
+                failures.append(f"{label}: {writes[label]} counter writes for {histogram.count} requests, "
+                                f"expected batches")
+        print("-" * 80)
+        baseline = median(throughputs[self.targets[0][0]])
+        if baseline and len(self.targets) > 1:
+            print(f"Median throughput relative to '{self.targets[0][0]}': " + ", ".join(
+                f"{label} {median(throughputs[label]) / baseline:.0%}" for label, _, _ in self.targets[1:]))
+        print("Range is the lowest and highest req/s of the rounds; where ranges overlap the\n"
+              "difference between two rows is within this machine's run-to-run noise.")
@@ -0,0 +1,392 @@
+"""
+Benchmarks of the read paths: the response cache, ETag revalidation, the
+aggregated dashboard/stats counts, the verified-user cache and the landing
+page bundle.
+"""
+
+import gzip
+import json
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .base import Benchmark, ComparisonBenchmark, db_roundtrips, mean_roundtrips
+from .timing import LatencyHistogram, percentile
+
+# Public reads served from the server-side response cache
+CACHED_ENDPOINTS = [
+    '/portfolio/personal',
+    '/portfolio/projects',
+    '/portfolio/projects?category=AI',
+    '/portfolio/projects/featured',
+    '/portfolio/tech-stack',
+    '/portfolio/stats',
+]
+
+class CacheBenchmark(Benchmark):
+    """Compares cold (cache miss) and warm (cache hit) latency of the cached portfolio reads"""
+
+    title = "PORTFOLIO RESPONSE CACHE BENCHMARK"
+    login_reason = "the cache can't be cleared between samples"
+
+    def __init__(self, api_base=None, iterations=50):
+        super().__init__(api_base)
+        self.iterations = iterations
+
+    def timed_get(self, path):
+        response = self.tester.session.get(f"{self.api_base}{path}", timeout=10)
+        timing = self.tester.session.pop_last_timing()
+        return response, timing['total']
+
+    def measure(self, failures):
+        """Clear the cache, then time a miss and a hit per endpoint"""
+        session = self.tester.session
+        histograms = {path: (LatencyHistogram(), LatencyHistogram()) for path in CACHED_ENDPOINTS}
+        for _ in range(self.iterations):
+            for path in CACHED_ENDPOINTS:
+                session.delete(f"{self.api_base}/admin/cache", timeout=10)
+                session.pop_last_timing()
+                for expected, histogram in zip(('MISS', 'HIT'), histograms[path]):
+                    response, seconds = self.timed_get(path)
+                    state = response.headers.get('X-Cache')
+                    if response.status_code != 200 or state != expected:
+                        failures.append(f"{path}: expected {expected}, got HTTP {response.status_code} X-Cache={state}")
+                    else:
+                        histogram.record(seconds)
+
+        print(f"{self.iterations} miss/hit pairs per endpoint (latencies in ms)")
+        print("-" * 80)
+        print(f"{'Endpoint':<42}{'miss p50':>10}{'miss p99':>10}{'hit p50':>10}{'hit p99':>10}{'Speedup':>10}")
+        for path, (miss, hit) in histograms.items():
+            speedup = miss.percentile(50) / hit.percentile(50) if hit.percentile(50) else 0.0
+            print(f"{'GET /api' + path:<42}{miss.percentile(50):>10.2f}{miss.percentile(99):>10.2f}"
+                  f"{hit.percentile(50):>10.2f}{hit.percentile(99):>10.2f}{speedup:>9.1f}x")
+
+        stats = session.get(f"{self.api_base}/admin/cache", timeout=10).json().get('data', {})
+        print("-" * 80)
+        print(f"Server cache: {stats.get('entries')} entries, {stats.get('hits')} hits, "
+              f"{stats.get('misses')} misses, {stats.get('evictions')} evictions")
+
+class RevalidationBenchmark(Benchmark):
+    """Compares full GETs with If-None-Match revalidations of the public portfolio reads"""
+
+    title = "PORTFOLIO ETAG REVALIDATION BENCHMARK"
+
+    def __init__(self, api_base=None, iterations=50):
+        super().__init__(api_base)
+        self.iterations = iterations
+
+    def describe(self):
+        return super().describe() + [
+            f"{self.iterations} full/conditional pairs per endpoint (latencies in ms, sizes in bytes)"]
+
+    def measure(self, failures):
+        """Time full and conditional requests per endpoint"""
+        print("-" * 80)
+        print(f"{'Endpoint':<42}{'200 p50':>9}{'304 p50':>9}{'200 TTFB':>10}{'304 TTFB':>10}{'200 body':>10}{'304 body':>10}")
+
+        session = self.tester.session
+        for path in CACHED_ENDPOINTS:
+            url = f"{self.api_base}{path}"
+            etag = session.get(url, timeout=10).headers.get('ETag')
+            session.pop_last_timing()
+            if not etag:
+                failures.append(f"{path}: no ETag")
+                continue
+
+            samples = {status: (LatencyHistogram(), LatencyHistogram()) for status in (200, 304)}
+            sizes = {200: 0, 304: 0}
+            for _ in range(self.iterations):
+                for headers in ({}, {'If-None-Match': etag}):
+                    response = session.get(url, headers=headers, timeout=10)
+                    timing = session.pop_last_timing()
+                    expected = 304 if headers else 200
+                    if response.status_code != expected:
+                        failures.append(f"{path}: expected HTTP {expected}, got {response.status_code}")
+                        continue
+                    total, ttfb = samples[expected]
+                    total.record(timing['total'])
+                    ttfb.record(timing['ttfb'])
+                    sizes[expected] = len(response.content)
+
+            print(f"{'GET /api' + path:<42}{samples[200][0].percentile(50):>9.2f}{samples[304][0].percentile(50):>9.2f}"
+                  f"{samples[200][1].percentile(50):>10.2f}{samples[304][1].percentile(50):>10.2f}"
+                  f"{sizes[200]:>10}{sizes[304]:>10}")
+
+class SummaryAggregationBenchmark(Benchmark):
+    """Compares the single-aggregation dashboard and stats counts with one count per number"""
+
+    title = "DASHBOARD / STATS AGGREGATION BENCHMARK"
+    login_reason = "the dashboard can't be read"
+    STRATEGIES = ('aggregate', 'legacy')
+    # (endpoint, clear the response cache before each sample)
+    ENDPOINTS = [('/admin/dashboard', False), ('/portfolio/stats', True)]
+
+    def __init__(self, api_base=None, iterations=50):
+        super().__init__(api_base)
+        self.iterations = iterations
+
+    @staticmethod
+    def counts(path, payload):
+        data = payload.get('data', {})
+        return data.get('stats') if path == '/admin/dashboard' else data
+
+    def measure(self, failures):
+        """Time both strategies per endpoint"""
+        session = self.tester.session
+        rows = []
+        for path, uncached in self.ENDPOINTS:
+            results = {}
+            for strategy in self.STRATEGIES:
+                histogram = LatencyHistogram()
+                roundtrips = []
+                last = None
+                url = f"{self.api_base}{path}" + ('?strategy=legacy' if strategy == 'legacy' else '')
+                for _ in range(self.iterations):
+                    if uncached:
+                        session.delete(f"{self.api_base}/admin/cache", timeout=10)
+                        session.pop_last_timing()
+                    response = session.get(url, timeout=10)
+                    timing = session.pop_last_timing()
+                    if response.status_code != 200:
+                        failures.append(f"{path} ({strategy}): HTTP {response.status_code}")
+                        continue
+                    histogram.record(timing['total'])
+                    if db_roundtrips(response) is not None:
+                        roundtrips.append(db_roundtrips(response))
+                    last = self.counts(path, response.json())
+                results[strategy] = (histogram, roundtrips, last)
+                rows.append((f"GET /api{path}", strategy, histogram, roundtrips))
+
+            trips = {strategy: results[strategy][1] for strategy in self.STRATEGIES}
+            if trips['legacy'] and trips['legacy'] == trips['aggregate']:
+                failures.append(f"{path}: ?strategy=legacy made the same round-trips; run the server with "
+                                f"LEGACY_COUNTS_PARAM=true")
+            if results['aggregate'][2] != results['legacy'][2]:
+                failures.append(f"{path}: aggregate counts {results['aggregate'][2]} "
+                                f"differ from legacy counts {results['legacy'][2]}")
+
+        print(f"{self.iterations} requests per endpoint and strategy (latencies in ms; "
+              f"round-trips from X-DB-Roundtrips, set DB_ROUNDTRIP_HEADER=true on the server)")
+        print("-" * 80)
+        print(f"{'Endpoint':<32}{'Strategy':<12}{'Round-trips':>12}{'p50':>10}{'p99':>10}")
+        for endpoint, strategy, histogram, roundtrips in rows:
+            print(f"{endpoint:<32}{strategy:<12}{mean_roundtrips(roundtrips):>12}{histogram.percentile(50):>10.2f}"
+                  f"{histogram.percentile(99):>10.2f}")
+
+class AuthCacheBenchmark(ComparisonBenchmark):
+    """Compares admin-route latency with and without the verified-user cache"""
+
+    title = "AUTH USER CACHE BENCHMARK"
+
+    # Cheap authenticated reads, so the auth lookup is a visible share of each request
+    ENDPOINTS = [('POST', '/auth/verify'), ('GET', '/admin/personal'), ('GET', '/admin/projects')]
+
+    def __init__(self, targets, iterations=50):
+        # targets: [(label, api_base)], e.g. stand-ins with and without the cache
+        super().__init__(targets)
+        self.iterations = iterations
+
+    def measure_target(self, label, api_base, failures):
+        """Time every endpoint on one target; returns [(endpoint, histogram, round-trips)]"""
+        tester = self.tester_for(api_base)
+        if not tester.test_admin_login_correct():
+            failures.append(f"{label}: admin login failed")
+            return []
+        session = tester.session
+        rows = []
+        for method, path in self.ENDPOINTS:
+            histogram = LatencyHistogram()
+            roundtrips = []
+            for _ in range(self.iterations):
+                response = session.request(method, f"{api_base}{path}", timeout=10)
+                timing = session.pop_last_timing()
+                if response.status_code != 200:
+                    failures.append(f"{label} {method} {path}: HTTP {response.status_code}")
+                    continue
+                histogram.record(timing['total'])
+                if db_roundtrips(response) is not None:
+                    roundtrips.append(db_roundtrips(response))
+            rows.append((f"{method} /api{path}", histogram, roundtrips))
+
+        # A logged-out token must not be served from the cache
+        session.post(f"{api_base}/auth/logout", timeout=10)
+        response = session.post(f"{api_base}/auth/verify", timeout=10)
+        if response.status_code == 200 and db_roundtrips(response) == 0:
+            failures.append(f"{label}: token still served from the cache after logout")
+        return rows
+
+    def describe(self):
+        return super().describe() + [f"{self.iterations} requests per endpoint and target (latencies in ms; "
+                                     f"round-trips from X-DB-Roundtrips)"]
+
+    def measure(self, failures):
+        """Measure every target"""
+        print("-" * 80)
+        print(f"{'Endpoint':<28}{'Target':<12}{'Round-trips':>12}{'p50':>10}{'p99':>10}")
+        for label, api_base in self.targets:
+            for endpoint, histogram, roundtrips in self.measure_target(label, api_base, failures):
+                print(f"{endpoint:<28}{label:<12}{mean_roundtrips(roundtrips):>12}{histogram.percentile(50):>10.2f}"
+                      f"{histogram.percentile(99):>10.2f}")
+
+# The landing page's requests and where their data sits in /portfolio/bundle
+LANDING_PAGE_REQUESTS = {
+    '/portfolio/personal': 'personal',
+    '/portfolio/projects': 'projects',
+    '/portfolio/tech-stack': 'techStack',
+    '/portfolio/stats': 'stats',
+}
+
+class PortfolioBundleBenchmark(Benchmark):
+    """First-paint data latency and bytes on the wire of the landing page's four
+    requests against the single pre-compressed /portfolio/bundle"""
+
+    title = "PORTFOLIO BUNDLE BENCHMARK"
+    # What a browser sends; the server picks br where it can
+    BROWSER_ENCODINGS = 'gzip, deflate, br'
+
+    def __init__(self, api_base=None, iterations=50):
+        super().__init__(api_base)
+        self.iterations = iterations
+
+    def fetch(self, path, encoding, headers=None):
+        """GET on a new connection, like a first visit; returns (seconds, bytes on the wire,
+        response, body as sent). Bytes count the status line, headers and encoded body."""
+        with requests.Session() as session:
+            started = time.perf_counter()
+            response = session.get(f"{self.api_base}{path}", stream=True, timeout=30,
+                                   headers=dict(headers or {}, **{'Accept-Encoding': encoding}))
+            raw = response.raw.read(decode_content=False)
+            elapsed = time.perf_counter() - started
+        header_bytes = (len(f"HTTP/1.1 {response.status_code} {response.reason}\r\n") + 2
+                        + sum(len(f"{name}: {value}\r\n") for name, value in response.raw.headers.items()))
+        return elapsed, header_bytes + len(raw), response, raw
+
+    @staticmethod
+    def decode(response, raw):
+        """Parsed JSON body, or None if it is brotli and there is no decoder here"""
+        encoding = response.headers.get('Content-Encoding', 'identity')
+        if encoding == 'gzip':
+            raw = gzip.decompress(raw)
+        elif encoding == 'br':
+            try:
+                import brotli
+            except ImportError:
+                return None
+            raw = brotli.decompress(raw)
+        return json.loads(raw)
+
+    def separate(self, encoding):
+        """The four requests in parallel, one connection each, as a browser would make them"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(LANDING_PAGE_REQUESTS)) as pool:
+            results = list(pool.map(lambda path: self.fetch(path, encoding), LANDING_PAGE_REQUESTS))
+        return time.perf_counter() - started, sum(wire for _, wire, _, _ in results), results
+
+    def first_paints(self, label, load, failures):
+        """Time iterations first paints; returns (latencies in ms, bytes on the wire,
+        bytes on the wire uncompressed, content encodings used)"""
+        latencies = []
+        wire = encoding = None
+        for _ in range(self.iterations):
+            seconds, wire, responses = load(self.BROWSER_ENCODINGS)
+            statuses = {response.status_code for _, _, response, _ in responses}
+            if statuses != {200}:
+                failures.append(f"{label}: HTTP {sorted(statuses)}")
+                break
+            encoding = '/'.join(sorted({response.headers.get('Content-Encoding', 'identity')
+                                        for _, _, response, _ in responses}))
+            latencies.append(seconds * 1000)
+        identity_wire = load('identity')[1]
+        return sorted(latencies), wire, identity_wire, encoding
+
+    def bundle(self, encoding):
+        seconds, wire, response, raw = self.fetch('/portfolio/bundle', encoding)
+        return seconds, wire, [(seconds, wire, response, raw)]
+
+    def check_contents(self, failures):
+        """The bundle must hold exactly what the four endpoints return"""
+        _, _, results = self.separate('gzip')
+        _, _, response, raw = self.fetch('/portfolio/bundle', 'gzip')
+        bundle = self.decode(response, raw)['data']
+        for (_, _, separate_response, separate_raw), (path, key) in zip(results, LANDING_PAGE_REQUESTS.items()):
+            if self.decode(separate_response, separate_raw)['data'] != bundle.get(key):
+                failures.append(f"bundle.{key} differs from GET {path}")
+
+    def check_revalidation(self, failures):
+        """A conditional GET with the bundle's ETag gets a 304 without a database round-trip"""
+        _, _, response, _ = self.fetch('/portfolio/bundle', 'gzip')
+        etag = response.headers.get('ETag')
+        if not etag:
+            failures.append("bundle has no ETag")
+            return
+        _, wire, revalidated, _ = self.fetch('/portfolio/bundle', 'gzip', {'If-None-Match': etag})
+        if revalidated.status_code != 304:
+            failures.append(f"conditional GET of the bundle returned HTTP {revalidated.status_code}, expected 304")
+        if db_roundtrips(response):
+            failures.append(f"bundle read took {response.headers['X-DB-Roundtrips']} database round-trip(s)")
+        return wire
+
+    def check_rebuild(self, failures):
+        """An admin write must show up in the next bundle, under a new ETag"""
+        if not self.tester.test_admin_login_correct():
+            failures.append("admin login failed, bundle rebuild not checked")
+            return
+        session = self.tester.session
+        original = session.get(f"{self.api_base}/admin/personal", timeout=10).json()['data']
+        editable = ('name', 'title', 'tagline', 'bio', 'email', 'phone', 'location', 'socialLinks')
+        fields = {key: original[key] for key in editable if original.get(key) is not None}
+        before = self.fetch('/portfolio/bundle', 'gzip')[2].headers.get('ETag')
+        tagline = f"{original['tagline'][:250]} (bundle check {secrets.token_hex(3)})"
+        try:
+            updated = session.put(f"{self.api_base}/admin/personal", json=dict(fields, tagline=tagline), timeout=10)
+            if updated.status_code != 200:
+                failures.append(f"personal update returned HTTP {updated.status_code}")
+                return
+            _, _, response, raw = self.fetch('/portfolio/bundle', 'gzip')
+            if response.headers.get('ETag') == before:
+                failures.append("bundle ETag unchanged after an admin write")
+            if self.decode(response, raw)['data']['personal'].get('tagline') != tagline:
+                failures.append("bundle not rebuilt after an admin write")
+        finally:
+            session.put(f"{self.api_base}/admin/personal", json=fields, timeout=10)
+
+    def describe(self):
+        return super().describe() + [f"{self.iterations} first paints per method, each on new connections "
+                                     f"(Accept-Encoding: {self.BROWSER_ENCODINGS}; latencies in ms, bytes "
+                                     f"include headers)"]
+
+    def measure(self, failures):
+        """Compare both ways of loading the landing page"""
+        print("-" * 80)
+        print(f"{'Method':<30}{'Reqs':>5}{'p50':>8}{'p99':>8}{'Bytes':>9}{'Uncompressed':>14}  Encoding")
+        rows = [('4 separate requests', len(LANDING_PAGE_REQUESTS), self.separate),
+                ('/portfolio/bundle', 1, self.bundle)]
+        measured = {}
+        for label, requests_made, load in rows:
+            try:
+                latencies, wire, identity_wire, encoding = self.first_paints(label, load, failures)
+            except (requests.exceptions.RequestException, ValueError) as error:
+                failures.append(f"{label}: {error}")
+                continue
+            measured[label] = (latencies, wire)
+            print(f"{label:<30}{requests_made:>5}{percentile(latencies, 50):>8.1f}{percentile(latencies, 99):>8.1f}"
+                  f"{wire or 0:>9}{identity_wire:>14}  {encoding}")
+
+        try:
+            self.check_contents(failures)
+            revalidation_bytes = self.check_revalidation(failures)
+            self.check_rebuild(failures)
+        except (requests.exceptions.RequestException, ValueError, KeyError) as error:
+            failures.append(f"bundle checks: {error}")
+            revalidation_bytes = None
+        print("-" * 80)
+        if len(measured) == 2:
+            (separate_ms, separate_bytes), (bundle_ms, bundle_bytes) = measured.values()
+            if separate_ms and bundle_ms:
+                print(f"Bundle: p50 {percentile(bundle_ms, 50) / percentile(separate_ms, 50):.0%} of the separate "
+                      f"requests' time, {bundle_bytes / separate_bytes:.0%} of their bytes")
+        if revalidation_bytes:
+            print(f"Revalidating the bundle (304): {revalidation_bytes} bytes")
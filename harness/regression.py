@@ -0,0 +1,194 @@
+"""
+The endpoint benchmark behind --bench: every public and admin read timed in
+turn, with regressions of the gated ones failing the run against a baseline
+recorded per git commit.
+"""
+
+import json
+import subprocess
+from datetime import datetime
+
+import requests
+
+from .base import Benchmark
+from .timing import LatencyHistogram
+
+# Endpoints timed by the benchmark runner
+BENCH_PUBLIC_ENDPOINTS = [
+    ('GET', '/health'),
+    ('GET', '/portfolio/personal'),
+    ('GET', '/portfolio/projects'),
+    ('GET', '/portfolio/projects/featured'),
+    ('GET', '/portfolio/tech-stack'),
+    ('GET', '/portfolio/stats'),
+]
+
+BENCH_ADMIN_ENDPOINTS = [
+    ('POST', '/auth/verify'),
+    ('GET', '/admin/dashboard'),
+    ('GET', '/admin/projects'),
+    ('GET', '/admin/personal'),
+    ('GET', '/admin/tech-stack'),
+    ('GET', '/admin/contact/messages'),
+]
+
+# Hot reads whose regressions fail the benchmark run by default
+BENCH_GATED_ENDPOINTS = ['GET /api/portfolio/projects', 'GET /api/admin/dashboard']
+
+class BenchmarkRunner(Benchmark):
+    """Times every public and admin endpoint and gates regressions against a baseline.
+    The results are recorded under the current commit when the run passes, or
+    regardless with save_failing; baseline_commit picks the one compared with."""
+
+    title = "PORTFOLIO BACKEND BENCHMARK"
+
+    def __init__(self, api_base=None, iterations=200, warmup=20, baseline_path='bench_baseline.json',
+                 threshold=15.0, min_delta_ms=0.5, gated=None, baseline_commit=None, save=True,
+                 save_failing=False):
+        super().__init__(api_base)
+        self.iterations = iterations
+        self.warmup = warmup
+        self.baseline_path = baseline_path
+        self.threshold = threshold
+        self.min_delta_ms = min_delta_ms
+        self.gated = list(BENCH_GATED_ENDPOINTS if gated is None else gated)
+        self.baseline_commit = baseline_commit
+        self.save = save
+        self.save_failing = save_failing
+        self.commit = self.git_commit()
+
+    @staticmethod
+    def endpoint_name(method, path):
+        return f"{method} /api{path}"
+
+    def time_endpoint(self, method, path):
+        """Warm up, then time a fixed number of calls to one endpoint"""
+        url = f"{self.api_base}{path}"
+        session = self.tester.session
+        histogram = LatencyHistogram()
+        errors = 0
+        for i in range(self.warmup + self.iterations):
+            try:
+                response = session.request(method, url, timeout=10)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            timing = session.pop_last_timing()
+            if i < self.warmup:
+                continue
+            if not ok:
+                errors += 1
+            elif timing:
+                histogram.record(timing['total'])
+        return {
+            'count': histogram.count,
+            'errors': errors,
+            'mean_ms': round(histogram.to_dict()['mean_ms'], 3),
+            'p50_ms': histogram.percentile(50),
+            'p95_ms': histogram.percentile(95),
+            'p99_ms': histogram.percentile(99),
+        }
+
+    def time_endpoints(self):
+        """Benchmark every endpoint and return {endpoint: stats}"""
+        endpoints = list(BENCH_PUBLIC_ENDPOINTS)
+        if self.tester.test_admin_login_correct():
+            endpoints += BENCH_ADMIN_ENDPOINTS
+        else:
+            print("⚠️ Admin login failed, benchmarking public endpoints only")
+        return {self.endpoint_name(method, path): self.time_endpoint(method, path) for method, path in endpoints}
+
+    @staticmethod
+    def git_commit():
+        """Short HEAD commit, suffixed with -dirty when the tree has local changes"""
+        try:
+            commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                    text=True, check=True).stdout.strip()
+            dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                   capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return 'unknown'
+        return f"{commit}-dirty" if dirty else commit
+
+    def load_baselines(self):
+        try:
+            with open(self.baseline_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_baseline(self, baselines, commit, results):
+        baselines[commit] = {
+            'recorded_at': datetime.now().isoformat(),
+            'target': self.api_base,
+            'iterations': self.iterations,
+            'warmup': self.warmup,
+            'results': results,
+        }
+        with open(self.baseline_path, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def reference_commit(baselines, commit, requested=None):
+        """Explicitly requested baseline, else the most recent one from another commit"""
+        if requested:
+            return requested if requested in baselines else None
+        others = [key for key in baselines if key != commit]
+        return max(others, key=lambda key: baselines[key]['recorded_at'], default=None)
+
+    def regressed(self, current, base, metric):
+        delta = current[metric] - base[metric]
+        return delta > self.min_delta_ms and delta > base[metric] * self.threshold / 100.0
+
+    def compare(self, results, reference):
+        """Print results next to the reference and return the regressed gated endpoints"""
+        base_results = reference['results'] if reference else {}
+        regressions = []
+        print(f"{'Endpoint':<36}{'p50':>8}{'p99':>8}{'base p50':>10}{'base p99':>10}{'Δp50':>8}{'Δp99':>8}  Status")
+        for endpoint, current in results.items():
+            base = base_results.get(endpoint)
+            gated = endpoint in self.gated
+            if not base or not base['count'] or not current['count']:
+                status = "no baseline" if current['count'] else "ERRORS"
+                print(f"{endpoint:<36}{current['p50_ms']:>8.2f}{current['p99_ms']:>8.2f}{'-':>10}{'-':>10}"
+                      f"{'-':>8}{'-':>8}  {status}")
+                continue
+
+            changes = [(current[m] - base[m]) / base[m] * 100.0 if base[m] else 0.0 for m in ('p50_ms', 'p99_ms')]
+            failed = [m for m in ('p50_ms', 'p99_ms') if self.regressed(current, base, m)]
+            if failed and gated:
+                status = "❌ REGRESSED"
+                regressions.append(endpoint)
+            elif failed:
+                status = "⚠️ slower (not gated)"
+            else:
+                status = "✅ OK" if gated else "ok"
+            print(f"{endpoint:<36}{current['p50_ms']:>8.2f}{current['p99_ms']:>8.2f}{base['p50_ms']:>10.2f}"
+                  f"{base['p99_ms']:>10.2f}{changes[0]:>+7.1f}%{changes[1]:>+7.1f}%  {status}")
+        return regressions
+
+    def describe(self):
+        return [f"Target: {self.api_base}",
+                f"Commit: {self.commit}, {self.warmup} warm-up + {self.iterations} timed iterations per endpoint"]
+
+    def measure(self, failures):
+        """Time the endpoints, compare with the baseline and record the results"""
+        results = self.time_endpoints()
+        baselines = self.load_baselines()
+        reference_key = self.reference_commit(baselines, self.commit, self.baseline_commit)
+        if self.baseline_commit and not reference_key:
+            print(f"⚠️ No baseline recorded for commit {self.baseline_commit} in {self.baseline_path}")
+        print(f"Baseline: {reference_key or 'none'} "
+              f"(threshold {self.threshold:.0f}% and {self.min_delta_ms}ms, latencies in ms)")
+        print("-" * 80)
+        failures.extend(f"{endpoint}: gated endpoint regressed"
+                        for endpoint in self.compare(results, baselines.get(reference_key)))
+        errors = sum(result['errors'] for result in results.values())
+        if errors:
+            failures.append(f"{errors} request(s) failed during the benchmark")
+
+        if self.save and (self.save_failing or not failures):
+            self.save_baseline(baselines, self.commit, results)
+            print(f"\nSaved results for {self.commit} to {self.baseline_path}")
+        elif self.save:
+            print("\nNot saving the results of a failing run (--save-baseline saves them anyway)")
@@ -0,0 +1,206 @@
+"""
+Indexed project search against downloading the whole project list and
+filtering it in the client, over a generated catalogue.
+"""
+
+import gzip
+import random
+import re
+import time
+
+import requests
+
+from bulk_import import delete_all, import_catalogue
+
+from .base import Benchmark
+from .timing import percentile
+
+# Vocabulary of the --bench-search catalogue. No two words stem alike and none is
+# a stop word, so MongoDB's stemmed text matches are exactly the words matched here.
+SEARCH_ADJECTIVES = ('realtime', 'serverless', 'offline', 'minimal', 'secure', 'scalable', 'modular', 'interactive')
+SEARCH_NOUNS = ('dashboard', 'tracker', 'chatbot', 'marketplace', 'planner', 'journal', 'scheduler', 'wallet',
+                'forum', 'gallery', 'quiz', 'recipe')
+SEARCH_TECHS = ('React', 'Vue', 'Angular', 'Svelte', 'Node.js', 'Express', 'Django', 'Flask', 'FastAPI', 'MongoDB',
+                'PostgreSQL', 'Redis', 'GraphQL', 'Docker', 'Kubernetes', 'AWS', 'TypeScript', 'Python', 'Rust',
+                'TensorFlow', 'PyTorch', 'Tailwind', 'Firebase', 'Prisma')
+SEARCH_QUERIES = [
+    ('keyword', {'q': 'dashboard'}),
+    ('two keywords', {'q': 'wallet chatbot'}),
+    ('keyword + category', {'q': 'tracker', 'category': 'AI'}),
+    ('tag', {'tech': 'Rust'}),
+    ('two tags', {'tech': 'React,GraphQL'}),
+    ('keyword + tag', {'q': 'serverless', 'tech': 'Docker'}),
+]
+# Field weights of the project_search index in models/Project.js
+SEARCH_WEIGHTS = {'title': 10, 'techStack': 5, 'description': 1}
+
+def search_words(value):
+    """Lowercased words of a field (a tag array counts as one text), split like a text index"""
+    text = ' '.join(value) if isinstance(value, list) else str(value or '')
+    return re.findall(r'[^\W_]+', text.lower())
+
+def client_search(projects, params, limit=12):
+    """What a browser holding the full list has to do: filter by keywords, tags and
+    category, rank keyword matches by weighted hits, and cut the first page.
+    Returns (first page, number of matches)."""
+    terms = set(search_words(params.get('q', '')))
+    tags = [tag for tag in params.get('tech', '').split(',') if tag]
+    category = params.get('category')
+    matches = []
+    for position, project in enumerate(projects):
+        if category and project.get('category') != category:
+            continue
+        if tags and not all(tag in project.get('techStack', ()) for tag in tags):
+            continue
+        score = 0
+        if terms:
+            score = sum(weight for field, weight in SEARCH_WEIGHTS.items()
+                        for word in search_words(project.get(field)) if word in terms)
+            if not score:
+                continue
+        matches.append((-score, position, project))
+    matches.sort(key=lambda match: match[:2])
+    return [project for _, _, project in matches[:limit]], len(matches)
+
+class ProjectSearchBenchmark(Benchmark):
+    """Indexed server-side project search (?q=, ?tech=) against downloading the whole
+    project list and filtering it in the client, over a generated catalogue"""
+
+    title = "PROJECT SEARCH BENCHMARK"
+    login_reason = "no catalogue can be generated"
+
+    def __init__(self, api_base=None, projects=50000, iterations=20, limit=12):
+        super().__init__(api_base)
+        self.projects = projects
+        self.iterations = iterations
+        self.limit = limit
+
+    def catalogue(self, run_id):
+        rng = random.Random(run_id)
+        projects = []
+        for index in range(self.projects):
+            adjective, other_adjective = rng.sample(SEARCH_ADJECTIVES, 2)
+            noun, other_noun = rng.sample(SEARCH_NOUNS, 2)
+            tech = rng.sample(SEARCH_TECHS, rng.randint(2, 4))
+            projects.append({
+                'title': f"{adjective.capitalize()} {noun} {run_id}-{index}",
+                'description': f"A {other_adjective} {other_noun} built on {' and '.join(tech[:2])}, "
+                               f"generated for the search benchmark",
+                'category': ('AI', 'Web')[index % 2],
+                'techStack': tech,
+                'githubUrl': f"https://github.com/example/search-{index}",
+                'liveUrl': f"https://search-{index}.example.com",
+                'featured': False,
+                'order': index,
+            })
+        return projects
+
+    def get(self, path, params=None):
+        """(ms, bytes on the wire, decoded body size, response) of one GET"""
+        started = time.perf_counter()
+        response = self.tester.session.get(f"{self.api_base}{path}", params=params, stream=True, timeout=120,
+                                           headers={'Accept-Encoding': 'gzip'})
+        raw = response.raw.read(decode_content=False)
+        elapsed = (time.perf_counter() - started) * 1000
+        response.raise_for_status()
+        body = gzip.decompress(raw) if response.headers.get('Content-Encoding') == 'gzip' else raw
+        response._content = body
+        return elapsed, len(raw), len(body), response
+
+    def full_list(self):
+        """Download and parse the whole list the way the client would, cold and then warm
+        (from the server's response cache); returns (ms, wire bytes, decoded bytes, projects) of each"""
+        fetches = []
+        for _ in range(2):
+            started = time.perf_counter()
+            _, wire, size, response = self.get('/portfolio/projects')
+            projects = response.json()['data']
+            fetches.append(((time.perf_counter() - started) * 1000, wire, size, projects))
+        return fetches
+
+    def check(self, label, params, data, expected_page, expected_total, failures):
+        """Server results must match the client's filter; keyword pages must be ranked"""
+        projects, pagination = data['projects'], data['pagination']
+        if pagination['total'] != expected_total:
+            failures.append(f"{label}: server counts {pagination['total']} matches, the full list has {expected_total}")
+        if pagination['pages'] != -(-expected_total // self.limit) or len(projects) > self.limit:
+            failures.append(f"{label}: pagination {pagination} for {expected_total} matches")
+        if 'q' in params:
+            scores = [project.get('score') for project in projects]
+            if None in scores or scores != sorted(scores, reverse=True):
+                failures.append(f"{label}: keyword results not ranked by score: {scores[:5]}")
+            terms = set(search_words(params['q']))
+            titled = any(terms & set(search_words(project['title'])) for project in expected_page)
+            if titled and projects and not terms & set(search_words(projects[0]['title'])):
+                failures.append(f"{label}: top result {projects[0]['title']!r} has no keyword in its title")
+        elif [project['_id'] for project in projects] != [project['_id'] for project in expected_page]:
+            failures.append(f"{label}: tag results not in the project list's order")
+
+    def check_pages(self, failures):
+        """Consecutive pages must not overlap, and bad parameters are refused"""
+        params = dict(SEARCH_QUERIES[0][1], limit=self.limit)
+        first = self.get('/portfolio/projects', dict(params, page=1))[3].json()['data']['projects']
+        second = self.get('/portfolio/projects', dict(params, page=2))[3].json()['data']['projects']
+        if {project['_id'] for project in first} & {project['_id'] for project in second}:
+            failures.append("pages 1 and 2 of a search overlap")
+        for bad in ({'limit': 0}, {'limit': 500}, {'page': 'x'}):
+            status = self.tester.session.get(f"{self.api_base}/portfolio/projects", params=bad, timeout=30).status_code
+            if status != 400:
+                failures.append(f"search with {bad} returned HTTP {status}, expected 400")
+
+    def measure(self, failures):
+        """Generate the catalogue, compare both ways of searching it and delete it"""
+        run_id = int(time.time())
+        started = time.perf_counter()
+        try:
+            created = import_catalogue(self.tester.session, self.api_base, projects=self.catalogue(run_id))['projects']
+        except requests.exceptions.RequestException as error:
+            failures.append(f"generating the catalogue failed: {error}")
+            return
+        print(f"{len(created)} projects generated in {time.perf_counter() - started:.1f}s")
+
+        try:
+            fetches = self.full_list()
+            (cold_ms, wire, size, projects), (warm_ms, _, _, _) = fetches
+            print(f"Full list: {len(projects)} projects, {size / 1e6:.1f} MB ({wire / 1e6:.1f} MB on the wire), "
+                  f"{cold_ms:.0f} ms cold / {warm_ms:.0f} ms warm to download and parse")
+            print(f"{self.iterations} searches per query for the first page of {self.limit}; latencies in ms, "
+                  f"the 1st uncached, later ones may hit the response cache")
+            print("-" * 80)
+            print(f"{'Query':<22}{'Matches':>9}{'Search 1st':>12}{'p50':>8}{'p99':>8}{'Bytes':>9}"
+                  f"{'Client p50':>12}")
+            search_medians, client_medians, search_bytes = [], [], []
+            for label, params in SEARCH_QUERIES:
+                params = dict(params, limit=self.limit)
+                latencies, wire = [], 0
+                for _ in range(self.iterations):
+                    elapsed, wire, _, response = self.get('/portfolio/projects', params)
+                    latencies.append(elapsed)
+                data = response.json()['data']
+                client_ms = []
+                for _ in range(max(1, self.iterations // 4)):
+                    client_started = time.perf_counter()
+                    expected_page, expected_total = client_search(projects, params, self.limit)
+                    client_ms.append((time.perf_counter() - client_started) * 1000)
+                self.check(label, params, data, expected_page, expected_total, failures)
+                first, latencies, client_ms = latencies[0], sorted(latencies), sorted(client_ms)
+                search_medians.append(percentile(latencies, 50))
+                client_medians.append(percentile(client_ms, 50))
+                search_bytes.append(wire)
+                print(f"{label:<22}{expected_total:>9}{first:>12.1f}{percentile(latencies, 50):>8.1f}"
+                      f"{percentile(latencies, 99):>8.1f}{wire:>9}{percentile(client_ms, 50):>12.1f}")
+            self.check_pages(failures)
+        except (requests.exceptions.RequestException, ValueError, KeyError) as error:
+            failures.append(f"search: {error}")
+            search_medians = []
+        finally:
+            deleted = delete_all(self.tester.session, self.api_base, 'projects', created)
+            if deleted != len(created):
+                failures.append(f"cleanup deleted {deleted} of {len(created)} generated projects")
+
+        print("-" * 80)
+        if search_medians:
+            print(f"Indexed search: first page in {percentile(sorted(search_medians), 50):.1f} ms "
+                  f"(median query), {max(search_bytes)} bytes at most")
+            print(f"Client-side: {cold_ms:.0f} ms and {fetches[0][1]} bytes before the first result, "
+                  f"then {percentile(sorted(client_medians), 50):.1f} ms of client CPU per search")
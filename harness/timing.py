@@ -0,0 +1,267 @@
+"""
+Client-side request timing: a requests.Session that times every call by phase
+(DNS, connect, time to first byte, transfer) into HDR-style histograms, which
+can be exported as JSON or in the Prometheus text format.
+"""
+
+import json
+import math
+import socket
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Request phases recorded for every call, in order
+PHASES = ('dns', 'connect', 'ttfb', 'transfer', 'total')
+
+# Bucket boundaries (seconds) used for the Prometheus text export
+PROMETHEUS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# DNS and connect durations of the current request, set by the timed connections below
+_phase_timings = threading.local()
+
+class _PhaseTimingMixin:
+    """Times name resolution and connection setup (TCP + TLS) on new connections"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            # Resolve once here and connect to the address, so the lookup isn't repeated
+            self._dns_host = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except (OSError, IndexError):
+            pass  # Let the real connection attempt report the failure
+        _phase_timings.dns = time.perf_counter() - start
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = host
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _phase_timings.connect = time.perf_counter() - start - getattr(_phase_timings, 'dns', 0.0)
+
+class _TimedHTTPConnection(_PhaseTimingMixin, HTTPConnection):
+    pass
+
+class _TimedHTTPSConnection(_PhaseTimingMixin, HTTPSConnection):
+    pass
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report DNS and connect timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+class LatencyHistogram:
+    """HDR-style histogram of microsecond values with fixed relative precision.
+
+    Values are grouped in power-of-two buckets, each split into linear sub-buckets,
+    so every recorded value keeps `significant_figures` digits of precision.
+    """
+
+    def __init__(self, significant_figures=2):
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value):
+        bucket = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return bucket * self.sub_bucket_half + (value >> bucket)
+
+    def _range(self, index):
+        """Lowest and highest value that share the counts slot at index"""
+        if index < self.sub_bucket_count:
+            return index, index
+        bucket = index // self.sub_bucket_half - 1
+        sub = index - bucket * self.sub_bucket_half
+        return sub << bucket, ((sub + 1) << bucket) - 1
+
+    def record(self, seconds):
+        value = max(int(seconds * 1_000_000), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct):
+        """Value at the given percentile, in milliseconds"""
+        if not self.count:
+            return 0.0
+        target = max(math.ceil(pct / 100.0 * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._range(index)[1], self.max) / 1000.0
+        return self.max / 1000.0
+
+    def count_at_or_below(self, seconds):
+        limit = seconds * 1_000_000
+        return sum(count for index, count in self.counts.items() if self._range(index)[1] <= limit)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'min_ms': (self.min or 0) / 1000.0,
+            'max_ms': self.max / 1000.0,
+            'mean_ms': self.total / self.count / 1000.0 if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'p999_ms': self.percentile(99.9),
+            # [lowest value in the slot (us), count] pairs, enough to rebuild the histogram
+            'buckets': [[self._range(index)[0], self.counts[index]] for index in sorted(self.counts)],
+        }
+
+def _prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class LatencyRecorder:
+    """Thread-safe per-endpoint, per-phase latency histograms"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, endpoint, timing):
+        with self.lock:
+            phases = self.histograms.setdefault(endpoint, {phase: LatencyHistogram() for phase in PHASES})
+            for phase in PHASES:
+                phases[phase].record(timing[phase])
+
+    def merge(self, other):
+        with self.lock:
+            for endpoint, other_phases in other.histograms.items():
+                phases = self.histograms.setdefault(endpoint, {phase: LatencyHistogram() for phase in PHASES})
+                for phase in PHASES:
+                    phases[phase].merge(other_phases[phase])
+
+    def to_json(self, target=None):
+        with self.lock:
+            return json.dumps({
+                'target': target,
+                'generated_at': datetime.now().isoformat(),
+                'endpoints': {
+                    endpoint: {phase: histogram.to_dict() for phase, histogram in phases.items()}
+                    for endpoint, phases in sorted(self.histograms.items())
+                }
+            }, indent=2)
+
+    def to_prometheus(self):
+        metric = 'portfolio_client_request_seconds'
+        lines = [
+            f"# HELP {metric} Client-side request latency measured by backend_test.py, by phase",
+            f"# TYPE {metric} histogram",
+        ]
+        with self.lock:
+            for endpoint, phases in sorted(self.histograms.items()):
+                for phase, histogram in phases.items():
+                    labels = f'endpoint="{_prometheus_label(endpoint)}",phase="{phase}"'
+                    for bound in PROMETHEUS_BUCKETS:
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {histogram.count_at_or_below(bound)}')
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.total / 1_000_000:.6f}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path=None, prometheus_path=None, target=None):
+        if json_path:
+            with open(json_path, 'w') as f:
+                f.write(self.to_json(target))
+        if prometheus_path:
+            with open(prometheus_path, 'w') as f:
+                f.write(self.to_prometheus())
+
+class TimedSession(requests.Session):
+    """requests.Session that times every call and feeds a LatencyRecorder.
+
+    total is measured with perf_counter around the whole call; ttfb is the time from
+    sending the request to parsed response headers (minus any DNS/connect on a new
+    connection) and transfer is the time spent reading the body. DNS and connect are
+    zero when a kept-alive connection was reused.
+    """
+
+    def __init__(self, recorder=None, pool_maxsize=32):
+        super().__init__()
+        self.recorder = recorder if recorder is not None else LatencyRecorder()
+        self._local = threading.local()
+        # Held while default headers are read or changed, so tests can share the session
+        self.headers_lock = threading.RLock()
+        adapter = TimedHTTPAdapter(pool_maxsize=pool_maxsize)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def prepare_request(self, request):
+        with self.headers_lock:
+            return super().prepare_request(request)
+
+    def request(self, method, url, *args, **kwargs):
+        _phase_timings.dns = 0.0
+        _phase_timings.connect = 0.0
+        start = time.perf_counter()
+        response = super().request(method, url, *args, **kwargs)
+        total = time.perf_counter() - start
+
+        # Session.send measures elapsed around the adapter call, before the body is read
+        elapsed = response.elapsed.total_seconds()
+        dns = _phase_timings.dns
+        connect = _phase_timings.connect
+        timing = {
+            'dns': dns,
+            'connect': connect,
+            'ttfb': max(elapsed - dns - connect, 0.0),
+            'transfer': max(total - elapsed, 0.0),
+            'total': total,
+        }
+        endpoint = f"{method.upper()} {urlsplit(url).path}"
+        self.recorder.record(endpoint, timing)
+        self._local.last_timing = dict(timing, endpoint=endpoint)
+        return response
+
+    def pop_last_timing(self):
+        """Timing of the last request made from this thread, if not already taken"""
+        timing = getattr(self._local, 'last_timing', None)
+        self._local.last_timing = None
+        return timing
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
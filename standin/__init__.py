@@ -0,0 +1,9 @@
+"""
+Local stand-in for the Portfolio backend API, started by backend_standin.py and
+by backend_test.py --standin.
+
+constants and util hold what the backend's configuration and routes share.
+store, ratelimit, outbox, images and logs stand in for MongoDB, the rate limit
+store, Resend, the image store and the logger; app has the routes and server
+serves them.
+"""
@@ -0,0 +1,915 @@
+"""
+The routes of the stand-in, on top of the in-memory store.
+"""
+
+import base64
+import csv
+import gzip
+import hashlib
+import hmac
+import io
+import json
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+try:
+    import brotli
+except ImportError:  # the bundle is then served in gzip and uncompressed only
+    brotli = None
+
+from .constants import (ADMIN_PROJECT_FIELDS, ADMIN_TECH_STACK_FIELDS, AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL,
+                        CACHE_MAX_ENTRIES, CACHE_TTL, CONTACT_DUPLICATE_WINDOW, CONTACT_FIELDS,
+                        CONTACT_FINGERPRINT_MAX_ENTRIES, CONTACT_LIST_FIELDS, CONTACT_MAX, CONTACT_TOTAL_TTL,
+                        CONTACT_WINDOW, DEFAULT_ADMIN_EMAIL, DEFAULT_ADMIN_PASSWORD, EXPORT_BATCH_SIZE,
+                        EXPORT_CONTENT_TYPES, FORMULA_START, GENERAL_RATE_MAX, GENERAL_RATE_WINDOW,
+                        IMAGE_MIME_TYPES, IMAGE_PRESETS, MAX_FEATURED_PROJECTS, MONGO_MAX_POOL_SIZE,
+                        PROJECT_FIELDS, PROJECT_SORT, RATE_LIMIT_SYNC_HITS, RATE_LIMIT_SYNC_INTERVAL,
+                        SEED_PERSONAL, TECH_STACK_FIELDS, TECH_STACK_SORT, TOKEN_TTL)
+from .images import LocalImageStore, build_image_set, image_public_ids
+from .logs import StructuredLogger, describe_contact_body
+from .metrics import RequestMetrics
+from .outbox import OutboxWorker, build_email, send_resend
+from .ratelimit import BatchedRateLimitStore, MemoryRateLimitStore, RateLimiter
+from .store import InMemoryStore
+from .util import (ApiError, accepts_encoding, decode_cursor, encode_cursor, encode_json, hash_password,
+                   http_date, is_fresh, iso_from_ms, new_id, now_iso, public_user)
+from .validation import (Validator, validate_batch, validate_contact, validate_personal, validate_project,
+                         validate_project_search, validate_tech_stack)
+
+def route_template(pattern):
+    """Express-style path of a route regex: (?P<id>[^/]+) becomes :id"""
+    return re.sub(r'\(\?P<(\w+)>[^)]*\)', r':\1', pattern).removesuffix('/?')
+
+class StandinApp:
+    """Routes requests onto the in-memory store, mirroring backend/routes/*.js"""
+
+    def __init__(self, admin_email=DEFAULT_ADMIN_EMAIL, admin_password=DEFAULT_ADMIN_PASSWORD, seed=True,
+                 resend_url=None, email_delivery='outbox', outbox_options=None,
+                 db_latency=0.0, auth_cache_ttl=AUTH_CACHE_TTL, seed_contacts=0,
+                 rate_limit_store=None, general_rate_max=GENERAL_RATE_MAX, db_pool_size=MONGO_MAX_POOL_SIZE,
+                 metrics_token=None, log_output=None, log_level='info', contact_log_sample_rate=1.0,
+                 image_dir=None, contact_duplicate_window=CONTACT_DUPLICATE_WINDOW, hydrated_read_param=False,
+                 legacy_counts_param=False, general_rate_sync_hits=RATE_LIMIT_SYNC_HITS,
+                 contact_duplicate_check_stored=False):
+        self.store = InMemoryStore(db_latency, db_pool_size)
+        # Uploaded image variants, served under /uploads like IMAGE_STORE=local;
+        # in a temporary directory removed at shutdown unless image_dir is given
+        self.images = LocalImageStore(image_dir)
+        # Structured logs go to log_output (a LogOutput), or nowhere if it is None
+        self.log_output = log_output
+        self.contact_log = StructuredLogger(log_output, log_level).child(route='POST /api/contact')
+        self.contact_log_sample_rate = contact_log_sample_rate
+        # Honour ?read=hydrated, like HYDRATED_READ_PARAM=true (benchmarks only)
+        self.hydrated_read_param = hydrated_read_param
+        # Honour ?strategy=legacy, like LEGACY_COUNTS_PARAM=true (benchmarks only)
+        self.legacy_counts_param = legacy_counts_param
+        # /api/metrics takes metrics_token as a bearer token, or an admin login if it is None
+        self.metrics = RequestMetrics()
+        self.metrics_token = metrics_token
+        if seed_contacts:
+            self.store.seed_contacts(seed_contacts)
+        # Contact emails go to the Resend API at resend_url: queued for the outbox
+        # worker, or sent before responding with email_delivery='inline'
+        self.resend_url = resend_url
+        self.email_delivery = email_delivery
+        self.outbox = OutboxWorker(self.store, resend_url, **(outbox_options or {})) if resend_url else None
+        if seed:
+            self.store.seed(admin_email, admin_password)
+        self.tokens = {}
+        self.tokens_lock = threading.Lock()
+        # token -> (user, expires); auth_cache_ttl=0 disables it
+        self.auth_cache_ttl = auth_cache_ttl
+        self.user_cache = OrderedDict()
+        # Rate limit counters are shared with other stand-ins given the same store;
+        # general_rate_max=None turns the general limiter off. With a shared store
+        # the general limiter writes its counters in batches, like the batched
+        # limiter in server.js; general_rate_sync_hits=1 writes every hit.
+        rate_limit_store = rate_limit_store or MemoryRateLimitStore()
+        self.general_rate_store = rate_limit_store
+        if general_rate_max and general_rate_sync_hits > 1 and not isinstance(rate_limit_store, MemoryRateLimitStore):
+            self.general_rate_store = BatchedRateLimitStore(rate_limit_store, general_rate_sync_hits,
+                                                            RATE_LIMIT_SYNC_INTERVAL)
+        self.general_limiter = (RateLimiter(self.general_rate_store, 'general', GENERAL_RATE_WINDOW, general_rate_max)
+                                if general_rate_max else None)
+        self.contact_limiter = RateLimiter(rate_limit_store, 'contact', CONTACT_WINDOW, CONTACT_MAX)
+        # Fingerprint of a recent contact submission -> expires, like
+        # utils/contactFingerprints.js; contact_duplicate_window=0 disables the check.
+        # The stored contacts are only searched too with contact_duplicate_check_stored,
+        # like CONTACT_DUPLICATE_CHECK_STORED (by default only under cluster.js)
+        self.contact_duplicate_window = contact_duplicate_window
+        self.contact_duplicate_check_stored = contact_duplicate_check_stored
+        self.recent_submissions = OrderedDict()
+        self.submissions_lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # status filter -> (approximate message total, expires)
+        self.contact_totals = {}
+        self.contact_lock = threading.Lock()
+        # Pre-serialized /api/portfolio/bundle, like utils/portfolioBundle.js
+        self.bundle = None
+        self.bundle_lock = threading.Lock()
+        self.bundle_builds = 0
+
+        admin = self.require_auth
+        cached = self.cached
+        general = self.limited(self.general_limiter, 'Too many requests. Please try again later.')
+        contact = self.limited(self.contact_limiter, 'Too many contact submissions. Please try again later.',
+                               skip=self.bypasses_rate_limit)
+        self.routes = [(method, re.compile(pattern), route_template(pattern), handler)
+                       for method, pattern, handler in [
+            ('GET', r'/api/health', self.health),
+            ('GET', r'/api/?', self.root),
+            ('GET', r'/api/metrics', self.metrics_auth(self.serve_metrics)),
+            ('POST', r'/api/auth/login', general(self.login)),
+            ('POST', r'/api/auth/verify', general(admin(self.verify))),
+            ('POST', r'/api/auth/logout', general(admin(self.logout))),
+            ('GET', r'/api/portfolio/personal', general(cached('personal')(self.portfolio_personal))),
+            ('GET', r'/api/portfolio/projects', general(cached('projects')(self.portfolio_projects))),
+            ('GET', r'/api/portfolio/projects/featured', general(cached('projects')(self.portfolio_featured))),
+            ('GET', r'/api/portfolio/tech-stack', general(cached('techstacks')(self.portfolio_tech_stack))),
+            ('GET', r'/api/portfolio/stats', general(cached('projects', 'techstacks')(self.portfolio_stats))),
+            ('GET', r'/api/portfolio/bundle', general(self.portfolio_bundle)),
+            ('POST', r'/api/contact/?', contact(self.contact)),
+            ('GET', r'/api/admin/projects', admin(self.admin_projects)),
+            ('POST', r'/api/admin/projects', admin(self.admin_create_project)),
+            ('POST', r'/api/admin/projects/bulk', admin(self.admin_bulk_projects)),
+            ('PUT', r'/api/admin/projects/(?P<id>[^/]+)', admin(self.admin_update_project)),
+            ('DELETE', r'/api/admin/projects/(?P<id>[^/]+)', admin(self.admin_delete_project)),
+            ('POST', r'/api/admin/upload/project-image', admin(self.admin_upload_project_image)),
+            ('POST', r'/api/admin/upload/profile-image', admin(self.admin_upload_profile_image)),
+            ('POST', r'/api/admin/upload/tech-logo', admin(self.admin_upload_tech_logo)),
+            ('GET', r'/api/admin/personal', admin(self.admin_personal)),
+            ('PUT', r'/api/admin/personal', admin(self.admin_update_personal)),
+            ('GET', r'/api/admin/tech-stack', admin(self.admin_tech_stack)),
+            ('POST', r'/api/admin/tech-stack', admin(self.admin_create_tech)),
+            ('POST', r'/api/admin/tech-stack/bulk', admin(self.admin_bulk_tech)),
+            ('PUT', r'/api/admin/tech-stack/(?P<id>[^/]+)', admin(self.admin_update_tech)),
+            ('DELETE', r'/api/admin/tech-stack/(?P<id>[^/]+)', admin(self.admin_delete_tech)),
+            ('GET', r'/api/admin/contact/messages', admin(self.admin_messages)),
+            ('GET', r'/api/admin/contact/export', admin(self.admin_contact_export)),
+            ('PUT', r'/api/admin/contact/messages/(?P<id>[^/]+)/status', admin(self.admin_message_status)),
+            ('GET', r'/api/admin/cache', admin(self.admin_cache_stats)),
+            ('DELETE', r'/api/admin/cache', admin(self.admin_cache_clear)),
+            ('GET', r'/api/admin/email-outbox', admin(self.admin_email_outbox)),
+            ('GET', r'/api/admin/db-metrics', admin(self.admin_db_metrics)),
+            ('GET', r'/api/admin/dashboard', admin(self.admin_dashboard)),
+            ('GET', r'/uploads/(?P<path>.+)', self.uploaded_image),
+        ]]
+
+    # ============= DISPATCH =============
+
+    def handle(self, request):
+        """Return (status, payload, headers) for a parsed request"""
+        try:
+            for method, pattern, template, handler in self.routes:
+                match = pattern.fullmatch(request.path)
+                if match and method == request.method:
+                    request.params = match.groupdict()
+                    request.route = template
+                    return handler(request)
+            raise ApiError(404, 'API endpoint not found')
+        except ApiError as error:
+            payload = {'success': False, 'message': error.message}
+            if error.errors is not None:
+                payload['errors'] = error.errors
+            return error.status, payload, error.headers
+
+    def require_auth(self, handler):
+        def wrapped(request):
+            header = request.header('authorization', '')
+            token = header.replace('Bearer ', '') if header else ''
+            if not token:
+                raise ApiError(401, 'No token provided, authorization denied')
+            with self.tokens_lock:
+                session = self.tokens.get(token)
+            if not session or session['expires'] < time.time():
+                raise ApiError(401, 'Token is not valid')
+            user = self.cached_user(token)
+            if user is None:
+                user = self.store.get('users', session['user_id'])
+                if not user:
+                    raise ApiError(401, 'Token is not valid')
+                self.cache_user(token, user, session['expires'])
+            request.user = user
+            request.token = token
+            return handler(request)
+        return wrapped
+
+    def metrics_auth(self, handler):
+        """Bearer metrics_token if one is configured, otherwise an admin login, like middleware/metrics.js"""
+        if self.metrics_token is None:
+            return self.require_auth(handler)
+
+        def wrapped(request):
+            token = request.header('authorization', '').replace('Bearer ', '')
+            if not hmac.compare_digest(token.encode('utf-8'), self.metrics_token.encode('utf-8')):
+                raise ApiError(401, 'Invalid metrics token')
+            return handler(request)
+        return wrapped
+
+    def cached_user(self, token):
+        if self.auth_cache_ttl <= 0:
+            return None
+        with self.tokens_lock:
+            entry = self.user_cache.get(token)
+            if entry is None or entry[1] <= time.time():
+                self.user_cache.pop(token, None)
+                return None
+            self.user_cache.move_to_end(token)
+            return entry[0]
+
+    def cache_user(self, token, user, token_expires):
+        """Cache the user behind a token, never past the token's expiry, like utils/userCache.js"""
+        if self.auth_cache_ttl <= 0:
+            return
+        with self.tokens_lock:
+            self.user_cache[token] = (user, min(time.time() + self.auth_cache_ttl, token_expires))
+            self.user_cache.move_to_end(token)
+            while len(self.user_cache) > AUTH_CACHE_MAX_ENTRIES:
+                self.user_cache.popitem(last=False)
+
+    def claim_submission(self, fingerprint):
+        """Remember a contact submission; False if it was already seen within the window"""
+        now = time.time()
+        with self.submissions_lock:
+            expires = self.recent_submissions.get(fingerprint)
+            if expires is not None and expires > now:
+                self.recent_submissions.move_to_end(fingerprint)
+                return False
+            self.recent_submissions[fingerprint] = now + self.contact_duplicate_window
+            self.recent_submissions.move_to_end(fingerprint)
+            while len(self.recent_submissions) > CONTACT_FINGERPRINT_MAX_ENTRIES:
+                self.recent_submissions.popitem(last=False)
+            return True
+
+    def list_fields(self, request, fields):
+        """Projection of a list route: its response fields, or whole documents with
+        ?read=hydrated where allowed, like hydratedRead in utils/serializers.js"""
+        return None if self.hydrated_read_param and request.query.get('read') == 'hydrated' else fields
+
+    def close_rate_limits(self):
+        """Write the general limiter's pending hits, like flushRateLimiters at shutdown"""
+        if isinstance(self.general_rate_store, BatchedRateLimitStore):
+            self.general_rate_store.stop()
+
+    @staticmethod
+    def bypasses_rate_limit(request):
+        return (request.header('x-bypass-rate-limit') == 'true' or
+                request.query.get('bypassRateLimit') == 'true')
+
+    @staticmethod
+    def limited(limiter, message, skip=None):
+        """Rate limit a route per client IP, like createRateLimiter; limiter=None lets everything through"""
+        def decorator(handler):
+            if limiter is None:
+                return handler
+
+            def wrapped(request):
+                if skip and skip(request):
+                    return handler(request)
+                allowed, limit_headers = limiter.hit(request.client_ip)
+                if not allowed:
+                    return 429, {'success': False, 'message': message}, limit_headers
+                try:
+                    status, payload, headers = handler(request)
+                except ApiError as error:
+                    error.headers = dict(error.headers, **limit_headers)
+                    raise
+                return status, payload, dict(headers, **limit_headers)
+            return wrapped
+        return decorator
+
+    def cached(self, *collections):
+        """Cache serialized 200 responses per path and query, like middleware/cache.js,
+        and answer conditional requests like middleware/conditional.js"""
+        def decorator(handler):
+            def wrapped(request):
+                key = request.path + '?' + '&'.join(f"{k}={v}" for k, v in sorted(request.query.items()))
+                version = self.store.version(*collections)
+                digest = hashlib.sha1(f"{key}|{version}".encode('utf-8')).hexdigest()
+                modified = self.store.last_modified(*collections)
+                validators = {'ETag': f'"{digest}"', 'Cache-Control': 'no-cache'}
+                if modified:
+                    validators['Last-Modified'] = http_date(modified)
+                if is_fresh(request, validators['ETag'], validators.get('Last-Modified')):
+                    return 304, None, validators
+
+                with self.cache_lock:
+                    entry = self.cache.get(key)
+                    if entry and entry[1] == version and entry[2] > time.time():
+                        self.cache.move_to_end(key)
+                        self.cache_stats['hits'] += 1
+                        return 200, entry[0], dict(validators, **{'X-Cache': 'HIT'})
+                    self.cache_stats['misses'] += 1
+
+                status, payload, headers = handler(request)
+                body = encode_json(payload)
+                if status == 200:
+                    with self.cache_lock:
+                        self.cache[key] = (body, version, time.time() + CACHE_TTL)
+                        self.cache.move_to_end(key)
+                        while len(self.cache) > CACHE_MAX_ENTRIES:
+                            self.cache.popitem(last=False)
+                            self.cache_stats['evictions'] += 1
+                    headers = dict(headers, **validators)
+                return status, body, dict(headers, **{'X-Cache': 'MISS'})
+            return wrapped
+        return decorator
+
+    @staticmethod
+    def ok(data=None, status=200, **extra):
+        payload = {'success': True}
+        payload.update(extra)
+        if data is not None:
+            payload['data'] = data
+        return status, payload, {}
+
+    # ============= HEALTH =============
+
+    def health(self, request):
+        return self.ok(message='Portfolio API is running', timestamp=now_iso())
+
+    def root(self, request):
+        return self.ok(message='Portfolio Backend API', version='1.0.0')
+
+    # ============= AUTH =============
+
+    def login(self, request):
+        v = Validator(request.body)
+        v.email('email', 'Please provide a valid email')
+        password = v.body.get('password')
+        if not isinstance(password, str) or len(password) < 8:
+            v.fail('password', 'Password must be at least 8 characters long')
+        body = v.check()
+
+        user = self.store.find_one('users', lambda doc: doc['email'] == body['email'])
+        if not user or not hmac.compare_digest(user['password'], hash_password(password)):
+            raise ApiError(401, 'Invalid credentials')
+
+        token = secrets.token_urlsafe(32)
+        with self.tokens_lock:
+            self.tokens[token] = {'user_id': user['_id'], 'expires': time.time() + TOKEN_TTL}
+        return self.ok(message='Login successful', token=token, user=public_user(user))
+
+    def verify(self, request):
+        return self.ok(message='Token is valid', user=public_user(request.user))
+
+    def logout(self, request):
+        with self.tokens_lock:
+            self.tokens.pop(request.token, None)
+            self.user_cache.pop(request.token, None)
+        return self.ok(message='Logout successful')
+
+    # ============= PUBLIC PORTFOLIO =============
+
+    def portfolio_personal(self, request):
+        personal = self.store.find_one('personal') or dict(SEED_PERSONAL)
+        return self.ok(personal)
+
+    def portfolio_projects(self, request):
+        category = request.query.get('category')
+        predicate = None
+        if category and category != 'All':
+            predicate = lambda doc: doc['category'] == category
+        if any(key in request.query for key in ('q', 'tech', 'page', 'limit')):
+            return self.search_projects(request, predicate)
+        return self.ok(self.store.find('projects', predicate, PROJECT_SORT,
+                                       fields=self.list_fields(request, PROJECT_FIELDS)))
+
+    def search_projects(self, request, predicate):
+        """Ranked, paginated ?q= / ?tech= search, like searchProjects in routes/portfolio.js"""
+        text, tags, page, limit = validate_project_search(request.query)
+        projects, total = self.store.search('projects', text, tags, predicate, PROJECT_SORT,
+                                            (page - 1) * limit, limit, PROJECT_FIELDS)
+        return self.ok({
+            'projects': projects,
+            'pagination': {'page': page, 'limit': limit, 'total': total, 'pages': -(-total // limit)}
+        })
+
+    def portfolio_featured(self, request):
+        projects = self.store.find('projects', lambda doc: doc['featured'],
+                                   [('order', 1), ('createdAt', -1)], limit=3,
+                                   fields=self.list_fields(request, PROJECT_FIELDS))
+        return self.ok(projects)
+
+    def portfolio_tech_stack(self, request):
+        return self.ok(self.store.find('techstacks', sort=TECH_STACK_SORT,
+                                       fields=self.list_fields(request, TECH_STACK_FIELDS)))
+
+    def legacy_counts(self, request):
+        return self.legacy_counts_param and request.query.get('strategy') == 'legacy'
+
+    def summary_counts(self, request, include_messages=False):
+        if self.legacy_counts(request):
+            return self.store.summary_legacy(include_messages)
+        return self.store.summary(include_messages)
+
+    def portfolio_stats(self, request):
+        if self.legacy_counts(request):
+            # The ETag validators cost an aggregation per collection (collectionVersion)
+            self.store.collection_version('projects')
+            self.store.collection_version('techstacks')
+            summary = {
+                'totalProjects': self.store.count('projects'),
+                'aiProjects': self.store.count('projects', lambda doc: doc['category'] == 'AI'),
+                'webProjects': self.store.count('projects', lambda doc: doc['category'] == 'Web'),
+                'techStackCount': self.store.count('techstacks')
+            }
+        else:
+            summary = self.store.summary()
+        return self.ok({
+            'totalProjects': summary['totalProjects'],
+            'aiProjects': summary['aiProjects'],
+            'webProjects': summary['webProjects'],
+            'techCount': summary['techStackCount'],
+            'yearsExperience': 3,
+            'clients': 25
+        })
+
+    def bundle_snapshot(self):
+        """The current bundle, rebuilt when personal, projects or tech stack changed since it was built.
+        Checking is a version lookup, not a store round-trip."""
+        collections = ('personal', 'projects', 'techstacks')
+        with self.bundle_lock:
+            version = self.store.version(*collections)
+            if self.bundle and self.bundle['version'] == version:
+                return self.bundle
+            summary = self.store.summary()
+            body = encode_json({'success': True, 'data': {
+                'personal': self.store.find_one('personal') or dict(SEED_PERSONAL),
+                'projects': self.store.find('projects', sort=PROJECT_SORT, fields=PROJECT_FIELDS),
+                'techStack': self.store.find('techstacks', sort=TECH_STACK_SORT, fields=TECH_STACK_FIELDS),
+                'stats': {
+                    'totalProjects': summary['totalProjects'],
+                    'aiProjects': summary['aiProjects'],
+                    'webProjects': summary['webProjects'],
+                    'techCount': summary['techStackCount'],
+                    'yearsExperience': 3,
+                    'clients': 25
+                }
+            }})
+            variants = {'identity': body, 'gzip': gzip.compress(body, 9)}
+            if brotli:
+                variants['br'] = brotli.compress(body, quality=11)
+            self.bundle_builds += 1
+            self.bundle = {
+                'version': version,
+                'etag': base64.urlsafe_b64encode(hashlib.sha1(body).digest()).decode('ascii').rstrip('='),
+                'lastModified': self.store.last_modified(*collections),
+                'variants': variants,
+            }
+            return self.bundle
+
+    def portfolio_bundle(self, request):
+        bundle = self.bundle_snapshot()
+        accepted = request.header('accept-encoding', '')
+        encoding = next((name for name in ('br', 'gzip')
+                         if name in bundle['variants'] and accepts_encoding(accepted, name)), 'identity')
+        headers = {
+            'Cache-Control': 'no-cache',
+            'Vary': 'Accept-Encoding',
+            'ETag': f'"{bundle["etag"]}{"" if encoding == "identity" else "-" + encoding}"'
+        }
+        if bundle['lastModified']:
+            headers['Last-Modified'] = http_date(bundle['lastModified'])
+        if is_fresh(request, headers['ETag'], headers.get('Last-Modified')):
+            return 304, None, headers
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return 200, bundle['variants'][encoding], headers
+
+    # ============= CONTACT =============
+
+    def contact(self, request):
+        log = self.contact_log.for_request(request, self.contact_log_sample_rate)
+        try:
+            body = validate_contact(request.body)
+        except ApiError as error:
+            log.debug('Contact submission failed validation', body=describe_contact_body(request.body),
+                      errors=[{'path': item.get('path'), 'msg': item.get('msg')} for item in error.errors or []])
+            raise
+        log.debug('Processing contact form submission', body=describe_contact_body(request.body))
+        log.debug('Client info', ipAddress=request.client_ip, userAgent=request.header('user-agent'))
+        # Replays of a recent submission are rejected before anything is stored or mailed
+        if self.contact_duplicate_window > 0:
+            fingerprint = hashlib.sha256(f"{body['email']}\n{body['message']}".encode('utf-8')).hexdigest()
+            since = iso_from_ms((time.time() - self.contact_duplicate_window) * 1000)
+            stored = self.contact_duplicate_check_stored
+            if not self.claim_submission(fingerprint) or (stored and self.store.exists_since(
+                    'contacts', request.client_ip, since,
+                    lambda doc: doc['email'] == body['email'] and doc['message'] == body['message'])):
+                log.info('Duplicate contact submission rejected', ipAddress=request.client_ip)
+                raise ApiError(409, 'This message was already received. I will get back to you soon.')
+        contact = self.store.insert('contacts', {
+            'name': body['name'],
+            'email': body['email'],
+            'message': body['message'],
+            'status': 'new',
+            'ipAddress': request.client_ip,
+            'userAgent': request.header('user-agent')
+        })
+        payload = {'name': contact['name'], 'email': contact['email'], 'message': contact['message']}
+        if self.email_delivery == 'inline':
+            if self.resend_url:
+                for kind in ('contactNotification', 'autoReply'):
+                    try:
+                        send_resend(self.resend_url, '/emails', build_email(kind, payload))
+                    except Exception as error:  # the inline route logs and carries on
+                        log.error(f'Failed to send {kind} email', err=str(error), contactId=contact['_id'])
+        else:
+            for kind in ('contactNotification', 'autoReply'):
+                self.store.insert('emailjobs', {
+                    'kind': kind, 'contact': contact['_id'], 'payload': payload,
+                    'status': 'pending', 'attempts': 0, 'nextAttemptAt': time.time()
+                })
+            if self.outbox:
+                self.outbox.notify()
+            log.debug('Contact saved', contactId=contact['_id'], emailsQueued=2)
+        log.info('Contact form submitted', contactId=contact['_id'], delivery=self.email_delivery)
+        return self.ok({'id': contact['_id'], 'timestamp': contact['createdAt']}, status=201,
+                       message='Thank you for your message! I will get back to you soon.')
+
+    # ============= ADMIN: PROJECTS =============
+
+    def admin_projects(self, request):
+        return self.ok(self.store.find('projects', sort=PROJECT_SORT,
+                                       fields=self.list_fields(request, ADMIN_PROJECT_FIELDS)))
+
+    def admin_create_project(self, request):
+        body = validate_project(request.body)
+        if body.get('featured'):
+            featured = self.store.find('projects', lambda doc: doc['featured'], [('updatedAt', 1)])
+            if len(featured) >= MAX_FEATURED_PROJECTS:
+                self.store.update('projects', featured[0]['_id'], {'featured': False})
+        project = self.store.insert('projects', dict(
+            {'imagePublicId': '', 'featured': False, 'order': 0}, **body))
+        return self.ok(project, status=201, message='Project created successfully')
+
+    def batch_targets(self, collection, create, update, remove):
+        """Documents a batch updates or deletes (one query), plus the ids that don't exist"""
+        ids = [doc_id.lower() for doc_id, _ in update] + [doc_id.lower() for doc_id in remove]
+        wanted = set(ids)
+        targets = {doc['_id']: doc for doc in self.store.find(collection, lambda doc: doc['_id'] in wanted)} if ids else {}
+        return targets, [doc_id for doc_id in ids if doc_id not in targets]
+
+    @staticmethod
+    def batch_operations(create, update, remove, defaults):
+        created = [new_id() for _ in create]
+        operations = [('insert', dict(defaults, **doc, _id=doc_id)) for doc, doc_id in zip(create, created)]
+        operations += [('update', doc_id.lower(), fields) for doc_id, fields in update]
+        operations += [('delete', doc_id.lower()) for doc_id in remove]
+        return operations, created
+
+    def admin_bulk_projects(self, request):
+        create, update, remove = validate_batch(request.body, validate_project)
+        targets, missing = self.batch_targets('projects', create, update, remove)
+        if missing:
+            return 404, {'success': False, 'message': 'Some projects were not found', 'missing': missing}, {}
+        featured = self.store.find('projects', lambda doc: doc['featured'], [('updatedAt', 1)])
+
+        batch_featured = sum(1 for doc in create if doc.get('featured')) + sum(
+            1 for doc_id, fields in update if fields.get('featured', targets[doc_id.lower()]['featured']))
+        if batch_featured > MAX_FEATURED_PROJECTS:
+            raise ApiError(400, f'A batch can feature at most {MAX_FEATURED_PROJECTS} projects')
+        untouched = [doc['_id'] for doc in featured if doc['_id'] not in targets]
+        unfeatured = untouched[:max(0, len(untouched) + batch_featured - MAX_FEATURED_PROJECTS)]
+
+        operations, created = self.batch_operations(
+            create, update, remove, {'imagePublicId': '', 'featured': False, 'order': 0})
+        operations[:0] = [('update', doc_id, {'featured': False}) for doc_id in unfeatured]
+        deleted = self.store.bulk_write('projects', operations)
+        for doc_id in remove:
+            project = targets[doc_id.lower()]
+            self.images.destroy(image_public_ids(project.get('imageSet'), project.get('imagePublicId')))
+        return self.ok({'created': created, 'updated': len(update), 'deleted': deleted, 'unfeatured': unfeatured},
+                       message='Projects updated successfully')
+
+    def admin_update_project(self, request):
+        body = validate_project(request.body)
+        project = self.store.update('projects', request.params['id'], body)
+        if not project:
+            raise ApiError(404, 'Project not found')
+        return self.ok(project, message='Project updated successfully')
+
+    def admin_delete_project(self, request):
+        project = self.store.delete('projects', request.params['id'])
+        if not project:
+            raise ApiError(404, 'Project not found')
+        self.images.destroy(image_public_ids(project.get('imageSet'), project.get('imagePublicId')))
+        return self.ok(message='Project deleted successfully')
+
+    # ============= ADMIN: IMAGE UPLOADS =============
+
+    def store_upload(self, request, field, preset_name, missing_message, type_message):
+        """Image set of the uploaded file in field, like storeImage in config/imageStore.js"""
+        preset = IMAGE_PRESETS[preset_name]
+        upload = request.files.get(field)
+        if not upload:
+            raise ApiError(400, missing_message)
+        if not upload['mimetype'].startswith('image/'):
+            raise ApiError(400, type_message)
+        if len(upload['buffer']) > preset['max_bytes']:
+            raise ApiError(400, 'File too large')
+        stored = self.images.upload(upload['buffer'], preset, f"http://{request.header('host')}/uploads")
+        return build_image_set(stored, preset, *self.images.formats(preset))
+
+    def uploaded(self, image_set, message):
+        return self.ok({'url': image_set['src'], 'publicId': image_set['publicIds'][0], 'imageSet': image_set},
+                       message=message)
+
+    def admin_upload_project_image(self, request):
+        image_set = self.store_upload(request, 'projectImage', 'project', 'No project image provided',
+                                      'Only image files are allowed for project images')
+        return self.uploaded(image_set, 'Project image uploaded successfully')
+
+    def admin_upload_profile_image(self, request):
+        image_set = self.store_upload(request, 'profileImage', 'profile', 'No profile image provided',
+                                      'Only image files are allowed')
+        personal = self.store.find_one('personal')
+        changes = {'profileImageUrl': image_set['src'], 'profileImagePublicId': image_set['publicIds'][0],
+                   'profileImageSet': image_set}
+        if personal:
+            self.store.update('personal', personal['_id'], changes)
+            # Only once the new set is saved, so a failed save keeps the old one
+            self.images.destroy(image_public_ids(personal.get('profileImageSet'), personal.get('profileImagePublicId')))
+        else:
+            self.store.insert('personal', dict(SEED_PERSONAL, **changes))
+        return self.uploaded(image_set, 'Profile image uploaded successfully')
+
+    def admin_upload_tech_logo(self, request):
+        image_set = self.store_upload(request, 'techLogo', 'techLogo', 'No tech logo provided',
+                                      'Only image files are allowed for tech logos')
+        return self.uploaded(image_set, 'Tech logo uploaded successfully')
+
+    def uploaded_image(self, request):
+        """A stored variant, like express.static over IMAGE_LOCAL_DIR in server.js"""
+        path = request.params['path']
+        data = self.images.read(path)
+        if data is None:
+            raise ApiError(404, 'Image not found')
+        fmt = path.rsplit('.', 1)[-1]
+        return 200, data, {'Content-Type': IMAGE_MIME_TYPES.get(fmt, 'application/octet-stream'),
+                           'Cache-Control': 'public, max-age=31536000, immutable',
+                           'Cross-Origin-Resource-Policy': 'cross-origin'}
+
+    # ============= ADMIN: PERSONAL =============
+
+    def admin_personal(self, request):
+        personal = self.store.find_one('personal')
+        if not personal:
+            personal = self.store.insert('personal', dict(SEED_PERSONAL))
+        return self.ok(personal)
+
+    def admin_update_personal(self, request):
+        body = validate_personal(request.body)
+        personal = self.store.find_one('personal')
+        if personal:
+            personal = self.store.update('personal', personal['_id'], body)
+        else:
+            personal = self.store.insert('personal', body)
+        return self.ok(personal, message='Personal information updated successfully')
+
+    # ============= ADMIN: TECH STACK =============
+
+    def admin_tech_stack(self, request):
+        return self.ok(self.store.find('techstacks', sort=TECH_STACK_SORT,
+                                       fields=self.list_fields(request, ADMIN_TECH_STACK_FIELDS)))
+
+    def admin_create_tech(self, request):
+        body = validate_tech_stack(request.body)
+        item = self.store.insert('techstacks', dict({'logoUrl': '', 'logoPublicId': '', 'order': 0}, **body))
+        return self.ok(item, status=201, message='Tech stack item created successfully')
+
+    def admin_bulk_tech(self, request):
+        create, update, remove = validate_batch(request.body, validate_tech_stack)
+        targets, missing = self.batch_targets('techstacks', create, update, remove)
+        if missing:
+            return 404, {'success': False, 'message': 'Some tech stack items were not found', 'missing': missing}, {}
+        operations, created = self.batch_operations(
+            create, update, remove, {'logoUrl': '', 'logoPublicId': '', 'order': 0})
+        deleted = self.store.bulk_write('techstacks', operations)
+        for doc_id in remove:
+            item = targets[doc_id.lower()]
+            self.images.destroy(image_public_ids(item.get('logoSet'), item.get('logoPublicId')))
+        return self.ok({'created': created, 'updated': len(update), 'deleted': deleted},
+                       message='Tech stack updated successfully')
+
+    def admin_update_tech(self, request):
+        body = validate_tech_stack(request.body)
+        item = self.store.update('techstacks', request.params['id'], body)
+        if not item:
+            raise ApiError(404, 'Tech stack item not found')
+        return self.ok(item, message='Tech stack item updated successfully')
+
+    def admin_delete_tech(self, request):
+        item = self.store.delete('techstacks', request.params['id'])
+        if not item:
+            raise ApiError(404, 'Tech stack item not found')
+        self.images.destroy(image_public_ids(item.get('logoSet'), item.get('logoPublicId')))
+        return self.ok(message='Tech stack item deleted successfully')
+
+    # ============= ADMIN: CONTACT MESSAGES =============
+
+    def admin_messages(self, request):
+        status = request.query.get('status')
+        predicate = None
+        if status and status != 'all':
+            predicate = lambda doc: doc['status'] == status
+
+        if 'page' in request.query and 'cursor' not in request.query:
+            # Original offset pagination with an exact total
+            page = int(request.query['page'])
+            limit = int(request.query.get('limit', 10))
+            contacts = self.store.offset_page('contacts', predicate, (page - 1) * limit, limit,
+                                              self.list_fields(request, CONTACT_LIST_FIELDS))
+            total = self.store.count('contacts', predicate)
+            return self.ok({
+                'contacts': contacts,
+                'pagination': {
+                    'page': page,
+                    'limit': limit,
+                    'total': total,
+                    'pages': -(-total // limit)
+                }
+            })
+
+        try:
+            limit = min(max(int(request.query.get('limit', 10)), 1), 100)
+        except ValueError:
+            limit = 10
+        after = None
+        if 'cursor' in request.query:
+            after = decode_cursor(request.query['cursor'])
+            if after is None:
+                raise ApiError(400, 'Invalid cursor')
+
+        fields = CONTACT_LIST_FIELDS
+        if request.query.get('fields'):
+            selected = [field.strip() for field in request.query['fields'].split(',') if field.strip()]
+            unknown = [field for field in selected if field not in CONTACT_FIELDS]
+            if unknown:
+                raise ApiError(400, f"Unknown fields: {', '.join(unknown)}")
+            # createdAt is part of the cursor, so it is always returned
+            fields = ['_id'] + list(dict.fromkeys(selected + ['createdAt']))
+
+        contacts = self.store.keyset_page('contacts', predicate, after, limit + 1, fields)
+        has_more = len(contacts) > limit
+        contacts = contacts[:limit]
+        next_cursor = encode_cursor(contacts[-1]) if has_more else None
+        return self.ok({
+            'contacts': contacts,
+            'pagination': {
+                'limit': limit,
+                'total': self.approximate_contact_total(status if predicate else None, predicate),
+                'totalIsApproximate': True,
+                'hasMore': has_more,
+                'nextCursor': next_cursor
+            }
+        })
+
+    def approximate_contact_total(self, status, predicate):
+        """Message total per status filter, refreshed every CONTACT_TOTAL_TTL seconds"""
+        key = status or 'all'
+        with self.contact_lock:
+            entry = self.contact_totals.get(key)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        total = self.store.count('contacts', predicate) if predicate else self.store.estimated_count('contacts')
+        with self.contact_lock:
+            self.contact_totals[key] = (total, time.time() + CONTACT_TOTAL_TTL)
+        return total
+
+    def admin_contact_export(self, request):
+        """Stream messages as NDJSON or CSV in cursor-sized batches, like routes/admin.js"""
+        export_format = request.query.get('format', 'ndjson')
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ApiError(400, 'Invalid format. Must be one of: ndjson, csv')
+
+        conditions = []
+        status = request.query.get('status')
+        if status and status != 'all':
+            conditions.append(lambda doc: doc['status'] == status)
+        for name, keep in (('since', lambda created, bound: created >= bound),
+                           ('until', lambda created, bound: created < bound)):
+            if name not in request.query:
+                continue
+            try:
+                bound = datetime.fromisoformat(request.query[name].replace('Z', '+00:00'))
+            except ValueError:
+                raise ApiError(400, f"Invalid {name} date")
+            if bound.tzinfo is None:
+                bound = bound.replace(tzinfo=timezone.utc)
+            bound = iso_from_ms(round(bound.timestamp() * 1000))
+            conditions.append(lambda doc, keep=keep, bound=bound: keep(doc['createdAt'], bound))
+        predicate = (lambda doc: all(condition(doc) for condition in conditions)) if conditions else None
+
+        fields = ['_id', *CONTACT_FIELDS]
+        if request.query.get('fields'):
+            fields = [field.strip() for field in request.query['fields'].split(',') if field.strip()]
+            unknown = [field for field in fields if field != '_id' and field not in CONTACT_FIELDS]
+            if unknown:
+                raise ApiError(400, f"Unknown fields: {', '.join(unknown)}")
+
+        def csv_cell(value):
+            text = '' if value is None else str(value)
+            return "'" + text if text.startswith(FORMULA_START) else text
+
+        def rows():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\r\n')
+            if export_format == 'csv':
+                writer.writerow(fields)
+            after = None
+            while True:
+                # One batch per store read, like a cursor's getMore
+                batch = self.store.keyset_page('contacts', predicate, after, EXPORT_BATCH_SIZE)
+                for doc in batch:
+                    if export_format == 'csv':
+                        writer.writerow([csv_cell(doc.get(field)) for field in fields])
+                    else:
+                        row = {field: doc[field] for field in fields if field in doc}
+                        buffer.write(json.dumps(row, separators=(',', ':')) + '\n')
+                chunk = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                yield chunk.encode('utf-8')
+                if len(batch) < EXPORT_BATCH_SIZE:
+                    return
+                after = (batch[-1]['createdAt'], batch[-1]['_id'])
+
+        stamp = now_iso()[:10]
+        return 200, rows(), {
+            'Content-Type': EXPORT_CONTENT_TYPES[export_format],
+            'Content-Disposition': f'attachment; filename="contact-messages-{stamp}.{export_format}"',
+            'Cache-Control': 'no-store'
+        }
+
+    def admin_message_status(self, request):
+        status = request.body.get('status') if isinstance(request.body, dict) else None
+        if status not in ('new', 'read', 'replied'):
+            raise ApiError(400, 'Invalid status. Must be one of: new, read, replied')
+        contact = self.store.update('contacts', request.params['id'], {'status': status})
+        if not contact:
+            raise ApiError(404, 'Contact message not found')
+        with self.contact_lock:
+            self.contact_totals.clear()
+        return self.ok(contact, message='Contact status updated successfully')
+
+    # ============= ADMIN: RESPONSE CACHE =============
+
+    def admin_cache_stats(self, request):
+        with self.cache_lock:
+            lookups = self.cache_stats['hits'] + self.cache_stats['misses']
+            bundle = self.bundle
+            bundle_stats = {
+                'builds': self.bundle_builds,
+                'stale': not bundle or bundle['version'] != self.store.version('personal', 'projects', 'techstacks'),
+                'bytes': {name: len(body) for name, body in bundle['variants'].items()} if bundle else None
+            }
+            return self.ok(dict(self.cache_stats, entries=len(self.cache), maxEntries=CACHE_MAX_ENTRIES,
+                                ttlMs=CACHE_TTL * 1000,
+                                hitRatio=self.cache_stats['hits'] / lookups if lookups else 0,
+                                bundle=bundle_stats))
+
+    def admin_cache_clear(self, request):
+        with self.cache_lock:
+            self.cache.clear()
+        return self.ok(message='Portfolio cache cleared')
+
+    # ============= ADMIN: EMAIL OUTBOX =============
+
+    def admin_email_outbox(self, request):
+        stats = dict.fromkeys(('pending', 'sending', 'sent', 'failed'), 0)
+        for job in self.store.find('emailjobs'):
+            stats[job['status']] += 1
+        return self.ok(stats)
+
+    # ============= ADMIN: DATABASE POOL =============
+
+    def admin_db_metrics(self, request):
+        return self.ok(self.store.pool.snapshot())
+
+    # ============= METRICS =============
+
+    def serve_metrics(self, request):
+        return 200, self.metrics.render(self.store.pool.snapshot()), {
+            'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+            'Cache-Control': 'no-store'
+        }
+
+    # ============= ADMIN: DASHBOARD =============
+
+    def admin_dashboard(self, request):
+        store = self.store
+        return self.ok({
+            'stats': self.summary_counts(request, include_messages=True),
+            'recentProjects': store.find('projects', sort=[('createdAt', -1)], limit=5,
+                                         fields=self.list_fields(request, ADMIN_PROJECT_FIELDS)),
+            'recentMessages': store.find('contacts', sort=[('createdAt', -1)], limit=5,
+                                         fields=self.list_fields(request, CONTACT_LIST_FIELDS))
+        })
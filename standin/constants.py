@@ -0,0 +1,190 @@
+"""
+Limits, defaults and seed data, kept in step with the backend's
+configuration and routes.
+"""
+
+import re
+
+DEFAULT_ADMIN_EMAIL = "admin@naveen-portfolio.com"
+DEFAULT_ADMIN_PASSWORD = "N@veenDev#2025"
+
+# Same limits as routes/auth.js and routes/contact.js
+TOKEN_TTL = 24 * 60 * 60
+CONTACT_WINDOW = 60 * 60
+CONTACT_MAX = 10
+# Same as CONTACT_DUPLICATE_WINDOW_MS and CONTACT_FINGERPRINT_MAX_ENTRIES
+CONTACT_DUPLICATE_WINDOW = 10 * 60
+CONTACT_FINGERPRINT_MAX_ENTRIES = 10000
+
+# Driver default pool size, and the buckets (ms) of utils/dbPoolMetrics.js
+MONGO_MAX_POOL_SIZE = 100
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Request duration buckets (seconds) of utils/metrics.js
+REQUEST_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Same levels and defaults as utils/logger.js
+LOG_LEVELS = {'trace': 10, 'debug': 20, 'info': 30, 'warn': 40, 'error': 50, 'fatal': 60}
+LOG_FLUSH_INTERVAL = 0.1
+LOG_MAX_BUFFER_BYTES = 1024 * 1024
+
+# Same default as SHUTDOWN_TIMEOUT_MS in server.js
+SHUTDOWN_TIMEOUT = 10
+
+# Same defaults as generalRateLimiter in server.js
+GENERAL_RATE_WINDOW = 15 * 60
+GENERAL_RATE_MAX = 100
+# Same defaults as RATE_LIMIT_SYNC_HITS and RATE_LIMIT_SYNC_MS
+RATE_LIMIT_SYNC_HITS = 10
+RATE_LIMIT_SYNC_INTERVAL = 1.0
+
+# Same defaults as the portfolio response cache in middleware/cache.js
+CACHE_TTL = 5 * 60
+CACHE_MAX_ENTRIES = 200
+
+# compression() in server.js gzips responses from this size on, at zlib's default level
+COMPRESSION_THRESHOLD = 1024
+
+# Same as the admin message list in routes/admin.js
+CONTACT_FIELDS = ('name', 'email', 'message', 'status', 'ipAddress', 'userAgent', 'createdAt', 'updatedAt')
+
+# Fields of the list responses, like the shapes in utils/serializers.js
+PROJECT_FIELDS = ('_id', 'title', 'description', 'category', 'image', 'imageSet', 'techStack', 'githubUrl',
+                  'liveUrl', 'featured', 'createdAt', 'updatedAt')
+ADMIN_PROJECT_FIELDS = PROJECT_FIELDS + ('imagePublicId', 'order')
+TECH_STACK_FIELDS = ('_id', 'name', 'icon', 'logoUrl', 'logoSet', 'color', 'category')
+ADMIN_TECH_STACK_FIELDS = TECH_STACK_FIELDS + ('logoPublicId', 'order', 'createdAt', 'updatedAt')
+CONTACT_LIST_FIELDS = ('_id',) + CONTACT_FIELDS
+CONTACT_TOTAL_TTL = 30
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_CONTENT_TYPES = {'ndjson': 'application/x-ndjson; charset=utf-8', 'csv': 'text/csv; charset=utf-8'}
+FORMULA_START = ('=', '+', '-', '@', '\t', '\r')
+
+# Same as the bulk endpoints in routes/admin.js and middleware/validation.js
+MAX_BATCH_ITEMS = 500
+MAX_FEATURED_PROJECTS = 3
+
+# Same as the project_search text index in models/Project.js and the project
+# search of routes/portfolio.js and middleware/validation.js
+PROJECT_SEARCH_WEIGHTS = {'title': 10, 'techStack': 5, 'description': 1}
+DEFAULT_SEARCH_LIMIT = 12
+MAX_SEARCH_LIMIT = 50
+MAX_SEARCH_TAGS = 10
+MAX_SEARCH_LENGTH = 100
+SEARCH_TERM_RE = re.compile(r'[^\W_]+')
+INTEGER_RE = re.compile(r'[+-]?\d+')
+
+# Same defaults as the verified-user cache in utils/userCache.js
+AUTH_CACHE_TTL = 60
+AUTH_CACHE_MAX_ENTRIES = 500
+
+# Same defaults as the email outbox worker in utils/emailOutbox.js
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_POLL_INTERVAL = 5.0
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE = 5.0
+OUTBOX_RETRY_MAX = 15 * 60
+EMAIL_SENDER = 'Naveen Agarwal <onboarding@resend.dev>'
+ADMIN_INBOX = 'naveenagarwal7624@gmail.com'
+
+# Same as IMAGE_PRESETS and the upload limits in config/imageStore.js
+IMAGE_PRESETS = {
+    'profile': {'folder': 'portfolio/profile', 'prefix': 'naveen-profile', 'widths': (160, 320, 640, 960),
+                'aspect_ratio': 1, 'crop': 'fill', 'fallback_format': 'jpg',
+                'sizes': '320px', 'max_bytes': 2 * 1024 * 1024},
+    'project': {'folder': 'portfolio/projects', 'prefix': 'project', 'widths': (320, 640, 960, 1280),
+                'aspect_ratio': 4 / 3, 'crop': 'limit', 'fallback_format': 'jpg',
+                'sizes': '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw', 'max_bytes': 3 * 1024 * 1024},
+    'techLogo': {'folder': 'portfolio/tech-logos', 'prefix': 'tech-logo', 'widths': (32, 64, 96, 128),
+                 'aspect_ratio': 1, 'crop': 'limit', 'fallback_format': 'png',
+                 'sizes': '32px', 'max_bytes': 1 * 1024 * 1024},
+}
+IMAGE_MODERN_FORMAT = 'webp'
+IMAGE_MIME_TYPES = {'jpg': 'image/jpeg', 'png': 'image/png', 'webp': 'image/webp', 'avif': 'image/avif'}
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# Like validator's isURL: a domain with a TLD or an IPv4 address
+URL_RE = re.compile(r"^(https?://)?([\w.-]+\.[a-z]{2,}|\d{1,3}(\.\d{1,3}){3})(:\d+)?(/\S*)?$", re.IGNORECASE)
+HEX_COLOR_RE = re.compile(r"^#([0-9a-f]{3}|[0-9a-f]{6})$", re.IGNORECASE)
+OBJECT_ID_RE = re.compile(r"^[0-9a-f]{24}$", re.IGNORECASE)
+
+SEED_PERSONAL = {
+    'name': "Naveen Agarwal",
+    'title': "Front-End Developer",
+    'tagline': "Passionate fresher eager to build modern, responsive web experiences with clean code and innovative design",
+    'bio': "Recent graduate and enthusiastic Front-End Developer with a strong foundation in modern web technologies.",
+    'email': "naveen.agarwal.dev@gmail.com",
+    'phone': "+91 98765 43210",
+    'location': "India",
+    'profileImageUrl': "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=400&h=400&fit=crop&crop=face",
+    'profileImagePublicId': "",
+    'resumeUrl': "",
+    'resumePublicId': "",
+    'socialLinks': {
+        'github': "https://github.com/NaveenAgarwal2004",
+        'linkedin': "https://linkedin.com/in/naveen-agar",
+        'twitter': "https://x.com/NaveenAgar47373",
+        'email': "mailto:naveenagarwal7624@gmail.com"
+    }
+}
+
+SEED_PROJECTS = [
+    {
+        'title': "AI Portfolio",
+        'description': "An innovative AI-powered portfolio website built with modern JavaScript.",
+        'category': "AI",
+        'image': "/Assests/Project Images/AI Portfolio.jpeg",
+        'techStack': ["JavaScript", "React", "AI Integration", "CSS3"],
+        'githubUrl': "https://github.com/NaveenAgarwal2004/AI-Portfolio-main-1",
+        'liveUrl': "https://naveen-ai-portfolio.vercel.app",
+        'featured': False,
+        'order': 1
+    },
+    {
+        'title': "Street Bazaar Platform",
+        'description': "A comprehensive e-commerce platform for street vendors and local businesses.",
+        'category': "Web",
+        'image': "/Assests/Project Images/StreetBazzar.jpeg",
+        'techStack': ["Python", "Django", "PostgreSQL", "REST API"],
+        'githubUrl': "https://github.com/NaveenAgarwal2004/Street-Bazaar",
+        'liveUrl': "https://street-bazaar-app.herokuapp.com",
+        'featured': True,
+        'order': 2
+    },
+    {
+        'title': "Job Board Application",
+        'description': "A full-featured job portal with job posting, application tracking and search filters.",
+        'category': "Web",
+        'image': "/Assests/Project Images/Job Board.png",
+        'techStack': ["TypeScript", "React", "Node.js", "MongoDB"],
+        'githubUrl': "https://github.com/NaveenAgarwal2004/Job-Board",
+        'liveUrl': "https://naveen-job-board.netlify.app",
+        'featured': False,
+        'order': 3
+    },
+    {
+        'title': "Task Management System",
+        'description': "A project and task management application with team collaboration and Kanban boards.",
+        'category': "Web",
+        'image': "/Assests/Project Images/Task Management.jpeg",
+        'techStack': ["TypeScript", "React", "Node.js", "Socket.io", "MongoDB"],
+        'githubUrl': "https://github.com/NaveenAgarwal2004/Task-Management-System",
+        'liveUrl': "https://naveen-task-system.vercel.app",
+        'featured': True,
+        'order': 4
+    }
+]
+
+SEED_TECH_STACK = [
+    {'name': "HTML5", 'icon': "FileCode", 'color': "#E34F26", 'category': "Frontend", 'order': 1},
+    {'name': "CSS3", 'icon': "Palette", 'color': "#1572B6", 'category': "Frontend", 'order': 2},
+    {'name': "JavaScript", 'icon': "Zap", 'color': "#F7DF1E", 'category': "Frontend", 'order': 3},
+    {'name': "React", 'icon': "Component", 'color': "#61DAFB", 'category': "Frontend", 'order': 4},
+    {'name': "Git", 'icon': "GitBranch", 'color': "#F05032", 'category': "Tools", 'order': 1},
+    {'name': "Node.js", 'icon': "Server", 'color': "#339933", 'category': "Backend", 'order': 1},
+    {'name': "MongoDB", 'icon': "Database", 'color': "#47A248", 'category': "Database", 'order': 1}
+]
+
+PROJECT_SORT = [('featured', -1), ('order', 1), ('createdAt', -1)]
+TECH_STACK_SORT = [('category', 1), ('order', 1), ('name', 1)]
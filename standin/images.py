@@ -0,0 +1,218 @@
+"""
+Uploaded images: PNG decoding and resizing, the local store of their width
+variants and the image sets that list them.
+"""
+
+import io
+import os
+import secrets
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # uploads are then resized as PNG only, without a modern format
+    Image = ImageOps = None
+
+from .constants import IMAGE_MIME_TYPES, IMAGE_MODERN_FORMAT
+from .util import ApiError
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+def decode_png(data):
+    """(width, height, channels, rows) of an 8-bit, non-interlaced PNG; rows are unfiltered bytes"""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError('not a PNG')
+    pos, header, idat = len(PNG_SIGNATURE), None, []
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', chunk)
+        elif kind == b'IDAT':
+            idat.append(chunk)
+        elif kind == b'IEND':
+            break
+    if header is None:
+        raise ValueError('PNG without a header')
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or color_type not in PNG_CHANNELS or interlace:
+        raise ValueError('only 8-bit, non-interlaced, non-palette PNGs are supported')
+    channels = PNG_CHANNELS[color_type]
+    raw = zlib.decompress(b''.join(idat))
+    stride = width * channels
+    rows, previous = [], bytes(stride)
+    for y in range(height):
+        start = y * (stride + 1)
+        kind, row = raw[start], bytearray(raw[start + 1:start + 1 + stride])
+        if kind == 1:
+            for i in range(channels, stride):
+                row[i] = (row[i] + row[i - channels]) & 0xff
+        elif kind == 2:
+            row = bytearray((a + b) & 0xff for a, b in zip(row, previous))
+        elif kind == 3:
+            for i in range(stride):
+                left = row[i - channels] if i >= channels else 0
+                row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xff
+        elif kind == 4:
+            for i in range(stride):
+                a = row[i - channels] if i >= channels else 0
+                b = previous[i]
+                c = previous[i - channels] if i >= channels else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                row[i] = (row[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xff
+        rows.append(bytes(row))
+        previous = rows[-1]
+    return width, height, channels, rows
+
+def encode_png(width, height, channels, rows):
+    """8-bit PNG of unfiltered rows (filter type None, which needs no per-byte work)"""
+    color_type = {v: k for k, v in PNG_CHANNELS.items()}[channels]
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    scanlines = b''.join(b'\x00' + row for row in rows)
+    return (PNG_SIGNATURE + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(scanlines, 9)) + chunk(b'IEND', b''))
+
+def resize_nearest(width, height, channels, rows, box):
+    """Nearest-neighbour resize of a (left, top, right, bottom) box of rows to the size of the box's target"""
+    (left, top, right, bottom), (new_width, new_height) = box
+    offsets = [(left + (x * (right - left)) // new_width) * channels for x in range(new_width)]
+    resized = []
+    for y in range(new_height):
+        row = rows[top + (y * (bottom - top)) // new_height]
+        resized.append(b''.join(row[offset:offset + channels] for offset in offsets))
+    return resized
+
+def variant_box(width, height, preset, target_width):
+    """Source box and output size of one variant: 'fill' crops the centre to the
+    preset's aspect ratio, 'limit' fits inside it; neither enlarges"""
+    target_height = round(target_width / preset['aspect_ratio'])
+    if preset['crop'] == 'fill':
+        crop_width = min(width, round(height * preset['aspect_ratio']))
+        crop_height = min(height, round(crop_width / preset['aspect_ratio']))
+        left, top = (width - crop_width) // 2, (height - crop_height) // 2
+        out_width = min(target_width, crop_width)
+        return (left, top, left + crop_width, top + crop_height), (out_width, max(1, round(out_width / preset['aspect_ratio'])))
+    scale = min(1, target_width / width, target_height / height)
+    return (0, 0, width, height), (max(1, round(width * scale)), max(1, round(height * scale)))
+
+class LocalImageStore:
+    """Writes upload variants to a directory, like LocalImageStore in
+    config/imageStore.js. Resizes and encodes with Pillow when it is installed;
+    without it only PNG uploads are accepted, and their variants are written as
+    PNG alone, with no modern format."""
+
+    def __init__(self, directory=None):
+        self.owned = directory is None
+        self.directory = os.path.realpath(directory or tempfile.mkdtemp(prefix='standin-images-'))
+        self.lock = threading.Lock()
+
+    def formats(self, preset):
+        """Fallback format of a preset's variants, and the modern formats written next to it"""
+        if Image is None:
+            return 'png', ()
+        return preset['fallback_format'], (IMAGE_MODERN_FORMAT,)
+
+    def path(self, public_id):
+        path = os.path.realpath(os.path.join(self.directory, public_id))
+        if not path.startswith(self.directory + os.sep):
+            raise ApiError(400, f'Invalid image public ID: {public_id}')
+        return path
+
+    def render(self, data, preset):
+        """(width, height, [(target width, format, encoded bytes, width, height)])"""
+        fallback, modern = self.formats(preset)
+        variants = []
+        if Image is None:
+            width, height, channels, rows = decode_png(data)
+            for target in preset['widths']:
+                box = variant_box(width, height, preset, target)
+                out_width, out_height = box[1]
+                encoded = encode_png(out_width, out_height, channels, resize_nearest(width, height, channels, rows, box))
+                variants.append((target, fallback, encoded, out_width, out_height))
+            return width, height, variants
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+        width, height = image.size
+        for target in preset['widths']:
+            box, size = variant_box(width, height, preset, target)
+            resized = image.resize(size, Image.LANCZOS, box=box)
+            for fmt in (fallback,) + modern:
+                out = io.BytesIO()
+                frame = resized.convert('RGB') if fmt == 'jpg' else resized
+                frame.save(out, {'jpg': 'JPEG', 'png': 'PNG', 'webp': 'WEBP', 'avif': 'AVIF'}[fmt],
+                           quality=80, optimize=True)
+                variants.append((target, fmt, out.getvalue(), size[0], size[1]))
+        return width, height, variants
+
+    def upload(self, data, preset, base_url):
+        try:
+            width, height, rendered = self.render(data, preset)
+        except Exception as error:
+            raise ApiError(400, f'Unsupported image: {error}')
+        public_id = f"{preset['folder']}/{preset['prefix']}-{int(time.time() * 1000)}-{secrets.token_hex(3)}"
+        os.makedirs(os.path.dirname(self.path(public_id)), exist_ok=True)
+        variants = []
+        for target, fmt, encoded, out_width, out_height in rendered:
+            variant_id = f"{public_id}-{target}w.{fmt}"
+            with open(self.path(variant_id), 'wb') as handle:
+                handle.write(encoded)
+            variants.append({'publicId': variant_id, 'url': f"{base_url}/{variant_id}", 'width': out_width,
+                             'height': out_height, 'format': fmt, 'bytes': len(encoded)})
+        return {'publicId': public_id, 'width': width, 'height': height, 'variants': variants}
+
+    def read(self, public_id):
+        try:
+            with open(self.path(public_id), 'rb') as handle:
+                return handle.read()
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    def destroy(self, public_ids):
+        for public_id in public_ids:
+            try:
+                os.remove(self.path(public_id))
+            except (FileNotFoundError, IsADirectoryError):
+                pass
+
+    def close(self):
+        if self.owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+def build_image_set(upload, preset, fallback, modern):
+    """srcset-style image set stored on a document, like buildImageSet in config/imageStore.js"""
+    def by_format(fmt):
+        widths = {}
+        for variant in sorted(upload['variants'], key=lambda variant: variant['width']):
+            if variant['format'] == fmt:
+                # An original narrower than a preset width yields the same file twice
+                widths.setdefault(variant['width'], variant)
+        return list(widths.values())
+
+    def srcset(variants):
+        return ', '.join(f"{variant['url']} {variant['width']}w" for variant in variants)
+
+    fallback_variants = by_format(fallback)
+    return {
+        'src': fallback_variants[-1]['url'],
+        'srcset': srcset(fallback_variants),
+        'sources': [{'type': IMAGE_MIME_TYPES[fmt], 'srcset': srcset(by_format(fmt))} for fmt in modern],
+        'sizes': preset['sizes'],
+        'width': upload['width'],
+        'height': upload['height'],
+        'publicIds': list(dict.fromkeys([upload['publicId']] + [variant['publicId'] for variant in upload['variants']]))
+    }
+
+def image_public_ids(image_set, legacy_public_id=''):
+    """Everything to remove with a document's image, like imagePublicIds in config/imageStore.js"""
+    return [public_id for public_id in dict.fromkeys([legacy_public_id] + list((image_set or {}).get('publicIds', [])))
+            if public_id]
@@ -0,0 +1,119 @@
+"""
+Structured JSON-lines logging, buffered like utils/logger.js.
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+
+from .constants import LOG_FLUSH_INTERVAL, LOG_LEVELS, LOG_MAX_BUFFER_BYTES
+
+class LogOutput:
+    """Buffered JSON-lines output, like BufferedOutput in utils/logger.js: lines are
+    written in batches by a background thread every flush_interval seconds, or one
+    write and flush per line with flush_interval=0"""
+
+    def __init__(self, stream, flush_interval=LOG_FLUSH_INTERVAL):
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.chunks = []
+        self.bytes = 0
+        self.dropped = 0
+        self.lines = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def write(self, line):
+        with self.lock:
+            self.lines += 1
+            if not self.flush_interval:
+                self.stream.write(line)
+                self.stream.flush()
+                return
+            if self.bytes + len(line) > LOG_MAX_BUFFER_BYTES:
+                self.dropped += 1
+                return
+            self.chunks.append(line)
+            self.bytes += len(line)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.loop, name='log-output', daemon=True)
+                self.thread.start()
+
+    def loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.dropped:
+                self.chunks.append(json.dumps({'level': LOG_LEVELS['warn'], 'time': int(time.time() * 1000),
+                                               'pid': os.getpid(), 'msg': 'Log lines dropped',
+                                               'dropped': self.dropped}) + '\n')
+                self.dropped = 0
+            data = ''.join(self.chunks)
+            self.chunks = []
+            self.bytes = 0
+        if data:
+            self.stream.write(data)
+            self.stream.flush()
+
+    def close(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        self.flush()
+
+class StructuredLogger:
+    """Leveled logger like utils/logger.js; output=None discards everything"""
+
+    def __init__(self, output=None, level='info', bindings=None, keep=True):
+        self.output = output
+        self.threshold = LOG_LEVELS[level]
+        self.bindings = bindings or {}
+        # False for a request that wasn't sampled: only warn and above get through
+        self.keep = keep
+
+    def child(self, **bindings):
+        return StructuredLogger(self.output, self.level_name(), dict(self.bindings, **bindings), self.keep)
+
+    def for_request(self, request, sample_rate=1.0):
+        """Child logger that keeps one request's debug and info lines with probability sample_rate"""
+        keep = self.keep and (sample_rate >= 1 or secrets.randbelow(1_000_000) < sample_rate * 1_000_000)
+        bindings = dict(self.bindings, reqId=request.header('x-request-id') or secrets.token_hex(16))
+        return StructuredLogger(self.output, self.level_name(), bindings, keep)
+
+    def level_name(self):
+        return next(name for name, value in LOG_LEVELS.items() if value == self.threshold)
+
+    def enabled(self, level):
+        value = LOG_LEVELS[level]
+        return (self.output is not None and value >= self.threshold
+                and (self.keep or value >= LOG_LEVELS['warn']))
+
+    def log(self, level, msg, **fields):
+        if not self.enabled(level):
+            return
+        entry = dict({'level': LOG_LEVELS[level], 'time': int(time.time() * 1000), 'pid': os.getpid()},
+                     **self.bindings, **fields, msg=msg)
+        self.output.write(json.dumps(entry, default=str) + '\n')
+
+    def debug(self, msg, **fields):
+        self.log('debug', msg, **fields)
+
+    def info(self, msg, **fields):
+        self.log('info', msg, **fields)
+
+    def warn(self, msg, **fields):
+        self.log('warn', msg, **fields)
+
+    def error(self, msg, **fields):
+        self.log('error', msg, **fields)
+
+def describe_contact_body(body):
+    """Shape of a submission for the logs, like describeBody in routes/contact.js"""
+    body = body if isinstance(body, dict) else {}
+    message = body.get('message')
+    return {'fields': list(body), 'messageLength': len(message) if isinstance(message, str) else None}
@@ -0,0 +1,133 @@
+"""
+Duration statistics and the Prometheus text output of /api/metrics.
+"""
+
+import bisect
+import os
+import threading
+import time
+
+from .constants import LATENCY_BUCKETS_MS, REQUEST_DURATION_BUCKETS
+
+class DurationStats:
+    """Count, total, max and bucketed distribution of durations, like utils/dbPoolMetrics.js"""
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, duration_ms, failed=False):
+        self.count += 1
+        self.failures += int(failed)
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+
+    def to_json(self):
+        buckets = {str(bound): count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)}
+        buckets['+Inf'] = self.buckets[-1]
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'totalMs': round(self.total_ms, 3),
+            'meanMs': round(self.total_ms / self.count, 3) if self.count else 0,
+            'maxMs': round(self.max_ms, 3),
+            'buckets': buckets,
+        }
+
+def prometheus_labels(**labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped))
+
+def process_rss():
+    """Resident set size in bytes, where /proc is available"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+class RequestMetrics:
+    """Request counts, in-flight requests and duration histograms by route template,
+    rendered in the Prometheus text format like utils/metrics.js"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {}
+        # (method, route) -> [cumulative bucket counts, count, sum]
+        self.durations = {}
+        self.in_flight = 0
+
+    def start(self):
+        with self.lock:
+            self.in_flight += 1
+        return time.perf_counter()
+
+    def record(self, started, method, route, status):
+        seconds = time.perf_counter() - started
+        with self.lock:
+            self.in_flight -= 1
+            self.totals[(method, route, status)] = self.totals.get((method, route, status), 0) + 1
+            histogram = self.durations.setdefault((method, route), [[0] * len(REQUEST_DURATION_BUCKETS), 0, 0.0])
+            for index in range(bisect.bisect_left(REQUEST_DURATION_BUCKETS, seconds), len(REQUEST_DURATION_BUCKETS)):
+                histogram[0][index] += 1
+            histogram[1] += 1
+            histogram[2] += seconds
+
+    @staticmethod
+    def metric(name, kind, help_text, lines):
+        return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *lines]
+
+    def render(self, pool_snapshot):
+        with self.lock:
+            totals = sorted(self.totals.items())
+            durations = sorted((key, (list(counts), count, total))
+                               for key, (counts, count, total) in self.durations.items())
+            in_flight = self.in_flight
+
+        histogram_lines = []
+        for (method, route), (counts, count, total) in durations:
+            labels = prometheus_labels(method=method, route=route)
+            name = 'http_request_duration_seconds'
+            histogram_lines += [f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                                for bound, cumulative in zip(REQUEST_DURATION_BUCKETS, counts)]
+            histogram_lines += [f'{name}_bucket{{{labels},le="+Inf"}} {count}',
+                                f'{name}_sum{{{labels}}} {total}', f'{name}_count{{{labels}}} {count}']
+
+        # The pool's buckets count durations per bucket in ms; Prometheus wants cumulative seconds
+        command_lines = []
+        for command, stats in pool_snapshot['operations'].items():
+            labels = prometheus_labels(command=command)
+            name = 'mongodb_command_duration_seconds'
+            cumulative = 0
+            for bound in LATENCY_BUCKETS_MS:
+                cumulative += stats['buckets'][str(bound)]
+                command_lines.append(f'{name}_bucket{{{labels},le="{bound / 1000}"}} {cumulative}')
+            command_lines += [f'{name}_bucket{{{labels},le="+Inf"}} {stats["count"]}',
+                              f'{name}_sum{{{labels}}} {stats["totalMs"] / 1000}',
+                              f'{name}_count{{{labels}}} {stats["count"]}']
+
+        pool = pool_snapshot['pool']
+        lines = [
+            *self.metric('http_requests_total', 'counter', 'HTTP requests answered, by route template and status code',
+                         [f'http_requests_total{{{prometheus_labels(method=method, route=route, status=status)}}} '
+                          f'{count}' for (method, route, status), count in totals]),
+            *self.metric('http_request_duration_seconds', 'histogram',
+                         'Time to answer HTTP requests, by route template', histogram_lines),
+            *self.metric('http_requests_in_flight', 'gauge', 'HTTP requests being handled',
+                         [f'http_requests_in_flight {in_flight}']),
+            *self.metric('process_resident_memory_bytes', 'gauge', 'Resident set size',
+                         [f'process_resident_memory_bytes {process_rss()}']),
+            *self.metric('mongodb_pool_connections', 'gauge', 'MongoDB pool connections, by state',
+                         [f'mongodb_pool_connections{{state="checked_out"}} {pool["checkedOut"]}',
+                          f'mongodb_pool_connections{{state="idle"}} {pool["idle"]}']),
+            *self.metric('mongodb_pool_wait_queue', 'gauge', 'Operations waiting for a MongoDB connection',
+                         [f'mongodb_pool_wait_queue {pool["waitQueue"]}']),
+            *self.metric('mongodb_command_duration_seconds', 'histogram',
+                         'MongoDB command round-trip time, by command', command_lines),
+        ]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
@@ -0,0 +1,131 @@
+"""
+Contact emails: the Resend API messages and the outbox worker that
+sends them.
+"""
+
+import json
+import secrets
+import threading
+import time
+import urllib.request
+
+from .constants import (ADMIN_INBOX, EMAIL_SENDER, OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS,
+                        OUTBOX_POLL_INTERVAL, OUTBOX_RETRY_BASE, OUTBOX_RETRY_MAX)
+
+def build_email(kind, payload):
+    """Resend API message for an outbox job, like config/resend.js"""
+    if kind == 'contactNotification':
+        return {
+            'from': EMAIL_SENDER,
+            'to': ADMIN_INBOX,
+            'reply_to': payload['email'],
+            'subject': 'New Contact Message from Portfolio',
+            'html': (f"<h2>New Contact Message</h2><p><strong>Name:</strong> {payload['name']}</p>"
+                     f"<p><strong>Email:</strong> {payload['email']}</p>"
+                     f"<p><strong>Message:</strong><br>{payload['message']}</p>")
+        }
+    return {
+        'from': EMAIL_SENDER,
+        'to': payload['email'],
+        'subject': 'Thanks for contacting me!',
+        'html': f"<h2>Hi {payload['name']},</h2><p>Thank you for reaching out through my portfolio website.</p>"
+    }
+
+def send_resend(resend_url, path, body):
+    """POST to the Resend API at resend_url; returns the decoded response, raises on failure"""
+    request = urllib.request.Request(
+        f"{resend_url.rstrip('/')}{path}",
+        data=json.dumps(body).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'Authorization': 'Bearer re_standin'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+class OutboxWorker:
+    """Drains the emailjobs collection in batches with retries and backoff, like utils/emailOutbox.js"""
+
+    def __init__(self, store, resend_url, batch_size=OUTBOX_BATCH_SIZE, poll_interval=OUTBOX_POLL_INTERVAL,
+                 max_attempts=OUTBOX_MAX_ATTEMPTS, retry_base=OUTBOX_RETRY_BASE, retry_max=OUTBOX_RETRY_MAX):
+        self.store = store
+        self.resend_url = resend_url
+        self.batch_size = min(batch_size, 100)
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.wakeup = threading.Event()
+        self.running = False
+        self.thread = None
+        self.next_retry_at = float('inf')
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.loop, name='standin-outbox', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join()
+
+    def notify(self):
+        self.wakeup.set()
+
+    def loop(self):
+        while self.running:
+            self.wakeup.clear()
+            self.next_retry_at = float('inf')
+            while self.running and self.process_batch() == self.batch_size:
+                pass
+            self.wakeup.wait(min(self.poll_interval, max(0, self.next_retry_at - time.time())))
+
+    def retry_delay(self, attempts):
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return delay * (0.5 + secrets.randbelow(1000) / 2000)
+
+    def send(self, emails):
+        """(provider id, error) per email, exactly one each: one batch call, or one call
+        per email if the batch is refused, so one bad email doesn't hold back the others"""
+        try:
+            ids = [sent.get('id') for sent in send_resend(self.resend_url, '/emails/batch', emails)['data']]
+            # An email without an id is retried like a failed one, so its job is settled either way
+            return [(ids[index], None) if index < len(ids) and ids[index] else (None, 'Resend returned no id for the email')
+                    for index in range(len(emails))]
+        except Exception as exc:  # any provider or network failure is retried
+            if len(emails) == 1:
+                return [(None, str(exc))]
+        results = []
+        for email_message in emails:
+            try:
+                results.append((send_resend(self.resend_url, '/emails', email_message)['id'], None))
+            except Exception as exc:
+                results.append((None, str(exc)))
+        return results
+
+    def process_batch(self):
+        now = time.time()
+        with self.store.lock:
+            due = self.store.find('emailjobs', lambda job: job['status'] == 'pending' and job['nextAttemptAt'] <= now,
+                                  sort=[('nextAttemptAt', 1)], limit=self.batch_size)
+            for job in due:
+                job['attempts'] += 1
+                self.store.update('emailjobs', job['_id'], {'status': 'sending', 'attempts': job['attempts']})
+        if not due:
+            return 0
+
+        results = self.send([build_email(job['kind'], job['payload']) for job in due])
+
+        settled = time.time()
+        for job, (provider_id, error) in zip(due, results):
+            if error is None:
+                changes = {'status': 'sent', 'sentAt': settled, 'providerId': provider_id}
+            elif job['attempts'] >= self.max_attempts:
+                changes = {'status': 'failed', 'lastError': error}
+            else:
+                next_attempt_at = settled + self.retry_delay(job['attempts'])
+                self.next_retry_at = min(self.next_retry_at, next_attempt_at)
+                changes = {'status': 'pending', 'lastError': error, 'nextAttemptAt': next_attempt_at}
+            self.store.update('emailjobs', job['_id'], changes)
+        return len(due)
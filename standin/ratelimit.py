@@ -0,0 +1,181 @@
+"""
+Rate limit counters, in this process or shared through SQLite, and the
+limiter that reads them.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+
+class MemoryRateLimitStore:
+    """Rate limit counters of this process only, like RATE_LIMIT_STORE=memory"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+
+    def hit(self, key, window, hits=1):
+        """Count hits in the given window; returns (count, previous window's count)"""
+        with self.lock:
+            slot, count, previous = self.counters.get(key, (None, 0, 0))
+            if slot != window:
+                count, previous = 0, count if slot == window - 1 else 0
+            self.counters[key] = (window, count + hits, previous)
+            return count + hits, previous
+
+class SqliteRateLimitStore:
+    """Rate limit counters in a SQLite file that several stand-in processes share,
+    standing in for the RateLimit collection: one atomic upsert per write. latency
+    is added to every write, like the round-trip to MongoDB."""
+
+    UPSERT = (
+        "INSERT INTO rate_limits (key, slot, count, previous) VALUES (?, ?, ?, 0) "
+        "ON CONFLICT (key) DO UPDATE SET "
+        "previous = CASE WHEN slot = excluded.slot THEN previous "
+        "WHEN slot = excluded.slot - 1 THEN count ELSE 0 END, "
+        "count = CASE WHEN slot = excluded.slot THEN count + excluded.count ELSE excluded.count END, "
+        "slot = excluded.slot "
+        "RETURNING count, previous"
+    )
+
+    def __init__(self, path, latency=0.0):
+        self.path = path
+        self.latency = latency
+        self.writes = 0
+        self.writes_lock = threading.Lock()
+        self.local = threading.local()
+        self.connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits "
+            "(key TEXT PRIMARY KEY, slot INTEGER NOT NULL, count INTEGER NOT NULL, previous INTEGER NOT NULL)")
+
+    def connection(self):
+        if not hasattr(self.local, 'connection'):
+            # Autocommit: every upsert is its own transaction
+            self.local.connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self.local.connection.execute('PRAGMA journal_mode=WAL')
+        return self.local.connection
+
+    def hit(self, key, window, hits=1):
+        with self.writes_lock:
+            self.writes += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.connection().execute(self.UPSERT, (key, window, hits)).fetchone()
+
+class BatchedRateLimitStore:
+    """Counts hits in this process and writes them to a shared store in the
+    background, like MongoRateLimitStore with syncHits > 1: a key's pending hits
+    are written once there are sync_hits of them, or within sync_interval seconds
+    of the first. Each write brings back the other processes' hits."""
+
+    def __init__(self, store, sync_hits, sync_interval):
+        self.store = store
+        self.sync_hits = sync_hits
+        self.sync_interval = sync_interval
+        self.lock = threading.Lock()
+        # key -> [window, count, previous, pending]
+        self.counters = {}
+        self.dirty = set()
+        self.latest_window = 0
+        self.wakeup = threading.Event()
+        self.running = True
+        # Started by the first hit, so worker processes forked before it get their own
+        self.thread = None
+
+    @property
+    def writes(self):
+        return self.store.writes
+
+    def hit(self, key, window, hits=1):
+        with self.lock:
+            if self.running and not (self.thread and self.thread.is_alive()):
+                self.thread = threading.Thread(target=self.loop, name='standin-rate-limit-sync', daemon=True)
+                self.thread.start()
+            counter = self.counters.get(key)
+            if counter is None:
+                counter = self.counters[key] = [window, 0, 0, 0]
+            elif counter[0] != window:
+                # Hits still pending are written into the current window
+                counter[:3] = [window, 0, counter[1] if counter[0] == window - 1 else 0]
+            counter[1] += hits
+            counter[3] += hits
+            self.dirty.add(key)
+            self.latest_window = max(self.latest_window, window)
+            if counter[3] >= self.sync_hits:
+                self.wakeup.set()
+            return counter[1], counter[2]
+
+    def sync(self):
+        """Write every pending hit, into the window of the key's latest hit"""
+        with self.lock:
+            pending = [(key, self.counters[key][0], self.counters[key][3]) for key in self.dirty]
+            for key, _, _ in pending:
+                self.counters[key][3] = 0
+            self.dirty.clear()
+        for key, window, hits in pending:
+            count, previous = self.store.hit(key, window, hits)
+            with self.lock:
+                counter = self.counters[key]
+                # Hits counted while the write was in flight are still pending
+                if counter[0] == window:
+                    counter[1:3] = [count + counter[3], previous]
+        with self.lock:
+            if len(self.counters) > 10000:
+                self.counters = {key: counter for key, counter in self.counters.items()
+                                 if key in self.dirty or counter[0] >= self.latest_window - 1}
+
+    def loop(self):
+        while self.running:
+            self.wakeup.wait(self.sync_interval)
+            self.wakeup.clear()
+            self.sync()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join()
+        self.sync()
+
+class RateLimiter:
+    """Sliding window counter limiter, like middleware/rateLimiter.js: the current
+    window's hits plus the overlapping part of the previous window's. Keys over the
+    limit are remembered until they are allowed again, without asking the store."""
+
+    def __init__(self, store, name, window, limit):
+        self.store = store
+        self.name = name
+        self.window = window
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.blocked = {}
+
+    def hit(self, key):
+        """Count a request from key; returns (allowed, RateLimit-* headers)"""
+        now = time.time()
+        with self.lock:
+            blocked_until = self.blocked.get(key, 0)
+        if blocked_until > now:
+            hits, reset = self.limit + 1, blocked_until
+        else:
+            window = int(now // self.window)
+            count, previous = self.store.hit(f"{self.name}:{key}", window)
+            window_start = window * self.window
+            hits = count + int(previous * (1 - (now - window_start) / self.window))
+            reset = window_start + self.window
+            if hits > self.limit:
+                freed_at = 1 if count >= self.limit else 1 - (self.limit - count) / previous
+                with self.lock:
+                    if len(self.blocked) >= 10000:
+                        self.blocked = {other: until for other, until in self.blocked.items() if until > now}
+                    self.blocked[key] = window_start + freed_at * self.window
+        headers = {
+            'RateLimit-Policy': f"{self.limit};w={self.window}",
+            'RateLimit-Limit': str(self.limit),
+            'RateLimit-Remaining': str(max(0, self.limit - hits)),
+            'RateLimit-Reset': str(max(0, math.ceil(reset - now))),
+        }
+        if hits > self.limit:
+            headers['Retry-After'] = headers['RateLimit-Reset']
+        return hits <= self.limit, headers
@@ -0,0 +1,41 @@
+"""
+The parsed request handed to route handlers, and multipart form parsing.
+"""
+
+import email.policy
+from email.parser import BytesParser
+
+class Request:
+    """Parsed HTTP request handed to route handlers"""
+
+    def __init__(self, method, path, query, headers, body, client_ip):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.client_ip = client_ip
+        self.params = {}
+        # multipart/form-data uploads by field name, like multer's req.file
+        self.files = {}
+        self.user = None
+        # Template of the matched route, e.g. /api/admin/projects/:id, for the request metrics
+        self.route = 'unmatched'
+
+    def header(self, name, default=None):
+        return self.headers.get(name, default)
+
+def parse_multipart(content_type, raw):
+    """(fields, files) of a multipart/form-data body; files map a field to
+    {'filename', 'mimetype', 'buffer'} like multer's req.file"""
+    message = BytesParser(policy=email.policy.HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + raw)
+    fields, files = {}, {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        payload = part.get_payload(decode=True) or b''
+        if part.get_filename() is None:
+            fields[name] = payload.decode('utf-8', 'replace')
+        else:
+            files[name] = {'filename': part.get_filename(), 'mimetype': part.get_content_type(), 'buffer': payload}
+    return fields, files
@@ -0,0 +1,283 @@
+"""
+Serving StandinApp over HTTP: the request handler, the backend that runs it
+on a loopback socket, graceful shutdown, worker processes and the command line.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .app import StandinApp
+from .constants import (COMPRESSION_THRESHOLD, CONTACT_DUPLICATE_WINDOW, GENERAL_RATE_MAX, LOG_LEVELS,
+                        SHUTDOWN_TIMEOUT)
+from .logs import LogOutput
+from .ratelimit import SqliteRateLimitStore
+from .request import Request, parse_multipart
+from .util import accepts_encoding, encode_json
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler that forwards every request to StandinApp"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'PortfolioStandin/1.0'
+    # Headers and body go out as separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def do_PUT(self):
+        self.dispatch()
+
+    def do_DELETE(self):
+        self.dispatch()
+
+    def dispatch(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        headers = {key.lower(): value for key, value in self.headers.items()}
+
+        length = int(headers.get('content-length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        files = {}
+        if headers.get('content-type', '').startswith('multipart/form-data'):
+            body, files = parse_multipart(headers['content-type'], raw)
+        else:
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                self.send_json(400, {'success': False, 'message': 'Invalid JSON body'})
+                return
+
+        # Like app.set('trust proxy', true): the client is the first X-Forwarded-For address
+        forwarded = headers.get('x-forwarded-for', '').split(',')[0].strip()
+        request = Request(self.command, url.path, query, headers, body, forwarded or self.client_address[0])
+        request.files = files
+        store = self.server.app.store
+        store.reset_roundtrips()
+        metrics = self.server.app.metrics
+        started = metrics.start()
+        status = 500
+        with self.server.flight_lock:
+            self.server.in_flight += 1
+        try:
+            # CPU time of handling and serializing, like reportCpuTime in middleware/metrics.js
+            cpu_started = time.thread_time()
+            status, payload, extra_headers = self.server.app.handle(request)
+            if isinstance(payload, (dict, list)):
+                payload = encode_json(payload)
+            extra_headers = dict(extra_headers, **{
+                'X-DB-Roundtrips': str(store.roundtrips()),
+                'Server-Timing': f"cpu;dur={(time.thread_time() - cpu_started) * 1000:.3f}"
+            })
+            if self.server.draining:
+                # Like server.js while draining: the client reconnects elsewhere
+                extra_headers['Connection'] = 'close'
+                self.close_connection = True
+            self.send_json(status, payload, extra_headers)
+        finally:
+            metrics.record(started, request.method, request.route, status)
+            with self.server.flight_lock:
+                self.server.in_flight -= 1
+
+    def send_json(self, status, payload, extra_headers=None):
+        self.send_response(status)
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        if status == 304:
+            # Not Modified carries no body
+            self.end_headers()
+            return
+        if hasattr(payload, '__next__'):
+            # Streamed body: write each chunk as it is produced
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for chunk in payload:
+                    if chunk:
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.wfile.write(b'0\r\n\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                # The client went away: stop producing rows
+                payload.close()
+                self.close_connection = True
+            return
+        body = payload if isinstance(payload, bytes) else encode_json(payload)
+        extra_headers = extra_headers or {}
+        if 'Content-Type' not in extra_headers:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        # Like compression(): gzip on every response, unless it is small, already
+        # encoded or an image, whose formats are compressed already
+        if ('Content-Encoding' not in extra_headers and len(body) >= COMPRESSION_THRESHOLD
+                and not extra_headers.get('Content-Type', '').startswith('image/')
+                and accepts_encoding(self.headers.get('Accept-Encoding'), 'gzip')):
+            body = gzip.compress(body, 6)
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StandinBackend:
+    """Runs a StandinApp on a loopback ThreadingHTTPServer in a background thread"""
+
+    def __init__(self, host='127.0.0.1', port=0, app=None):
+        self.app = app or StandinApp()
+        self.server = ThreadingHTTPServer((host, port), StandinRequestHandler)
+        self.server.daemon_threads = True
+        self.server.app = self.app
+        # Requests being answered, and whether a graceful shutdown has begun
+        self.server.in_flight = 0
+        self.server.flight_lock = threading.Lock()
+        self.server.draining = False
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        if self.app.outbox:
+            self.app.outbox.start()
+        self.thread = threading.Thread(target=self.server.serve_forever, name='standin-backend', daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        if self.app.outbox:
+            self.app.outbox.stop()
+        self.server.shutdown()
+        self.app.close_rate_limits()
+        if self.app.log_output:
+            self.app.log_output.close()
+        self.app.images.close()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def serve(backend, shutdown_timeout=SHUTDOWN_TIMEOUT):
+    """Serve until SIGTERM or SIGINT, then stop accepting connections and give the
+    requests in flight up to shutdown_timeout seconds to finish, like server.js"""
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+    backend.start()
+    while not stop.wait(0.5):
+        pass
+
+    backend.server.draining = True
+    if backend.app.outbox:
+        backend.app.outbox.stop()
+    backend.server.shutdown()
+    deadline = time.time() + shutdown_timeout
+    while backend.server.in_flight and time.time() < deadline:
+        time.sleep(0.01)
+    backend.server.server_close()
+    backend.app.close_rate_limits()
+    if backend.app.log_output:
+        backend.app.log_output.close()
+    backend.app.images.close()
+
+def serve_workers(backend, workers):
+    """Pre-fork mode, like cluster.js: workers processes accept on the one listening
+    socket; crashed ones are replaced, and SIGTERM drains them all. Every worker
+    has its own copy of the in-memory store, so writes are only seen by the worker
+    that made them; use it for read load."""
+    children = set()
+    stopping = False
+
+    def fork():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                serve(backend)
+            except BaseException:
+                code = 1
+            os._exit(code)
+        children.add(pid)
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            os.kill(pid, signal.SIGTERM)
+
+    for _ in range(workers):
+        fork()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while children:
+        pid, status = os.wait()
+        children.discard(pid)
+        if not stopping:
+            print(f"Stand-in worker {pid} died (status {status}), restarting", flush=True)
+            time.sleep(1)
+            fork()
+    backend.server.server_close()
+
+def main():
+    """Serve the stand-in backend in the foreground"""
+    parser = argparse.ArgumentParser(description="Local in-memory stand-in for the Portfolio backend")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--resend-url', help="Resend API base URL for contact emails, e.g. fake_resend.py")
+    parser.add_argument('--email-delivery', choices=('outbox', 'inline'), default='outbox')
+    parser.add_argument('--rate-limit-db', metavar='PATH',
+                        help="SQLite file holding the rate limit counters, shared by every stand-in "
+                             "given the same path (default: counters in this process)")
+    parser.add_argument('--general-rate-max', type=int, default=GENERAL_RATE_MAX,
+                        help=f"Requests per IP per 15 minutes on /api/auth and /api/portfolio, 0 for no limit "
+                             f"(default: {GENERAL_RATE_MAX})")
+    parser.add_argument('--metrics-token',
+                        help="Bearer token for /api/metrics, like METRICS_TOKEN (default: admin login)")
+    parser.add_argument('--log-level', choices=LOG_LEVELS, default='info',
+                        help="Structured log level on stdout, like LOG_LEVEL (default: info)")
+    parser.add_argument('--contact-log-sample-rate', type=float, default=1.0,
+                        help="Fraction of contact submissions logged below warn, like CONTACT_LOG_SAMPLE_RATE")
+    parser.add_argument('--contact-duplicate-window', type=float, default=CONTACT_DUPLICATE_WINDOW,
+                        help=f"Seconds a repeated contact submission is rejected for, 0 to accept repeats, "
+                             f"like CONTACT_DUPLICATE_WINDOW_MS (default: {CONTACT_DUPLICATE_WINDOW})")
+    parser.add_argument('--image-dir', metavar='PATH',
+                        help="Directory for uploaded image variants, like IMAGE_LOCAL_DIR "
+                             "(default: a temporary directory removed at shutdown)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes sharing the listening socket, like CLUSTER_WORKERS (default: 1)")
+    args = parser.parse_args()
+
+    rate_limit_store = SqliteRateLimitStore(args.rate_limit_db) if args.rate_limit_db else None
+    backend = StandinBackend(args.host, args.port,
+                             StandinApp(resend_url=args.resend_url, email_delivery=args.email_delivery,
+                                        rate_limit_store=rate_limit_store, general_rate_max=args.general_rate_max,
+                                        metrics_token=args.metrics_token, log_output=LogOutput(sys.stdout),
+                                        log_level=args.log_level,
+                                        contact_log_sample_rate=args.contact_log_sample_rate,
+                                        contact_duplicate_window=args.contact_duplicate_window,
+                                        image_dir=args.image_dir))
+    # Flushed, so a parent process started with --port 0 can read the address
+    print(f"Stand-in backend listening on {backend.url}/api", flush=True)
+    if args.workers > 1:
+        serve_workers(backend, args.workers)
+    else:
+        serve(backend)
@@ -0,0 +1,459 @@
+"""
+The in-memory store behind the stand-in: collections mirroring the
+Mongoose models, their indexes and a simulated connection pool.
+"""
+
+import bisect
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from .constants import (MONGO_MAX_POOL_SIZE, PROJECT_SEARCH_WEIGHTS, SEARCH_TERM_RE, SEED_PERSONAL,
+                        SEED_PROJECTS, SEED_TECH_STACK)
+from .metrics import DurationStats
+from .util import hash_password, new_id, now_iso, project_doc, sort_docs
+
+class ConnectionPool:
+    """Bounded pool of simulated MongoDB connections: opened on demand up to max_size,
+    then kept idle; callers beyond that wait their turn, like the driver's pool"""
+
+    def __init__(self, max_size=MONGO_MAX_POOL_SIZE):
+        self.max_size = max_size
+        self.condition = threading.Condition()
+        self.connections = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.check_out_wait = DurationStats()
+        self.operations = {}
+
+    @contextmanager
+    def connection(self, operation):
+        """Hold a connection for one operation, timing the check-out and the operation"""
+        started = time.perf_counter()
+        with self.condition:
+            self.waiting += 1
+            while self.checked_out >= self.max_size:
+                self.condition.wait()
+            self.waiting -= 1
+            self.checked_out += 1
+            self.connections = max(self.connections, self.checked_out)
+            self.check_out_wait.record((time.perf_counter() - started) * 1000)
+        checked_out = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            with self.condition:
+                self.checked_out -= 1
+                self.operations.setdefault(operation, DurationStats()).record(
+                    (time.perf_counter() - checked_out) * 1000, failed)
+                self.condition.notify()
+
+    def snapshot(self):
+        """Same shape as dbPoolMetrics.snapshot()"""
+        with self.condition:
+            return {
+                'pid': os.getpid(),
+                'attached': True,
+                'pool': {
+                    'maxPoolSize': self.max_size,
+                    'minPoolSize': 0,
+                    'connections': self.connections,
+                    'checkedOut': self.checked_out,
+                    'idle': self.connections - self.checked_out,
+                    'waitQueue': self.waiting,
+                    'created': self.connections,
+                    'closed': 0,
+                    'checkOutFailures': 0,
+                    'cleared': 0,
+                    'checkOutWait': self.check_out_wait.to_json(),
+                },
+                'operations': {name: stats.to_json() for name, stats in sorted(self.operations.items())},
+            }
+
+def search_terms(text):
+    """Lowercased words of a text, split like a MongoDB text index (no stemming or stop words)"""
+    return SEARCH_TERM_RE.findall(text.lower())
+
+class SearchIndex:
+    """Text index over weighted fields plus a multikey index over a tag array, like
+    projectSchema's project_search and techStack indexes. Call with the store's lock held."""
+
+    def __init__(self, weights, tag_field):
+        self.weights = weights
+        self.tag_field = tag_field
+        # term -> {_id: score of the term in that document}
+        self.terms = defaultdict(dict)
+        # tag -> {_id}
+        self.tags = defaultdict(set)
+
+    def term_scores(self, doc):
+        """Score of each term of a document, with MongoDB's formula: per field, the
+        weight times a frequency that halves with every repeat, damped for long fields"""
+        scores = Counter()
+        for field, weight in self.weights.items():
+            value = doc.get(field)
+            words = search_terms(' '.join(value) if isinstance(value, list) else str(value or ''))
+            for term, count in Counter(words).items():
+                frequency = 2 - 2 ** (1 - count)
+                scores[term] += weight * frequency * (0.5 * count / len(words) + 0.5)
+        return scores
+
+    def add(self, doc):
+        for term, score in self.term_scores(doc).items():
+            self.terms[term][doc['_id']] = score
+        for tag in set(doc.get(self.tag_field) or ()):
+            self.tags[tag].add(doc['_id'])
+
+    def remove(self, doc):
+        for term in self.term_scores(doc):
+            postings = self.terms[term]
+            postings.pop(doc['_id'], None)
+            if not postings:
+                del self.terms[term]
+        for tag in set(doc.get(self.tag_field) or ()):
+            self.tags[tag].discard(doc['_id'])
+            if not self.tags[tag]:
+                del self.tags[tag]
+
+    def match(self, terms, tags):
+        """{_id: score} of the documents containing any of terms and every one of
+        tags, scores summed over the terms; None matches everything"""
+        matches = None
+        if terms:
+            matches = Counter()
+            for term in set(terms):
+                for doc_id, score in self.terms.get(term, {}).items():
+                    matches[doc_id] += score
+        for tag in tags:
+            tagged = self.tags.get(tag, set())
+            if matches is None:
+                matches = dict.fromkeys(tagged, None)
+            else:
+                matches = {doc_id: score for doc_id, score in matches.items() if doc_id in tagged}
+        return matches
+
+class InMemoryStore:
+    """Thread-safe in-memory collections mirroring the Mongoose models"""
+
+    COLLECTIONS = ('users', 'personal', 'projects', 'techstacks', 'contacts', 'emailjobs')
+    # Collections with a sorted (createdAt, _id) index, like contactSchema's
+    KEYSET_INDEXED = ('contacts',)
+    # Collections with a sorted (field, createdAt) index: the field
+    FIELD_INDEXED = {'contacts': 'ipAddress'}
+    # Collections with text and tag indexes: (field weights, tag array field)
+    SEARCH_INDEXED = {'projects': (PROJECT_SEARCH_WEIGHTS, 'techStack')}
+
+    def __init__(self, latency=0.0, pool_size=MONGO_MAX_POOL_SIZE):
+        # Seconds each operation sleeps, to stand in for a network hop to MongoDB
+        self.latency = latency
+        # Every operation holds one of pool_size connections for its round-trip
+        self.pool = ConnectionPool(pool_size)
+        self.lock = threading.RLock()
+        self.collections = {name: {} for name in self.COLLECTIONS}
+        # Bumped on every write, so cached reads can tell when their source changed
+        self.versions = {name: 0 for name in self.COLLECTIONS}
+        # Ascending (createdAt, _id) keys; ISO timestamps sort chronologically as strings
+        self.indexes = {name: [] for name in self.KEYSET_INDEXED}
+        # field value -> ascending (createdAt, _id) keys of the documents having it
+        self.field_indexes = {name: defaultdict(list) for name in self.FIELD_INDEXED}
+        self.search_indexes = {name: SearchIndex(*spec) for name, spec in self.SEARCH_INDEXED.items()}
+        # Per-thread count of store operations, reported as X-DB-Roundtrips
+        self.local = threading.local()
+
+    def roundtrip(self, operation='command'):
+        self.local.roundtrips = getattr(self.local, 'roundtrips', 0) + 1
+        with self.pool.connection(operation):
+            if self.latency:
+                time.sleep(self.latency)
+
+    def reset_roundtrips(self):
+        self.local.roundtrips = 0
+
+    def roundtrips(self):
+        return getattr(self.local, 'roundtrips', 0)
+
+    def version(self, *collections):
+        with self.lock:
+            return tuple(self.versions[name] for name in collections)
+
+    def insert(self, collection, doc):
+        self.roundtrip('insert')
+        with self.lock:
+            timestamp = now_iso()
+            doc = dict(doc, _id=new_id(), createdAt=timestamp, updatedAt=timestamp)
+            self.collections[collection][doc['_id']] = doc
+            self.index_doc(collection, doc)
+            self.versions[collection] += 1
+            return dict(doc)
+
+    def index_doc(self, collection, doc):
+        """Add a new document to its collection's indexes. Call with the lock held."""
+        key = (doc['createdAt'], doc['_id'])
+        if collection in self.indexes:
+            bisect.insort(self.indexes[collection], key)
+        if collection in self.field_indexes:
+            bisect.insort(self.field_indexes[collection][doc.get(self.FIELD_INDEXED[collection])], key)
+        if collection in self.search_indexes:
+            self.search_indexes[collection].add(doc)
+
+    def unindex_doc(self, collection, doc):
+        """Remove a deleted document from its collection's indexes. Call with the lock held."""
+        key = (doc['createdAt'], doc['_id'])
+        if collection in self.indexes:
+            keys = self.indexes[collection]
+            del keys[bisect.bisect_left(keys, key)]
+        if collection in self.field_indexes:
+            value = doc.get(self.FIELD_INDEXED[collection])
+            keys = self.field_indexes[collection][value]
+            del keys[bisect.bisect_left(keys, key)]
+            if not keys:
+                del self.field_indexes[collection][value]
+        if collection in self.search_indexes:
+            self.search_indexes[collection].remove(doc)
+
+    def get(self, collection, doc_id):
+        self.roundtrip('find')
+        with self.lock:
+            doc = self.collections[collection].get(doc_id)
+            return dict(doc) if doc else None
+
+    def find(self, collection, predicate=None, sort=None, limit=None, fields=None):
+        """Matching documents, sorted and limited, with only fields when given"""
+        self.roundtrip('find')
+        with self.lock:
+            docs = [doc for doc in self.collections[collection].values()
+                    if predicate is None or predicate(doc)]
+            if sort:
+                docs = sort_docs(docs, sort)
+            if limit is not None:
+                docs = docs[:limit]
+            return [project_doc(doc, fields) for doc in docs]
+
+    def last_modified(self, *collections):
+        """Newest updatedAt across the given collections, or None when they are empty"""
+        with self.lock:
+            stamps = [doc['updatedAt'] for name in collections for doc in self.collections[name].values()]
+        return max(stamps, default=None)
+
+    def summary(self, include_messages=False):
+        """Dashboard / stats counts in one pass, like utils/portfolioStats.js"""
+        self.roundtrip('aggregate')
+        counts = dict.fromkeys(('totalProjects', 'featuredProjects', 'aiProjects', 'webProjects',
+                                'techStackCount', 'totalMessages', 'newMessages'), 0)
+        with self.lock:
+            for doc in self.collections['projects'].values():
+                counts['totalProjects'] += 1
+                counts['featuredProjects'] += bool(doc['featured'])
+                counts['aiProjects'] += doc['category'] == 'AI'
+                counts['webProjects'] += doc['category'] == 'Web'
+            counts['techStackCount'] = len(self.collections['techstacks'])
+            if include_messages:
+                for doc in self.collections['contacts'].values():
+                    counts['totalMessages'] += 1
+                    counts['newMessages'] += doc['status'] == 'new'
+        return counts
+
+    def summary_legacy(self, include_messages=False):
+        """The same counts as one count() per number"""
+        counts = {
+            'totalProjects': self.count('projects'),
+            'featuredProjects': self.count('projects', lambda doc: doc['featured']),
+            'aiProjects': self.count('projects', lambda doc: doc['category'] == 'AI'),
+            'webProjects': self.count('projects', lambda doc: doc['category'] == 'Web'),
+            'techStackCount': self.count('techstacks'),
+            'totalMessages': 0,
+            'newMessages': 0
+        }
+        if include_messages:
+            counts['totalMessages'] = self.count('contacts')
+            counts['newMessages'] = self.count('contacts', lambda doc: doc['status'] == 'new')
+        return counts
+
+    def collection_version(self, collection):
+        """(count, newest updatedAt) in one aggregation, like collectionVersion in
+        middleware/conditional.js"""
+        self.roundtrip('aggregate')
+        with self.lock:
+            docs = self.collections[collection].values()
+            return len(docs), max((doc['updatedAt'] for doc in docs), default=None)
+
+    def find_one(self, collection, predicate=None):
+        docs = self.find(collection, predicate, limit=1)
+        return docs[0] if docs else None
+
+    def count(self, collection, predicate=None):
+        self.roundtrip('count')
+        with self.lock:
+            return sum(1 for doc in self.collections[collection].values()
+                       if predicate is None or predicate(doc))
+
+    def update(self, collection, doc_id, changes):
+        self.roundtrip('update')
+        with self.lock:
+            doc = self.collections[collection].get(doc_id)
+            if doc is None:
+                return None
+            search_index = self.search_indexes.get(collection)
+            if search_index:
+                search_index.remove(doc)
+            doc.update(changes)
+            doc['updatedAt'] = now_iso()
+            if search_index:
+                search_index.add(doc)
+            self.versions[collection] += 1
+            return dict(doc)
+
+    def delete(self, collection, doc_id):
+        self.roundtrip('delete')
+        with self.lock:
+            doc = self.collections[collection].pop(doc_id, None)
+            if doc is not None:
+                self.unindex_doc(collection, doc)
+                self.versions[collection] += 1
+            return doc
+
+    def bulk_write(self, collection, operations):
+        """Apply ('insert', doc), ('update', id, changes) and ('delete', id) operations
+        in order as one round-trip, like Model.bulkWrite; returns the deleted count"""
+        self.roundtrip('bulkWrite')
+        deleted = 0
+        with self.lock:
+            docs = self.collections[collection]
+            search_index = self.search_indexes.get(collection)
+            timestamp = now_iso()
+            for kind, *args in operations:
+                if kind == 'insert':
+                    doc = dict(args[0], createdAt=timestamp, updatedAt=timestamp)
+                    docs[doc['_id']] = doc
+                    self.index_doc(collection, doc)
+                elif kind == 'update':
+                    doc = docs.get(args[0])
+                    if doc is not None:
+                        if search_index:
+                            search_index.remove(doc)
+                        doc.update(args[1])
+                        doc['updatedAt'] = timestamp
+                        if search_index:
+                            search_index.add(doc)
+                else:
+                    doc = docs.pop(args[0], None)
+                    if doc is not None:
+                        deleted += 1
+                        self.unindex_doc(collection, doc)
+            self.versions[collection] += 1
+        return deleted
+
+    def newest_first(self, collection, predicate=None, before=None):
+        """Walk an indexed collection in (createdAt, _id) descending order, starting
+        after the key before when given. Call with the lock held."""
+        keys = self.indexes[collection]
+        docs = self.collections[collection]
+        position = bisect.bisect_left(keys, before) if before else len(keys)
+        for index in range(position - 1, -1, -1):
+            doc = docs[keys[index][1]]
+            if predicate is None or predicate(doc):
+                yield doc
+
+    def keyset_page(self, collection, predicate=None, after=None, limit=10, fields=None):
+        """Up to limit documents following the sort key after; seeks like an index range scan"""
+        self.roundtrip('find')
+        with self.lock:
+            page = []
+            for doc in self.newest_first(collection, predicate, after):
+                if len(page) == limit:
+                    break
+                page.append(project_doc(doc, fields))
+            return page
+
+    def offset_page(self, collection, predicate=None, offset=0, limit=10, fields=None):
+        """Like find().sort().skip(offset).limit(limit): walks every skipped document"""
+        self.roundtrip('find')
+        with self.lock:
+            page = []
+            for position, doc in enumerate(self.newest_first(collection, predicate)):
+                if position >= offset + limit:
+                    break
+                if position >= offset:
+                    page.append(project_doc(doc, fields))
+            return page
+
+    def search(self, collection, text='', tags=(), predicate=None, sort=None, offset=0, limit=10, fields=None):
+        """One page of a $text and $all tag query answered from the collection's search
+        index, and the number of matches. Keyword matches come first by score (set as
+        the page's score field), then in sort order."""
+        self.roundtrip('find')
+        with self.lock:
+            docs = self.collections[collection]
+            scores = self.search_indexes[collection].match(search_terms(text), tags)
+            if scores is None:
+                scores = dict.fromkeys(docs, None)
+            matches = [docs[doc_id] for doc_id in scores if predicate is None or predicate(docs[doc_id])]
+            if sort:
+                matches = sort_docs(matches, sort)
+            if text:
+                matches.sort(key=lambda doc: scores[doc['_id']], reverse=True)
+            page = [dict(project_doc(doc, fields), score=scores[doc['_id']]) if text else project_doc(doc, fields)
+                    for doc in matches[offset:offset + limit]]
+            return page, len(matches)
+
+    def estimated_count(self, collection):
+        """Like estimatedDocumentCount: read from collection metadata, no scan"""
+        self.roundtrip('count')
+        with self.lock:
+            return len(self.collections[collection])
+
+    def exists_since(self, collection, value, since, predicate=None):
+        """Whether a document with the indexed field equal to value, created at or after
+        since, matches predicate; seeks the (field, createdAt) index like Model.exists"""
+        self.roundtrip('find')
+        with self.lock:
+            keys = self.field_indexes[collection].get(value, ())
+            docs = self.collections[collection]
+            return any(predicate is None or predicate(docs[doc_id])
+                       for _, doc_id in keys[bisect.bisect_left(keys, (since,)):])
+
+    def seed(self, admin_email, admin_password):
+        """Load the same shape of data as scripts/seedDatabase.js"""
+        self.insert('users', {
+            'email': admin_email.lower(),
+            'password': hash_password(admin_password),
+            'role': 'admin'
+        })
+        self.insert('personal', dict(SEED_PERSONAL))
+        for project in SEED_PROJECTS:
+            self.insert('projects', dict(project, imagePublicId=''))
+        for item in SEED_TECH_STACK:
+            self.insert('techstacks', dict(item, logoUrl='', logoPublicId=''))
+
+    def seed_contacts(self, count):
+        """Bulk-load count contact messages, one every second going back from now.
+        Pairs share a timestamp, so paging has to break ties on _id."""
+        now = datetime.now(timezone.utc)
+        statuses = ('new', 'read', 'replied')
+        with self.lock:
+            for index in range(count):
+                moment = now - timedelta(seconds=index // 2)
+                timestamp = moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+                doc = {
+                    '_id': new_id(),
+                    'name': f"Seeded Sender {index}",
+                    'email': f"sender{index}@example.com",
+                    'message': f"Seeded contact message number {index} for pagination benchmarks. " * 3,
+                    'status': statuses[index % 3],
+                    'ipAddress': f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+                    'userAgent': 'Mozilla/5.0 (X11; Linux x86_64) backend_standin seed',
+                    'createdAt': timestamp,
+                    'updatedAt': timestamp
+                }
+                self.collections['contacts'][doc['_id']] = doc
+            self.indexes['contacts'] = sorted((doc['createdAt'], doc['_id'])
+                                              for doc in self.collections['contacts'].values())
+            by_ip = self.field_indexes['contacts'] = defaultdict(list)
+            for created_at, doc_id in self.indexes['contacts']:
+                by_ip[self.collections['contacts'][doc_id]['ipAddress']].append((created_at, doc_id))
+            self.versions['contacts'] += 1
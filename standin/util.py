@@ -0,0 +1,115 @@
+"""
+Helpers the stand-in's routes and store share: timestamps, JSON and
+conditional-request handling, cursors, document projection and passwords.
+"""
+
+import base64
+import hashlib
+import json
+import re
+import secrets
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+def now_iso():
+    """Current UTC time formatted like a serialized JS Date"""
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+def encode_json(payload):
+    """Serialize like Express res.json (no whitespace)"""
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+def http_date(iso_timestamp):
+    """IMF-fixdate for a stored ISO timestamp, like Date.prototype.toUTCString"""
+    moment = datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00'))
+    return format_datetime(moment.replace(microsecond=0), usegmt=True)
+
+def is_fresh(request, etag, last_modified):
+    """Same rules as the `fresh` module Express uses for req.fresh"""
+    none_match = request.header('if-none-match')
+    modified_since = request.header('if-modified-since')
+    if not none_match and not modified_since:
+        return False
+    if 'no-cache' in (request.header('cache-control') or ''):
+        return False
+    if none_match and none_match != '*':
+        tags = [tag.strip().replace('W/', '', 1) for tag in none_match.split(',')]
+        if etag.replace('W/', '', 1) not in tags:
+            return False
+    if modified_since:
+        try:
+            if not last_modified or parsedate_to_datetime(last_modified) > parsedate_to_datetime(modified_since):
+                return False
+        except (TypeError, ValueError):
+            return False
+    return True
+
+def accepts_encoding(header, encoding):
+    """Whether an Accept-Encoding header allows encoding (q=0 refuses it)"""
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        if name.strip().lower() in (encoding, '*'):
+            quality = params.strip().removeprefix('q=')
+            try:
+                return not params or float(quality) > 0
+            except ValueError:
+                return True
+    return False
+
+def iso_from_ms(ms):
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+def ms_from_iso(iso_timestamp):
+    return round(datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00')).timestamp() * 1000)
+
+def encode_cursor(doc):
+    """Opaque keyset cursor, in the same format as utils/pagination.js"""
+    raw = json.dumps([ms_from_iso(doc['createdAt']), doc['_id']], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """(createdAt, _id) sort key of a cursor, or None when it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        ms, doc_id = json.loads(raw)
+        if not isinstance(ms, int) or not re.fullmatch(r'[0-9a-f]{24}', doc_id, re.IGNORECASE):
+            return None
+        return iso_from_ms(ms), doc_id
+    except (TypeError, ValueError):
+        return None
+
+def project_doc(doc, fields=None):
+    """Copy of a document with only the given fields, like a query projection; all of them for None"""
+    if fields is None:
+        return dict(doc)
+    return {field: doc[field] for field in fields if field in doc}
+
+def new_id():
+    """Random 24-character hex id, shaped like a Mongo ObjectId"""
+    return secrets.token_hex(12)
+
+def sort_docs(docs, spec):
+    """Sort documents by a Mongo-style [(field, direction), ...] spec"""
+    docs = list(docs)
+    for field, direction in reversed(spec):
+        docs.sort(key=lambda doc: (doc.get(field) is not None, doc.get(field)), reverse=direction < 0)
+    return docs
+
+class ApiError(Exception):
+    """Error that maps directly onto a JSON error response"""
+
+    def __init__(self, status, message, errors=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.errors = errors
+        self.headers = {}
+
+def hash_password(password):
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+def public_user(user):
+    return {'id': user['_id'], 'email': user['email'], 'role': user['role']}
+
+def without_password(user):
+    return {key: value for key, value in user.items() if key != 'password'}
@@ -0,0 +1,189 @@
+"""
+Request body validation with the messages of the backend's
+express-validator chains.
+"""
+
+import math
+
+from .constants import (DEFAULT_SEARCH_LIMIT, EMAIL_RE, HEX_COLOR_RE, INTEGER_RE, MAX_BATCH_ITEMS,
+                        MAX_SEARCH_LENGTH, MAX_SEARCH_LIMIT, MAX_SEARCH_TAGS, OBJECT_ID_RE, URL_RE)
+from .util import ApiError
+
+class Validator:
+    """Collects express-validator style field errors"""
+
+    def __init__(self, body):
+        self.body = body if isinstance(body, dict) else {}
+        self.errors = []
+
+    def fail(self, field, message):
+        self.errors.append({'type': 'field', 'msg': message, 'path': field, 'location': 'body'})
+
+    def string(self, field, min_length, max_length, message, optional=False):
+        value = self.body.get(field)
+        if value is None and optional:
+            return
+        value = value.strip() if isinstance(value, str) else ''
+        if not min_length <= len(value) <= max_length:
+            self.fail(field, message)
+        else:
+            self.body[field] = value
+
+    def email(self, field, message):
+        value = self.body.get(field)
+        if not isinstance(value, str) or not EMAIL_RE.match(value.strip()):
+            self.fail(field, message)
+        else:
+            self.body[field] = value.strip().lower()
+
+    def url(self, field, message, optional=False):
+        value = self.body.get(field)
+        if optional and not value:
+            return
+        if not isinstance(value, str) or not URL_RE.match(value.strip()):
+            self.fail(field, message)
+
+    def object(self, field, message):
+        value = self.body.get(field)
+        if value is not None and not isinstance(value, dict):
+            self.fail(field, message)
+
+    def one_of(self, field, choices, message):
+        if self.body.get(field) not in choices:
+            self.fail(field, message)
+
+    def check(self):
+        if self.errors:
+            raise ApiError(400, 'Validation errors', self.errors)
+        return self.body
+
+def validate_project(body):
+    v = Validator(body)
+    v.string('title', 2, 200, 'Title must be between 2 and 200 characters')
+    v.string('description', 10, 1000, 'Description must be between 10 and 1000 characters')
+    v.one_of('category', ('AI', 'Web'), 'Category must be either AI or Web')
+    v.url('image', 'Image must be a valid URL', optional=True)
+    v.object('imageSet', 'Image set must be an object')
+    v.url('githubUrl', 'GitHub URL must be a valid URL')
+    v.url('liveUrl', 'Live URL must be a valid URL')
+    tech_stack = v.body.get('techStack')
+    if not isinstance(tech_stack, list) or not tech_stack:
+        v.fail('techStack', 'Tech stack must be an array with at least one item')
+    if 'featured' in v.body and not isinstance(v.body['featured'], bool):
+        v.fail('featured', 'Featured must be a boolean')
+    order = v.body.get('order', 0)
+    if not isinstance(order, int) or isinstance(order, bool) or order < 0:
+        v.fail('order', 'Order must be a non-negative integer')
+    return v.check()
+
+def validate_tech_stack(body):
+    v = Validator(body)
+    v.string('name', 1, 100, 'Name must be between 1 and 100 characters')
+    v.string('icon', 1, 100, 'Icon must be between 1 and 100 characters')
+    if not isinstance(v.body.get('color'), str) or not HEX_COLOR_RE.match(v.body['color']):
+        v.fail('color', 'Color must be a valid hex color')
+    v.one_of('category', ('Frontend', 'Backend', 'Database', 'Tools', 'Cloud', 'Mobile'),
+             'Category must be one of: Frontend, Backend, Database, Tools, Cloud, Mobile')
+    v.url('logoUrl', 'Logo URL must be a valid URL', optional=True)
+    v.object('logoSet', 'Logo set must be an object')
+    return v.check()
+
+def validate_batch(body, validate):
+    """Validate a { create, update: [{ id, ...fields }], delete: [id] } bulk body as a
+    whole, like batchValidation; returns (create, [(id, fields)], delete)"""
+    body = body if isinstance(body, dict) else {}
+    create, update, remove = (body.get(key, []) for key in ('create', 'update', 'delete'))
+    if not all(isinstance(items, list) for items in (create, update, remove)):
+        raise ApiError(400, 'create, update and delete must be arrays')
+    size = len(create) + len(update) + len(remove)
+    if size == 0:
+        raise ApiError(400, 'Batch is empty')
+    if size > MAX_BATCH_ITEMS:
+        raise ApiError(400, f'Batch is limited to {MAX_BATCH_ITEMS} items')
+
+    errors = []
+    seen = set()
+
+    def fail(path, message):
+        errors.append({'type': 'field', 'msg': message, 'path': path, 'location': 'body'})
+
+    def check_item(item, path):
+        if not isinstance(item, dict):
+            fail(path, 'Must be an object')
+            return item
+        try:
+            return validate(item)
+        except ApiError as error:
+            errors.extend(dict(field_error, path=f"{path}.{field_error['path']}") for field_error in error.errors)
+            return item
+
+    def check_id(doc_id, path):
+        if not isinstance(doc_id, str) or not OBJECT_ID_RE.match(doc_id):
+            fail(path, 'Must be a valid id')
+        elif doc_id.lower() in seen:
+            fail(path, 'Each id may appear only once per batch')
+        else:
+            seen.add(doc_id.lower())
+
+    create = [check_item(item, f'create[{index}]') for index, item in enumerate(create)]
+    updates = []
+    for index, item in enumerate(update):
+        if not isinstance(item, dict):
+            fail(f'update[{index}]', 'Must be an object')
+            continue
+        fields = {key: value for key, value in item.items() if key != 'id'}
+        check_id(item.get('id'), f'update[{index}].id')
+        updates.append((item.get('id'), check_item(fields, f'update[{index}]')))
+    for index, doc_id in enumerate(remove):
+        check_id(doc_id, f'delete[{index}]')
+    if errors:
+        raise ApiError(400, 'Validation errors', errors)
+    return create, updates, remove
+
+def validate_project_search(query):
+    """Parse ?q=, ?tech=, ?page= and ?limit= like projectSearchValidation; returns
+    (text, tags, page, limit)"""
+    errors = []
+
+    def fail(field, message):
+        errors.append({'type': 'field', 'msg': message, 'path': field, 'location': 'query'})
+
+    def integer(field, default, low, high, message):
+        value = query.get(field)
+        if value is None:
+            return default
+        if not INTEGER_RE.fullmatch(value) or not low <= int(value) <= high:
+            fail(field, message)
+            return default
+        return int(value)
+
+    text = query.get('q', '').strip()
+    if len(text) > MAX_SEARCH_LENGTH:
+        fail('q', f'Search text must be at most {MAX_SEARCH_LENGTH} characters')
+    tags = [tag.strip() for tag in query.get('tech', '').split(',') if tag.strip()]
+    if len(tags) > MAX_SEARCH_TAGS:
+        fail('tech', f'At most {MAX_SEARCH_TAGS} tech tags can be searched for')
+    page = integer('page', 1, 1, math.inf, 'Page must be a positive integer')
+    limit = integer('limit', DEFAULT_SEARCH_LIMIT, 1, MAX_SEARCH_LIMIT,
+                    f'Limit must be between 1 and {MAX_SEARCH_LIMIT}')
+    if errors:
+        raise ApiError(400, 'Validation errors', errors)
+    return text, tags, page, limit
+
+def validate_personal(body):
+    v = Validator(body)
+    v.string('name', 2, 100, 'Name must be between 2 and 100 characters')
+    v.string('title', 2, 200, 'Title must be between 2 and 200 characters')
+    v.string('tagline', 10, 300, 'Tagline must be between 10 and 300 characters')
+    v.string('bio', 50, 2000, 'Bio must be between 50 and 2000 characters')
+    v.email('email', 'Please provide a valid email')
+    v.url('profileImageUrl', 'Profile image must be a valid URL', optional=True)
+    v.url('resumeUrl', 'Resume must be a valid URL', optional=True)
+    return v.check()
+
+def validate_contact(body):
+    v = Validator(body)
+    v.string('name', 2, 100, 'Name must be between 2 and 100 characters')
+    v.email('email', 'Please provide a valid email')
+    v.string('message', 10, 1000, 'Message must be between 10 and 1000 characters')
+    return v.check()